@@ -5,6 +5,8 @@ Accelerapp - Next Generation Hardware Control Platform
 __version__ = "1.0.0"
 __author__ = "The Writer Ben"
 
-from .core import AccelerappCore
+from .lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {"AccelerappCore": ".core"})
 
 __all__ = ["AccelerappCore", "__version__"]
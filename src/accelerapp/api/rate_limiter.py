@@ -3,13 +3,15 @@ Rate limiting for API calls and LLM requests.
 Prevents abuse and manages resource usage.
 """
 
+import math
 import time
 from typing import Dict, Optional, Tuple
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
 import threading
 
+from ..utils.rate_limit import Limit, RateAlgorithm, RateLimitEngine
+
 
 @dataclass
 class RateLimitRule:
@@ -18,33 +20,56 @@ class RateLimitRule:
     max_requests: int  # Maximum requests allowed
     time_window: int  # Time window in seconds
     burst_size: Optional[int] = None  # Optional burst allowance
+    exact: bool = False  # Track every request instead of the approximate window
 
     def __post_init__(self):
         if self.burst_size is None:
             self.burst_size = self.max_requests
 
+    def to_limit(self) -> Limit:
+        """Engine limit for this rule: max_requests per sliding time_window."""
+        algorithm = RateAlgorithm.SLIDING_LOG if self.exact else RateAlgorithm.SLIDING_WINDOW
+        return Limit(self.max_requests, self.time_window, algorithm=algorithm)
+
 
 class RateLimiter:
     """
-    Token bucket rate limiter with per-client tracking.
+    Sliding-window rate limiter with per-client tracking.
     Supports both request-based and token-based limiting.
+
+    Usage is kept as two counters per client in a shared RateLimitEngine,
+    so checks cost O(1) whatever the client's request volume. The window is
+    approximated from two fixed buckets and can briefly admit more than
+    max_requests per time_window; rules with ``exact=True`` keep a log of
+    request times and never do.
     """
 
-    def __init__(self, default_rule: Optional[RateLimitRule] = None):
+    def __init__(
+        self, default_rule: Optional[RateLimitRule] = None, engine: Optional[RateLimitEngine] = None
+    ):
         """
         Initialize rate limiter.
 
         Args:
             default_rule: Default rate limiting rule
+            engine: Rate limit engine to share (a private one by default)
         """
         self.default_rule = default_rule or RateLimitRule(
             max_requests=100, time_window=3600, burst_size=10  # 1 hour
         )
 
-        self.client_buckets: Dict[str, deque] = {}
+        self.engine = engine if engine is not None else RateLimitEngine()
         self.client_rules: Dict[str, RateLimitRule] = {}
         self.lock = threading.Lock()
 
+    @property
+    def client_buckets(self) -> Dict[str, int]:
+        """Snapshot of tracked clients and the requests they used in the current window."""
+        return {
+            client_id: self.get_client_info(client_id)["used"]
+            for client_id in self.engine.client_ids()
+        }
+
     def set_rule(self, client_id: str, rule: RateLimitRule):
         """
         Set rate limit rule for specific client.
@@ -67,49 +92,27 @@ class RateLimiter:
         Returns:
             Tuple of (allowed, info_dict)
         """
-        with self.lock:
-            rule = self.client_rules.get(client_id, self.default_rule)
-
-            # Initialize bucket for new client
-            if client_id not in self.client_buckets:
-                self.client_buckets[client_id] = deque()
-
-            bucket = self.client_buckets[client_id]
-            current_time = time.time()
-
-            # Remove old entries outside time window
-            cutoff_time = current_time - rule.time_window
-            while bucket and bucket[0] < cutoff_time:
-                bucket.popleft()
-
-            # Check if within limit
-            current_usage = len(bucket)
-            remaining = rule.max_requests - current_usage
-
-            if current_usage + tokens <= rule.max_requests:
-                # Add tokens to bucket
-                for _ in range(tokens):
-                    bucket.append(current_time)
-
-                return True, {
-                    "allowed": True,
-                    "limit": rule.max_requests,
-                    "remaining": remaining - tokens,
-                    "reset_time": current_time + rule.time_window,
-                }
-            else:
-                # Rate limit exceeded
-                oldest_request = bucket[0] if bucket else current_time
-                reset_time = oldest_request + rule.time_window
-                retry_after = int(reset_time - current_time)
-
-                return False, {
-                    "allowed": False,
-                    "limit": rule.max_requests,
-                    "remaining": 0,
-                    "reset_time": reset_time,
-                    "retry_after": retry_after,
-                }
+        rule = self.client_rules.get(client_id, self.default_rule)
+        decision = self.engine.acquire(client_id, [rule.to_limit()], cost=tokens)
+        current_time = time.time()
+
+        if decision.allowed:
+            return True, {
+                "allowed": True,
+                "limit": rule.max_requests,
+                "remaining": decision.remaining,
+                "reset_time": current_time + decision.reset_after,
+            }
+
+        # Rate limit exceeded
+        retry_after = decision.retry_after
+        return False, {
+            "allowed": False,
+            "limit": rule.max_requests,
+            "remaining": 0,
+            "reset_time": current_time + min(retry_after, 2 * rule.time_window),
+            "retry_after": math.ceil(retry_after) if math.isfinite(retry_after) else None,
+        }
 
     def reset_client(self, client_id: str):
         """
@@ -118,9 +121,7 @@ class RateLimiter:
         Args:
             client_id: Client identifier
         """
-        with self.lock:
-            if client_id in self.client_buckets:
-                self.client_buckets[client_id].clear()
+        self.engine.reset(client_id)
 
     def get_client_info(self, client_id: str) -> Dict[str, any]:
         """
@@ -132,45 +133,32 @@ class RateLimiter:
         Returns:
             Client rate limit information
         """
-        with self.lock:
-            rule = self.client_rules.get(client_id, self.default_rule)
-            bucket = self.client_buckets.get(client_id, deque())
-
-            current_time = time.time()
-            cutoff_time = current_time - rule.time_window
-
-            # Count valid requests
-            valid_requests = sum(1 for t in bucket if t >= cutoff_time)
-
-            return {
-                "client_id": client_id,
-                "limit": rule.max_requests,
-                "used": valid_requests,
-                "remaining": rule.max_requests - valid_requests,
-                "time_window": rule.time_window,
-                "burst_size": rule.burst_size,
-            }
+        rule = self.client_rules.get(client_id, self.default_rule)
+        decision = self.engine.peek(client_id, [rule.to_limit()], cost=0)
+
+        return {
+            "client_id": client_id,
+            "limit": rule.max_requests,
+            "used": rule.max_requests - decision.remaining,
+            "remaining": decision.remaining,
+            "time_window": rule.time_window,
+            "burst_size": rule.burst_size,
+        }
 
     def cleanup_old_clients(self, max_age_seconds: int = 86400):
         """
         Remove data for inactive clients.
 
+        Clients whose windows have fully expired are also evicted
+        automatically by the engine as requests come in.
+
         Args:
             max_age_seconds: Maximum age to keep client data (default 24 hours)
         """
+        evicted = self.engine.evict_idle(max_idle=max_age_seconds)
         with self.lock:
-            current_time = time.time()
-            cutoff_time = current_time - max_age_seconds
-
-            clients_to_remove = []
-            for client_id, bucket in self.client_buckets.items():
-                if not bucket or bucket[-1] < cutoff_time:
-                    clients_to_remove.append(client_id)
-
-            for client_id in clients_to_remove:
-                del self.client_buckets[client_id]
-                if client_id in self.client_rules:
-                    del self.client_rules[client_id]
+            for client_id in evicted:
+                self.client_rules.pop(client_id, None)
 
 
 class APIKeyManager:
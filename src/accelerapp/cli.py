@@ -4,7 +4,6 @@ Command-line interface for Accelerapp.
 
 import click
 from pathlib import Path
-from .core import AccelerappCore
 from . import __version__
 
 
@@ -33,6 +32,8 @@ def generate(config_file, output, firmware_only, software_only, ui_only):
 
     CONFIG_FILE: Path to YAML configuration file with hardware specs
     """
+    from .core import AccelerappCore
+
     click.echo(f"Loading configuration from: {config_file}")
 
     # Initialize core
@@ -138,8 +139,17 @@ communication:
 
 
 @main.command()
-def info():
+@click.option(
+    "--import-time", "import_time", is_flag=True, help="Report cold import time of Accelerapp"
+)
+@click.option("--module", default="accelerapp.cli", help="Module to time with --import-time")
+@click.option("--top", default=15, help="Number of slowest imports to list")
+def info(import_time, module, top):
     """Display information about Accelerapp."""
+    if import_time:
+        _report_import_time(module, top)
+        return
+
     click.echo("Accelerapp v0.1.0")
     click.echo("\nNext Generation Hardware Control Platform")
     click.echo("\nFeatures:")
@@ -155,5 +165,22 @@ def info():
     click.echo("  https://github.com/thewriterben/Accelerapp")
 
 
+def _report_import_time(module: str, top: int):
+    """Print the cold import time of a module and its slowest imports."""
+    from .utils.import_time import measure_import_time, slowest_imports
+
+    try:
+        report = measure_import_time(module)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Import time for {module}: {report['total_ms']:.1f} ms")
+    click.echo(f"Interpreter wall time: {report['wall_ms']:.1f} ms")
+    click.echo(f"Modules imported: {len(report['modules'])}")
+    click.echo(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in slowest_imports(report, limit=top):
+        click.echo(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {entry['name']}")
+
+
 if __name__ == "__main__":
     main()
@@ -2,79 +2,78 @@
 Core architecture module for Accelerapp v2.0.
 Provides fundamental interfaces, dependency injection, configuration management,
 exception handling, and event-driven architecture.
-"""
-
-# Legacy Phase 1 imports (backward compatible)
-from .interfaces import IService, IAgent, IPlugin, IRepository, BaseService
-from .dependency_injection import ServiceContainer as LegacyServiceContainer
 
-# Phase 2 enhanced imports (v2.0)
-# Configuration Management
-try:
-    from .config import ConfigurationManager
-    from .config import AppConfig, ServiceConfig, PerformanceConfig, MonitoringConfig
-except ImportError:
-    # Fallback to legacy config if new one doesn't exist
-    from .config import ConfigurationManager
+Submodules are imported on first attribute access; configuration (pydantic),
+exceptions and events are not loaded until something uses them.
+"""
 
-# Exception Handling - prefer new, fallback to old
-try:
-    from .exceptions import (
-        ErrorCode,
-        AccelerappException,
-        ConfigurationError,
-        ServiceError,
-        ValidationError,
-        ResourceError,
-        PluginError,
-        CircuitBreakerError,
-        RetryExhaustedError,
-        CacheError,
-        MonitoringError,
-    )
-except ImportError:
-    from .exceptions import (
-        AccelerappException,
-        ConfigurationError,
-        ServiceError,
-        ValidationError,
-        ResourceError,
-    )
+from ..lazy import lazy_exports
 
-# Enhanced DI Container (v2.0)
-try:
-    from .container import ServiceContainer as EnhancedServiceContainer
-    from .container import ServiceLifecycle, LifecycleManager, ServiceHealthMonitor
-    # Prefer enhanced container, but keep legacy available
-    ServiceContainer = EnhancedServiceContainer
-except ImportError:
-    ServiceContainer = LegacyServiceContainer
+_EXPORTS = {
+    # Legacy Phase 1 (backward compatible)
+    "IService": ".interfaces",
+    "IAgent": ".interfaces",
+    "IPlugin": ".interfaces",
+    "IRepository": ".interfaces",
+    "BaseService": ".interfaces",
+    "LegacyServiceContainer": ".dependency_injection:ServiceContainer",
+    # Configuration Management
+    "ConfigurationManager": ".config",
+    "AppConfig": ".config",
+    "ServiceConfig": ".config",
+    "PerformanceConfig": ".config",
+    "MonitoringConfig": ".config",
+    # Exception Handling
+    "ErrorCode": ".exceptions",
+    "AccelerappException": ".exceptions",
+    "ConfigurationError": ".exceptions",
+    "ServiceError": ".exceptions",
+    "ValidationError": ".exceptions",
+    "ResourceError": ".exceptions",
+    "PluginError": ".exceptions",
+    "CircuitBreakerError": ".exceptions",
+    "RetryExhaustedError": ".exceptions",
+    "CacheError": ".exceptions",
+    "MonitoringError": ".exceptions",
+    # Enhanced DI Container (preferred over the legacy container)
+    "ServiceContainer": ".container",
+    "EnhancedServiceContainer": ".container:ServiceContainer",
+    "ServiceLifecycle": ".container",
+    "LifecycleManager": ".container",
+    "ServiceHealthMonitor": ".container",
+    # Event-Driven Architecture
+    "EventBus": ".events",
+    "Event": ".events",
+    "EventStore": ".events",
+    "Saga": ".events",
+    "SagaOrchestrator": ".events",
+}
 
-# Event-Driven Architecture (v2.0)
-try:
-    from .events import EventBus, Event, EventStore, Saga, SagaOrchestrator
-except ImportError:
-    # Events not available in legacy version
-    pass
+_lazy_getattr, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
 
-# Import AccelerappCore from the legacy core.py for backward compatibility
-import sys
-from pathlib import Path
 
-# Get parent directory and import from core.py
-parent_dir = Path(__file__).parent.parent
-core_module_path = parent_dir / "core.py"
-if core_module_path.exists():
+def _load_legacy_core():
+    """Load AccelerappCore from the legacy core.py shadowed by this package."""
     import importlib.util
+    from pathlib import Path
+
+    core_module_path = Path(__file__).parent.parent / "core.py"
+    if not core_module_path.exists():
+        return None
     spec = importlib.util.spec_from_file_location("accelerapp_core_legacy", core_module_path)
-    if spec and spec.loader:
-        core_legacy = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(core_legacy)
-        AccelerappCore = core_legacy.AccelerappCore
-    else:
-        AccelerappCore = None
-else:
-    AccelerappCore = None
+    if not spec or not spec.loader:
+        return None
+    core_legacy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(core_legacy)
+    return core_legacy.AccelerappCore
+
+
+def __getattr__(name: str):
+    if name == "AccelerappCore":
+        value = globals()["AccelerappCore"] = _load_legacy_core()
+        return value
+    return _lazy_getattr(name)
+
 
 # Backward compatible exports
 __all__ = [
@@ -94,36 +93,28 @@ __all__ = [
     "ConfigurationManager",
     # Dependency Injection
     "ServiceContainer",
+    # Enhanced Configuration
+    "AppConfig",
+    "ServiceConfig",
+    "PerformanceConfig",
+    "MonitoringConfig",
+    # Enhanced Exceptions
+    "ErrorCode",
+    "PluginError",
+    "CircuitBreakerError",
+    "RetryExhaustedError",
+    "CacheError",
+    "MonitoringError",
+    # Enhanced DI
+    "ServiceLifecycle",
+    "LifecycleManager",
+    "ServiceHealthMonitor",
+    # Events
+    "EventBus",
+    "Event",
+    "EventStore",
+    "Saga",
+    "SagaOrchestrator",
+    # Orchestration
+    "AccelerappCore",
 ]
-
-# Add v2.0 exports if available
-try:
-    __all__.extend([
-        # Enhanced Configuration
-        "AppConfig",
-        "ServiceConfig",
-        "PerformanceConfig",
-        "MonitoringConfig",
-        # Enhanced Exceptions
-        "ErrorCode",
-        "PluginError",
-        "CircuitBreakerError",
-        "RetryExhaustedError",
-        "CacheError",
-        "MonitoringError",
-        # Enhanced DI
-        "ServiceLifecycle",
-        "LifecycleManager",
-        "ServiceHealthMonitor",
-        # Events
-        "EventBus",
-        "Event",
-        "EventStore",
-        "Saga",
-        "SagaOrchestrator",
-    ])
-except NameError:
-    pass
-
-if AccelerappCore:
-    __all__.append("AccelerappCore")
@@ -3,5 +3,6 @@ Audit logging module.
 """
 
 from .audit_logger import EnterpriseAuditLogger
+from .event_store import AuditEventStore
 
-__all__ = ["EnterpriseAuditLogger"]
+__all__ = ["EnterpriseAuditLogger", "AuditEventStore"]
@@ -3,11 +3,17 @@ Enterprise Audit Logger.
 Comprehensive audit trails for compliance.
 """
 
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, List
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 import json
+import logging
+
+from .event_store import AuditEventStore
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -31,36 +37,82 @@ class EnterpriseAuditLogger:
     """
     Enterprise-grade audit logging system.
     Provides comprehensive audit trails for compliance requirements.
+    
+    Events are appended to segmented JSONL files and indexed by tenant,
+    user and resource, so logging costs one line of I/O and queries touch
+    only matching events, newest first.
     """
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        retention_days: Optional[int] = None
+    ):
         """
         Initialize audit logger.
         
         Args:
             storage_path: Path to store audit logs
+            retention_days: Optional age after which events are compacted away
         """
         self.storage_path = storage_path or Path.home() / ".accelerapp" / "audit"
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self.events: List[AuditEvent] = []
+        self.retention_days = retention_days
+        self.store = AuditEventStore(
+            self.storage_path,
+            AuditEvent,
+            index_fields=("tenant_id", "user_id", "resource_id")
+        )
         self._load_events()
     
+    @property
+    def events(self) -> List[AuditEvent]:
+        """All retained events, oldest first."""
+        return self.store.records
+    
     def _load_events(self) -> None:
-        """Load audit events from storage."""
+        """
+        Import a legacy audit_log.json into the segment store.
+        
+        The whole file is parsed first and stored as one segment written
+        atomically; only then is it renamed to audit_log.json.migrated.
+        Events already stored by an import interrupted before the rename
+        are skipped. If migration fails the legacy file is left in place
+        and retried on the next start.
+        """
         events_file = self.storage_path / "audit_log.json"
         if events_file.exists():
             try:
                 with open(events_file, "r") as f:
-                    data = json.load(f)
-                    self.events = [AuditEvent(**e) for e in data]
-            except Exception:
-                self.events = []
+                    events = [AuditEvent(**e) for e in json.load(f)]
+                known = {event.event_id for event in self.store.records}
+                self.store.import_records([e for e in events if e.event_id not in known])
+                events_file.rename(events_file.with_name("audit_log.json.migrated"))
+            except (OSError, ValueError, TypeError) as e:
+                logger.error("Failed to migrate legacy audit log %s: %s", events_file, e)
+        
+        if self.retention_days is not None:
+            self.compact()
     
-    def _save_events(self) -> None:
-        """Save audit events to storage."""
-        events_file = self.storage_path / "audit_log.json"
-        with open(events_file, "w") as f:
-            json.dump([asdict(e) for e in self.events], f, indent=2)
+    def compact(self, before: Optional[str] = None) -> int:
+        """
+        Remove expired events and their segments.
+        
+        Args:
+            before: ISO timestamp cutoff (default: now minus retention_days)
+            
+        Returns:
+            Number of events removed
+        """
+        if before is None:
+            if self.retention_days is None:
+                return 0
+            before = (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat()
+        return self.store.compact(before)
+    
+    def close(self) -> None:
+        """Flush pending writes to disk and close the log."""
+        self.store.close()
     
     def log_event(
         self,
@@ -107,8 +159,7 @@ class EnterpriseAuditLogger:
             user_agent=user_agent
         )
         
-        self.events.append(event)
-        self._save_events()
+        self.store.append(event)
         
         return event
     
@@ -139,39 +190,45 @@ class EnterpriseAuditLogger:
         Returns:
             List of matching AuditEvent instances
         """
-        filtered_events = self.events
-        
-        if tenant_id:
-            filtered_events = [e for e in filtered_events if e.tenant_id == tenant_id]
-        
-        if user_id:
-            filtered_events = [e for e in filtered_events if e.user_id == user_id]
-        
-        if action:
-            filtered_events = [e for e in filtered_events if e.action == action]
-        
-        if resource_type:
-            filtered_events = [e for e in filtered_events if e.resource_type == resource_type]
-        
-        if status:
-            filtered_events = [e for e in filtered_events if e.status == status]
-        
-        if start_time:
-            filtered_events = [
-                e for e in filtered_events
-                if e.timestamp >= start_time
-            ]
-        
-        if end_time:
-            filtered_events = [
-                e for e in filtered_events
-                if e.timestamp <= end_time
-            ]
-        
-        # Sort by timestamp descending
-        filtered_events.sort(key=lambda e: e.timestamp, reverse=True)
+        return list(islice(
+            self.iter_events(
+                tenant_id, user_id, action, resource_type, status, start_time, end_time
+            ),
+            limit
+        ))
+    
+    def iter_events(
+        self,
+        tenant_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        status: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> Iterator[AuditEvent]:
+        """
+        Iterate audit events matching filters, newest first, without
+        materializing the result.
         
-        return filtered_events[:limit]
+        Args:
+            Same filters as query_events
+            
+        Returns:
+            Lazy iterator of AuditEvent instances
+        """
+        filters = {
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "status": status,
+        }
+        return self.store.iter_newest(
+            {field: value for field, value in filters.items() if value},
+            start_time=start_time or None,
+            end_time=end_time or None
+        )
     
     def get_user_activity(self, user_id: str, limit: int = 50) -> List[AuditEvent]:
         """
@@ -203,12 +260,10 @@ class EnterpriseAuditLogger:
         Returns:
             List of AuditEvent instances
         """
-        events = [
-            e for e in self.events
-            if e.resource_type == resource_type and e.resource_id == resource_id
-        ]
-        events.sort(key=lambda e: e.timestamp, reverse=True)
-        return events[:limit]
+        events = self.store.iter_newest(
+            {"resource_id": resource_id, "resource_type": resource_type}
+        )
+        return list(islice(events, limit))
     
     def get_statistics(
         self,
@@ -0,0 +1,400 @@
+"""
+Append-only segment storage for audit events.
+Keeps events in time order with per-field indexes for newest-first queries.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Type
+from dataclasses import dataclass, asdict
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+@dataclass
+class _Segment:
+    """One segment file and the time range of its events."""
+
+    path: Path
+    count: int = 0
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+
+    def add(self, timestamp: str) -> None:
+        self.count += 1
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+
+class AuditEventStore:
+    """
+    Append-only, segmented JSONL store for dataclass records.
+
+    Each record is written as one JSON line to the newest segment file;
+    segments roll over after a fixed number of records, and fsync is
+    batched (group commit) by record count and elapsed time. All records
+    stay in memory sorted by timestamp, with a position index per indexed
+    field, so queries walk only the smallest matching index, bound it by
+    binary search on time and yield newest first. Expired segments are
+    deleted (or rewritten if only partly expired) by compact().
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        record_type: Type,
+        index_fields: Sequence[str] = ("tenant_id", "user_id"),
+        time_field: str = "timestamp",
+        segment_max_events: int = 10000,
+        sync_batch: int = 256,
+        sync_interval: float = 1.0
+    ):
+        """
+        Initialize event store and load existing segments.
+
+        Args:
+            directory: Directory holding segment files
+            record_type: Dataclass of stored records
+            index_fields: Record fields to index for equality queries
+            time_field: Record field holding an ISO timestamp
+            segment_max_events: Records per segment before rolling over
+            sync_batch: Records written between fsyncs
+            sync_interval: Maximum seconds between fsyncs while writing
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.record_type = record_type
+        self.index_fields = tuple(index_fields)
+        self.time_field = time_field
+        self.segment_max_events = segment_max_events
+        self.sync_batch = sync_batch
+        self.sync_interval = sync_interval
+
+        self.records: List[Any] = []
+        self._timestamps: List[str] = []
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {}
+        self._segments: List[_Segment] = []
+        self._next_segment = 1
+        self._file: Optional[TextIO] = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.RLock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _load(self) -> None:
+        """Read every segment, dropping a torn final line left by a crash."""
+        # Leftovers of an interrupted rewrite or import; the segments are intact
+        for temporary in self.directory.glob(f"{SEGMENT_PREFIX}*.tmp"):
+            temporary.unlink()
+
+        records = []
+        paths = sorted(
+            self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"),
+            key=lambda p: p.name
+        )
+        if paths:
+            with open(paths[-1], "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    f.truncate(data.rfind(b"\n") + 1)
+        for path in paths:
+            segment = _Segment(path)
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        record = self.record_type(**json.loads(line))
+                    except (ValueError, TypeError):
+                        continue
+                    segment.add(getattr(record, self.time_field))
+                    records.append(record)
+            self._segments.append(segment)
+            number = path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+            if number.isdigit():
+                self._next_segment = max(self._next_segment, int(number) + 1)
+
+        records.sort(key=lambda r: getattr(r, self.time_field))
+        self.records = records
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """
+        Rebuild timestamps and field indexes from the sorted records.
+
+        New lists are built rather than edited in place, so iterators over
+        the previous ones stay consistent.
+        """
+        self._timestamps = [getattr(r, self.time_field) for r in self.records]
+        self._indexes = {field: {} for field in self.index_fields}
+        for position, record in enumerate(self.records):
+            for field, index in self._indexes.items():
+                index.setdefault(getattr(record, field), []).append(position)
+
+    def append(self, record: Any) -> None:
+        """
+        Append a record.
+
+        Args:
+            record: Record to store
+        """
+        timestamp = getattr(record, self.time_field)
+        line = json.dumps(asdict(record), separators=(",", ":")) + "\n"
+        with self._lock:
+            segment = self._writable_segment()
+            self._file.write(line)
+            self._file.flush()
+            segment.add(timestamp)
+            self._pending += 1
+            if (
+                self._pending >= self.sync_batch
+                or time.monotonic() - self._last_sync >= self.sync_interval
+            ):
+                self._sync()
+
+            if self._timestamps and timestamp < self._timestamps[-1]:
+                # Clock went backwards: keep time order, at the cost of a reindex
+                position = _bisect(self._timestamps, timestamp, right=True)
+                self.records = self.records[:position] + [record] + self.records[position:]
+                self._reindex()
+                return
+
+            position = len(self.records)
+            self.records.append(record)
+            self._timestamps.append(timestamp)
+            for field, index in self._indexes.items():
+                index.setdefault(getattr(record, field), []).append(position)
+
+    def import_records(self, records: Sequence[Any]) -> int:
+        """
+        Atomically add a batch of records as a new segment.
+
+        The segment is written to a temporary file, synced and renamed into
+        place, so after a crash either every record is stored or none is.
+
+        Args:
+            records: Records to store
+
+        Returns:
+            Number of records imported
+        """
+        records = list(records)
+        if not records:
+            return 0
+        lines = [json.dumps(asdict(r), separators=(",", ":")) + "\n" for r in records]
+        with self._lock:
+            self._close_file()
+            path = self._segment_path()
+            temporary = path.with_suffix(".tmp")
+            with open(temporary, "w") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, path)
+
+            segment = _Segment(path)
+            for record in records:
+                segment.add(getattr(record, self.time_field))
+            self._segments.append(segment)
+            self.records = sorted(
+                self.records + records, key=lambda r: getattr(r, self.time_field)
+            )
+            self._reindex()
+        return len(records)
+
+    def _segment_path(self) -> Path:
+        """Allocate the path of the next segment."""
+        name = f"{SEGMENT_PREFIX}{self._next_segment:08d}{SEGMENT_SUFFIX}"
+        self._next_segment += 1
+        return self.directory / name
+
+    def _writable_segment(self) -> _Segment:
+        """Get the segment to append to, rolling over when it is full."""
+        segment = self._segments[-1] if self._segments else None
+        if segment is None or segment.count >= self.segment_max_events:
+            segment = _Segment(self._segment_path())
+            self._segments.append(segment)
+            self._close_file()
+        if self._file is None:
+            self._file = open(segment.path, "a")
+        return segment
+
+    def _sync(self) -> None:
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def sync(self) -> None:
+        """Force written records to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Sync and close the open segment."""
+        with self._lock:
+            self._close_file()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def iter_newest(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        predicate: Optional[Callable[[Any], bool]] = None
+    ) -> Iterator[Any]:
+        """
+        Iterate matching records, newest first.
+
+        Args:
+            filters: Field to required value mapping
+            start_time: Optional inclusive lower time bound (ISO format)
+            end_time: Optional inclusive upper time bound (ISO format)
+            predicate: Optional extra record test
+
+        Returns:
+            Lazy iterator of records
+        """
+        filters = dict(filters or {})
+        with self._lock:
+            # Walk the smallest index among the filtered fields
+            positions: Sequence[int] = range(len(self.records))
+            chosen = None
+            for field, value in filters.items():
+                index = self._indexes.get(field)
+                if index is not None:
+                    candidate = index.get(value, [])
+                    if chosen is None or len(candidate) < len(positions):
+                        positions, chosen = candidate, field
+            filters.pop(chosen, None)
+
+            timestamps = self._timestamps
+            low = 0 if start_time is None else _bisect(
+                positions, start_time, key=timestamps.__getitem__
+            )
+            high = len(positions) if end_time is None else _bisect(
+                positions, end_time, key=timestamps.__getitem__, right=True
+            )
+            records = self.records
+
+        # Appends only extend these lists and rebuilds replace them, so the
+        # captured range stays valid while the caller consumes it lazily
+        for i in range(high - 1, low - 1, -1):
+            record = records[positions[i]]
+            if all(getattr(record, field) == value for field, value in filters.items()):
+                if predicate is None or predicate(record):
+                    yield record
+
+    def compact(self, before: str) -> int:
+        """
+        Drop records older than a timestamp.
+
+        Segments holding only older records are deleted; a segment that
+        straddles the cutoff is rewritten with its newer records.
+
+        Args:
+            before: ISO timestamp; older records are removed
+
+        Returns:
+            Number of records removed
+        """
+        with self._lock:
+            removed = _bisect(self._timestamps, before)
+            if not removed:
+                return 0
+
+            kept = []
+            for segment in self._segments:
+                if segment.last_timestamp is not None and segment.last_timestamp < before:
+                    if segment is self._segments[-1]:
+                        self._close_file()
+                    segment.path.unlink()
+                    continue
+                if segment.first_timestamp is not None and segment.first_timestamp < before:
+                    self._rewrite(segment, before)
+                kept.append(segment)
+            self._segments = kept
+
+            self.records = self.records[removed:]
+            self._reindex()
+            return removed
+
+    def _rewrite(self, segment: _Segment, before: str) -> None:
+        """Rewrite a segment without its records older than a timestamp."""
+        if self._segments and segment is self._segments[-1]:
+            self._close_file()
+
+        lines = []
+        rewritten = _Segment(segment.path)
+        with open(segment.path, "r") as f:
+            for line in f:
+                try:
+                    timestamp = json.loads(line)[self.time_field]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if timestamp >= before:
+                    lines.append(line if line.endswith("\n") else line + "\n")
+                    rewritten.add(timestamp)
+
+        temporary = segment.path.with_suffix(".tmp")
+        with open(temporary, "w") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, segment.path)
+        segment.count = rewritten.count
+        segment.first_timestamp = rewritten.first_timestamp
+        segment.last_timestamp = rewritten.last_timestamp
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        with self._lock:
+            return {
+                "records": len(self.records),
+                "segments": len(self._segments),
+                "oldest": self._timestamps[0] if self._timestamps else None,
+                "newest": self._timestamps[-1] if self._timestamps else None,
+            }
+
+
+def _bisect(
+    items: Sequence[Any],
+    value: Any,
+    key: Callable[[Any], Any] = lambda item: item,
+    right: bool = False
+) -> int:
+    """Binary search over sorted items (bisect's key= needs Python 3.10)."""
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high) // 2
+        probe = key(items[middle])
+        if probe < value or (right and probe == value):
+            low = middle + 1
+        else:
+            high = middle
+    return low
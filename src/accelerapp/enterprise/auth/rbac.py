@@ -3,8 +3,8 @@ Role-Based Access Control (RBAC) Manager.
 Implements fine-grained permissions and role management.
 """
 
-from typing import Dict, Any, Optional, List, Set
-from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, Iterable, Optional, List, Set, Tuple
+from dataclasses import dataclass, fields
 
 
 @dataclass
@@ -28,10 +28,26 @@ class Role:
     inherits_from: Optional[List[str]] = None  # Parent roles
 
 
+@dataclass
+class _UserAccess:
+    """Materialized permissions of one user."""
+    
+    version: int
+    permission_ids: FrozenSet[str]
+    grants: FrozenSet[Tuple[str, str]]  # (resource, action)
+
+
 class RBACManager:
     """
     Manages Role-Based Access Control.
     Provides fine-grained permission management and role hierarchy.
+    
+    Role inheritance is followed transitively (cycles are tolerated). Each
+    role's permission closure and each user's (resource, action) grants
+    are materialized on first use. Assigning or revoking a role drops that
+    user's entry; editing roles or permissions bumps a version that makes
+    every materialized entry stale. Edit roles and permissions through the
+    manager (update_role, update_permission, ...) rather than directly.
     """
     
     def __init__(self):
@@ -39,6 +55,9 @@ class RBACManager:
         self.permissions: Dict[str, Permission] = {}
         self.roles: Dict[str, Role] = {}
         self.user_roles: Dict[str, Set[str]] = {}  # user_id -> set of role_ids
+        self._version = 0
+        self._role_closures: Dict[str, FrozenSet[str]] = {}
+        self._user_access: Dict[str, _UserAccess] = {}
         self._initialize_default_permissions()
         self._initialize_default_roles()
     
@@ -112,6 +131,7 @@ class RBACManager:
         )
         
         self.permissions[permission_id] = permission
+        self._invalidate()
         return permission
     
     def create_role(
@@ -144,8 +164,127 @@ class RBACManager:
         )
         
         self.roles[role_id] = role
+        self._invalidate()
         return role
     
+    def delete_role(self, role_id: str) -> bool:
+        """
+        Delete a role; users and child roles simply lose its permissions.
+        
+        Args:
+            role_id: Role identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.roles.pop(role_id, None) is None:
+            return False
+        self._invalidate()
+        return True
+    
+    def update_permission(self, permission_id: str, /, **changes: Any) -> bool:
+        """
+        Update fields of a permission.
+        
+        Args:
+            permission_id: Permission identifier
+            **changes: New values for Permission fields (resource, action,
+                description)
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            ValueError: If a field is unknown or is the identifier
+        """
+        permission = self.permissions.get(permission_id)
+        if permission is None:
+            return False
+        self._check_fields(Permission, "permission_id", changes)
+        
+        for name, value in changes.items():
+            setattr(permission, name, value)
+        self._invalidate()
+        return True
+    
+    def update_role(self, role_id: str, /, **changes: Any) -> bool:
+        """
+        Update fields of a role.
+        
+        Args:
+            role_id: Role identifier
+            **changes: New values for Role fields (name, description,
+                permissions, inherits_from)
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            ValueError: If a field is unknown or is the identifier
+        """
+        role = self.roles.get(role_id)
+        if role is None:
+            return False
+        self._check_fields(Role, "role_id", changes)
+        if "permissions" in changes:
+            changes["permissions"] = set(changes["permissions"])
+        if "inherits_from" in changes:
+            changes["inherits_from"] = list(changes["inherits_from"] or [])
+        
+        for name, value in changes.items():
+            setattr(role, name, value)
+        self._invalidate()
+        return True
+    
+    def grant_permission(self, role_id: str, permission_id: str) -> bool:
+        """
+        Add a permission to a role.
+        
+        Args:
+            role_id: Role identifier
+            permission_id: Permission identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        role = self.roles.get(role_id)
+        if role is None or permission_id not in self.permissions:
+            return False
+        role.permissions.add(permission_id)
+        self._invalidate()
+        return True
+    
+    def revoke_permission(self, role_id: str, permission_id: str) -> bool:
+        """
+        Remove a permission from a role.
+        
+        Args:
+            role_id: Role identifier
+            permission_id: Permission identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        role = self.roles.get(role_id)
+        if role is None or permission_id not in role.permissions:
+            return False
+        role.permissions.discard(permission_id)
+        self._invalidate()
+        return True
+    
+    def set_role_parents(self, role_id: str, inherits_from: List[str]) -> bool:
+        """
+        Replace the roles a role inherits from.
+        
+        Args:
+            role_id: Role identifier
+            inherits_from: Parent role IDs
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.update_role(role_id, inherits_from=inherits_from)
+    
     def assign_role(self, user_id: str, role_id: str) -> bool:
         """
         Assign a role to a user.
@@ -164,6 +303,7 @@ class RBACManager:
             self.user_roles[user_id] = set()
         
         self.user_roles[user_id].add(role_id)
+        self._user_access.pop(user_id, None)
         return True
     
     def revoke_role(self, user_id: str, role_id: str) -> bool:
@@ -179,6 +319,7 @@ class RBACManager:
         """
         if user_id in self.user_roles and role_id in self.user_roles[user_id]:
             self.user_roles[user_id].remove(role_id)
+            self._user_access.pop(user_id, None)
             return True
         return False
     
@@ -197,12 +338,8 @@ class RBACManager:
         Returns:
             True if user has permission, False otherwise
         """
-        if user_id not in self.user_roles:
-            return False
-        
-        # Get all permissions from user's roles (including inherited)
-        user_permissions = self._get_user_permissions(user_id)
-        return permission_id in user_permissions
+        access = self._access(user_id)
+        return access is not None and permission_id in access.permission_ids
     
     def check_resource_access(
         self,
@@ -221,36 +358,95 @@ class RBACManager:
         Returns:
             True if user has access, False otherwise
         """
-        user_permissions = self._get_user_permissions(user_id)
-        
-        # Find matching permissions
-        for perm_id in user_permissions:
-            permission = self.permissions.get(perm_id)
-            if permission and permission.resource == resource and permission.action == action:
-                return True
+        access = self._access(user_id)
+        return access is not None and (resource, action) in access.grants
+    
+    def check_resource_access_bulk(
+        self,
+        user_ids: Iterable[str],
+        requests: Iterable[Tuple[str, str]]
+    ) -> Dict[str, Dict[Tuple[str, str], bool]]:
+        """
+        Check many users against many (resource, action) pairs.
         
-        return False
+        Args:
+            user_ids: User identifiers
+            requests: (resource, action) pairs to check for every user
+            
+        Returns:
+            Mapping of user ID to {(resource, action): allowed}
+        """
+        requests = list(requests)
+        results = {}
+        for user_id in user_ids:
+            access = self._access(user_id)
+            grants = access.grants if access is not None else frozenset()
+            results[user_id] = {request: request in grants for request in requests}
+        return results
     
     def _get_user_permissions(self, user_id: str) -> Set[str]:
         """Get all permissions for a user including inherited."""
-        if user_id not in self.user_roles:
-            return set()
+        access = self._access(user_id)
+        return set(access.permission_ids) if access is not None else set()
+    
+    def _access(self, user_id: str) -> Optional[_UserAccess]:
+        """Get a user's materialized permissions, rebuilding them if stale."""
+        access = self._user_access.get(user_id)
+        if access is not None and access.version == self._version:
+            return access
         
-        all_permissions = set()
+        role_ids = self.user_roles.get(user_id)
+        if role_ids is None:
+            return None
         
-        for role_id in self.user_roles[user_id]:
-            role = self.roles.get(role_id)
-            if role:
-                all_permissions.update(role.permissions)
-                
-                # Add inherited permissions
-                if role.inherits_from:
-                    for parent_role_id in role.inherits_from:
-                        parent_role = self.roles.get(parent_role_id)
-                        if parent_role:
-                            all_permissions.update(parent_role.permissions)
+        permission_ids: Set[str] = set()
+        for role_id in role_ids:
+            permission_ids |= self._role_permissions(role_id)
+        grants = set()
+        for permission_id in permission_ids:
+            permission = self.permissions.get(permission_id)
+            if permission:
+                grants.add((permission.resource, permission.action))
         
-        return all_permissions
+        access = _UserAccess(self._version, frozenset(permission_ids), frozenset(grants))
+        self._user_access[user_id] = access
+        return access
+    
+    def _role_permissions(self, role_id: str) -> FrozenSet[str]:
+        """Get permissions of a role and every role it transitively inherits from."""
+        closure = self._role_closures.get(role_id)
+        if closure is not None:
+            return closure
+        
+        permissions: Set[str] = set()
+        seen = {role_id}
+        pending = [role_id]
+        while pending:
+            role = self.roles.get(pending.pop())
+            if not role:
+                continue
+            permissions.update(role.permissions)
+            for parent_id in role.inherits_from or ():
+                if parent_id not in seen:
+                    seen.add(parent_id)
+                    pending.append(parent_id)
+        
+        closure = frozenset(permissions)
+        self._role_closures[role_id] = closure
+        return closure
+    
+    def _invalidate(self) -> None:
+        """Mark role closures and materialized user permissions stale."""
+        self._version += 1
+        self._role_closures.clear()
+    
+    @staticmethod
+    def _check_fields(cls: type, key: str, changes: Dict[str, Any]) -> None:
+        """Reject changes to unknown fields or to the identifier the object is stored under."""
+        invalid = set(changes) - {f.name for f in fields(cls)}
+        invalid |= set(changes) & {key}
+        if invalid:
+            raise ValueError(f"Cannot update {cls.__name__} fields: {', '.join(sorted(invalid))}")
     
     def get_user_roles(self, user_id: str) -> List[Role]:
         """
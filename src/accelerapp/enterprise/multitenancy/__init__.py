@@ -2,6 +2,6 @@
 Multi-tenancy module.
 """
 
-from .tenant_manager import TenantManager
+from .tenant_manager import TenantManager, ResourceReservation
 
-__all__ = ["TenantManager"]
+__all__ = ["TenantManager", "ResourceReservation"]
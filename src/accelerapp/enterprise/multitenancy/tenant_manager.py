@@ -3,10 +3,11 @@ Multi-Tenancy Manager.
 Provides isolated environments for different organizations.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import secrets
+import threading
 
 
 @dataclass
@@ -33,16 +34,60 @@ class TenantResource:
     created_at: str
 
 
+@dataclass
+class ResourceReservation:
+    """Quota held for tenant resources that are about to be created."""
+    
+    reservation_id: str
+    tenant_id: str
+    counts: Dict[str, int]  # resource_type -> reserved count
+    created_at: str
+    active: bool = True
+
+
+class _TenantLedger:
+    """One tenant's resources, indexed by ID and type, plus reserved quota."""
+    
+    __slots__ = ("lock", "resources", "by_type", "reserved")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.resources: Dict[str, TenantResource] = {}
+        self.by_type: Dict[str, Dict[str, TenantResource]] = {}
+        self.reserved: Dict[str, int] = {}
+    
+    def used(self, resource_type: str) -> int:
+        """Committed plus reserved resources of a type."""
+        return len(self.by_type.get(resource_type, ())) + self.reserved.get(resource_type, 0)
+    
+    def add(self, resource: TenantResource):
+        self.resources[resource.resource_id] = resource
+        self.by_type.setdefault(resource.resource_type, {})[resource.resource_id] = resource
+    
+    def release(self, counts: Dict[str, int]):
+        for resource_type, count in counts.items():
+            remaining = self.reserved.get(resource_type, 0) - count
+            if remaining > 0:
+                self.reserved[resource_type] = remaining
+            else:
+                self.reserved.pop(resource_type, None)
+
+
 class TenantManager:
     """
     Manages multi-tenant environments.
     Provides isolation and resource management for different organizations.
+    
+    Each tenant's resources are indexed by ID and by type, so quota checks
+    and usage reports read counters instead of scanning resources. Quota
+    is claimed under a per-tenant lock, either directly on create or as a
+    reservation that is committed (or released) later.
     """
     
     def __init__(self):
         """Initialize tenant manager."""
         self.tenants: Dict[str, Tenant] = {}
-        self.resources: Dict[str, List[TenantResource]] = {}  # tenant_id -> resources
+        self._ledgers: Dict[str, _TenantLedger] = {}  # tenant_id -> resources and quota
         self.default_limits = {
             "max_devices": 100,
             "max_users": 50,
@@ -80,10 +125,18 @@ class TenantManager:
         )
         
         self.tenants[tenant_id] = tenant
-        self.resources[tenant_id] = []
+        self._ledgers[tenant_id] = _TenantLedger()
         
         return tenant
     
+    @property
+    def resources(self) -> Dict[str, List[TenantResource]]:
+        """Snapshot of resources per tenant."""
+        return {
+            tenant_id: list(ledger.resources.values())
+            for tenant_id, ledger in self._ledgers.items()
+        }
+    
     def get_tenant(self, tenant_id: str) -> Optional[Tenant]:
         """
         Get a tenant by ID.
@@ -200,24 +253,181 @@ class TenantManager:
         if not tenant or tenant.status != "active":
             return None
         
-        # Check resource limits
-        if not self._check_resource_limit(tenant_id, resource_type):
+        ledger = self._ledgers[tenant_id]
+        with ledger.lock:
+            # Check resource limits
+            if not self._within_limit(tenant, ledger, resource_type, 1):
+                return None
+            
+            resource = self._new_resource(
+                tenant_id, resource_type, data, datetime.utcnow().isoformat()
+            )
+            ledger.add(resource)
+        return resource
+    
+    def create_resources(
+        self,
+        requests: Iterable[Tuple[str, str, Dict[str, Any]]]
+    ) -> Optional[List[TenantResource]]:
+        """
+        Create many resources, possibly across tenants, all or nothing.
+        
+        Quota for every tenant in the batch is reserved first; if any
+        tenant is inactive or over a limit, all reservations are released
+        and nothing is created.
+        
+        Args:
+            requests: (tenant_id, resource_type, data) tuples
+            
+        Returns:
+            Created TenantResource instances in request order, or None
+        """
+        requests = list(requests)
+        demand: Dict[str, Dict[str, int]] = {}
+        for tenant_id, resource_type, _ in requests:
+            counts = demand.setdefault(tenant_id, {})
+            counts[resource_type] = counts.get(resource_type, 0) + 1
+        
+        reservations = []
+        for tenant_id, counts in demand.items():
+            reservation = self.reserve_resources(tenant_id, counts)
+            if reservation is None:
+                for taken in reservations:
+                    self.release_reservation(taken)
+                return None
+            reservations.append(reservation)
+        
+        created_at = datetime.utcnow().isoformat()
+        created = [
+            self._new_resource(tenant_id, resource_type, data, created_at)
+            for tenant_id, resource_type, data in requests
+        ]
+        grouped: Dict[str, List[TenantResource]] = {}
+        for resource in created:
+            grouped.setdefault(resource.tenant_id, []).append(resource)
+        for reservation in reservations:
+            self._commit(reservation, grouped[reservation.tenant_id])
+        return created
+    
+    def reserve_resources(
+        self,
+        tenant_id: str,
+        counts: Dict[str, int]
+    ) -> Optional[ResourceReservation]:
+        """
+        Reserve quota for resources to be created later.
+        
+        Reserved quota counts against limits until the reservation is
+        committed or released.
+        
+        Args:
+            tenant_id: Tenant identifier
+            counts: Resource type to number of resources
+            
+        Returns:
+            ResourceReservation, or None if the tenant is inactive or a
+            limit would be exceeded
+        """
+        tenant = self.tenants.get(tenant_id)
+        if not tenant or tenant.status != "active":
             return None
         
-        resource_id = secrets.token_urlsafe(16)
-        resource = TenantResource(
-            resource_id=resource_id,
+        ledger = self._ledgers[tenant_id]
+        with ledger.lock:
+            for resource_type, count in counts.items():
+                if count < 0 or not self._within_limit(tenant, ledger, resource_type, count):
+                    return None
+            for resource_type, count in counts.items():
+                ledger.reserved[resource_type] = ledger.reserved.get(resource_type, 0) + count
+        
+        return ResourceReservation(
+            reservation_id=secrets.token_urlsafe(16),
             tenant_id=tenant_id,
-            resource_type=resource_type,
-            data=data,
+            counts=dict(counts),
             created_at=datetime.utcnow().isoformat()
         )
+    
+    def commit_reservation(
+        self,
+        reservation: ResourceReservation,
+        resources: List[Tuple[str, Dict[str, Any]]]
+    ) -> Optional[List[TenantResource]]:
+        """
+        Create reserved resources; unused reserved quota is released.
         
-        if tenant_id not in self.resources:
-            self.resources[tenant_id] = []
+        Args:
+            reservation: Active reservation
+            resources: (resource_type, data) tuples within the reserved counts
+            
+        Returns:
+            Created TenantResource instances, or None if the reservation is
+            no longer active or does not cover the resources
+        """
+        counts: Dict[str, int] = {}
+        for resource_type, _ in resources:
+            counts[resource_type] = counts.get(resource_type, 0) + 1
+        if any(count > reservation.counts.get(t, 0) for t, count in counts.items()):
+            return None
         
-        self.resources[tenant_id].append(resource)
-        return resource
+        created_at = datetime.utcnow().isoformat()
+        created = [
+            self._new_resource(reservation.tenant_id, resource_type, data, created_at)
+            for resource_type, data in resources
+        ]
+        return created if self._commit(reservation, created) else None
+    
+    def release_reservation(self, reservation: ResourceReservation) -> bool:
+        """
+        Return reserved quota without creating resources.
+        
+        Args:
+            reservation: Reservation to release
+            
+        Returns:
+            True if the reservation was active
+        """
+        ledger = self._ledgers.get(reservation.tenant_id)
+        if ledger is None:
+            return False
+        with ledger.lock:
+            if not reservation.active:
+                return False
+            reservation.active = False
+            ledger.release(reservation.counts)
+        return True
+    
+    def _commit(
+        self,
+        reservation: ResourceReservation,
+        resources: List[TenantResource]
+    ) -> bool:
+        """Add resources covered by a reservation and close it."""
+        ledger = self._ledgers.get(reservation.tenant_id)
+        if ledger is None:
+            return False
+        with ledger.lock:
+            if not reservation.active:
+                return False
+            reservation.active = False
+            ledger.release(reservation.counts)
+            for resource in resources:
+                ledger.add(resource)
+        return True
+    
+    @staticmethod
+    def _new_resource(
+        tenant_id: str,
+        resource_type: str,
+        data: Dict[str, Any],
+        created_at: str
+    ) -> TenantResource:
+        return TenantResource(
+            resource_id=secrets.token_urlsafe(16),
+            tenant_id=tenant_id,
+            resource_type=resource_type,
+            data=data,
+            created_at=created_at
+        )
     
     def get_tenant_resources(
         self,
@@ -234,12 +444,14 @@ class TenantManager:
         Returns:
             List of TenantResource instances
         """
-        resources = self.resources.get(tenant_id, [])
+        ledger = self._ledgers.get(tenant_id)
+        if ledger is None:
+            return []
         
         if resource_type:
-            resources = [r for r in resources if r.resource_type == resource_type]
+            return list(ledger.by_type.get(resource_type, {}).values())
         
-        return resources
+        return list(ledger.resources.values())
     
     def delete_resource(self, tenant_id: str, resource_id: str) -> bool:
         """
@@ -252,16 +464,20 @@ class TenantManager:
         Returns:
             True if successful, False otherwise
         """
-        if tenant_id not in self.resources:
+        ledger = self._ledgers.get(tenant_id)
+        if ledger is None:
             return False
         
-        resources = self.resources[tenant_id]
-        for i, resource in enumerate(resources):
-            if resource.resource_id == resource_id:
-                del resources[i]
-                return True
+        with ledger.lock:
+            resource = ledger.resources.pop(resource_id, None)
+            if resource is None:
+                return False
+            of_type = ledger.by_type[resource.resource_type]
+            del of_type[resource_id]
+            if not of_type:
+                del ledger.by_type[resource.resource_type]
         
-        return False
+        return True
     
     def _check_resource_limit(self, tenant_id: str, resource_type: str) -> bool:
         """Check if tenant can create more resources of this type."""
@@ -269,16 +485,22 @@ class TenantManager:
         if not tenant:
             return False
         
-        # Count existing resources of this type
-        current_count = sum(
-            1 for r in self.resources.get(tenant_id, [])
-            if r.resource_type == resource_type
-        )
-        
+        ledger = self._ledgers[tenant_id]
+        with ledger.lock:
+            return self._within_limit(tenant, ledger, resource_type, 1)
+    
+    @staticmethod
+    def _within_limit(
+        tenant: Tenant,
+        ledger: _TenantLedger,
+        resource_type: str,
+        count: int
+    ) -> bool:
+        """Check a limit against committed and reserved resources (lock held)."""
         # Check against limit (if defined)
-        limit_key = f"max_{resource_type}"
-        if limit_key in tenant.resource_limits:
-            return current_count < tenant.resource_limits[limit_key]
+        limit = tenant.resource_limits.get(f"max_{resource_type}")
+        if limit is not None:
+            return ledger.used(resource_type) + count <= limit
         
         return True
     
@@ -296,20 +518,19 @@ class TenantManager:
         if not tenant:
             return {}
         
-        resources = self.resources.get(tenant_id, [])
-        
-        # Count resources by type
-        resource_counts = {}
-        for resource in resources:
-            resource_counts[resource.resource_type] = \
-                resource_counts.get(resource.resource_type, 0) + 1
+        ledger = self._ledgers[tenant_id]
+        with ledger.lock:
+            total = len(ledger.resources)
+            resource_counts = {t: len(resources) for t, resources in ledger.by_type.items()}
+            reserved = dict(ledger.reserved)
         
         return {
             "tenant_id": tenant_id,
             "tenant_name": tenant.name,
             "status": tenant.status,
-            "total_resources": len(resources),
+            "total_resources": total,
             "resources_by_type": resource_counts,
+            "reserved_by_type": reserved,
             "limits": tenant.resource_limits
         }
     
@@ -3,41 +3,62 @@ Hardware abstraction layer module for Accelerapp.
 Provides unified hardware component interfaces and conflict detection.
 Integrates WildCAM_ESP32 hardware generation capabilities.
 
+Submodules are imported on first attribute access, so using one device
+family does not import the others (or their optional dependencies).
 """
 
-from .abstraction import HardwareAbstractionLayer, HardwareComponent, ComponentFactory
-from .protocols import (
-    ProtocolType,
-    I2CConfig,
-    SPIConfig,
-    CANConfig,
-    ProtocolGenerator,
-    DeviceDriverGenerator,
-)
-from .design import EnclosureGenerator, EnclosureDesign, BoardSupportMatrix, ESP32BoardType
-from .environmental import EnvironmentalValidator, ValidationResult, EnvironmentType
-from .esp32_marauder import (
-    ESP32Marauder,
-    MarauderCommand,
-    AttackType,
-    WiFiNetwork,
-    BluetoothDevice,
-    PacketCapture,
-)
-from .flipper_zero import (
-    FlipperZero,
-    FlipperProtocol,
-    RFIDType,
-    NFCType,
-    RFIDTag,
-    NFCTag,
-    SubGHzSignal,
-    IRSignal,
-)
-from .camera import (
-    ESP32Camera,
+from ..lazy import lazy_exports
 
-)
+_EXPORTS = {
+    "HardwareAbstractionLayer": ".abstraction",
+    "HardwareComponent": ".abstraction",
+    "ComponentFactory": ".abstraction",
+    "ProtocolType": ".protocols",
+    "I2CConfig": ".protocols",
+    "SPIConfig": ".protocols",
+    "CANConfig": ".protocols",
+    "ProtocolGenerator": ".protocols",
+    "DeviceDriverGenerator": ".protocols",
+    "EnclosureGenerator": ".design",
+    "EnclosureDesign": ".design",
+    "BoardSupportMatrix": ".design",
+    "ESP32BoardType": ".design",
+    "EnvironmentalValidator": ".environmental",
+    "ValidationResult": ".environmental",
+    "EnvironmentType": ".environmental",
+    "ESP32Marauder": ".esp32_marauder",
+    "MarauderCommand": ".esp32_marauder",
+    "AttackType": ".esp32_marauder",
+    "WiFiNetwork": ".esp32_marauder",
+    "BluetoothDevice": ".esp32_marauder",
+    "PacketCapture": ".esp32_marauder",
+    "FlipperZero": ".flipper_zero",
+    "FlipperProtocol": ".flipper_zero",
+    "RFIDType": ".flipper_zero",
+    "NFCType": ".flipper_zero",
+    "RFIDTag": ".flipper_zero",
+    "NFCTag": ".flipper_zero",
+    "SubGHzSignal": ".flipper_zero",
+    "IRSignal": ".flipper_zero",
+    "ESP32Camera": ".camera",
+    # CYD (ESP32-2432S028R)
+    "DisplayDriver": ".cyd",
+    "TouchController": ".cyd",
+    "GPIOManager": ".cyd",
+    "PowerManager": ".cyd",
+    "SensorMonitor": ".cyd",
+    "CommunityIntegration": ".cyd",
+    "TemplateManager": ".cyd",
+    "ExampleLoader": ".cyd",
+    "CYDCodeGenerator": ".cyd",
+    "HardwareOptimizer": ".cyd",
+    "ProjectBuilder": ".cyd",
+    "CYDSimulator": ".cyd",
+    "CYDTwinModel": ".cyd",
+    "CYDMonitor": ".cyd",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
 
 __all__ = [
     "HardwareAbstractionLayer",
@@ -70,5 +91,18 @@ __all__ = [
     "NFCTag",
     "SubGHzSignal",
     "IRSignal",
-
+    "DisplayDriver",
+    "TouchController",
+    "GPIOManager",
+    "PowerManager",
+    "SensorMonitor",
+    "CommunityIntegration",
+    "TemplateManager",
+    "ExampleLoader",
+    "CYDCodeGenerator",
+    "HardwareOptimizer",
+    "ProjectBuilder",
+    "CYDSimulator",
+    "CYDTwinModel",
+    "CYDMonitor",
 ]
@@ -1,3 +1,51 @@
 """
+Camera hardware support for Accelerapp.
+Provides ESP32-CAM devices, sensor drivers, streaming protocols and
+image processing utilities.
 
+Submodules are imported on first attribute access.
+"""
+
+from ...lazy import lazy_exports
+
+_EXPORTS = {
+    "ESP32Camera": ".esp32_cam",
+    "CameraConfig": ".esp32_cam",
+    "StreamConfig": ".esp32_cam",
+    "MotionDetector": ".esp32_cam",
+    "MotionEvent": ".esp32_cam",
+    "AIProcessor": ".esp32_cam",
+    "CameraDigitalTwin": ".esp32_cam",
+    "StorageManager": ".esp32_cam",
+    "CameraSecurityManager": ".esp32_cam",
+    "OV2640Driver": ".drivers",
+    "OV3660Driver": ".drivers",
+    "MJPEGProtocol": ".protocols",
+    "MJPEGStreamServer": ".protocols",
+    "RTSPProtocol": ".protocols",
+    "ImageProcessor": ".utils",
+    "NetworkHelper": ".utils",
+    "ConfigValidator": ".utils",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
+
+__all__ = [
+    "ESP32Camera",
+    "CameraConfig",
+    "StreamConfig",
+    "MotionDetector",
+    "MotionEvent",
+    "AIProcessor",
+    "CameraDigitalTwin",
+    "StorageManager",
+    "CameraSecurityManager",
+    "OV2640Driver",
+    "OV3660Driver",
+    "MJPEGProtocol",
+    "MJPEGStreamServer",
+    "RTSPProtocol",
+    "ImageProcessor",
+    "NetworkHelper",
+    "ConfigValidator",
 ]
@@ -1,3 +1,61 @@
 """
+ESP32-CAM camera support.
+Provides camera control, AI processing, storage, security and remote access.
 
+Submodules are imported on first attribute access, so using storage or AI
+processing does not import the streaming stack (or its dependencies).
+"""
+
+from ....lazy import lazy_exports
+
+_EXPORTS = {
+    "ESP32Camera": ".core",
+    "CameraConfig": ".core",
+    "StreamConfig": ".streaming",
+    "MotionDetector": ".motion_detection",
+    "MotionEvent": ".motion_detection",
+    "AIProcessor": ".ai_processing",
+    "DetectionModel": ".ai_processing",
+    "DetectionResult": ".ai_processing",
+    "InferenceBackend": ".ai_processing",
+    "ModelConfig": ".ai_processing",
+    "CameraDigitalTwin": ".digital_twin",
+    "StorageManager": ".storage",
+    "StorageConfig": ".storage",
+    "StorageType": ".storage",
+    "WriteBehindWriter": ".storage",
+    "CameraSecurityManager": ".security",
+    "SecurityConfig": ".security",
+    "AccessLevel": ".security",
+    "RemoteAccess": ".remote_access",
+    "AuthConfig": ".remote_access",
+    "TunnelConfig": ".remote_access",
+    "TunnelType": ".remote_access",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
+
+__all__ = [
+    "ESP32Camera",
+    "CameraConfig",
+    "StreamConfig",
+    "MotionDetector",
+    "MotionEvent",
+    "AIProcessor",
+    "DetectionModel",
+    "DetectionResult",
+    "InferenceBackend",
+    "ModelConfig",
+    "CameraDigitalTwin",
+    "StorageManager",
+    "StorageConfig",
+    "StorageType",
+    "WriteBehindWriter",
+    "CameraSecurityManager",
+    "SecurityConfig",
+    "AccessLevel",
+    "RemoteAccess",
+    "AuthConfig",
+    "TunnelConfig",
+    "TunnelType",
 ]
@@ -3,13 +3,23 @@ AI Processing module for ESP32-CAM with TinyML integration.
 Supports object detection, face recognition, and edge AI inference.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, Deque, List, Optional, Tuple
+from collections import deque
 from enum import Enum
 from dataclasses import dataclass, field
+import itertools
 import logging
+import queue
+import threading
+import time
+
+from ..utils.image_processing import ImageProcessor, NUMPY_AVAILABLE, np
 
 logger = logging.getLogger(__name__)
 
+# Pipeline stages tracked for latency metrics
+PIPELINE_STAGES = ("preprocess", "inference", "postprocess")
+
 
 class DetectionModel(Enum):
     """Supported detection models."""
@@ -54,6 +64,12 @@ class ModelConfig:
     # Detection settings
     max_detections: int = 10
     nms_threshold: float = 0.5  # Non-maximum suppression
+    history_size: int = 100
+    
+    # Host-side pipeline settings
+    batch_size: int = 8
+    queue_size: int = 32
+    metrics_window: int = 100
     
     # Face recognition specific
     num_faces: int = 10
@@ -76,25 +92,143 @@ class DetectionResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def bbox_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """
+    Intersection over union of two (x, y, width, height) boxes.
+    
+    Args:
+        a: First bounding box
+        b: Second bounding box
+    
+    Returns:
+        IoU in the range 0.0 to 1.0
+    """
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    intersection = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def non_max_suppression(
+    detections: List[DetectionResult],
+    iou_threshold: float,
+    max_detections: Optional[int] = None,
+) -> List[DetectionResult]:
+    """
+    Greedy per-label non-maximum suppression.
+    
+    Detections are visited in descending confidence order and dropped when
+    they overlap an already kept detection of the same label by more than
+    ``iou_threshold``. Detections without a bounding box are always kept.
+    
+    Args:
+        detections: Candidate detections
+        iou_threshold: Maximum allowed IoU between kept boxes
+        max_detections: Optional cap on returned detections
+    
+    Returns:
+        Kept detections, highest confidence first
+    """
+    kept: List[DetectionResult] = []
+    kept_boxes: Dict[str, List[Tuple[int, int, int, int]]] = {}
+    
+    for detection in sorted(detections, key=lambda d: d.confidence, reverse=True):
+        if max_detections is not None and len(kept) >= max_detections:
+            break
+        if detection.bbox is not None:
+            boxes = kept_boxes.setdefault(detection.label, [])
+            if any(bbox_iou(detection.bbox, box) > iou_threshold for box in boxes):
+                continue
+            boxes.append(detection.bbox)
+        kept.append(detection)
+    
+    return kept
+
+
+class _StageMetrics:
+    """Rolling per-stage latency and throughput metrics."""
+    
+    def __init__(self, window: int):
+        self.latencies: Dict[str, Deque[float]] = {
+            stage: deque(maxlen=window) for stage in PIPELINE_STAGES
+        }
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.frames_processed = 0
+        self.batches_processed = 0
+    
+    def record(self, stage: str, elapsed: float, frames: int) -> None:
+        """Record per-frame latency for a stage that handled ``frames`` frames."""
+        self.latencies[stage].append(elapsed * 1000.0 / max(frames, 1))
+    
+    def record_frames(self, frames: int) -> None:
+        """Record completion of a batch of frames."""
+        now = time.monotonic()
+        self.frame_times.extend(itertools.repeat(now, frames))
+        self.frames_processed += frames
+        self.batches_processed += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """Summarize latencies (ms per frame) and recent FPS."""
+        stages = {}
+        for stage, samples in self.latencies.items():
+            ordered = sorted(samples)
+            stages[stage] = {
+                "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+                "p95_ms": ordered[int((len(ordered) - 1) * 0.95)] if ordered else 0.0,
+                "samples": len(ordered),
+            }
+        
+        fps = 0.0
+        if len(self.frame_times) > 1:
+            span = self.frame_times[-1] - self.frame_times[0]
+            if span > 0:
+                fps = (len(self.frame_times) - 1) / span
+        
+        return {
+            "stages": stages,
+            "fps": fps,
+            "frames_processed": self.frames_processed,
+            "batches_processed": self.batches_processed,
+        }
+
+
 class AIProcessor:
     """
     AI processing engine for ESP32-CAM.
     Integrates TinyML models for edge inference.
     """
     
-    def __init__(self, camera, config: Optional[ModelConfig] = None):
+    def __init__(
+        self,
+        camera,
+        config: Optional[ModelConfig] = None,
+        inference_fn: Optional[Callable[[List[Any]], List[List[Dict[str, Any]]]]] = None,
+    ):
         """
         Initialize AI processor.
         
         Args:
             camera: ESP32Camera instance
             config: Model configuration
+            inference_fn: Optional batched inference callable that maps a list
+                of preprocessed frames to one list of raw detections per frame
         """
         self.camera = camera
         self.config = config or ModelConfig()
         self.model_loaded = False
         self.inference_count = 0
-        self.detection_history = []
+        self.detection_history: Deque[DetectionResult] = deque(maxlen=self.config.history_size)
+        self.inference_fn = inference_fn
+        
+        # Host-side pipeline state
+        self._frame_queue: Deque[Tuple[Any, Any]] = deque(maxlen=self.config.queue_size)
+        self._frames_available = threading.Condition()
+        self._frames_dropped = 0
+        self._pipeline_errors = 0
+        self._metrics = _StageMetrics(self.config.metrics_window)
+        self._pipeline_threads: List[threading.Thread] = []
+        self._pipeline_running = threading.Event()
         
         logger.info(f"AIProcessor initialized with model: {self.config.model_type.value}")
     
@@ -152,21 +286,7 @@ class AIProcessor:
                 logger.error("No frame available for detection")
                 return []
             
-            # Preprocess frame
-            preprocessed = self._preprocess_frame(frame)
-            
-            # Run inference
-            detections = self._run_inference(preprocessed)
-            
-            # Post-process results
-            results = self._postprocess_results(detections)
-            
-            self.inference_count += 1
-            self.detection_history.extend(results)
-            
-            # Keep only last 100 detections
-            if len(self.detection_history) > 100:
-                self.detection_history = self.detection_history[-100:]
+            results = self._process_batch([frame])[0]
             
             logger.debug(f"Detection complete: {len(results)} objects found")
             
@@ -176,26 +296,254 @@ class AIProcessor:
             logger.error(f"Detection failed: {e}")
             return []
     
-    def _preprocess_frame(self, frame: bytes) -> bytes:
+    def _preprocess_frame(self, frame: Any) -> Any:
         """
         Preprocess frame for model input.
         
+        Decoded frames (NumPy arrays) are converted to the model color space
+        and resized to the model input size; encoded frames are passed through
+        for the on-device decoder.
+        
         Args:
             frame: Raw frame data
         
         Returns:
             Preprocessed frame
         """
-        # In production, this would:
-        # 1. Resize to model input size
-        # 2. Convert color space if needed
-        # 3. Normalize pixel values
-        # 4. Apply quantization if needed
+        if not NUMPY_AVAILABLE or not isinstance(frame, np.ndarray):
+            return frame
+        
+        if self.config.input_channels == 1:
+            frame = ImageProcessor.to_grayscale(frame)
+        return ImageProcessor.resize_image(
+            frame, self.config.input_width, self.config.input_height
+        )
+    
+    def _preprocess_batch(self, frames: List[Any]) -> List[Any]:
+        """
+        Preprocess a batch of frames.
+        
+        Same-shaped decoded frames are stacked and resized in one vectorized
+        call; anything else is handled per frame.
+        
+        Args:
+            frames: Raw frames
+        
+        Returns:
+            Preprocessed frames in input order
+        """
+        stackable = (
+            NUMPY_AVAILABLE
+            and len(frames) > 1
+            and all(isinstance(frame, np.ndarray) for frame in frames)
+            and len({frame.shape for frame in frames}) == 1
+        )
+        if not stackable:
+            return [self._preprocess_frame(frame) for frame in frames]
+        
+        batch = np.stack(frames)
+        if self.config.input_channels == 1:
+            batch = ImageProcessor.to_grayscale(batch, batch=True)
+        
+        # One output allocation per batch; rows are handed to inference as views
+        out = np.empty(
+            (len(frames), self.config.input_height, self.config.input_width) + batch.shape[3:],
+            dtype=batch.dtype,
+        )
+        ImageProcessor.resize_image(
+            batch, self.config.input_width, self.config.input_height, out=out, batch=True
+        )
+        return list(out)
+    
+    def _run_inference_batch(self, frames: List[Any]) -> List[List[Dict[str, Any]]]:
+        """
+        Run model inference over a batch of preprocessed frames.
+        
+        Args:
+            frames: Preprocessed frames
+        
+        Returns:
+            Raw inference results per frame
+        """
+        if self.inference_fn is not None:
+            return self.inference_fn(frames)
+        return [self._run_inference(frame) for frame in frames]
+    
+    def _process_batch(self, frames: List[Any]) -> List[List[DetectionResult]]:
+        """Run preprocess, inference and postprocess stages over a batch."""
+        preprocessed = self._timed("preprocess", len(frames), self._preprocess_batch, frames)
+        raw = self._timed("inference", len(frames), self._run_inference_batch, preprocessed)
+        return self._finish_batch(raw)
+    
+    def _finish_batch(self, raw: List[List[Dict[str, Any]]]) -> List[List[DetectionResult]]:
+        """Postprocess raw batch output and update history and counters."""
+        results = self._timed(
+            "postprocess",
+            len(raw),
+            lambda batch: [self._postprocess_results(frame_raw) for frame_raw in batch],
+            raw,
+        )
+        
+        for frame_results in results:
+            self.detection_history.extend(frame_results)
+        self.inference_count += len(results)
+        self._metrics.record_frames(len(results))
+        return results
+    
+    def _timed(self, stage: str, frames: int, func: Callable, *args) -> Any:
+        """Run a pipeline stage and record its per-frame latency."""
+        start = time.perf_counter()
+        result = func(*args)
+        self._metrics.record(stage, time.perf_counter() - start, frames)
+        return result
+    
+    def submit_frame(self, frame: Any, source_id: Any = None) -> bool:
+        """
+        Queue a frame for pipelined detection.
+        
+        The queue is bounded; when it is full the oldest frame is dropped so
+        that analysis keeps up with live streams.
+        
+        Args:
+            frame: Frame data
+            source_id: Identifier of the originating stream
+        
+        Returns:
+            True if the frame was queued without dropping another
+        """
+        with self._frames_available:
+            dropped = len(self._frame_queue) == self._frame_queue.maxlen
+            if dropped:
+                self._frames_dropped += 1
+            self._frame_queue.append((source_id, frame))
+            self._frames_available.notify()
+        return not dropped
+    
+    def _take_batch(self) -> List[Tuple[Any, Any]]:
+        """Pop up to ``batch_size`` queued frames."""
+        with self._frames_available:
+            count = min(self.config.batch_size, len(self._frame_queue))
+            return [self._frame_queue.popleft() for _ in range(count)]
+    
+    def process_pending(
+        self,
+        max_batches: Optional[int] = None,
+    ) -> List[Tuple[Any, List[DetectionResult]]]:
+        """
+        Drain queued frames synchronously in batches.
+        
+        Args:
+            max_batches: Maximum number of batches to process (all if None)
+        
+        Returns:
+            List of (source_id, detections) in submission order
+        """
+        if not self.model_loaded:
+            logger.error("Model not loaded")
+            return []
         
-        logger.debug("Preprocessing frame")
-        return frame
+        output = []
+        for _ in itertools.count() if max_batches is None else range(max_batches):
+            batch = self._take_batch()
+            if not batch:
+                break
+            sources = [source for source, _ in batch]
+            results = self._process_batch([frame for _, frame in batch])
+            output.extend(zip(sources, results))
+        return output
     
-    def _run_inference(self, frame: bytes) -> List[Dict[str, Any]]:
+    def start_pipeline(
+        self,
+        callback: Callable[[Any, List[DetectionResult]], None],
+    ) -> bool:
+        """
+        Start background pipelined detection over the frame queue.
+        
+        Preprocessing runs on one thread and inference/postprocessing on
+        another, connected by a small handoff queue so that consecutive
+        batches overlap.
+        
+        Args:
+            callback: Called with (source_id, detections) for each frame
+        
+        Returns:
+            True if the pipeline was started
+        """
+        if not self.model_loaded:
+            logger.error("Model not loaded")
+            return False
+        if self._pipeline_running.is_set():
+            return False
+        
+        handoff: "queue.Queue[Optional[Tuple[List[Any], List[Any]]]]" = queue.Queue(maxsize=2)
+        self._pipeline_running.set()
+        
+        def preprocess_worker() -> None:
+            try:
+                while self._pipeline_running.is_set():
+                    with self._frames_available:
+                        if not self._frame_queue:
+                            self._frames_available.wait(timeout=0.1)
+                    batch = self._take_batch()
+                    if not batch:
+                        continue
+                    frames = [frame for _, frame in batch]
+                    try:
+                        preprocessed = self._timed(
+                            "preprocess", len(frames), self._preprocess_batch, frames
+                        )
+                    except Exception as e:
+                        self._pipeline_errors += 1
+                        logger.error(f"Pipeline preprocessing failed: {e}")
+                        continue
+                    handoff.put(([source for source, _ in batch], preprocessed))
+            finally:
+                # Always release the inference worker, even if this thread dies
+                self._pipeline_running.clear()
+                handoff.put(None)
+        
+        def inference_worker() -> None:
+            while True:
+                item = handoff.get()
+                if item is None:
+                    break
+                sources, preprocessed = item
+                try:
+                    raw = self._timed(
+                        "inference", len(preprocessed), self._run_inference_batch, preprocessed
+                    )
+                    for source, results in zip(sources, self._finish_batch(raw)):
+                        callback(source, results)
+                except Exception as e:
+                    self._pipeline_errors += 1
+                    logger.error(f"Pipeline batch failed: {e}")
+        
+        self._pipeline_threads = [
+            threading.Thread(target=preprocess_worker, name="ai-preprocess", daemon=True),
+            threading.Thread(target=inference_worker, name="ai-inference", daemon=True),
+        ]
+        for thread in self._pipeline_threads:
+            thread.start()
+        
+        logger.info("AI pipeline started")
+        return True
+    
+    def stop_pipeline(self, timeout: float = 5.0) -> None:
+        """
+        Stop background pipelined detection.
+        
+        Args:
+            timeout: Seconds to wait for each worker thread
+        """
+        self._pipeline_running.clear()
+        with self._frames_available:
+            self._frames_available.notify_all()
+        for thread in self._pipeline_threads:
+            thread.join(timeout)
+        self._pipeline_threads = []
+        logger.info("AI pipeline stopped")
+    
+    def _run_inference(self, frame: Any) -> List[Dict[str, Any]]:
         """
         Run model inference.
         
@@ -241,11 +589,9 @@ class AIProcessor:
                 )
                 results.append(result)
         
-        # Apply non-maximum suppression if needed
-        if len(results) > self.config.max_detections:
-            results = results[:self.config.max_detections]
-        
-        return results
+        return non_max_suppression(
+            results, self.config.nms_threshold, self.config.max_detections
+        )
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -254,7 +600,8 @@ class AIProcessor:
         Returns:
             Statistics dictionary
         """
-        recent_detections = self.detection_history[-20:] if self.detection_history else []
+        recent_detections = list(itertools.islice(reversed(self.detection_history), 20))[::-1]
+        pipeline = self._metrics.summary()
         
         return {
             "model_loaded": self.model_loaded,
@@ -270,6 +617,15 @@ class AIProcessor:
                 }
                 for d in recent_detections
             ],
+            "pipeline": {
+                **pipeline,
+                "queue_depth": len(self._frame_queue),
+                "queue_capacity": self._frame_queue.maxlen,
+                "frames_dropped": self._frames_dropped,
+                "errors": self._pipeline_errors,
+                "batch_size": self.config.batch_size,
+                "running": self._pipeline_running.is_set(),
+            },
         }
     
     def generate_inference_code(self) -> Dict[str, str]:
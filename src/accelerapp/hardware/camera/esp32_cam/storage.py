@@ -3,10 +3,20 @@ Storage management for ESP32-CAM.
 Handles local SD card storage, file management, and cloud uploads.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Deque, Dict, Any, Optional, List, Tuple
+from collections import OrderedDict, deque
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
+import errno
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class StorageType(Enum):
@@ -24,6 +34,13 @@ class FileFormat(Enum):
     MP4 = "mp4"
 
 
+class ShardInterval(Enum):
+    """Time bucket used for directory sharding."""
+    HOUR = "%Y/%m/%d/%H"
+    DAY = "%Y/%m/%d"
+    MONTH = "%Y/%m"
+
+
 @dataclass
 class StorageConfig:
     """Storage configuration."""
@@ -32,7 +49,232 @@ class StorageConfig:
     max_file_size_mb: int = 10
     auto_cleanup: bool = True
     cleanup_threshold_percent: int = 80
+    cleanup_target_percent: int = 70
     file_format: FileFormat = FileFormat.JPEG
+    capacity_mb: int = 1024
+    
+    # Persist frame bytes passed as ``data`` (metadata-only when False)
+    persist_data: bool = False
+    # Write-behind queue settings
+    write_behind: bool = True
+    write_queue_size: int = 256
+    fsync_batch_size: int = 32
+    fsync_interval_ms: int = 200
+    # Optional time-bucketed directory sharding
+    shard_interval: Optional[ShardInterval] = None
+
+
+class WriteBehindWriter:
+    """
+    Background writer that persists files off the caller's thread.
+    
+    Operations are applied in submission order. Writes are grouped into
+    batches of up to ``batch_size`` operations (or whatever arrives within
+    ``flush_interval``); every file in a batch is written first and then
+    fsynced together with its parent directories, so durability costs one
+    fsync round per batch instead of stalling each capture.
+    
+    Failed operations never stop the writer thread; they are counted, kept
+    for ``take_errors`` and make the next ``flush`` return False.
+    """
+    
+    def __init__(
+        self,
+        batch_size: int = 32,
+        flush_interval: float = 0.2,
+        max_pending: int = 256,
+    ):
+        """
+        Initialize write-behind writer.
+        
+        Args:
+            batch_size: Maximum operations per fsync batch
+            flush_interval: Seconds to wait for a batch to fill
+            max_pending: Queue bound; submitters block when it is full
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Optional[bytes]]]]" = queue.Queue(
+            maxsize=max_pending
+        )
+        self._stats = {
+            "writes": 0,
+            "deletes": 0,
+            "batches": 0,
+            "bytes_written": 0,
+            "errors": 0,
+        }
+        self._errors: Deque[Tuple[str, str]] = deque(maxlen=100)
+        self._reported_errors = 0
+        self._last_error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self._thread.start()
+    
+    def submit_write(self, path: str, data: bytes) -> None:
+        """Queue a file write."""
+        self._queue.put(("write", path, data))
+    
+    def submit_delete(self, path: str) -> None:
+        """Queue a file deletion."""
+        self._queue.put(("delete", path, None))
+    
+    def pending(self) -> int:
+        """Number of queued operations not yet applied."""
+        return self._queue.unfinished_tasks
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for all queued operations to be applied and synced.
+        
+        Args:
+            timeout: Maximum seconds to wait (forever if None)
+        
+        Returns:
+            True if the queue drained and no operation failed since the
+            previous flush
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        errors = self._stats["errors"]
+        failed = errors != self._reported_errors
+        self._reported_errors = errors
+        return not failed
+    
+    def take_errors(self) -> List[Tuple[str, str]]:
+        """
+        Return and clear the most recent failures.
+        
+        Returns:
+            List of (path, error message) tuples, oldest first
+        """
+        errors = list(self._errors)
+        self._errors.clear()
+        return errors
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending operations and stop the writer thread."""
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            **self._stats,
+            "pending": self.pending(),
+            "last_error": self._last_error,
+        }
+    
+    def _run(self) -> None:
+        """Collect operations into batches and apply them."""
+        while True:
+            op = self._queue.get()
+            if op is None:
+                self._queue.task_done()
+                return
+            
+            batch = [op]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        op = self._queue.get(timeout=remaining)
+                    else:
+                        op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    stop = True
+                    break
+                batch.append(op)
+            
+            try:
+                self._apply_batch(batch)
+            except Exception as e:
+                self._record_error("batch", batch[0][1], e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    self._queue.task_done()
+            if stop:
+                return
+    
+    def _apply_batch(self, batch: List[Tuple[str, str, Optional[bytes]]]) -> None:
+        """Write, fsync and delete one batch of operations in order."""
+        written: List[Tuple[int, str]] = []
+        directories = set()
+        
+        try:
+            for kind, path, data in batch:
+                try:
+                    if kind == "write":
+                        directory = os.path.dirname(path)
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                            directories.add(directory)
+                        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                        written.append((fd, path))
+                        view = memoryview(data or b"")
+                        while view:
+                            view = view[os.write(fd, view):]
+                        self._stats["writes"] += 1
+                        self._stats["bytes_written"] += len(data or b"")
+                    else:
+                        if os.path.exists(path):
+                            os.remove(path)
+                            directories.add(os.path.dirname(path))
+                        self._stats["deletes"] += 1
+                except OSError as e:
+                    self._record_error(kind, path, e)
+            
+            for fd, path in written:
+                try:
+                    os.fsync(fd)
+                except OSError as e:
+                    self._record_error("fsync", path, e)
+            for directory in directories:
+                try:
+                    self._fsync_directory(directory)
+                except OSError as e:
+                    self._record_error("fsync", directory, e)
+        finally:
+            for fd, _ in written:
+                os.close(fd)
+        
+        self._stats["batches"] += 1
+    
+    def _record_error(self, kind: str, path: str, error: Exception) -> None:
+        """Count and keep a failed operation for callers to inspect."""
+        self._stats["errors"] += 1
+        self._last_error = f"{kind}: {error}"
+        self._errors.append((path, self._last_error))
+        logger.error(f"Storage {kind} failed for {path}: {error}")
+    
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """Persist directory entries (no-op where unsupported)."""
+        if not directory or not hasattr(os, "O_DIRECTORY"):
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            # Some filesystems cannot sync directories at all
+            if e.errno != errno.EINVAL:
+                raise
+        finally:
+            os.close(fd)
 
 
 class StorageManager:
@@ -51,9 +293,12 @@ class StorageManager:
         """
         self.camera = camera
         self.config = config or StorageConfig()
-        self._files: List[Dict[str, Any]] = []
+        # Insertion-ordered index: oldest file first for O(1) eviction
+        self._files: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._total_size = 0
-        self._capacity = 1024 * 1024 * 1024  # 1GB simulated
+        self._capacity = self.config.capacity_mb * 1024 * 1024
+        self._sequence = itertools.count()
+        self._writer: Optional[WriteBehindWriter] = None
     
     def initialize(self) -> bool:
         """
@@ -70,35 +315,16 @@ class StorageManager:
         Save image to storage.
         
         Args:
-            image_data: Image data dictionary
+            image_data: Image data dictionary (``size_bytes`` and optional ``data``)
             filename: Optional filename (auto-generated if not provided)
-            
+        
         Returns:
             Path to saved file, or None if failed
         """
         if not filename:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"IMG_{timestamp}.{self.config.file_format.value}"
-        
-        filepath = f"{self.config.base_path}/{filename}"
-        
-        # Simulate file storage
-        file_info = {
-            "filename": filename,
-            "filepath": filepath,
-            "size": image_data.get("size_bytes", 0),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "format": self.config.file_format.value,
-        }
-        
-        self._files.append(file_info)
-        self._total_size += file_info["size"]
-        
-        # Check if cleanup is needed
-        if self.config.auto_cleanup:
-            self._check_cleanup()
+            filename = self._generate_filename("IMG", self.config.file_format.value)
         
-        return filepath
+        return self._store(filename, image_data, {"format": self.config.file_format.value})
     
     def save_video(self, video_data: Dict[str, Any], filename: Optional[str] = None) -> Optional[str]:
         """
@@ -107,45 +333,138 @@ class StorageManager:
         Args:
             video_data: Video data dictionary
             filename: Optional filename
-            
+        
         Returns:
             Path to saved file, or None if failed
         """
         if not filename:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"VID_{timestamp}.avi"
+            filename = self._generate_filename("VID", "avi")
         
-        filepath = f"{self.config.base_path}/{filename}"
+        extra = {"duration_sec": video_data.get("duration_sec", 0)}
+        return self._store(filename, video_data, extra)
+    
+    def _generate_filename(self, prefix: str, extension: str) -> str:
+        """Generate a unique timestamped filename."""
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+        return f"{prefix}_{timestamp}_{next(self._sequence):04d}.{extension}"
+    
+    def _resolve_path(self, filename: str, when: datetime) -> str:
+        """Build the storage path, sharded into time buckets if configured."""
+        if self.config.shard_interval is None:
+            return f"{self.config.base_path}/{filename}"
+        bucket = when.strftime(self.config.shard_interval.value)
+        return f"{self.config.base_path}/{bucket}/{filename}"
+    
+    def _store(
+        self,
+        filename: str,
+        payload: Dict[str, Any],
+        extra: Dict[str, Any],
+    ) -> Optional[str]:
+        """Index a file and hand its bytes to the writer."""
+        data = payload.get("data")
+        size = payload.get("size_bytes", len(data) if data is not None else 0)
+        if size > self.config.max_file_size_mb * 1024 * 1024:
+            logger.warning(f"File {filename} exceeds max size ({size} bytes)")
+            return None
         
+        if filename in self._files:
+            self._remove(filename)
+        
+        now = datetime.utcnow()
+        filepath = self._resolve_path(filename, now)
         file_info = {
             "filename": filename,
             "filepath": filepath,
-            "size": video_data.get("size_bytes", 0),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "duration_sec": video_data.get("duration_sec", 0),
+            "size": size,
+            "timestamp": now.isoformat() + "Z",
+            **extra,
         }
         
-        self._files.append(file_info)
-        self._total_size += file_info["size"]
+        self._files[filename] = file_info
+        self._total_size += size
+        
+        if self.config.persist_data and data is not None:
+            self._persist(filepath, bytes(data))
+        
+        # Check if cleanup is needed
+        if self.config.auto_cleanup:
+            self._check_cleanup()
         
         return filepath
     
+    def _persist(self, filepath: str, data: bytes) -> None:
+        """Write file bytes through the write-behind queue or inline."""
+        if self.config.write_behind:
+            self._get_writer().submit_write(filepath, data)
+            return
+        
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _unpersist(self, filepath: str) -> None:
+        """Remove file bytes, ordered after any pending write of the same path."""
+        if not self.config.persist_data:
+            return
+        if self._writer is not None:
+            self._writer.submit_delete(filepath)
+        elif os.path.exists(filepath):
+            os.remove(filepath)
+    
+    def _get_writer(self) -> WriteBehindWriter:
+        """Lazily start the write-behind writer."""
+        if self._writer is None:
+            self._writer = WriteBehindWriter(
+                batch_size=self.config.fsync_batch_size,
+                flush_interval=self.config.fsync_interval_ms / 1000.0,
+                max_pending=self.config.write_queue_size,
+            )
+        return self._writer
+    
+    def _remove(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Drop a file from the index and storage."""
+        file_info = self._files.pop(filename, None)
+        if file_info is not None:
+            self._total_size -= file_info["size"]
+            self._unpersist(file_info["filepath"])
+        return file_info
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued writes and deletions to reach storage.
+        
+        Args:
+            timeout: Maximum seconds to wait (forever if None)
+        
+        Returns:
+            True if everything was written
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+    
+    def close(self) -> None:
+        """Flush pending writes and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
     def delete_file(self, filename: str) -> bool:
         """
         Delete file from storage.
         
         Args:
             filename: Name of file to delete
-            
+        
         Returns:
             True if deleted successfully
         """
-        for i, file_info in enumerate(self._files):
-            if file_info["filename"] == filename:
-                self._total_size -= file_info["size"]
-                self._files.pop(i)
-                return True
-        return False
+        return self._remove(filename) is not None
     
     def list_files(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -153,11 +472,15 @@ class StorageManager:
         
         Args:
             limit: Maximum number of files to return
-            
+        
         Returns:
             List of file information dictionaries
         """
-        return self._files[-limit:]
+        if limit <= 0:
+            return []
+        newest = list(itertools.islice(reversed(self._files.values()), limit))
+        newest.reverse()
+        return newest
     
     def get_storage_info(self) -> Dict[str, Any]:
         """
@@ -177,14 +500,22 @@ class StorageManager:
             "used_percent": used_percent,
             "file_count": len(self._files),
             "auto_cleanup_enabled": self.config.auto_cleanup,
+            "oldest_file": next(iter(self._files), None),
+            "shard_interval": (
+                self.config.shard_interval.name.lower() if self.config.shard_interval else None
+            ),
+            "writer": self._writer.get_stats() if self._writer else None,
         }
     
     def _check_cleanup(self) -> None:
         """Check if cleanup is needed and perform if necessary."""
-        used_percent = (self._total_size / self._capacity) * 100
+        if self._capacity <= 0:
+            return
         
-        if used_percent >= self.config.cleanup_threshold_percent:
-            self._cleanup_old_files()
+        threshold = self._capacity * self.config.cleanup_threshold_percent / 100
+        if self._total_size >= threshold:
+            target = self._capacity * self.config.cleanup_target_percent / 100
+            self._evict_oldest(target_size=min(target, threshold))
     
     def _cleanup_old_files(self, count: int = 10) -> int:
         """
@@ -192,14 +523,34 @@ class StorageManager:
         
         Args:
             count: Number of files to delete
-            
+        
+        Returns:
+            Number of files deleted
+        """
+        return self._evict_oldest(max_files=count)
+    
+    def _evict_oldest(
+        self,
+        target_size: Optional[float] = None,
+        max_files: Optional[int] = None,
+    ) -> int:
+        """
+        Evict oldest files until usage is below a target or a count is reached.
+        
+        Args:
+            target_size: Stop once total size drops below this many bytes
+            max_files: Stop after evicting this many files
+        
         Returns:
             Number of files deleted
         """
         deleted = 0
-        while deleted < count and self._files:
-            file_info = self._files.pop(0)  # Remove oldest
-            self._total_size -= file_info["size"]
+        while self._files:
+            if max_files is not None and deleted >= max_files:
+                break
+            if target_size is not None and self._total_size < target_size:
+                break
+            self._remove(next(iter(self._files)))  # Remove oldest
             deleted += 1
         
         return deleted
@@ -211,7 +562,8 @@ class StorageManager:
         Returns:
             True if successful
         """
-        self._files.clear()
+        for filename in list(self._files):
+            self._remove(filename)
         self._total_size = 0
         return True
     
@@ -222,14 +574,11 @@ class StorageManager:
         Args:
             filename: Name of file to upload
             destination: Cloud destination URL or path
-            
+        
         Returns:
             True if upload successful
         """
         # Placeholder for cloud upload functionality
         # In real implementation, would upload via FTP, SFTP, or cloud API
-        for file_info in self._files:
-            if file_info["filename"] == filename:
-                # Simulate successful upload
-                return True
-        return False
+        # Simulate successful upload
+        return filename in self._files
@@ -2,10 +2,11 @@
 Streaming protocol implementations for ESP32-CAM.
 """
 
-from .mjpeg import MJPEGProtocol
+from .mjpeg import MJPEGProtocol, MJPEGStreamServer
 from .rtsp import RTSPProtocol
 
 __all__ = [
     "MJPEGProtocol",
+    "MJPEGStreamServer",
     "RTSPProtocol",
 ]
@@ -2,7 +2,18 @@
 MJPEG streaming protocol implementation.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import inspect
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+FRAME_BOUNDARY = b"--frame\r\n"
+FRAME_TRAILER = b"\r\n"
 
 
 class MJPEGProtocol:
@@ -28,7 +39,7 @@ class MJPEGProtocol:
         
         Args:
             port: HTTP port for streaming
-            
+        
         Returns:
             True if stream started successfully
         """
@@ -67,22 +78,74 @@ class MJPEGProtocol:
             "Expires": "0",
         }
     
+    @staticmethod
+    def frame_header(frame_length: int) -> bytes:
+        """
+        Build the multipart part header for a frame.
+        
+        Args:
+            frame_length: JPEG frame size in bytes
+        
+        Returns:
+            Boundary and part headers
+        """
+        return b"".join((
+            FRAME_BOUNDARY,
+            b"Content-Type: image/jpeg\r\n",
+            b"Content-Length: %d\r\n\r\n" % frame_length,
+        ))
+    
+    def frame_parts(self, frame_data: bytes) -> Tuple[bytes, memoryview, bytes]:
+        """
+        Split a frame into multipart pieces without copying the JPEG data.
+        
+        Writing the pieces one at a time avoids joining the JPEG data into a
+        new per-client buffer.
+        
+        Args:
+            frame_data: JPEG frame data
+        
+        Returns:
+            Tuple of (part header, frame view, trailer)
+        """
+        self._frame_count += 1
+        return self.frame_header(len(frame_data)), memoryview(frame_data), FRAME_TRAILER
+    
     def format_frame(self, frame_data: bytes) -> bytes:
         """
         Format frame data for MJPEG stream.
         
         Args:
             frame_data: JPEG frame data
-            
+        
         Returns:
             Formatted frame with MJPEG boundaries
         """
-        header = b"--frame\r\n"
-        header += b"Content-Type: image/jpeg\r\n"
-        header += f"Content-Length: {len(frame_data)}\r\n\r\n".encode()
+        return b"".join(self.frame_parts(frame_data))
+    
+    def create_server(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 81,
+        frame_source: Optional[Callable[[], Any]] = None,
+        fps: float = 15.0,
+    ) -> "MJPEGStreamServer":
+        """
+        Create an asyncio relay server that shares this stream with many clients.
         
-        self._frame_count += 1
-        return header + frame_data + b"\r\n"
+        Args:
+            host: Bind address
+            port: HTTP port for streaming
+            frame_source: Callable returning the next JPEG frame (sync or async);
+                defaults to ``camera.capture_frame``
+            fps: Capture rate when a frame source is polled
+        
+        Returns:
+            MJPEG stream server
+        """
+        if frame_source is None:
+            frame_source = getattr(self.camera, "capture_frame", None)
+        return MJPEGStreamServer(self, host=host, port=port, frame_source=frame_source, fps=fps)
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -97,3 +160,293 @@ class MJPEGProtocol:
             "frames_sent": self._frame_count,
             "default_port": 81,
         }
+
+
+@dataclass
+class SharedFrame:
+    """Captured frame shared by every connected client."""
+    
+    sequence: int
+    header: bytes
+    data: memoryview
+    captured_at: float
+    
+    @property
+    def size(self) -> int:
+        """Bytes on the wire for this frame."""
+        return len(self.header) + self.data.nbytes + len(FRAME_TRAILER)
+
+
+@dataclass
+class MJPEGClientStats:
+    """Per-client delivery statistics."""
+    
+    client_id: int
+    peer: str
+    connected_at: float = field(default_factory=time.monotonic)
+    frames_sent: int = 0
+    frames_skipped: int = 0
+    bytes_sent: int = 0
+    last_latency_ms: float = 0.0
+    total_latency_ms: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        elapsed = max(time.monotonic() - self.connected_at, 1e-9)
+        return {
+            "client_id": self.client_id,
+            "peer": self.peer,
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+            "bytes_sent": self.bytes_sent,
+            "fps": self.frames_sent / elapsed,
+            "last_latency_ms": self.last_latency_ms,
+            "avg_latency_ms": self.total_latency_ms / self.frames_sent if self.frames_sent else 0.0,
+            "connected_seconds": elapsed,
+        }
+
+
+class MJPEGStreamServer:
+    """
+    Asyncio MJPEG relay for multiple viewers.
+    
+    One captured frame is shared by all clients. Each client always sends the
+    newest frame once its previous write has drained, so slow clients skip
+    frames instead of accumulating a backlog. Frames are written as separate
+    header/memoryview/trailer pieces rather than concatenated per client; the
+    transport may still buffer a piece it cannot send immediately.
+    """
+    
+    def __init__(
+        self,
+        protocol: MJPEGProtocol,
+        host: str = "0.0.0.0",
+        port: int = 81,
+        frame_source: Optional[Callable[[], Any]] = None,
+        fps: float = 15.0,
+        stream_path: str = "/stream",
+    ):
+        """
+        Initialize MJPEG stream server.
+        
+        Args:
+            protocol: MJPEG protocol handler
+            host: Bind address
+            port: HTTP port (0 picks a free port)
+            frame_source: Callable returning the next JPEG frame, or None when
+                frames are pushed with ``publish_frame``
+            fps: Capture rate for the frame source
+            stream_path: HTTP path serving the stream
+        """
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.frame_source = frame_source
+        self.fps = fps
+        self.stream_path = stream_path
+        
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._capture_task: Optional["asyncio.Task[None]"] = None
+        self._frame: Optional[SharedFrame] = None
+        self._frame_event: Optional[asyncio.Event] = None
+        self._sequence = itertools.count(1)
+        self._client_ids = itertools.count(1)
+        self._clients: Dict[int, MJPEGClientStats] = {}
+        self._handlers: Set["asyncio.Task[None]"] = set()
+        # Totals of disconnected clients
+        self._closed_bytes = 0
+        self._closed_frames = 0
+    
+    async def start(self) -> bool:
+        """
+        Start listening and, if configured, capturing frames.
+        
+        Returns:
+            True if the server started
+        """
+        if self._server is not None:
+            return False
+        
+        self._frame_event = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        
+        if self.frame_source is not None:
+            self._capture_task = asyncio.ensure_future(self._capture_loop())
+        
+        self.protocol._streaming = True
+        logger.info(f"MJPEG relay listening on {self.host}:{self.port}{self.stream_path}")
+        return True
+    
+    async def stop(self) -> None:
+        """Stop capturing, disconnect all clients and close the listener."""
+        if self._capture_task is not None:
+            self._capture_task.cancel()
+            try:
+                await self._capture_task
+            except asyncio.CancelledError:
+                pass
+            self._capture_task = None
+        
+        handlers = list(self._handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        
+        if self._frame_event is not None:
+            self._frame_event.set()
+        self.protocol._streaming = False
+    
+    def publish_frame(self, frame_data: bytes, captured_at: Optional[float] = None) -> int:
+        """
+        Publish a frame to every connected client.
+        
+        Must be called from the event loop thread. The frame bytes are wrapped
+        in a memoryview once and shared; they must not be mutated afterwards.
+        
+        Args:
+            frame_data: JPEG frame data
+            captured_at: Monotonic capture timestamp (defaults to now)
+        
+        Returns:
+            Sequence number of the published frame
+        """
+        header, view, _ = self.protocol.frame_parts(frame_data)
+        self._frame = SharedFrame(
+            sequence=next(self._sequence),
+            header=header,
+            data=view,
+            captured_at=time.monotonic() if captured_at is None else captured_at,
+        )
+        
+        # Wake every waiting client, then arm a fresh event for the next frame
+        if self._frame_event is not None:
+            self._frame_event.set()
+        self._frame_event = asyncio.Event()
+        return self._frame.sequence
+    
+    async def _capture_loop(self) -> None:
+        """Poll the frame source at the configured rate."""
+        interval = 1.0 / self.fps if self.fps > 0 else 0.0
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            started = loop.time()
+            try:
+                if inspect.iscoroutinefunction(self.frame_source):
+                    frame = await self.frame_source()
+                else:
+                    frame = await loop.run_in_executor(None, self.frame_source)
+                if frame:
+                    self.publish_frame(frame)
+            except Exception as e:
+                logger.error(f"Frame capture failed: {e}")
+            
+            await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+    
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Serve one HTTP client until it disconnects."""
+        peer = writer.get_extra_info("peername")
+        stats = MJPEGClientStats(client_id=next(self._client_ids), peer=str(peer))
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            parts = request.split(b"\r\n", 1)[0].split()
+            path = parts[1].decode("latin-1") if len(parts) > 1 else ""
+            if path.split("?", 1)[0] != self.stream_path:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+                return
+            
+            headers = "".join(
+                f"{name}: {value}\r\n" for name, value in self.protocol.get_stream_header().items()
+            )
+            writer.write(f"HTTP/1.1 200 OK\r\n{headers}\r\n".encode())
+            await writer.drain()
+            
+            self._clients[stats.client_id] = stats
+            await self._stream_to_client(writer, stats)
+            
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"MJPEG client {stats.client_id} failed: {e}")
+        finally:
+            self._handlers.discard(task)
+            self._clients.pop(stats.client_id, None)
+            self._closed_bytes += stats.bytes_sent
+            self._closed_frames += stats.frames_sent
+            writer.close()
+    
+    async def _stream_to_client(
+        self,
+        writer: asyncio.StreamWriter,
+        stats: MJPEGClientStats,
+    ) -> None:
+        """Send the newest shared frame each time the client's writes drain."""
+        last_sequence = 0
+        
+        while not writer.is_closing():
+            frame = self._frame
+            if frame is None or frame.sequence == last_sequence:
+                if self._server is None:
+                    return
+                await self._frame_event.wait()
+                continue
+            
+            if last_sequence:
+                stats.frames_skipped += frame.sequence - last_sequence - 1
+            last_sequence = frame.sequence
+            
+            writer.write(frame.header)
+            writer.write(frame.data)
+            writer.write(FRAME_TRAILER)
+            await writer.drain()
+            
+            latency_ms = (time.monotonic() - frame.captured_at) * 1000.0
+            stats.frames_sent += 1
+            stats.bytes_sent += frame.size
+            stats.last_latency_ms = latency_ms
+            stats.total_latency_ms += latency_ms
+    
+    def get_client_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get statistics for connected clients.
+        
+        Returns:
+            List of per-client statistics dictionaries
+        """
+        return [stats.to_dict() for stats in self._clients.values()]
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get relay status.
+        
+        Returns:
+            Status dictionary
+        """
+        clients = self.get_client_stats()
+        return {
+            "running": self._server is not None,
+            "host": self.host,
+            "port": self.port,
+            "stream_path": self.stream_path,
+            "clients": len(clients),
+            "current_frame": self._frame.sequence if self._frame else 0,
+            "total_bytes_sent": sum(c["bytes_sent"] for c in clients) + self._closed_bytes,
+            "total_frames_sent": sum(c["frames_sent"] for c in clients) + self._closed_frames,
+            "client_stats": clients,
+        }
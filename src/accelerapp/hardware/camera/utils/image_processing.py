@@ -1,8 +1,72 @@
 """
 Image processing utilities for ESP32-CAM.
+
+Host-side operations work on decoded frames held in NumPy arrays: a single
+frame is ``(H, W)`` grayscale or ``(H, W, C)`` color, and a batch of frames
+adds a leading axis (``batch=True``). Every operation accepts an optional
+``out`` array so callers can reuse preallocated buffers across frames.
 """
 
-from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+# Integer BT.601 luma weights (sum to 256) for uint8 grayscale conversion
+_LUMA_WEIGHTS = (77, 150, 29)
+
+# Normalized 5-tap binomial kernel used for separable Gaussian-like blur
+_BLUR_KERNEL = (1.0 / 16, 4.0 / 16, 6.0 / 16, 4.0 / 16, 1.0 / 16)
+
+_FILTERS = ("grayscale", "blur", "sharpen", "invert")
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error when NumPy is not installed."""
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "NumPy is required for frame processing. Install with: pip install accelerapp[vision]"
+        )
+
+
+def _is_encoded(image_data: Any) -> bool:
+    """Check whether input is an undecoded byte buffer rather than a frame array."""
+    return isinstance(image_data, (bytes, bytearray, memoryview))
+
+
+@lru_cache(maxsize=64)
+def _area_weights(src: int, dst: int) -> "np.ndarray":
+    """
+    Build a (dst, src) matrix whose rows average the source pixels
+    overlapping each destination pixel, weighted by overlap length.
+    """
+    scale = src / dst
+    edges = np.arange(dst + 1, dtype=np.float64) * scale
+    starts, ends = edges[:-1, None], edges[1:, None]
+    pixels = np.arange(src, dtype=np.float64)[None, :]
+    overlap = np.clip(np.minimum(ends, pixels + 1) - np.maximum(starts, pixels), 0.0, None)
+    weights = overlap / overlap.sum(axis=1, keepdims=True)
+    weights = weights.astype(np.float32)
+    weights.setflags(write=False)
+    return weights
+
+
+def _store(result: "np.ndarray", out: Optional["np.ndarray"], dtype: Any) -> "np.ndarray":
+    """Round/clip a float result into ``out`` (or a new array of ``dtype``)."""
+    if out is None:
+        out = np.empty(result.shape, dtype=dtype)
+    if np.issubdtype(out.dtype, np.integer):
+        info = np.iinfo(out.dtype)
+        np.rint(result, out=result)
+        np.clip(result, info.min, info.max, out=result)
+    np.copyto(out, result, casting="unsafe")
+    return out
 
 
 class ImageProcessor:
@@ -12,22 +76,218 @@ class ImageProcessor:
     """
     
     @staticmethod
-    def calculate_brightness(image_data: bytes) -> float:
+    def as_frame(
+        image_data: bytes,
+        width: int,
+        height: int,
+        channels: int = 1,
+    ) -> "np.ndarray":
+        """
+        Wrap a raw (decoded) pixel buffer as a frame array without copying.
+        
+        Args:
+            image_data: Raw 8-bit pixel data, e.g. PIXFORMAT_GRAYSCALE or RGB888
+            width: Frame width in pixels
+            height: Frame height in pixels
+            channels: Bytes per pixel
+        
+        Returns:
+            Read-only frame view of shape (H, W) or (H, W, C)
+        """
+        _require_numpy()
+        frame = np.frombuffer(image_data, dtype=np.uint8, count=width * height * channels)
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        return frame.reshape(shape)
+    
+    @staticmethod
+    def to_grayscale(
+        frame: "np.ndarray",
+        out: Optional["np.ndarray"] = None,
+        batch: bool = False,
+    ) -> "np.ndarray":
+        """
+        Convert color frames to 8-bit luma.
+        
+        Args:
+            frame: Frame (H, W[, C]) or batch (N, H, W[, C])
+            out: Optional preallocated uint8 output buffer
+            batch: Whether the leading axis is a batch axis
+        
+        Returns:
+            Grayscale frame(s) of shape (H, W) or (N, H, W)
+        """
+        _require_numpy()
+        spatial_dims = 3 if batch else 2
+        if frame.ndim == spatial_dims:
+            if out is None:
+                return frame
+            np.copyto(out, frame, casting="unsafe")
+            return out
+        
+        r, g, b = _LUMA_WEIGHTS
+        luma = frame[..., 0].astype(np.uint16) * r
+        luma += frame[..., 1].astype(np.uint16) * g
+        luma += frame[..., 2].astype(np.uint16) * b
+        luma >>= 8
+        if out is None:
+            return luma.astype(np.uint8)
+        np.copyto(out, luma, casting="unsafe")
+        return out
+    
+    @staticmethod
+    def calculate_brightness(image_data: Any, batch: bool = False) -> Any:
         """
         Calculate average brightness of image.
         
+        Uses a 256-bin luma histogram. Raw byte buffers are treated as 8-bit
+        grayscale samples.
+        
         Args:
-            image_data: Raw image data
-            
+            image_data: Frame array, batch of frames, or raw grayscale bytes
+            batch: Whether the leading axis is a batch axis
+        
+        Returns:
+            Brightness value (0.0 to 1.0), or an array of values for a batch
+        """
+        if _is_encoded(image_data):
+            if not image_data:
+                return 0.0
+            if not NUMPY_AVAILABLE:
+                return sum(bytes(image_data)) / (len(image_data) * 255.0)
+            luma = np.frombuffer(image_data, dtype=np.uint8)
+            batch = False
+        else:
+            _require_numpy()
+            luma = ImageProcessor.to_grayscale(image_data, batch=batch)
+        
+        levels = np.arange(256, dtype=np.float64)
+        
+        if not batch:
+            if luma.size == 0:
+                return 0.0
+            hist = np.bincount(luma.ravel(), minlength=256)
+            return float(hist @ levels / (luma.size * 255.0))
+        
+        frames = luma.reshape(luma.shape[0], -1)
+        if frames.shape[1] == 0:
+            return np.zeros(frames.shape[0])
+        # Offset each frame into its own 256-bin range so one bincount builds every histogram
+        offsets = (np.arange(frames.shape[0], dtype=np.int64) * 256)[:, None]
+        hist = np.bincount((frames + offsets).ravel(), minlength=frames.shape[0] * 256)
+        hist = hist.reshape(frames.shape[0], 256)
+        return hist @ levels / (frames.shape[1] * 255.0)
+    
+    @staticmethod
+    def frame_difference(
+        frame1: "np.ndarray",
+        frame2: "np.ndarray",
+        out: Optional["np.ndarray"] = None,
+        batch: bool = False,
+    ) -> "np.ndarray":
+        """
+        Compute the absolute per-pixel luma difference between frames.
+        
+        Args:
+            frame1: Reference frame(s)
+            frame2: Current frame(s)
+            out: Optional preallocated uint8 output buffer
+            batch: Whether the leading axis is a batch axis
+        
         Returns:
-            Brightness value (0.0 to 1.0)
+            Difference image(s) as uint8
         """
-        # Placeholder implementation
-        # In real implementation, would analyze pixel values
-        return 0.5
+        _require_numpy()
+        a = ImageProcessor.to_grayscale(frame1, batch=batch)
+        b = ImageProcessor.to_grayscale(frame2, batch=batch)
+        if out is None:
+            out = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.uint8)
+        # max - min avoids uint8 wrap-around without widening to int16
+        np.subtract(np.maximum(a, b), np.minimum(a, b), out=out, casting="unsafe")
+        return out
     
     @staticmethod
-    def detect_motion_regions(frame1: bytes, frame2: bytes, threshold: float = 0.1) -> list:
+    def label_regions(
+        mask: "np.ndarray",
+        block_size: int = 8,
+        min_fill: float = 0.1,
+        min_area: int = 1,
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Extract connected regions from a binary motion mask.
+        
+        The mask is reduced to a grid of ``block_size`` cells (a cell is active
+        when at least ``min_fill`` of its pixels are set) and 8-connected
+        active cells are grouped with union-find, so labeling cost scales with
+        the number of active cells instead of pixels.
+        
+        Args:
+            mask: Boolean mask of shape (H, W)
+            block_size: Cell edge length in pixels (1 for pixel-level labeling)
+            min_fill: Fraction of set pixels needed to activate a cell
+            min_area: Minimum region area in pixels
+        
+        Returns:
+            List of motion regions (x, y, width, height), largest first
+        """
+        _require_numpy()
+        height, width = mask.shape
+        rows = -(-height // block_size)
+        cols = -(-width // block_size)
+        
+        padded = np.zeros((rows * block_size, cols * block_size), dtype=np.uint16)
+        padded[:height, :width] = mask
+        counts = padded.reshape(rows, block_size, cols, block_size).sum(axis=(1, 3))
+        active = counts >= max(1, int(np.ceil(min_fill * block_size * block_size)))
+        
+        cells = np.flatnonzero(active)
+        if cells.size == 0:
+            return []
+        
+        parent = {int(cell): int(cell) for cell in cells}
+        
+        def find(cell: int) -> int:
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+        
+        # Union each active cell with its already-visited 8-neighbours
+        for dy, dx in ((0, 1), (1, -1), (1, 0), (1, 1)):
+            x0, x1 = max(0, -dx), cols - max(0, dx)
+            linked = active[: rows - dy, x0:x1] & active[dy:, x0 + dx: x1 + dx]
+            ys, xs = np.nonzero(linked)
+            xs = xs + x0
+            for a, b in zip(ys * cols + xs, (ys + dy) * cols + xs + dx):
+                root_a, root_b = find(int(a)), find(int(b))
+                if root_a != root_b:
+                    parent[root_b] = root_a
+        
+        roots = np.array([find(int(cell)) for cell in cells])
+        order = np.argsort(roots, kind="stable")
+        roots, sorted_cells = roots[order], cells[order]
+        boundaries = np.flatnonzero(np.diff(roots)) + 1
+        
+        regions = []
+        for group in np.split(sorted_cells, boundaries):
+            ys, xs = np.divmod(group, cols)
+            x0, y0 = int(xs.min()) * block_size, int(ys.min()) * block_size
+            x1 = min(width, (int(xs.max()) + 1) * block_size)
+            y1 = min(height, (int(ys.max()) + 1) * block_size)
+            if (x1 - x0) * (y1 - y0) >= min_area:
+                regions.append((x0, y0, x1 - x0, y1 - y0))
+        
+        regions.sort(key=lambda region: region[2] * region[3], reverse=True)
+        return regions
+    
+    @staticmethod
+    def detect_motion_regions(
+        frame1: Any,
+        frame2: Any,
+        threshold: float = 0.1,
+        block_size: int = 8,
+        min_area: int = 1,
+        batch: bool = False,
+    ) -> list:
         """
         Detect motion regions between two frames.
         
@@ -35,56 +295,191 @@ class ImageProcessor:
             frame1: First frame data
             frame2: Second frame data
             threshold: Motion detection threshold
-            
+            block_size: Labeling cell size in pixels
+            min_area: Minimum region area in pixels
+            batch: Compare batches of frame pairs along the leading axis
+        
         Returns:
-            List of motion regions (x, y, width, height)
+            List of motion regions (x, y, width, height), or one list per
+            frame pair when ``batch`` is True
         """
-        # Placeholder implementation
-        # In real implementation, would perform frame differencing
-        return []
+        if _is_encoded(frame1) or _is_encoded(frame2):
+            # Encoded frames carry no pixel geometry; decode before comparing
+            return []
+        
+        diff = ImageProcessor.frame_difference(frame1, frame2, batch=batch)
+        mask = diff > int(threshold * 255)
+        
+        if not batch:
+            return ImageProcessor.label_regions(mask, block_size=block_size, min_area=min_area)
+        return [
+            ImageProcessor.label_regions(frame_mask, block_size=block_size, min_area=min_area)
+            for frame_mask in mask
+        ]
     
     @staticmethod
-    def resize_image(image_data: bytes, target_width: int, target_height: int) -> bytes:
+    def resize_image(
+        image_data: Any,
+        target_width: int,
+        target_height: int,
+        out: Optional["np.ndarray"] = None,
+        batch: bool = False,
+    ) -> Any:
         """
         Resize image to target dimensions.
         
+        Uses area averaging implemented as two matrix products with cached
+        separable weight matrices.
+        
         Args:
             image_data: Original image data
             target_width: Target width in pixels
             target_height: Target height in pixels
-            
+            out: Optional preallocated output buffer
+            batch: Whether the leading axis is a batch axis
+        
         Returns:
             Resized image data
         """
-        # Placeholder - would use image library in real implementation
-        return image_data
+        if _is_encoded(image_data):
+            # Encoded frames must be decoded before resampling
+            return image_data
+        
+        _require_numpy()
+        frame = image_data
+        spatial_axis = 1 if batch else 0
+        height, width = frame.shape[spatial_axis], frame.shape[spatial_axis + 1]
+        color = frame.ndim == spatial_axis + 3
+        
+        rows = _area_weights(height, target_height)
+        cols = _area_weights(width, target_width)
+        
+        pixels = frame.astype(np.float32)
+        if color:
+            pixels = np.moveaxis(pixels, -1, -3)
+        result = rows @ pixels @ cols.T
+        if color:
+            result = np.moveaxis(result, -3, -1)
+        
+        return _store(result, out, frame.dtype)
+    
+    @staticmethod
+    def convolve_separable(
+        frame: "np.ndarray",
+        kernel: Tuple[float, ...],
+        out: Optional["np.ndarray"] = None,
+        batch: bool = False,
+    ) -> "np.ndarray":
+        """
+        Convolve frames with a separable kernel along rows and columns.
+        
+        Args:
+            frame: Frame(s) to filter
+            kernel: 1-D kernel applied along both spatial axes
+            out: Optional preallocated output buffer (may alias ``frame``)
+            batch: Whether the leading axis is a batch axis
+        
+        Returns:
+            Filtered frame(s) with the input dtype
+        """
+        _require_numpy()
+        result = ImageProcessor._convolve_float(frame, kernel, batch)
+        return _store(result, out, frame.dtype)
     
     @staticmethod
-    def apply_filter(image_data: bytes, filter_type: str) -> bytes:
+    def _convolve_float(
+        frame: "np.ndarray",
+        kernel: Tuple[float, ...],
+        batch: bool,
+    ) -> "np.ndarray":
+        """Separable convolution with edge padding, returning float32."""
+        radius = len(kernel) // 2
+        row_axis = 1 if batch else 0
+        
+        result = frame.astype(np.float32)
+        for axis in (row_axis, row_axis + 1):
+            pad = [(0, 0)] * result.ndim
+            pad[axis] = (radius, radius)
+            padded = np.pad(result, pad, mode="edge")
+            size = result.shape[axis]
+            acc = np.zeros_like(result)
+            window = [slice(None)] * result.ndim
+            for offset, weight in enumerate(kernel):
+                window[axis] = slice(offset, offset + size)
+                acc += weight * padded[tuple(window)]
+            result = acc
+        return result
+    
+    @staticmethod
+    def apply_filter(
+        image_data: Any,
+        filter_type: str,
+        out: Optional["np.ndarray"] = None,
+        batch: bool = False,
+    ) -> Any:
         """
         Apply image filter.
         
         Args:
             image_data: Original image data
-            filter_type: Filter type (grayscale, blur, sharpen, etc.)
-            
+            filter_type: Filter type (grayscale, blur, sharpen, invert)
+            out: Optional preallocated output buffer (may alias the input)
+            batch: Whether the leading axis is a batch axis
+        
         Returns:
             Filtered image data
         """
-        # Placeholder - would apply actual filters in real implementation
-        return image_data
+        if _is_encoded(image_data):
+            # Encoded frames must be decoded before filtering
+            return image_data
+        
+        _require_numpy()
+        if filter_type not in _FILTERS:
+            raise ValueError(
+                f"Unsupported filter '{filter_type}'. Supported: {', '.join(_FILTERS)}"
+            )
+        
+        frame = image_data
+        if filter_type == "grayscale":
+            return ImageProcessor.to_grayscale(frame, out=out, batch=batch)
+        
+        if filter_type == "invert":
+            if out is None:
+                out = np.empty_like(frame)
+            np.subtract(np.iinfo(frame.dtype).max, frame, out=out, casting="unsafe")
+            return out
+        
+        blurred = ImageProcessor._convolve_float(frame, _BLUR_KERNEL, batch)
+        if filter_type == "blur":
+            return _store(blurred, out, frame.dtype)
+        
+        # Unsharp mask: original + (original - blurred)
+        sharpened = frame.astype(np.float32)
+        sharpened *= 2.0
+        sharpened -= blurred
+        return _store(sharpened, out, frame.dtype)
     
     @staticmethod
-    def get_image_info(image_data: bytes) -> Dict[str, Any]:
+    def get_image_info(image_data: Any) -> Dict[str, Any]:
         """
         Get information about image.
         
         Args:
             image_data: Image data
-            
+        
         Returns:
             Image information dictionary
         """
+        if not _is_encoded(image_data) and NUMPY_AVAILABLE and isinstance(image_data, np.ndarray):
+            height, width = image_data.shape[:2]
+            return {
+                "size_bytes": int(image_data.nbytes),
+                "format": "raw",
+                "estimated_dimensions": f"{width}x{height}",
+                "channels": image_data.shape[2] if image_data.ndim == 3 else 1,
+                "dtype": str(image_data.dtype),
+            }
+        
         return {
             "size_bytes": len(image_data),
             "format": "jpeg",
@@ -6,6 +6,8 @@ for development, testing, and remote management.
 """
 
 from .simulator import CYDSimulator, SimulationMode, SimulatedState
+from .framebuffer import FrameSnapshot, RGB565FrameBuffer
+from .fleet import CYDFleetSimulator, FleetTelemetry, run_fleet
 from .models import CYDTwinModel, TwinStatus, DisplayState, TouchState, PowerState, SystemState
 from .monitoring import CYDMonitor, AlertLevel, Alert, Metric
 
@@ -15,6 +17,11 @@ __all__ = [
     "CYDMonitor",
     "SimulationMode",
     "SimulatedState",
+    "RGB565FrameBuffer",
+    "FrameSnapshot",
+    "CYDFleetSimulator",
+    "FleetTelemetry",
+    "run_fleet",
     "TwinStatus",
     "DisplayState",
     "TouchState",
@@ -0,0 +1,455 @@
+"""
+Headless fleet simulator for CYD digital twins.
+
+Simulates many CYD devices at once by keeping per-device state in NumPy
+arrays and advancing the whole fleet with vectorized steps. Intended for
+power/thermal soak tests over simulated hours or days.
+"""
+
+import heapq
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+from .simulator import (
+    AMBIENT_TEMPERATURE_C,
+    COOLING_RATE,
+    CPU_POWER_W,
+    DISPLAY_POWER_W,
+    GPIO_POWER_W,
+    HEATING_RATE,
+)
+
+GPIO_PIN_COUNT = 40
+DISPLAY_WIDTH = 320
+DISPLAY_HEIGHT = 240
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error when NumPy is not installed."""
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "NumPy is required for fleet simulation. "
+            "Install with: pip install accelerapp[simulation]"
+        )
+
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """Event queued for injection at a simulated time."""
+
+    step: int
+    sequence: int
+    event_type: str = field(compare=False)
+    data: Dict[str, Any] = field(compare=False)
+    instances: Optional[Tuple[int, ...]] = field(compare=False, default=None)
+
+
+@dataclass
+class FleetTelemetry:
+    """Sampled fleet telemetry (one row per sample, one column per device)."""
+
+    times: Any  # shape (samples,)
+    temperature: Any  # shape (samples, devices)
+    power: Any  # shape (samples, devices)
+
+    @property
+    def device_count(self) -> int:
+        """Number of devices covered by the telemetry."""
+        return self.temperature.shape[1]
+
+    def device(self, index: int) -> Dict[str, List[float]]:
+        """
+        Get the sampled series for one device.
+
+        Args:
+            index: Device index
+
+        Returns:
+            Dictionary with times, temperature and power lists
+        """
+        return {
+            "times": self.times.tolist(),
+            "temperature": self.temperature[:, index].tolist(),
+            "power": self.power[:, index].tolist(),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize telemetry across the fleet.
+
+        Returns:
+            Aggregate statistics
+        """
+        if len(self.times) == 0:
+            return {"samples": 0, "devices": self.device_count}
+
+        return {
+            "samples": len(self.times),
+            "devices": self.device_count,
+            "duration_s": float(self.times[-1] - self.times[0]),
+            "temperature_mean_c": float(self.temperature.mean()),
+            "temperature_max_c": float(self.temperature.max()),
+            "temperature_min_c": float(self.temperature.min()),
+            "power_mean_w": float(self.power.mean()),
+            "power_max_w": float(self.power.max()),
+            "energy_wh": self._energy_wh(),
+        }
+
+    def _energy_wh(self) -> float:
+        """Fleet energy estimate from sampled power (trapezoidal)."""
+        if len(self.times) < 2:
+            return 0.0
+        total_power = self.power.sum(axis=1)
+        widths = np.diff(self.times)
+        return float(((total_power[1:] + total_power[:-1]) * 0.5 * widths).sum() / 3600.0)
+
+    @classmethod
+    def concatenate(cls, shards: Sequence["FleetTelemetry"]) -> "FleetTelemetry":
+        """
+        Merge telemetry from fleet shards sampled on the same schedule.
+
+        Args:
+            shards: Telemetry in device order
+
+        Returns:
+            Combined telemetry
+        """
+        return cls(
+            times=shards[0].times,
+            temperature=np.concatenate([s.temperature for s in shards], axis=1),
+            power=np.concatenate([s.power for s in shards], axis=1),
+        )
+
+
+class CYDFleetSimulator:
+    """
+    Vectorized simulator for a fleet of CYD devices.
+
+    Uses the same power and thermal model as CYDSimulator, but every
+    device's state is a slot in a shared array and one step advances the
+    whole fleet. Events are scheduled with inject_event and applied when
+    simulated time reaches them.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        dt: float = 1.0,
+        cpu_frequency: int = 240,
+        display_on: bool = True,
+        temperature: float = AMBIENT_TEMPERATURE_C,
+    ):
+        """
+        Initialize fleet simulator.
+
+        Args:
+            count: Number of simulated devices
+            dt: Step size in seconds
+            cpu_frequency: Initial CPU frequency in MHz for every device
+            display_on: Whether displays start lit
+            temperature: Initial temperature in Celsius
+        """
+        _require_numpy()
+        if count < 1:
+            raise ValueError("Fleet must contain at least one device")
+        if dt <= 0:
+            raise ValueError("Step size must be positive")
+        if cpu_frequency not in CPU_POWER_W:
+            raise ValueError(f"Unsupported CPU frequency: {cpu_frequency}")
+
+        self.count = count
+        self.dt = dt
+        self._step = 0
+        self._sequence = itertools.count()
+        self._events: List[ScheduledEvent] = []
+        self._events_applied = 0
+
+        self.temperature = np.full(count, temperature, dtype=np.float64)
+        self.cpu_frequency = np.full(count, cpu_frequency, dtype=np.int16)
+        self.display_on = np.full(count, display_on, dtype=bool)
+        self.gpio_configured = np.zeros((count, GPIO_PIN_COUNT), dtype=bool)
+        self.gpio_state = np.zeros((count, GPIO_PIN_COUNT), dtype=bool)
+        self.touch_count = np.zeros(count, dtype=np.int64)
+        self.power = np.zeros(count, dtype=np.float64)
+        self._update_power()
+
+    @property
+    def time(self) -> float:
+        """Current simulated time in seconds."""
+        return self._step * self.dt
+
+    def inject_event(
+        self,
+        at: float,
+        event_type: str,
+        data: Dict[str, Any],
+        instances: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Schedule an event for some or all devices.
+
+        Supported event types match CYDSimulator.inject_event (touch, gpio,
+        temperature) plus cpu_frequency and display.
+
+        Args:
+            at: Simulated time in seconds (applied at the first step >= at)
+            event_type: Type of event
+            data: Event data
+            instances: Device indices (all devices if None)
+        """
+        if event_type not in self._EVENT_HANDLERS:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        step = max(self._step, math.ceil(at / self.dt - 1e-9))
+        targets = tuple(instances) if instances is not None else None
+        heapq.heappush(
+            self._events,
+            ScheduledEvent(step, next(self._sequence), event_type, data, targets),
+        )
+
+    def step(self, steps: int = 1) -> None:
+        """
+        Advance the fleet, applying scheduled events as they come due.
+
+        Args:
+            steps: Number of steps of size dt
+        """
+        self._run_until(self._step + steps, sample_every=None)
+
+    def run(self, duration: float, sample_interval: float = 60.0) -> FleetTelemetry:
+        """
+        Fast-forward the fleet and collect sampled telemetry.
+
+        Args:
+            duration: Simulated seconds to run
+            sample_interval: Seconds between telemetry samples
+
+        Returns:
+            Telemetry sampled from the current time to the end of the run
+        """
+        sample_every = max(1, round(sample_interval / self.dt))
+        end = self._step + round(duration / self.dt)
+        return self._run_until(end, sample_every)
+
+    def _run_until(self, end: int, sample_every: Optional[int]) -> Optional[FleetTelemetry]:
+        """Advance to step end, stopping at event and sample boundaries."""
+        times: List[float] = []
+        temperature: List[Any] = []
+        power: List[Any] = []
+        next_sample = self._step
+
+        while True:
+            while self._events and self._events[0].step <= self._step:
+                self._apply(heapq.heappop(self._events))
+
+            if sample_every is not None and self._step >= next_sample:
+                times.append(self.time)
+                temperature.append(self.temperature.copy())
+                power.append(self.power.copy())
+                next_sample += sample_every
+
+            if self._step >= end:
+                break
+
+            target = end
+            if sample_every is not None:
+                target = min(target, next_sample)
+            if self._events:
+                target = min(target, self._events[0].step)
+            self._advance(target - self._step)
+
+        if sample_every is None:
+            return None
+        return FleetTelemetry(
+            times=np.array(times),
+            temperature=np.array(temperature).reshape(len(times), self.count),
+            power=np.array(power).reshape(len(times), self.count),
+        )
+
+    def _advance(self, steps: int) -> None:
+        """Integrate the thermal model for a span with constant power."""
+        heat = HEATING_RATE * self.dt * self.power
+        cool = COOLING_RATE * self.dt
+        temperature = self.temperature
+        warm = np.empty(self.count, dtype=bool)
+
+        for _ in range(steps):
+            temperature += heat
+            np.greater(temperature, AMBIENT_TEMPERATURE_C, out=warm)
+            np.subtract(temperature, cool, out=temperature, where=warm)
+        self._step += steps
+
+    def _update_power(self) -> None:
+        """Recompute per-device power from CPU, display and GPIO state."""
+        cpu_power = np.zeros(self.count, dtype=np.float64)
+        for frequency, watts in CPU_POWER_W.items():
+            cpu_power[self.cpu_frequency == frequency] = watts
+        self.power = (
+            cpu_power
+            + self.display_on * DISPLAY_POWER_W
+            + self.gpio_configured.sum(axis=1) * GPIO_POWER_W
+        )
+
+    def _apply(self, event: ScheduledEvent) -> None:
+        """Apply one scheduled event."""
+        targets = slice(None) if event.instances is None else list(event.instances)
+        self._EVENT_HANDLERS[event.event_type](self, targets, event.data)
+        self._update_power()
+        self._events_applied += 1
+
+    def _on_touch(self, targets: Any, data: Dict[str, Any]) -> None:
+        """Count a touch on devices (ignored outside the display)."""
+        x, y = data.get("x", 0), data.get("y", 0)
+        if 0 <= x < DISPLAY_WIDTH and 0 <= y < DISPLAY_HEIGHT:
+            self.touch_count[targets] += 1
+
+    def _on_gpio(self, targets: Any, data: Dict[str, Any]) -> None:
+        """Configure a GPIO pin and set its level."""
+        pin = data.get("pin")
+        if pin is not None and 0 <= pin < GPIO_PIN_COUNT:
+            self.gpio_configured[targets, pin] = True
+            self.gpio_state[targets, pin] = data.get("state", False)
+
+    def _on_temperature(self, targets: Any, data: Dict[str, Any]) -> None:
+        """Override device temperature."""
+        self.temperature[targets] = data.get("temperature", AMBIENT_TEMPERATURE_C)
+
+    def _on_cpu_frequency(self, targets: Any, data: Dict[str, Any]) -> None:
+        """Change CPU frequency (80, 160 or 240 MHz)."""
+        frequency = data.get("frequency")
+        if frequency in CPU_POWER_W:
+            self.cpu_frequency[targets] = frequency
+
+    def _on_display(self, targets: Any, data: Dict[str, Any]) -> None:
+        """Turn displays on or off."""
+        self.display_on[targets] = bool(data.get("on", True))
+
+    _EVENT_HANDLERS = {
+        "touch": _on_touch,
+        "gpio": _on_gpio,
+        "temperature": _on_temperature,
+        "cpu_frequency": _on_cpu_frequency,
+        "display": _on_display,
+    }
+
+    def get_device_state(self, index: int) -> Dict[str, Any]:
+        """
+        Get the state of one device in CYDSimulator statistics form.
+
+        Args:
+            index: Device index
+
+        Returns:
+            Device state dictionary
+        """
+        pins = np.flatnonzero(self.gpio_configured[index])
+        return {
+            "simulation_time": self.time,
+            "cpu_frequency_mhz": int(self.cpu_frequency[index]),
+            "power_consumption_w": float(self.power[index]),
+            "temperature_c": float(self.temperature[index]),
+            "display_on": bool(self.display_on[index]),
+            "gpio_states": {int(pin): bool(self.gpio_state[index, pin]) for pin in pins},
+            "touch_points": int(self.touch_count[index]),
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get fleet-wide statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        return {
+            "devices": self.count,
+            "simulation_time": self.time,
+            "dt": self.dt,
+            "steps": self._step,
+            "pending_events": len(self._events),
+            "events_applied": self._events_applied,
+            "temperature_mean_c": float(self.temperature.mean()),
+            "temperature_max_c": float(self.temperature.max()),
+            "power_total_w": float(self.power.sum()),
+        }
+
+
+def _run_shard(
+    offset: int,
+    count: int,
+    duration: float,
+    dt: float,
+    sample_interval: float,
+    events: Sequence[Tuple[float, str, Dict[str, Any], Optional[Sequence[int]]]],
+    options: Dict[str, Any],
+) -> FleetTelemetry:
+    """Run one contiguous slice of a fleet (process pool worker)."""
+    fleet = CYDFleetSimulator(count, dt=dt, **options)
+    for at, event_type, data, instances in events:
+        if instances is None:
+            fleet.inject_event(at, event_type, data)
+            continue
+        local = [i - offset for i in instances if offset <= i < offset + count]
+        if local:
+            fleet.inject_event(at, event_type, data, local)
+    return fleet.run(duration, sample_interval)
+
+
+def run_fleet(
+    count: int,
+    duration: float,
+    dt: float = 1.0,
+    sample_interval: float = 60.0,
+    events: Optional[Sequence[Tuple[float, str, Dict[str, Any], Optional[Sequence[int]]]]] = None,
+    processes: int = 1,
+    **options: Any,
+) -> FleetTelemetry:
+    """
+    Run a fleet simulation, optionally sharded across worker processes.
+
+    Devices are independent, so the fleet is split into contiguous shards
+    that each run in their own process; telemetry is merged in device order.
+
+    Args:
+        count: Number of simulated devices
+        duration: Simulated seconds to run
+        dt: Step size in seconds
+        sample_interval: Seconds between telemetry samples
+        events: (time, event_type, data, instances) tuples using global indices
+        processes: Number of worker processes
+        **options: Extra CYDFleetSimulator arguments
+
+    Returns:
+        Combined fleet telemetry
+    """
+    events = list(events or [])
+    processes = max(1, min(processes, count))
+    if processes == 1:
+        return _run_shard(0, count, duration, dt, sample_interval, events, options)
+
+    bounds = [count * i // processes for i in range(processes + 1)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(
+                _run_shard,
+                start,
+                stop - start,
+                duration,
+                dt,
+                sample_interval,
+                events,
+                options,
+            )
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+        return FleetTelemetry.concatenate([future.result() for future in futures])
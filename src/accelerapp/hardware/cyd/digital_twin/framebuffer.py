@@ -0,0 +1,354 @@
+"""
+RGB565 frame buffer for CYD display simulation.
+
+Stores the display as one contiguous ``array('H')`` so fills, blits and
+exports run as slice operations instead of per-pixel Python loops, and
+tracks dirty rectangles for incremental export.
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+# Byte translation tables expanding RGB565 fields to 8 bits per channel.
+# R and B come from a single byte each; G is split across both bytes with
+# non-overlapping bits, so the two partial tables can be OR-ed together.
+_R_FROM_HIGH = bytes(((b >> 3) << 3) | (b >> 5) for b in range(256))
+_G_FROM_HIGH = bytes(((b & 0x07) << 5) | ((b & 0x07) >> 1) for b in range(256))
+_G_FROM_LOW = bytes((b >> 5) << 2 for b in range(256))
+_B_FROM_LOW = bytes(((b & 0x1F) << 3) | ((b & 0x1F) >> 2) for b in range(256))
+
+
+def _rect_union(a: Rect, b: Rect) -> Rect:
+    """Bounding box of two rectangles."""
+    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+    x1 = max(a[0] + a[2], b[0] + b[2])
+    y1 = max(a[1] + a[3], b[1] + b[3])
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _rects_touch(a: Rect, b: Rect) -> bool:
+    """Check whether two rectangles overlap or share an edge."""
+    return (
+        a[0] <= b[0] + b[2]
+        and b[0] <= a[0] + a[2]
+        and a[1] <= b[1] + b[3]
+        and b[1] <= a[1] + a[3]
+    )
+
+
+class FrameSnapshot:
+    """
+    Read-only copy of a frame buffer, indexed like a 2-D pixel list.
+
+    ``snapshot[y][x]`` returns a pixel color; each row is a read-only
+    memoryview into the private copy, so later drawing does not change it.
+    """
+
+    def __init__(self, pixels: array, width: int, height: int):
+        """
+        Initialize snapshot.
+
+        Args:
+            pixels: Row-major pixel array owned by the snapshot
+            width: Display width in pixels
+            height: Display height in pixels
+        """
+        self.width = width
+        self.height = height
+        self._pixels = pixels
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("row index out of range")
+        start = y * self.width
+        return memoryview(self._pixels)[start:start + self.width].toreadonly()
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return (self[y] for y in range(self.height))
+
+    def tolist(self) -> List[List[int]]:
+        """Pixel colors as a list of rows."""
+        return [row.tolist() for row in self]
+
+
+class RGB565FrameBuffer:
+    """
+    Contiguous RGB565 frame buffer with dirty-rectangle tracking.
+
+    Pixels are stored row-major in native byte order. Exports use the
+    big-endian byte order sent to the ILI9341 panel.
+    """
+
+    def __init__(self, width: int = 320, height: int = 240, max_dirty_rects: int = 16):
+        """
+        Initialize frame buffer.
+
+        Args:
+            width: Display width in pixels
+            height: Display height in pixels
+            max_dirty_rects: Dirty rectangles kept before collapsing to one
+        """
+        self.width = width
+        self.height = height
+        self.max_dirty_rects = max_dirty_rects
+        self._blank = array("H", bytes(2 * width * height))
+        self._pixels = array("H", self._blank)
+        self._dirty: List[Rect] = []
+
+    @property
+    def pixels(self) -> array:
+        """Underlying pixel array (row-major)."""
+        return self._pixels
+
+    def clip(self, x: int, y: int, w: int, h: int) -> Optional[Rect]:
+        """
+        Clip a rectangle to the display.
+
+        Returns:
+            Clipped rectangle or None if fully outside
+        """
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + w), min(self.height, y + h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def mark_dirty(self, rect: Rect) -> None:
+        """
+        Record a modified region, merging it with touching regions.
+
+        Args:
+            rect: Modified rectangle (already clipped)
+        """
+        for index, existing in enumerate(self._dirty):
+            if _rects_touch(existing, rect):
+                merged = _rect_union(existing, rect)
+                del self._dirty[index]
+                self.mark_dirty(merged)
+                return
+
+        self._dirty.append(rect)
+        if len(self._dirty) > self.max_dirty_rects:
+            bounds = self._dirty[0]
+            for other in self._dirty[1:]:
+                bounds = _rect_union(bounds, other)
+            self._dirty = [bounds]
+
+    def get_dirty_rects(self) -> List[Rect]:
+        """Get regions modified since the last clear."""
+        return list(self._dirty)
+
+    def clear_dirty(self) -> None:
+        """Forget tracked modifications."""
+        self._dirty.clear()
+
+    def set_pixel(self, x: int, y: int, color: int) -> None:
+        """Set one pixel (ignored outside the display)."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._pixels[y * self.width + x] = color
+            self.mark_dirty((x, y, 1, 1))
+
+    def get_pixel(self, x: int, y: int) -> Optional[int]:
+        """Get one pixel, or None outside the display."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._pixels[y * self.width + x]
+        return None
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
+        """
+        Fill a rectangle with one color using row slice assignment.
+
+        Args:
+            x, y: Top-left corner
+            w, h: Width and height
+            color: RGB565 color value
+        """
+        rect = self.clip(x, y, w, h)
+        if rect is None:
+            return
+        x0, y0, rw, rh = rect
+
+        if rw == self.width:
+            start = y0 * self.width
+            self._pixels[start:start + rw * rh] = array("H", [color]) * (rw * rh)
+        else:
+            row = array("H", [color]) * rw
+            for py in range(y0, y0 + rh):
+                start = py * self.width + x0
+                self._pixels[start:start + rw] = row
+        self.mark_dirty(rect)
+
+    def blit(self, x: int, y: int, w: int, h: int, pixels: Sequence[int]) -> None:
+        """
+        Copy a w*h block of RGB565 pixels onto the display.
+
+        Args:
+            x, y: Destination top-left corner
+            w, h: Source block size
+            pixels: Row-major RGB565 values (array('H') avoids conversion)
+
+        Raises:
+            ValueError: If the block is empty or pixels holds fewer than w*h values
+        """
+        if w <= 0 or h <= 0:
+            raise ValueError(f"Invalid blit size: {w}x{h}")
+        if len(pixels) < w * h:
+            raise ValueError(f"Blit of {w}x{h} needs {w * h} pixels, got {len(pixels)}")
+        rect = self.clip(x, y, w, h)
+        if rect is None:
+            return
+        x0, y0, rw, rh = rect
+        source = pixels
+        if not (isinstance(pixels, array) and pixels.typecode == "H"):
+            source = array("H", pixels)
+        sx, sy = x0 - x, y0 - y
+
+        for row in range(rh):
+            src = (sy + row) * w + sx
+            dst = (y0 + row) * self.width + x0
+            self._pixels[dst:dst + rw] = source[src:src + rw]
+        self.mark_dirty(rect)
+
+    def clear(self, color: int = 0x0000) -> None:
+        """Fill the whole display in place."""
+        if color == 0x0000:
+            self._pixels[:] = self._blank
+        else:
+            self._pixels[:] = array("H", [color]) * (self.width * self.height)
+        self.mark_dirty((0, 0, self.width, self.height))
+
+    def is_blank(self) -> bool:
+        """Check whether every pixel is black."""
+        return self._pixels == self._blank
+
+    def count_lit(self) -> int:
+        """Number of non-black pixels."""
+        return len(self._pixels) - self._pixels.count(0)
+
+    def view(self) -> memoryview:
+        """
+        Zero-copy view of the pixels in native byte order.
+
+        Returns:
+            memoryview with format 'H' and shape (height, width)
+        """
+        return memoryview(self._pixels).cast("B").cast("H", [self.height, self.width])
+
+    def snapshot(self) -> FrameSnapshot:
+        """
+        Copy the pixels into an immutable, row-indexable snapshot.
+
+        Returns:
+            FrameSnapshot indexed as ``snapshot[y][x]``
+        """
+        return FrameSnapshot(array("H", self._pixels), self.width, self.height)
+
+    def to_rgb565(self, rect: Optional[Rect] = None) -> bytes:
+        """
+        Export pixels as big-endian RGB565.
+
+        Args:
+            rect: Region to export (whole display if None)
+
+        Returns:
+            Packed RGB565 bytes
+        """
+        region = self._region(rect)
+        if sys.byteorder == "little":
+            region.byteswap()
+        return region.tobytes()
+
+    def to_rgb888(self, rect: Optional[Rect] = None) -> bytes:
+        """
+        Export pixels as packed RGB888 using byte translation tables.
+
+        Args:
+            rect: Region to export (whole display if None)
+
+        Returns:
+            Packed RGB888 bytes
+        """
+        be = self.to_rgb565(rect)
+        high, low = be[0::2], be[1::2]
+        count = len(high)
+
+        green = int.from_bytes(high.translate(_G_FROM_HIGH), "big") | int.from_bytes(
+            low.translate(_G_FROM_LOW), "big"
+        )
+
+        out = bytearray(count * 3)
+        out[0::3] = high.translate(_R_FROM_HIGH)
+        out[1::3] = green.to_bytes(count, "big")
+        out[2::3] = low.translate(_B_FROM_LOW)
+        return bytes(out)
+
+    def to_png(self, rect: Optional[Rect] = None) -> bytes:
+        """
+        Export pixels as an RGB PNG image.
+
+        Args:
+            rect: Region to export (whole display if None)
+
+        Returns:
+            PNG file bytes
+        """
+        _, _, w, h = rect or (0, 0, self.width, self.height)
+        rgb = self.to_rgb888(rect)
+        stride = w * 3
+
+        raw = bytearray((stride + 1) * h)  # filter byte 0 (None) per row
+        for row in range(h):
+            start = row * (stride + 1) + 1
+            raw[start:start + stride] = rgb[row * stride:(row + 1) * stride]
+
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            body = tag + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+        header = struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)
+        return b"".join((
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"IDAT", zlib.compress(bytes(raw), 6)),
+            chunk(b"IEND", b""),
+        ))
+
+    def export_dirty(self, format: str = "rgb565", clear: bool = True) -> List[Tuple[Rect, bytes]]:
+        """
+        Export only the regions modified since the last export.
+
+        Args:
+            format: Output format (rgb565, rgb888, png)
+            clear: Reset dirty tracking after exporting
+
+        Returns:
+            List of (rect, data) pairs
+        """
+        exporter = {"rgb565": self.to_rgb565, "rgb888": self.to_rgb888, "png": self.to_png}[format]
+        regions = [(rect, exporter(rect)) for rect in self._dirty]
+        if clear:
+            self.clear_dirty()
+        return regions
+
+    def _region(self, rect: Optional[Rect]) -> array:
+        """Copy a rectangular region into a new array."""
+        if rect is None or rect == (0, 0, self.width, self.height):
+            return array("H", self._pixels)
+        x, y, w, h = rect
+        if w == self.width:
+            return self._pixels[y * self.width:(y + h) * self.width]
+        region = array("H")
+        for row in range(y, y + h):
+            start = row * self.width + x
+            region.extend(self._pixels[start:start + w])
+        return region
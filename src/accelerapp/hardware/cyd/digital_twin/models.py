@@ -4,11 +4,18 @@ Digital twin models for CYD hardware.
 Provides data models and state management for CYD digital twins.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional
+from collections import deque
 from dataclasses import dataclass, field
+from itertools import islice
 from datetime import datetime
 from enum import Enum
 
+from ....utils.timeseries import RingTimeSeries
+
+# Windows (seconds) with incrementally maintained telemetry aggregates
+TELEMETRY_WINDOWS = (60.0, 300.0, 3600.0)
+
 
 class TwinStatus(Enum):
     """Digital twin status."""
@@ -97,8 +104,15 @@ class CYDTwinModel:
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     # Telemetry
-    telemetry_history: List[Dict[str, Any]] = field(default_factory=list)
+    telemetry_history: Deque[Dict[str, Any]] = field(init=False, repr=False, compare=False)
     max_telemetry_records: int = 1000
+    _telemetry_fields: Dict[str, RingTimeSeries] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        """Allocate the bounded telemetry history."""
+        self.telemetry_history = deque(maxlen=self.max_telemetry_records)
 
     def update_display_state(self, **kwargs) -> None:
         """
@@ -176,19 +190,29 @@ class CYDTwinModel:
         """
         Record telemetry data point.
         
+        Numeric fields are also tracked as time series for windowed
+        aggregates (see get_telemetry_aggregate).
+        
         Args:
             data: Telemetry data
         """
+        now = datetime.now()
+        stamp = now.timestamp()
         record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             **data
         }
         
         self.telemetry_history.append(record)
         
-        # Limit history size
-        if len(self.telemetry_history) > self.max_telemetry_records:
-            self.telemetry_history = self.telemetry_history[-self.max_telemetry_records:]
+        for key, value in data.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            series = self._telemetry_fields.get(key)
+            if series is None:
+                series = RingTimeSeries(self.max_telemetry_records, windows=TELEMETRY_WINDOWS)
+                self._telemetry_fields[key] = series
+            series.append(value, stamp)
 
     def get_telemetry(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -200,7 +224,26 @@ class CYDTwinModel:
         Returns:
             List of telemetry records
         """
-        return self.telemetry_history[-limit:]
+        history = self.telemetry_history
+        return list(islice(history, max(len(history) - max(limit, 0), 0), None))
+
+    def get_telemetry_aggregate(
+        self, field_name: str, window_seconds: float = 300.0
+    ) -> Dict[str, Any]:
+        """
+        Get count, mean, min and max of a numeric telemetry field.
+        
+        Args:
+            field_name: Telemetry field name
+            window_seconds: Window length in seconds
+            
+        Returns:
+            Dictionary with count, mean, min and max (None when no data)
+        """
+        series = self._telemetry_fields.get(field_name)
+        if series is None:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+        return series.aggregate(window_seconds, datetime.now().timestamp())
 
     def get_state_summary(self) -> Dict[str, Any]:
         """
@@ -4,11 +4,14 @@ Real-time monitoring for CYD digital twins.
 Provides monitoring, alerting, and analytics for CYD devices.
 """
 
-from typing import Dict, Any, List, Optional, Callable
+import heapq
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 
+from ....utils.timeseries import RingTimeSeries
+
 
 class AlertLevel(Enum):
     """Alert severity levels."""
@@ -51,11 +54,27 @@ class CYDMonitor:
     - Health check automation
     """
 
-    def __init__(self):
-        """Initialize CYD monitor."""
+    # (state key, metric name, unit) recorded on every state update
+    METRIC_FIELDS = (
+        ("temperature_c", "temperature", "celsius"),
+        ("power_consumption_mw", "power_consumption", "milliwatts"),
+        ("cpu_frequency_mhz", "cpu_frequency", "megahertz"),
+    )
+
+    # Windows (seconds) with incrementally maintained aggregates
+    DEFAULT_WINDOWS = (60.0, 300.0, 3600.0)
+
+    def __init__(self, metric_history: int = 1000):
+        """
+        Initialize CYD monitor.
+        
+        Args:
+            metric_history: Samples retained per device and metric
+        """
         self._devices: Dict[str, Any] = {}
         self._alerts: List[Alert] = []
-        self._metrics: List[Metric] = []
+        self._metrics: Dict[Tuple[str, str], RingTimeSeries] = {}
+        self._metric_history = metric_history
         self._alert_handlers: List[Callable[[Alert], None]] = []
         self._thresholds = self._default_thresholds()
 
@@ -201,38 +220,27 @@ class CYDMonitor:
     def _record_metrics(self, device_id: str, state: Dict[str, Any]) -> None:
         """Record performance metrics."""
         now = datetime.now()
+        stamp = now.timestamp()
         
-        if "temperature_c" in state:
-            self._metrics.append(Metric(
-                name="temperature",
-                value=state["temperature_c"],
-                unit="celsius",
-                timestamp=now,
-                device_id=device_id,
-            ))
-        
-        if "power_consumption_mw" in state:
-            self._metrics.append(Metric(
-                name="power_consumption",
-                value=state["power_consumption_mw"],
-                unit="milliwatts",
-                timestamp=now,
-                device_id=device_id,
-            ))
-        
-        if "cpu_frequency_mhz" in state:
-            self._metrics.append(Metric(
-                name="cpu_frequency",
-                value=state["cpu_frequency_mhz"],
-                unit="megahertz",
+        for key, name, unit in self.METRIC_FIELDS:
+            if key not in state:
+                continue
+            
+            series = self._metrics.get((device_id, name))
+            if series is None:
+                series = RingTimeSeries(
+                    self._metric_history, windows=self.DEFAULT_WINDOWS, keep_items=True
+                )
+                self._metrics[(device_id, name)] = series
+            
+            metric = Metric(
+                name=name,
+                value=state[key],
+                unit=unit,
                 timestamp=now,
                 device_id=device_id,
-            ))
-        
-        # Limit metric history
-        max_metrics = 10000
-        if len(self._metrics) > max_metrics:
-            self._metrics = self._metrics[-max_metrics:]
+            )
+            series.append(metric.value, stamp, metric)
 
     def _create_alert(
         self,
@@ -331,18 +339,42 @@ class CYDMonitor:
         Returns:
             List of metrics
         """
-        metrics = self._metrics
-        
-        if device_id:
-            metrics = [m for m in metrics if m.device_id == device_id]
-        
-        if metric_name:
-            metrics = [m for m in metrics if m.name == metric_name]
-        
-        if since:
-            metrics = [m for m in metrics if m.timestamp >= since]
+        if limit <= 0:
+            return []
+        
+        stamp = since.timestamp() if since else None
+        matches = [
+            series.items(limit, stamp)
+            for (series_device, series_name), series in self._metrics.items()
+            if (not device_id or series_device == device_id)
+            and (not metric_name or series_name == metric_name)
+        ]
+        
+        if len(matches) == 1:
+            return matches[0]
+        return list(heapq.merge(*matches, key=lambda m: m.timestamp))[-limit:]
+
+    def get_metric_aggregate(
+        self,
+        device_id: str,
+        metric_name: str,
+        window_seconds: float = 300.0
+    ) -> Dict[str, Any]:
+        """
+        Get count, mean, min and max of a device metric over a time window.
         
-        return metrics[-limit:]
+        Args:
+            device_id: Device identifier
+            metric_name: Metric name
+            window_seconds: Window length in seconds
+            
+        Returns:
+            Dictionary with count, mean, min and max (None when no data)
+        """
+        series = self._metrics.get((device_id, metric_name))
+        if series is None:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+        return series.aggregate(window_seconds, datetime.now().timestamp())
 
     def get_device_summary(self, device_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -401,7 +433,7 @@ class CYDMonitor:
             "inactive_devices": total_devices - active_devices,
             "alerts_24h": alerts_24h,
             "critical_alerts": critical_alerts,
-            "total_metrics": len(self._metrics),
+            "total_metrics": sum(len(series) for series in self._metrics.values()),
         }
 
     def set_threshold(self, name: str, value: float) -> None:
@@ -9,6 +9,16 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from .framebuffer import FrameSnapshot, RGB565FrameBuffer, Rect
+
+# Power and thermal model shared with the fleet simulator
+CPU_POWER_W = {80: 0.05, 160: 0.08, 240: 0.16}
+DISPLAY_POWER_W = 0.075
+GPIO_POWER_W = 0.001
+AMBIENT_TEMPERATURE_C = 25.0
+HEATING_RATE = 0.01  # degC per watt-second
+COOLING_RATE = 0.02  # degC per second above ambient
+
 
 class SimulationMode(Enum):
     """Simulation modes."""
@@ -21,7 +31,7 @@ class SimulationMode(Enum):
 class SimulatedState:
     """Simulated hardware state."""
     timestamp: datetime
-    display_buffer: List[List[int]]  # 2D array of pixel colors
+    display_buffer: FrameSnapshot  # Copy of RGB565 pixel colors, indexed [y][x]
     touch_points: List[Tuple[int, int]]
     gpio_states: Dict[int, bool]
     power_consumption: float
@@ -52,7 +62,7 @@ class CYDSimulator:
         self.mode = mode
         self._width = 320
         self._height = 240
-        self._display_buffer = [[0x0000 for _ in range(self._width)] for _ in range(self._height)]
+        self._framebuffer = RGB565FrameBuffer(self._width, self._height)
         self._touch_points: List[Tuple[int, int]] = []
         self._gpio_states: Dict[int, bool] = {}
         self._running = False
@@ -73,7 +83,8 @@ class CYDSimulator:
 
     def reset(self) -> None:
         """Reset simulator to initial state."""
-        self._display_buffer = [[0x0000 for _ in range(self._width)] for _ in range(self._height)]
+        self._framebuffer.clear()
+        self._framebuffer.clear_dirty()
         self._touch_points.clear()
         self._gpio_states.clear()
         self._simulation_time = 0.0
@@ -94,11 +105,11 @@ class CYDSimulator:
         
         # Update temperature based on power consumption
         if self._power_consumption > 0:
-            self._temperature += 0.01 * self._power_consumption * delta_time
+            self._temperature += HEATING_RATE * self._power_consumption * delta_time
         
         # Passive cooling
-        if self._temperature > 25.0:
-            self._temperature -= 0.02 * delta_time
+        if self._temperature > AMBIENT_TEMPERATURE_C:
+            self._temperature -= COOLING_RATE * delta_time
 
     def set_pixel(self, x: int, y: int, color: int) -> None:
         """
@@ -108,8 +119,7 @@ class CYDSimulator:
             x, y: Pixel coordinates
             color: RGB565 color value
         """
-        if 0 <= x < self._width and 0 <= y < self._height:
-            self._display_buffer[y][x] = color
+        self._framebuffer.set_pixel(x, y, color)
 
     def get_pixel(self, x: int, y: int) -> Optional[int]:
         """
@@ -121,9 +131,7 @@ class CYDSimulator:
         Returns:
             RGB565 color value or None if out of bounds
         """
-        if 0 <= x < self._width and 0 <= y < self._height:
-            return self._display_buffer[y][x]
-        return None
+        return self._framebuffer.get_pixel(x, y)
 
     def fill_rectangle(self, x: int, y: int, w: int, h: int, color: int) -> None:
         """
@@ -134,9 +142,21 @@ class CYDSimulator:
             w, h: Width and height
             color: RGB565 color value
         """
-        for py in range(y, min(y + h, self._height)):
-            for px in range(x, min(x + w, self._width)):
-                self._display_buffer[py][px] = color
+        self._framebuffer.fill_rect(x, y, w, h, color)
+
+    def blit(self, x: int, y: int, w: int, h: int, pixels: List[int]) -> None:
+        """
+        Copy a block of pixels into simulated display.
+        
+        Args:
+            x, y: Top-left corner
+            w, h: Block width and height
+            pixels: Row-major RGB565 values
+            
+        Raises:
+            ValueError: If the block is empty or pixels holds fewer than w*h values
+        """
+        self._framebuffer.blit(x, y, w, h, pixels)
 
     def simulate_touch(self, x: int, y: int) -> None:
         """
@@ -197,22 +217,14 @@ class CYDSimulator:
     def _update_power_consumption(self) -> None:
         """Update power consumption based on current state."""
         # Base consumption from CPU
-        cpu_power = {
-            80: 0.05,
-            160: 0.08,
-            240: 0.16,
-        }.get(self._cpu_frequency, 0.16)
+        cpu_power = CPU_POWER_W.get(self._cpu_frequency, CPU_POWER_W[240])
         
         # Display consumption (if any pixels are non-black)
-        display_on = any(
-            self._display_buffer[y][x] != 0x0000
-            for y in range(self._height)
-            for x in range(self._width)
-        )
-        display_power = 0.075 if display_on else 0.0
+        display_on = not self._framebuffer.is_blank()
+        display_power = DISPLAY_POWER_W if display_on else 0.0
         
         # GPIO power (estimate)
-        gpio_power = len(self._gpio_states) * 0.001
+        gpio_power = len(self._gpio_states) * GPIO_POWER_W
         
         self._power_consumption = cpu_power + display_power + gpio_power
 
@@ -227,7 +239,7 @@ class CYDSimulator:
         
         return SimulatedState(
             timestamp=datetime.now(),
-            display_buffer=self._display_buffer,
+            display_buffer=self._framebuffer.snapshot(),
             touch_points=self._touch_points.copy(),
             gpio_states=self._gpio_states.copy(),
             power_consumption=self._power_consumption,
@@ -246,14 +258,35 @@ class CYDSimulator:
             Display buffer data
         """
         if format == "rgb565":
-            data = bytearray()
-            for row in self._display_buffer:
-                for pixel in row:
-                    data.extend(pixel.to_bytes(2, byteorder='big'))
-            return bytes(data)
+            return self._framebuffer.to_rgb565()
+        if format == "rgb888":
+            return self._framebuffer.to_rgb888()
+        if format == "png":
+            return self._framebuffer.to_png()
         
         return b""
 
+    def export_dirty_regions(self, format: str = "rgb565") -> List[Tuple[Rect, bytes]]:
+        """
+        Export only display regions changed since the previous export.
+        
+        Args:
+            format: Output format (rgb565, rgb888, png)
+            
+        Returns:
+            List of ((x, y, width, height), data) pairs
+        """
+        return self._framebuffer.export_dirty(format)
+
+    def get_display_view(self) -> memoryview:
+        """
+        Get a zero-copy view of the display buffer.
+        
+        Returns:
+            memoryview of native-endian RGB565 pixels with shape (height, width)
+        """
+        return self._framebuffer.view()
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get simulation statistics.
@@ -261,11 +294,7 @@ class CYDSimulator:
         Returns:
             Statistics dictionary
         """
-        pixel_count = sum(
-            1 for y in range(self._height)
-            for x in range(self._width)
-            if self._display_buffer[y][x] != 0x0000
-        )
+        pixel_count = self._framebuffer.count_lit()
         
         return {
             "simulation_time": self._simulation_time,
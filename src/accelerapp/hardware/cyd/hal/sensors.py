@@ -5,11 +5,14 @@ Provides temperature and performance monitoring capabilities
 for ESP32 Cheap Yellow Display boards.
 """
 
+import heapq
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from ....utils.timeseries import RingTimeSeries
+
 
 class SensorType(Enum):
     """Sensor types available on CYD."""
@@ -43,10 +46,18 @@ class SensorMonitor:
     # LDR (Light Dependent Resistor) pin
     LDR_PIN = 34
 
-    def __init__(self):
-        """Initialize sensor monitor."""
-        self._readings: List[SensorReading] = []
-        self._max_readings = 1000
+    # Windows (seconds) with incrementally maintained aggregates
+    DEFAULT_WINDOWS = (60.0, 300.0, 900.0)
+
+    def __init__(self, max_readings: int = 1000):
+        """
+        Initialize sensor monitor.
+        
+        Args:
+            max_readings: Readings retained per sensor type
+        """
+        self._series: Dict[SensorType, RingTimeSeries] = {}
+        self._max_readings = max_readings
 
     def read_temperature(self) -> Optional[float]:
         """
@@ -129,11 +140,14 @@ class SensorMonitor:
         Args:
             reading: Sensor reading to record
         """
-        self._readings.append(reading)
+        series = self._series.get(reading.sensor_type)
+        if series is None:
+            series = RingTimeSeries(
+                self._max_readings, windows=self.DEFAULT_WINDOWS, keep_items=True
+            )
+            self._series[reading.sensor_type] = series
         
-        # Limit stored readings
-        if len(self._readings) > self._max_readings:
-            self._readings = self._readings[-self._max_readings:]
+        series.append(reading.value, reading.timestamp.timestamp(), reading)
 
     def get_readings(
         self,
@@ -150,12 +164,35 @@ class SensorMonitor:
         Returns:
             List of sensor readings
         """
-        readings = self._readings
-        
         if sensor_type:
-            readings = [r for r in readings if r.sensor_type == sensor_type]
+            series = self._series.get(sensor_type)
+            return series.items(limit) if series else []
+        
+        merged = heapq.merge(
+            *(series.items(limit) for series in self._series.values()),
+            key=lambda r: r.timestamp,
+        )
+        return list(merged)[-limit:] if limit > 0 else []
+
+    def get_aggregate(
+        self,
+        sensor_type: SensorType,
+        minutes: float = 5
+    ) -> Dict[str, Any]:
+        """
+        Get count, mean, min and max of readings over a time period.
         
-        return readings[-limit:]
+        Args:
+            sensor_type: Type of sensor
+            minutes: Time period in minutes
+            
+        Returns:
+            Dictionary with count, mean, min and max (None when no data)
+        """
+        series = self._series.get(sensor_type)
+        if series is None:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+        return series.aggregate(minutes * 60.0, datetime.now().timestamp())
 
     def get_average(
         self,
@@ -172,17 +209,7 @@ class SensorMonitor:
         Returns:
             Average value or None if no data
         """
-        now = datetime.now()
-        readings = [
-            r for r in self._readings
-            if r.sensor_type == sensor_type
-            and (now - r.timestamp).total_seconds() < minutes * 60
-        ]
-        
-        if not readings:
-            return None
-        
-        return sum(r.value for r in readings) / len(readings)
+        return self.get_aggregate(sensor_type, minutes)["mean"]
 
     def get_min_max(
         self,
@@ -199,25 +226,18 @@ class SensorMonitor:
         Returns:
             Dictionary with min and max values or None
         """
-        now = datetime.now()
-        readings = [
-            r for r in self._readings
-            if r.sensor_type == sensor_type
-            and (now - r.timestamp).total_seconds() < minutes * 60
-        ]
-        
-        if not readings:
+        aggregate = self.get_aggregate(sensor_type, minutes)
+        if not aggregate["count"]:
             return None
         
-        values = [r.value for r in readings]
         return {
-            "min": min(values),
-            "max": max(values),
+            "min": aggregate["min"],
+            "max": aggregate["max"],
         }
 
     def clear_readings(self) -> None:
         """Clear all stored sensor readings."""
-        self._readings.clear()
+        self._series.clear()
 
     def generate_code(self, platform: str = "arduino") -> str:
         """
@@ -9,10 +9,10 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable
 
-import serial
-import serial.tools.list_ports
+if TYPE_CHECKING:
+    import serial
 
 
 class MarauderCommand(Enum):
@@ -151,7 +151,7 @@ class ESP32Marauder:
         self.timeout = timeout
         self.logger = logger or logging.getLogger(__name__)
         
-        self.connection: Optional[serial.Serial] = None
+        self.connection: Optional["serial.Serial"] = None
         self.is_connected = False
         self.is_scanning = False
         self.is_attacking = False
@@ -166,28 +166,35 @@ class ESP32Marauder:
         self._packet_callbacks: List[Callable] = []
     
     @staticmethod
-    def discover_devices() -> List[Dict[str, Any]]:
+    def discover_devices(port: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Discover ESP32 Marauder devices on serial ports.
         
+        Args:
+            port: Only check this serial port (all ports if None)
+        
         Returns:
             List of discovered device information
         """
+        import serial.tools.list_ports  # pyserial is only needed once hardware is used
+
         devices = []
         ports = serial.tools.list_ports.comports()
+        if port is not None:
+            ports = [candidate for candidate in ports if candidate.device == port]
         
-        for port in ports:
+        for candidate in ports:
             # Check for ESP32 VID/PIDs
-            if port.vid in [0x10C4, 0x1A86, 0x303A]:  # Common ESP32 VIDs
+            if candidate.vid in [0x10C4, 0x1A86, 0x303A]:  # Common ESP32 VIDs
                 device_info = {
-                    "port": port.device,
-                    "description": port.description,
-                    "hwid": port.hwid,
-                    "vid": port.vid,
-                    "pid": port.pid,
-                    "serial_number": port.serial_number,
-                    "manufacturer": port.manufacturer,
-                    "product": port.product,
+                    "port": candidate.device,
+                    "description": candidate.description,
+                    "hwid": candidate.hwid,
+                    "vid": candidate.vid,
+                    "pid": candidate.pid,
+                    "serial_number": candidate.serial_number,
+                    "manufacturer": candidate.manufacturer,
+                    "product": candidate.product,
                 }
                 devices.append(device_info)
         
@@ -216,6 +223,8 @@ class ESP32Marauder:
                 self.port = devices[0]["port"]
                 self.logger.info(f"Auto-detected device on {self.port}")
             
+            import serial
+
             self.connection = serial.Serial(
                 self.port,
                 baudrate=self.baudrate,
@@ -9,10 +9,10 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable
 
-import serial
-import serial.tools.list_ports
+if TYPE_CHECKING:
+    import serial
 
 
 class FlipperProtocol(Enum):
@@ -180,7 +180,7 @@ class FlipperZero:
         self.timeout = timeout
         self.logger = logger or logging.getLogger(__name__)
         
-        self.connection: Optional[serial.Serial] = None
+        self.connection: Optional["serial.Serial"] = None
         self.is_connected = False
         self.is_reading = False
         
@@ -195,28 +195,35 @@ class FlipperZero:
         self._signal_callbacks: List[Callable] = []
     
     @staticmethod
-    def discover_devices() -> List[Dict[str, Any]]:
+    def discover_devices(port: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Discover Flipper Zero devices on serial ports.
         
+        Args:
+            port: Only check this serial port (all ports if None)
+        
         Returns:
             List of discovered device information
         """
+        import serial.tools.list_ports  # pyserial is only needed once hardware is used
+
         devices = []
         ports = serial.tools.list_ports.comports()
+        if port is not None:
+            ports = [candidate for candidate in ports if candidate.device == port]
         
-        for port in ports:
+        for candidate in ports:
             # Check for Flipper Zero VID/PID
-            if port.vid == 0x0483 and port.pid == 0x5740:  # Flipper Zero
+            if candidate.vid == 0x0483 and candidate.pid == 0x5740:  # Flipper Zero
                 device_info = {
-                    "port": port.device,
-                    "description": port.description,
-                    "hwid": port.hwid,
-                    "vid": port.vid,
-                    "pid": port.pid,
-                    "serial_number": port.serial_number,
-                    "manufacturer": port.manufacturer,
-                    "product": port.product or "Flipper Zero",
+                    "port": candidate.device,
+                    "description": candidate.description,
+                    "hwid": candidate.hwid,
+                    "vid": candidate.vid,
+                    "pid": candidate.pid,
+                    "serial_number": candidate.serial_number,
+                    "manufacturer": candidate.manufacturer,
+                    "product": candidate.product or "Flipper Zero",
                 }
                 devices.append(device_info)
         
@@ -245,6 +252,8 @@ class FlipperZero:
                 self.port = devices[0]["port"]
                 self.logger.info(f"Auto-detected Flipper Zero on {self.port}")
             
+            import serial
+
             self.connection = serial.Serial(
                 self.port,
                 baudrate=self.baudrate,
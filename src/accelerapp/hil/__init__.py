@@ -5,6 +5,7 @@ Hardware-in-the-Loop (HIL) testing framework.
 from .framework import HILTestFramework, TestCase, TestResult
 from .hardware import HardwareInterface, DeviceAdapter, SimulatedHardware
 from .runner import TestRunner
+from .scheduler import TestScheduler, DurationHistory
 
 __all__ = [
     "HILTestFramework",
@@ -14,4 +15,6 @@ __all__ = [
     "DeviceAdapter",
     "SimulatedHardware",
     "TestRunner",
+    "TestScheduler",
+    "DurationHistory",
 ]
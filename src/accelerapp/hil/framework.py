@@ -2,10 +2,11 @@
 HIL testing framework core.
 """
 
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from .scheduler import DurationHistory, TestScheduler, plan_shards, run_in_processes
 
 
 class TestStatus(Enum):
@@ -45,13 +46,32 @@ class TestResult:
             "timestamp": self.timestamp,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestResult":
+        """Create from dictionary."""
+        return cls(
+            test_id=data["test_id"],
+            test_name=data["test_name"],
+            status=TestStatus(data["status"]),
+            message=data.get("message", ""),
+            duration=data.get("duration", 0.0),
+            data=data.get("data", {}),
+            timestamp=data.get("timestamp", ""),
+        )
+
 
 class TestCase:
     """
     Base class for HIL test cases.
     """
 
-    def __init__(self, test_id: str, name: str, description: str = ""):
+    def __init__(
+        self,
+        test_id: str,
+        name: str,
+        description: str = "",
+        resources: Optional[Sequence[str]] = None,
+    ):
         """
         Initialize test case.
 
@@ -59,11 +79,15 @@ class TestCase:
             test_id: Unique test identifier
             name: Test name
             description: Test description
+            resources: Hardware resources (boards, fixtures) the test needs
+                exclusively; tests without shared resources may run in parallel
         """
         self.test_id = test_id
         self.name = name
         self.description = description
+        self.resources = tuple(resources or ())
         self.hardware_interface = None
+        self.acquired_resources: Dict[str, Any] = {}
 
     def setup(self):
         """Setup method called before test execution."""
@@ -167,11 +191,16 @@ class HILTestFramework:
         Initialize HIL test framework.
 
         Args:
-            config: Framework configuration
+            config: Framework configuration. Recognized keys: workers
+                (concurrent tests, default 1), processes (worker processes,
+                default 1) and history_path (JSON file of test durations)
         """
         self.config = config or {}
         self.test_cases: Dict[str, TestCase] = {}
         self.test_results: List[TestResult] = []
+        self.resources: Dict[str, Any] = {}
+        self.history = DurationHistory(self.config.get("history_path"))
+        self.last_schedule: Dict[str, Any] = {}
 
     def register_test(self, test_case: TestCase):
         """
@@ -182,6 +211,28 @@ class HILTestFramework:
         """
         self.test_cases[test_case.test_id] = test_case
 
+    def register_resource(self, name: str, resource: Any):
+        """
+        Register a hardware resource that tests can declare.
+
+        Args:
+            name: Resource name used in TestCase.resources
+            resource: HardwareInterface or DeviceAdapter bound to tests
+        """
+        self.resources[name] = resource
+
+    def create_scheduler(self, workers: int) -> TestScheduler:
+        """
+        Create a scheduler sharing this framework's history and resources.
+
+        Args:
+            workers: Maximum tests running at once
+
+        Returns:
+            TestScheduler instance
+        """
+        return TestScheduler(workers, history=self.history, resources=self.resources)
+
     def run_test(self, test_id: str) -> TestResult:
         """
         Run a specific test.
@@ -207,29 +258,116 @@ class HILTestFramework:
 
         return result
 
-    def run_all_tests(self) -> List[TestResult]:
+    def run_tests(
+        self,
+        test_ids: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        processes: Optional[int] = None,
+    ) -> List[TestResult]:
         """
-        Run all registered tests.
+        Run tests, concurrently when more than one worker is configured.
+
+        Tests are ordered longest first by historical duration and tests
+        sharing a resource never run at the same time. With several
+        processes the suite is sharded by resource group. Durations are
+        recorded in the history for sequential and concurrent runs alike.
+
+        Args:
+            test_ids: Tests to run (None for all registered tests)
+            workers: Concurrent tests per process (config "workers" if None)
+            processes: Worker processes (config "processes" if None)
 
         Returns:
-            List of test results
+            List of test results in the requested order
         """
-        results = []
+        workers = workers or self.config.get("workers", 1)
+        processes = processes or self.config.get("processes", 1)
+        ids = list(self.test_cases) if test_ids is None else test_ids
+
+        missing = [test_id for test_id in ids if test_id not in self.test_cases]
+        tests = [self.test_cases[test_id] for test_id in ids if test_id in self.test_cases]
+
+        if workers <= 1 and processes <= 1:
+            self.last_schedule = {}
+            by_id = {test.test_id: test.run() for test in tests}
+        elif processes > 1:
+            shards = plan_shards(tests, processes, self.history)
+            outcomes = run_in_processes(self, shards, workers)
+            by_id = {r.test_id: r for results, _ in outcomes for r in results}
+            stats = [run for _, run in outcomes]
+            self.last_schedule = {
+                "workers": workers,
+                "processes": len(stats),
+                "tests": len(by_id),
+                "makespan": max((run["makespan"] for run in stats), default=0.0),
+                "total_test_time": sum(run["total_test_time"] for run in stats),
+            }
+        else:
+            scheduler = self.create_scheduler(workers)
+            by_id = {r.test_id: r for r in scheduler.run(tests)}
+            self.last_schedule = {"processes": 1, **scheduler.last_run}
 
-        for test_id in self.test_cases:
-            result = self.run_test(test_id)
+        results = []
+        for test_id in ids:
+            if test_id in missing:
+                results.append(self.run_test(test_id))
+                continue
+            result = by_id[test_id]
+            self.history.record(test_id, result.duration)
+            self.test_results.append(result)
             results.append(result)
+        self.history.save()
 
         return results
 
-    def get_test_summary(self) -> Dict[str, Any]:
+    def run_shard(
+        self, shard_index: int, shard_count: int, workers: Optional[int] = None
+    ) -> List[TestResult]:
         """
-        Get summary of test results.
+        Run one shard of the suite (e.g. one CI job per HIL rack section).
+
+        Every caller using the same history computes the same sharding.
+
+        Args:
+            shard_index: Shard to run (0-based)
+            shard_count: Total number of shards
+            workers: Concurrent tests within the shard
+
+        Returns:
+            List of test results for the shard
+        """
+        shards = plan_shards(list(self.test_cases.values()), shard_count, self.history)
+        test_ids = [test.test_id for test in shards[shard_index]]
+        workers = workers or self.config.get("workers", 1)
+        return self.run_tests(test_ids, workers=workers, processes=1)
+
+    def run_all_tests(
+        self, workers: Optional[int] = None, processes: Optional[int] = None
+    ) -> List[TestResult]:
+        """
+        Run all registered tests.
+
+        Args:
+            workers: Concurrent tests per process (config "workers" if None)
+            processes: Worker processes (config "processes" if None)
+
+        Returns:
+            List of test results
+        """
+        return self.run_tests(workers=workers, processes=processes)
+
+    @staticmethod
+    def summarize(results: Sequence[TestResult]) -> Dict[str, Any]:
+        """
+        Summarize a list of test results.
+
+        Args:
+            results: Test results
 
         Returns:
             Summary dictionary
         """
-        if not self.test_results:
+        if not results:
             return {
                 "total": 0,
                 "passed": 0,
@@ -239,11 +377,11 @@ class HILTestFramework:
             }
 
         summary = {
-            "total": len(self.test_results),
-            "passed": sum(1 for r in self.test_results if r.status == TestStatus.PASSED),
-            "failed": sum(1 for r in self.test_results if r.status == TestStatus.FAILED),
-            "error": sum(1 for r in self.test_results if r.status == TestStatus.ERROR),
-            "skipped": sum(1 for r in self.test_results if r.status == TestStatus.SKIPPED),
+            "total": len(results),
+            "passed": sum(1 for r in results if r.status == TestStatus.PASSED),
+            "failed": sum(1 for r in results if r.status == TestStatus.FAILED),
+            "error": sum(1 for r in results if r.status == TestStatus.ERROR),
+            "skipped": sum(1 for r in results if r.status == TestStatus.SKIPPED),
         }
 
         summary["pass_rate"] = (
@@ -252,6 +390,15 @@ class HILTestFramework:
 
         return summary
 
+    def get_test_summary(self) -> Dict[str, Any]:
+        """
+        Get summary of test results.
+
+        Returns:
+            Summary dictionary
+        """
+        return self.summarize(self.test_results)
+
     def clear_results(self):
         """Clear all test results."""
         self.test_results.clear()
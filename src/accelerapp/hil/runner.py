@@ -2,7 +2,7 @@
 Test runner for executing HIL tests.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Union
 from pathlib import Path
 import json
 from datetime import datetime
@@ -25,7 +25,11 @@ class TestRunner:
         self.reports: List[Dict[str, Any]] = []
 
     def run_tests(
-        self, test_ids: Optional[List[str]] = None, verbose: bool = False
+        self,
+        test_ids: Optional[List[str]] = None,
+        verbose: bool = False,
+        workers: Optional[int] = None,
+        processes: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Run tests and generate report.
@@ -33,22 +37,18 @@ class TestRunner:
         Args:
             test_ids: Specific test IDs to run (None for all)
             verbose: Enable verbose output
+            workers: Concurrent tests per process (framework config if None)
+            processes: Worker processes for sharded runs (framework config if None)
 
         Returns:
             Test report dictionary
         """
-        if test_ids:
-            results = []
-            for test_id in test_ids:
-                result = self.framework.run_test(test_id)
-                results.append(result)
-                if verbose:
-                    self._print_result(result)
-        else:
-            results = self.framework.run_all_tests()
-            if verbose:
-                for result in results:
-                    self._print_result(result)
+        results = self.framework.run_tests(
+            test_ids or None, workers=workers, processes=processes
+        )
+        if verbose:
+            for result in results:
+                self._print_result(result)
 
         summary = self.framework.get_test_summary()
 
@@ -57,6 +57,52 @@ class TestRunner:
             "summary": summary,
             "results": [r.to_dict() for r in results],
         }
+        if self.framework.last_schedule:
+            report["schedule"] = dict(self.framework.last_schedule)
+
+        self.reports.append(report)
+
+        return report
+
+    def merge_reports(
+        self, reports: Sequence[Union[Dict[str, Any], Path, str]]
+    ) -> Dict[str, Any]:
+        """
+        Merge reports from sharded runs into one report.
+
+        The merged report becomes the latest report, so save_report writes
+        it. When a test appears in several reports the last result wins.
+
+        Args:
+            reports: Report dictionaries or paths to JSON reports
+
+        Returns:
+            Merged report dictionary
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        schedules = []
+
+        for report in reports:
+            if not isinstance(report, dict):
+                report = json.loads(Path(report).read_text())
+            for result in report.get("results", []):
+                merged.pop(result["test_id"], None)
+                merged[result["test_id"]] = result
+            if "schedule" in report:
+                schedules.append(report["schedule"])
+
+        results = [TestResult.from_dict(r) for r in merged.values()]
+        report = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "summary": self.framework.summarize(results),
+            "results": list(merged.values()),
+            "shards": len(reports),
+        }
+        if schedules:
+            report["schedule"] = {
+                "makespan": max(s.get("makespan", 0.0) for s in schedules),
+                "total_test_time": sum(s.get("total_test_time", 0.0) for s in schedules),
+            }
 
         self.reports.append(report)
 
@@ -0,0 +1,298 @@
+"""
+Parallel scheduling for HIL tests.
+
+Maps tests to the hardware resources they declare, runs independent tests
+concurrently, and shards test suites across worker processes.
+"""
+
+import json
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from .framework import HILTestFramework, TestCase, TestResult
+
+
+class DurationHistory:
+    """
+    Historical test durations used to order tests longest first.
+
+    Durations are smoothed exponentially so one slow run does not dominate.
+    """
+
+    def __init__(self, path: Optional[Path] = None, smoothing: float = 0.3):
+        """
+        Initialize duration history.
+
+        Args:
+            path: JSON file to load from and save to (in-memory if None)
+            smoothing: Weight of the newest duration (0-1)
+        """
+        self.path = Path(path) if path else None
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        self.load()
+
+    def load(self):
+        """Load durations from the history file, if any."""
+        if self.path and self.path.exists():
+            try:
+                self.durations.update(json.loads(self.path.read_text()))
+            except (OSError, ValueError):
+                pass
+
+    def save(self):
+        """Save durations to the history file, if any."""
+        if self.path:
+            self.path.write_text(json.dumps(self.durations, indent=2, sort_keys=True))
+
+    def record(self, test_id: str, duration: float):
+        """
+        Record a measured test duration.
+
+        Args:
+            test_id: Test identifier
+            duration: Duration in seconds
+        """
+        previous = self.durations.get(test_id)
+        if previous is None:
+            self.durations[test_id] = duration
+        else:
+            self.durations[test_id] = previous + self.smoothing * (duration - previous)
+
+    def estimate(self, test_id: str) -> float:
+        """
+        Estimate a test's duration.
+
+        Unknown tests are assumed to be as long as the longest known test,
+        so they are started early rather than extending the tail.
+
+        Args:
+            test_id: Test identifier
+
+        Returns:
+            Estimated duration in seconds
+        """
+        if test_id in self.durations:
+            return self.durations[test_id]
+        return max(self.durations.values(), default=1.0)
+
+
+def order_longest_first(tests: Sequence["TestCase"], history: DurationHistory) -> List["TestCase"]:
+    """
+    Order tests by estimated duration, longest first.
+
+    Args:
+        tests: Tests to order
+        history: Duration history
+
+    Returns:
+        Ordered list (ties keep registration order)
+    """
+    return sorted(tests, key=lambda t: -history.estimate(t.test_id))
+
+
+def group_by_resources(tests: Sequence["TestCase"]) -> List[List["TestCase"]]:
+    """
+    Group tests that transitively share a hardware resource.
+
+    Args:
+        tests: Tests to group
+
+    Returns:
+        Groups in order of first appearance
+    """
+    parent = list(range(len(tests)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    for index, test in enumerate(tests):
+        for resource in test.resources:
+            if resource in owner:
+                parent[find(index)] = find(owner[resource])
+            else:
+                owner[resource] = index
+
+    groups: Dict[int, List["TestCase"]] = {}
+    for index, test in enumerate(tests):
+        groups.setdefault(find(index), []).append(test)
+    return list(groups.values())
+
+
+def plan_shards(
+    tests: Sequence["TestCase"], shard_count: int, history: DurationHistory
+) -> List[List["TestCase"]]:
+    """
+    Split tests into shards with balanced estimated durations.
+
+    Tests sharing a resource always land in the same shard, so shards can
+    run in separate processes without contending for hardware. Resource
+    groups are packed longest first onto the least loaded shard.
+
+    Args:
+        tests: Tests to shard
+        shard_count: Number of shards
+        history: Duration history
+
+    Returns:
+        List of shard_count test lists (each in registration order)
+    """
+    position = {test.test_id: index for index, test in enumerate(tests)}
+    shards: List[List["TestCase"]] = [[] for _ in range(max(1, shard_count))]
+    loads = [0.0] * len(shards)
+
+    groups = group_by_resources(tests)
+    groups.sort(key=lambda g: -sum(history.estimate(t.test_id) for t in g))
+    for group in groups:
+        target = loads.index(min(loads))
+        shards[target].extend(group)
+        loads[target] += sum(history.estimate(t.test_id) for t in group)
+
+    for shard in shards:
+        shard.sort(key=lambda t: position[t.test_id])
+    return shards
+
+
+class TestScheduler:
+    """
+    Runs tests concurrently while holding per-resource locks.
+
+    A single dispatcher hands tests to a thread pool in longest-first
+    order, skipping ahead past tests whose resources are busy. A test
+    holds every resource it declares for its whole run, so tests on the
+    same board never overlap, while tests on different boards (or with no
+    declared resources) run side by side.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        history: Optional[DurationHistory] = None,
+        resources: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_workers: Maximum tests running at once
+            history: Duration history for ordering
+            resources: Resource name to hardware interface/adapter mapping
+        """
+        self.max_workers = max(1, max_workers)
+        self.history = history or DurationHistory()
+        self.resources = resources or {}
+        self.last_run: Dict[str, Any] = {}
+
+    def run(self, tests: Sequence["TestCase"]) -> List["TestResult"]:
+        """
+        Run tests concurrently.
+
+        Args:
+            tests: Tests to run
+
+        Returns:
+            Results in the order the tests were given
+        """
+        pending = order_longest_first(tests, self.history)
+        busy: Set[str] = set()
+        results: Dict[str, "TestResult"] = {}
+        start = perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running: Dict[Any, "TestCase"] = {}
+            while pending or running:
+                index = 0
+                while len(running) < self.max_workers and index < len(pending):
+                    test = pending[index]
+                    if busy.intersection(test.resources):
+                        index += 1
+                        continue
+                    busy.update(test.resources)
+                    del pending[index]
+                    running[pool.submit(self._execute, test)] = test
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    test = running.pop(future)
+                    busy.difference_update(test.resources)
+                    results[test.test_id] = future.result()
+
+        ordered = [results[test.test_id] for test in tests]
+        self.last_run = {
+            "workers": self.max_workers,
+            "tests": len(ordered),
+            "makespan": perf_counter() - start,
+            "total_test_time": sum(r.duration for r in ordered),
+        }
+        return ordered
+
+    def _execute(self, test: "TestCase") -> "TestResult":
+        """Bind declared resources to a test and run it."""
+        test.acquired_resources = {
+            name: self.resources[name] for name in test.resources if name in self.resources
+        }
+        if test.hardware_interface is None and test.acquired_resources:
+            test.hardware_interface = next(iter(test.acquired_resources.values()))
+        return test.run()
+
+
+# Framework inherited by forked shard workers (set only while a pool is live)
+_FORKED_FRAMEWORK: Optional["HILTestFramework"] = None
+
+
+def _run_forked_shard(
+    test_ids: List[str], workers: int
+) -> Tuple[List["TestResult"], Dict[str, Any]]:
+    """Process pool worker: run one shard of the inherited framework."""
+    framework = _FORKED_FRAMEWORK
+    tests = [framework.test_cases[test_id] for test_id in test_ids]
+    scheduler = framework.create_scheduler(workers)
+    return scheduler.run(tests), scheduler.last_run
+
+
+def run_in_processes(
+    framework: "HILTestFramework", shards: List[List["TestCase"]], workers: int
+) -> List[Tuple[List["TestResult"], Dict[str, Any]]]:
+    """
+    Run shards in forked worker processes.
+
+    Test cases are often defined ad hoc and hold live hardware handles, so
+    instead of pickling them each worker inherits the framework via fork
+    and receives only test IDs. Where fork is unavailable the shards run
+    one after another in this process.
+
+    Args:
+        framework: Framework owning the tests
+        shards: Test shards
+        workers: Concurrent tests per shard
+
+    Returns:
+        (results, run stats) per shard
+    """
+    global _FORKED_FRAMEWORK
+
+    shard_ids = [[test.test_id for test in shard] for shard in shards if shard]
+    if "fork" not in multiprocessing.get_all_start_methods():
+        outcomes = []
+        for test_ids in shard_ids:
+            scheduler = framework.create_scheduler(workers)
+            tests = [framework.test_cases[test_id] for test_id in test_ids]
+            outcomes.append((scheduler.run(tests), scheduler.last_run))
+        return outcomes
+
+    _FORKED_FRAMEWORK = framework
+    try:
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=len(shard_ids), mp_context=context) as pool:
+            futures = [pool.submit(_run_forked_shard, ids, workers) for ids in shard_ids]
+            return [future.result() for future in futures]
+    finally:
+        _FORKED_FRAMEWORK = None
@@ -0,0 +1,44 @@
+"""
+Deferred imports for Accelerapp packages.
+
+Packages declare their public names with the submodule that defines them;
+a module-level __getattr__ (PEP 562) imports the submodule the first time
+a name is accessed and caches the result in the package namespace, so
+later lookups cost nothing.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, MutableMapping, Tuple
+
+
+def lazy_exports(
+    package: str, namespace: MutableMapping[str, Any], exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build __getattr__ and __dir__ functions for a package.
+
+    Args:
+        package: Package name (__name__ of the package)
+        namespace: Package globals(), used to cache resolved names
+        exports: Exported name to "module" or "module:attribute" mapping;
+            relative modules (".config") resolve against the package, and
+            the attribute defaults to the exported name
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package
+    """
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, _, attribute = target.partition(":")
+        module = importlib.import_module(module_name, package)
+        value = getattr(module, attribute or name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -5,10 +5,12 @@ Supports ESP32 Marauder, Flipper Zero, and other hardware platforms.
 
 import asyncio
 import logging
+import time
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Callable
+from typing import Any, Dict, List, Optional, Set, Callable, Tuple
 
 from ..hardware.esp32_marauder import ESP32Marauder, WiFiNetwork, BluetoothDevice
 from ..hardware.flipper_zero import FlipperZero, RFIDTag, NFCTag, SubGHzSignal, IRSignal
@@ -105,18 +107,233 @@ class ScanResults:
         }
 
 
+@dataclass
+class PooledConnection:
+    """Open device connection held by the connection pool."""
+    
+    port: str
+    device: Any
+    opened_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: bool = True
+    
+    def is_healthy(self) -> bool:
+        """Check that the underlying serial link is still open."""
+        if self.device is None or not getattr(self.device, "is_connected", False):
+            return False
+        connection = getattr(self.device, "connection", None)
+        if connection is None:
+            return False
+        return bool(getattr(connection, "is_open", True))
+
+
+class ConnectionPool:
+    """
+    Port to connection pool for serial hardware devices.
+    Reuses healthy open connections and closes idle ones after a timeout.
+    """
+    
+    def __init__(self, idle_timeout: float = 300.0, logger: Optional[logging.Logger] = None):
+        """
+        Initialize connection pool.
+        
+        Args:
+            idle_timeout: Seconds a released connection may stay open unused
+            logger: Logger instance
+        """
+        self.idle_timeout = idle_timeout
+        self.logger = logger or get_logger(__name__)
+        self._connections: Dict[str, PooledConnection] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    def acquire(self, port: Optional[str]) -> Optional[PooledConnection]:
+        """
+        Get a healthy pooled connection for a port.
+        
+        Args:
+            port: Serial port
+        
+        Returns:
+            Pooled connection or None if a new one must be opened
+        """
+        entry = self._connections.get(port) if port else None
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        
+        if not entry.is_healthy():
+            self.logger.warning(f"Pooled connection on {port} failed health check")
+            self.evict(port)
+            self._stats["misses"] += 1
+            return None
+        
+        entry.in_use = True
+        entry.last_used = time.monotonic()
+        self._stats["hits"] += 1
+        return entry
+    
+    def add(self, port: str, device: Any) -> PooledConnection:
+        """
+        Add a freshly opened connection to the pool.
+        
+        Args:
+            port: Serial port
+            device: Connected device instance
+        
+        Returns:
+            Pooled connection entry
+        """
+        existing = self._connections.get(port)
+        if existing is not None and existing.device is not device:
+            self.evict(port)
+        
+        entry = PooledConnection(port=port, device=device)
+        self._connections[port] = entry
+        return entry
+    
+    def release(self, port: Optional[str]) -> bool:
+        """
+        Return a connection to the pool without closing it.
+        
+        Args:
+            port: Serial port
+        
+        Returns:
+            True if the port had a pooled connection
+        """
+        entry = self._connections.get(port) if port else None
+        if entry is None:
+            return False
+        entry.in_use = False
+        entry.last_used = time.monotonic()
+        return True
+    
+    def evict(self, port: Optional[str], close: bool = True) -> bool:
+        """
+        Remove a connection from the pool.
+        
+        Args:
+            port: Serial port
+            close: Close the device connection as well
+        
+        Returns:
+            True if a connection was removed
+        """
+        entry = self._connections.pop(port, None) if port else None
+        if entry is None:
+            return False
+        
+        if close and entry.device is not None:
+            try:
+                entry.device.disconnect()
+            except Exception as e:
+                self.logger.error(f"Failed to close pooled connection on {port}: {e}")
+        
+        self._stats["evictions"] += 1
+        return True
+    
+    def prune_idle(self, now: Optional[float] = None) -> List[str]:
+        """
+        Close released connections idle longer than the timeout and unhealthy ones.
+        
+        Args:
+            now: Monotonic timestamp (defaults to current time)
+        
+        Returns:
+            Ports whose connections were closed
+        """
+        now = time.monotonic() if now is None else now
+        pruned = [
+            port
+            for port, entry in self._connections.items()
+            if not entry.is_healthy()
+            or (not entry.in_use and now - entry.last_used >= self.idle_timeout)
+        ]
+        for port in pruned:
+            self.evict(port)
+        return pruned
+    
+    def close_all(self) -> None:
+        """Close every pooled connection."""
+        for port in list(self._connections.keys()):
+            self.evict(port)
+    
+    def __contains__(self, port: object) -> bool:
+        return port in self._connections
+    
+    def __len__(self) -> int:
+        return len(self._connections)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+        
+        Returns:
+            Statistics dictionary
+        """
+        return {
+            "size": len(self._connections),
+            "in_use": sum(1 for entry in self._connections.values() if entry.in_use),
+            "idle_timeout": self.idle_timeout,
+            **self._stats,
+        }
+
+
+# Discovery probes: device type -> (driver class, device id prefix, capabilities)
+_DISCOVERY_PROBES: Dict[DeviceType, Tuple[type, str, Set[DeviceCapability]]] = {
+    DeviceType.ESP32_MARAUDER: (
+        ESP32Marauder,
+        "marauder",
+        {
+            DeviceCapability.WIFI_SCAN,
+            DeviceCapability.BLUETOOTH_SCAN,
+            DeviceCapability.DEAUTH_ATTACK,
+            DeviceCapability.PACKET_CAPTURE,
+        },
+    ),
+    DeviceType.FLIPPER_ZERO: (
+        FlipperZero,
+        "flipper",
+        {
+            DeviceCapability.RFID_125KHZ,
+            DeviceCapability.RFID_HF,
+            DeviceCapability.NFC,
+            DeviceCapability.SUBGHZ,
+            DeviceCapability.INFRARED,
+            DeviceCapability.GPIO,
+            DeviceCapability.IBUTTON,
+            DeviceCapability.BADUSB,
+        },
+    ),
+}
+
+_DEVICE_NAMES = {
+    DeviceType.ESP32_MARAUDER: "ESP32 Marauder",
+    DeviceType.FLIPPER_ZERO: "Flipper Zero",
+}
+
+
 class HardwareManager:
     """
     Unified hardware manager for coordinating multiple devices.
     Provides device discovery, registration, and coordinated operations.
     """
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        discovery_ttl: float = 5.0,
+        idle_timeout: float = 300.0,
+        executor: Optional[Executor] = None,
+    ):
         """
         Initialize hardware manager.
         
         Args:
             logger: Logger instance
+            discovery_ttl: Seconds discovery probe results are reused
+            idle_timeout: Seconds an idle pooled connection stays open
+            executor: Executor for blocking probe/connect calls (loop default if None)
         """
         self.logger = logger or get_logger(__name__)
         self.devices: Dict[str, ManagedDevice] = {}
@@ -127,68 +344,188 @@ class HardwareManager:
             "scan_complete": [],
             "error": [],
         }
+        self.discovery_ttl = discovery_ttl
+        self._executor = executor
+        self._discovery_cache: Dict[DeviceType, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._known_ports: Dict[str, DeviceType] = {}
+        self.connection_pool = ConnectionPool(idle_timeout=idle_timeout, logger=self.logger)
     
-    async def discover_devices(self) -> List[ManagedDevice]:
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """Run a blocking hardware call in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def _probe(self, device_type: DeviceType, force_refresh: bool) -> List[Dict[str, Any]]:
+        """Run one discovery probe, reusing cached results within the TTL."""
+        cached = self._discovery_cache.get(device_type)
+        if not force_refresh and cached and time.monotonic() - cached[0] < self.discovery_ttl:
+            return cached[1]
+        
+        driver = _DISCOVERY_PROBES[device_type][0]
+        try:
+            results = await self._run_blocking(driver.discover_devices)
+        except Exception as e:
+            self.logger.error(f"{_DEVICE_NAMES[device_type]} discovery failed: {e}")
+            return cached[1] if cached else []
+        
+        self._discovery_cache[device_type] = (time.monotonic(), results)
+        return results
+    
+    async def _probe_all(
+        self,
+        force_refresh: bool = False,
+    ) -> Dict[str, Tuple[DeviceType, Dict[str, Any]]]:
+        """Run all discovery probes concurrently and index the results by port."""
+        device_types = list(_DISCOVERY_PROBES.keys())
+        probe_results = await asyncio.gather(
+            *(self._probe(device_type, force_refresh) for device_type in device_types)
+        )
+        
+        found: Dict[str, Tuple[DeviceType, Dict[str, Any]]] = {}
+        for device_type, device_infos in zip(device_types, probe_results):
+            for device_info in device_infos:
+                found[device_info["port"]] = (device_type, device_info)
+        return found
+    
+    async def _probe_port(self, port: str) -> Optional[Tuple[DeviceType, Dict[str, Any]]]:
+        """Run every discovery probe against one port and refresh its cache entries."""
+        device_types = list(_DISCOVERY_PROBES.keys())
+        probe_results = await asyncio.gather(
+            *(
+                self._run_blocking(_DISCOVERY_PROBES[device_type][0].discover_devices, port)
+                for device_type in device_types
+            ),
+            return_exceptions=True,
+        )
+        
+        match = None
+        for device_type, result in zip(device_types, probe_results):
+            if isinstance(result, Exception):
+                self.logger.error(f"{_DEVICE_NAMES[device_type]} probe of {port} failed: {result}")
+                continue
+            if result and match is None:
+                match = (device_type, result[0])
+            cached = self._discovery_cache.get(device_type)
+            if cached:
+                others = [info for info in cached[1] if info.get("port") != port]
+                self._discovery_cache[device_type] = (cached[0], others + result)
+        return match
+    
+    def _build_managed_device(
+        self,
+        device_type: DeviceType,
+        device_info: Dict[str, Any],
+    ) -> ManagedDevice:
+        """Create a managed device entry from probe output."""
+        _, prefix, capabilities = _DISCOVERY_PROBES[device_type]
+        return ManagedDevice(
+            device_id=f"{prefix}_{device_info['port']}",
+            device_type=device_type,
+            device=None,  # Will be created on connect
+            capabilities=set(capabilities),
+            port=device_info["port"],
+            metadata=device_info,
+        )
+    
+    async def discover_devices(self, force_refresh: bool = False) -> List[ManagedDevice]:
         """
         Discover all available hardware devices.
         
+        Probes run concurrently in the executor and their results are cached
+        for ``discovery_ttl`` seconds.
+        
+        Args:
+            force_refresh: Ignore cached probe results
+        
         Returns:
             List of discovered devices
         """
         discovered = []
         
         try:
-            # Discover ESP32 Marauder devices
-            marauder_devices = ESP32Marauder.discover_devices()
-            for device_info in marauder_devices:
-                device_id = f"marauder_{device_info['port']}"
-                if device_id not in self.devices:
-                    managed_device = ManagedDevice(
-                        device_id=device_id,
-                        device_type=DeviceType.ESP32_MARAUDER,
-                        device=None,  # Will be created on connect
-                        capabilities={
-                            DeviceCapability.WIFI_SCAN,
-                            DeviceCapability.BLUETOOTH_SCAN,
-                            DeviceCapability.DEAUTH_ATTACK,
-                            DeviceCapability.PACKET_CAPTURE,
-                        },
-                        port=device_info["port"],
-                        metadata=device_info,
-                    )
-                    discovered.append(managed_device)
-                    self.logger.info(f"Discovered ESP32 Marauder: {device_id}")
+            found = await self._probe_all(force_refresh)
+            self._known_ports = {port: device_type for port, (device_type, _) in found.items()}
             
-            # Discover Flipper Zero devices
-            flipper_devices = FlipperZero.discover_devices()
-            for device_info in flipper_devices:
-                device_id = f"flipper_{device_info['port']}"
-                if device_id not in self.devices:
-                    managed_device = ManagedDevice(
-                        device_id=device_id,
-                        device_type=DeviceType.FLIPPER_ZERO,
-                        device=None,  # Will be created on connect
-                        capabilities={
-                            DeviceCapability.RFID_125KHZ,
-                            DeviceCapability.RFID_HF,
-                            DeviceCapability.NFC,
-                            DeviceCapability.SUBGHZ,
-                            DeviceCapability.INFRARED,
-                            DeviceCapability.GPIO,
-                            DeviceCapability.IBUTTON,
-                            DeviceCapability.BADUSB,
-                        },
-                        port=device_info["port"],
-                        metadata=device_info,
-                    )
+            for device_type, device_info in found.values():
+                managed_device = self._build_managed_device(device_type, device_info)
+                if managed_device.device_id not in self.devices:
                     discovered.append(managed_device)
-                    self.logger.info(f"Discovered Flipper Zero: {device_id}")
-        
+                    self.logger.info(
+                        f"Discovered {_DEVICE_NAMES[device_type]}: {managed_device.device_id}"
+                    )
+            
         except Exception as e:
             self.logger.error(f"Device discovery failed: {e}")
         
         return discovered
     
+    async def handle_hotplug(self, port: str, added: bool = True) -> List[ManagedDevice]:
+        """
+        Incrementally update discovery state for a single port.
+        
+        Intended to be driven by OS hotplug notifications (udev, IOKit, WM_DEVICECHANGE)
+        so that only the affected port is processed instead of a full rescan.
+        
+        Args:
+            port: Serial port that appeared or disappeared
+            added: True if the port appeared, False if it was removed
+        
+        Returns:
+            Newly discovered devices on the port (empty on removal)
+        """
+        if not added:
+            self._forget_port(port)
+            return []
+        
+        match = await self._probe_port(port)
+        if match is None:
+            return []
+        
+        device_type, device_info = match
+        self._known_ports[port] = device_type
+        managed_device = self._build_managed_device(device_type, device_info)
+        if managed_device.device_id in self.devices:
+            return []
+        
+        self.logger.info(f"Hotplugged {_DEVICE_NAMES[device_type]}: {managed_device.device_id}")
+        return [managed_device]
+    
+    async def refresh_hotplug(self) -> Dict[str, List[str]]:
+        """
+        Re-probe ports and apply only the differences since the previous scan.
+        
+        Returns:
+            Dictionary with ``added`` and ``removed`` port lists
+        """
+        previous = dict(self._known_ports)
+        found = await self._probe_all(force_refresh=True)
+        
+        added = [port for port in found if port not in previous]
+        removed = [port for port in previous if port not in found]
+        
+        for port in removed:
+            self._forget_port(port)
+        for port in added:
+            self._known_ports[port] = found[port][0]
+        
+        return {"added": added, "removed": removed}
+    
+    def _forget_port(self, port: str) -> None:
+        """Drop pooled connections and cached probe results for a removed port."""
+        self._known_ports.pop(port, None)
+        self.connection_pool.evict(port)
+        
+        for device_type, (timestamp, results) in list(self._discovery_cache.items()):
+            remaining = [info for info in results if info.get("port") != port]
+            if len(remaining) != len(results):
+                self._discovery_cache[device_type] = (timestamp, remaining)
+        
+        for managed_device in self.devices.values():
+            if managed_device.port == port and managed_device.status != DeviceStatus.DISCONNECTED:
+                managed_device.status = DeviceStatus.DISCONNECTED
+                self.logger.info(f"Device removed: {managed_device.device_id}")
+                self._trigger_callbacks("device_disconnected", managed_device)
+    
     def register_device(
         self,
         device_id: str,
@@ -242,6 +579,9 @@ class HardwareManager:
         """
         Connect to a registered device.
         
+        Healthy pooled connections for the device port are reused; otherwise a
+        new connection is opened in the executor and added to the pool.
+        
         Args:
             device_id: Device identifier
         
@@ -255,6 +595,15 @@ class HardwareManager:
         managed_device = self.devices[device_id]
         
         try:
+            pooled = self.connection_pool.acquire(managed_device.port)
+            if pooled is not None:
+                managed_device.device = pooled.device
+                managed_device.status = DeviceStatus.CONNECTED
+                managed_device.last_seen = datetime.now()
+                self.logger.debug(f"Reusing pooled connection for {device_id}")
+                self._trigger_callbacks("device_connected", managed_device)
+                return True
+            
             # Create device instance if not exists
             if managed_device.device is None:
                 if managed_device.device_type == DeviceType.ESP32_MARAUDER:
@@ -271,10 +620,16 @@ class HardwareManager:
                     self.logger.error(f"Unsupported device type: {managed_device.device_type}")
                     return False
             
-            # Connect to device
-            success = managed_device.device.connect(managed_device.port)
+            # Connect to device without blocking the event loop
+            success = await self._run_blocking(
+                managed_device.device.connect, managed_device.port
+            )
             
             if success:
+                port = managed_device.port or getattr(managed_device.device, "port", None)
+                if port:
+                    managed_device.port = port
+                    self.connection_pool.add(port, managed_device.device)
                 managed_device.status = DeviceStatus.CONNECTED
                 managed_device.last_seen = datetime.now()
                 self.logger.info(f"Connected to device: {device_id}")
@@ -289,6 +644,45 @@ class HardwareManager:
             managed_device.status = DeviceStatus.ERROR
             return False
     
+    def release_device(self, device_id: str) -> bool:
+        """
+        Mark a device disconnected but keep its connection pooled for reuse.
+        
+        The connection is closed by ``prune_idle_connections`` once it has been
+        idle longer than the pool idle timeout.
+        
+        Args:
+            device_id: Device identifier
+        
+        Returns:
+            True if the device had a pooled connection
+        """
+        managed_device = self.devices.get(device_id)
+        if managed_device is None:
+            self.logger.error(f"Device {device_id} not registered")
+            return False
+        
+        if not self.connection_pool.release(managed_device.port):
+            return False
+        
+        managed_device.status = DeviceStatus.DISCONNECTED
+        self._trigger_callbacks("device_disconnected", managed_device)
+        return True
+    
+    def prune_idle_connections(self) -> List[str]:
+        """
+        Close idle or unhealthy pooled connections.
+        
+        Returns:
+            Ports whose connections were closed
+        """
+        pruned = self.connection_pool.prune_idle()
+        for managed_device in self.devices.values():
+            if managed_device.port in pruned and managed_device.status == DeviceStatus.CONNECTED:
+                managed_device.status = DeviceStatus.DISCONNECTED
+                self._trigger_callbacks("device_disconnected", managed_device)
+        return pruned
+    
     def disconnect_device(self, device_id: str) -> bool:
         """
         Disconnect from a device.
@@ -306,7 +700,7 @@ class HardwareManager:
         managed_device = self.devices[device_id]
         
         try:
-            if managed_device.device:
+            if not self.connection_pool.evict(managed_device.port) and managed_device.device:
                 managed_device.device.disconnect()
             
             managed_device.status = DeviceStatus.DISCONNECTED
@@ -590,6 +984,7 @@ class HardwareManager:
                 if d.status == DeviceStatus.BUSY
             ),
             "capabilities": [cap.value for cap in self.get_capabilities()],
+            "connection_pool": self.connection_pool.get_stats(),
             "devices": {
                 device_id: device.to_dict()
                 for device_id, device in self.devices.items()
@@ -603,4 +998,7 @@ class HardwareManager:
         for device_id in list(self.devices.keys()):
             self.disconnect_device(device_id)
         
+        self.connection_pool.close_all()
         self.devices.clear()
+        self._discovery_cache.clear()
+        self._known_ports.clear()
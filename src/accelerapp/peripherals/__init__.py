@@ -3,10 +3,13 @@ Advanced peripheral abstraction layer.
 Provides comprehensive peripheral support with conflict resolution.
 """
 
+from .allocator import AllocationResult, PeripheralAllocator
 from .conflict_resolver import PeripheralConflictResolver
 from .resource_manager import PeripheralResourceManager
 
 __all__ = [
+    "AllocationResult",
+    "PeripheralAllocator",
     "PeripheralConflictResolver",
     "PeripheralResourceManager",
 ]
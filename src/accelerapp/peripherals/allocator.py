@@ -0,0 +1,538 @@
+"""
+Constraint-solving allocator for pins, alternate functions, timers and DMA.
+
+Every resource (a pin, a peripheral instance, a timer, a DMA stream) is one
+bit of an integer and every choice a peripheral can make is the mask of the
+resources it consumes, so conflict tests are single AND operations. The
+search is backtracking with forward checking, smallest-domain-first variable
+ordering and an all-different matching check over single-resource choices;
+independent parts of a design are solved separately. When a design cannot be
+allocated, a minimal set of mutually conflicting peripherals is reported.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Resource kinds used in reserved keys, e.g. ("pin", 13) or ("dma", 4)
+PIN = "pin"
+INSTANCE = "instance"
+TIMER = "timer"
+DMA = "dma"
+
+
+@dataclass
+class AllocationResult:
+    """Outcome of allocating a peripheral design."""
+
+    success: bool
+    assignments: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    conflict_set: List[str] = field(default_factory=list)
+    message: str = ""
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Variable:
+    """One decision: a pin mapping option, a signal pin, a timer or a DMA stream."""
+
+    peripheral: str
+    kind: str
+    name: str
+    masks: List[int]  # option variables: resource mask per option
+    values: List[Any]
+    unit: bool = False  # single-resource choices; domain is a resource mask
+    bits: List[int] = field(default_factory=list)  # unit variables: bit per choice
+    union: int = 0
+    prev: Optional["_Variable"] = None  # identical earlier request (symmetry breaking)
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+def _augment(
+    start: int, domains: List[int], owner: Dict[int, int], match: Dict[int, int]
+) -> Optional[List[int]]:
+    """
+    Extend a matching from a slot along an augmenting path (breadth-first Kuhn step).
+
+    Returns:
+        None on success, otherwise the slots reached, which together can
+        use fewer resources than their number (a Hall violator)
+    """
+    parent: Dict[int, int] = {}
+    visited = 0
+    queue = [start]
+    for slot in queue:
+        free = domains[slot] & ~visited
+        while free:
+            bit = free & -free
+            free ^= bit
+            visited |= bit
+            parent[bit] = slot
+            holder = owner.get(bit)
+            if holder is not None:
+                queue.append(holder)
+                continue
+            while True:
+                slot = parent[bit]
+                previous = match.get(slot)
+                match[slot] = bit
+                owner[bit] = slot
+                if slot == start:
+                    return None
+                bit = previous
+    return queue
+
+
+class PeripheralAllocator:
+    """
+    Allocates pins, alternate functions, timers and DMA streams together.
+
+    A peripheral is described with the resolver's configuration format plus
+    the choices it allows:
+
+        {
+            "id": "spi_display",
+            "type": "spi",
+            "pins": [{"pin": 13, "function": "GPIO_OUTPUT"}],  # fixed pins
+            "options": [  # alternative instance/pin mappings, preferred first
+                {"instance": "SPI1", "af": 5, "pins": {"sck": 5, "miso": 6, "mosi": 7}},
+                {"instance": "SPI1", "af": 5, "pins": {"sck": 19, "miso": 20, "mosi": 21}},
+            ],
+            "signals": {"cs": [4, 8, 9]},  # freely routable signals
+            "timers": 1,  # count, or one candidate list per timer
+            "dma": [[11, 13]],  # count, or one candidate list per stream
+        }
+
+    Pins, instances, timers and DMA streams are exclusive.
+    """
+
+    def __init__(self, timer_count: int = 4, dma_count: int = 8, node_limit: int = 100000):
+        """
+        Initialize allocator.
+
+        Args:
+            timer_count: Timers available to count-only timer requests
+            dma_count: DMA streams available to count-only DMA requests
+            node_limit: Maximum search nodes per solve, including conflict analysis
+        """
+        self.timer_count = timer_count
+        self.dma_count = dma_count
+        self.node_limit = node_limit
+
+    def solve(
+        self,
+        peripherals: List[Dict[str, Any]],
+        reserved: Optional[Iterable[Tuple[str, Any]]] = None,
+    ) -> AllocationResult:
+        """
+        Allocate resources for a design.
+
+        Args:
+            peripherals: Peripheral configurations
+            reserved: Resources that are already taken, as (kind, id) keys
+
+        Returns:
+            AllocationResult with per-peripheral assignments, or the minimal
+            conflict set if the design cannot be allocated
+        """
+        start = time.perf_counter()
+        self._stats = {"nodes": 0, "backtracks": 0, "components": 0}
+        self._core = None
+        bits: Dict[Tuple[str, Any], int] = {}
+        reserved_mask = 0
+        for key in reserved or ():
+            reserved_mask |= self._bit(bits, key)
+
+        configs: Dict[str, Dict[str, Any]] = {}
+        variables: Dict[str, List[_Variable]] = {}
+        for position, config in enumerate(peripherals):
+            peripheral_id = str(config.get("id", f"periph_{position}"))
+            configs[peripheral_id] = config
+            variables[peripheral_id] = self._build(peripheral_id, config, bits, reserved_mask)
+
+        kind_masks: Dict[str, int] = {}
+        for (kind, _), index in bits.items():
+            kind_masks[kind] = kind_masks.get(kind, 0) | 1 << index
+        self._kind_masks = list(kind_masks.values())
+
+        result = AllocationResult(success=True)
+        for component in self._components(variables):
+            self._stats["components"] += 1
+            flat = [var for peripheral_id in component for var in variables[peripheral_id]]
+            solution, exhausted = self._search(flat)
+            if solution is None:
+                result.success = False
+                if exhausted:
+                    result.conflict_set = list(component)
+                    result.message = "Search limit reached before an allocation was found"
+                    break
+                result.conflict_set, minimal = self._conflict_set(component, variables)
+                result.message = f"No allocation satisfies {', '.join(result.conflict_set)}"
+                if not minimal:
+                    result.message += " (search limit reached; set may not be minimal)"
+                break
+            for var, value in zip(flat, solution):
+                self._record(result.assignments, configs, var, value)
+
+        if not result.success:
+            result.assignments = {}
+        self._stats["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        result.stats = self._stats
+        return result
+
+    @staticmethod
+    def _bit(bits: Dict[Tuple[str, Any], int], key: Tuple[str, Any]) -> int:
+        index = bits.get(key)
+        if index is None:
+            index = bits[key] = len(bits)
+        return 1 << index
+
+    def _build(
+        self,
+        peripheral_id: str,
+        config: Dict[str, Any],
+        bits: Dict[Tuple[str, Any], int],
+        reserved: int,
+    ) -> List[_Variable]:
+        """Turn one peripheral configuration into search variables."""
+        fixed_mask = 0
+        fixed_valid = True
+        for pin_info in config.get("pins", []):
+            pin_bit = self._bit(bits, (PIN, pin_info.get("pin")))
+            fixed_valid = fixed_valid and not fixed_mask & pin_bit
+            fixed_mask |= pin_bit
+
+        # The option variable carries the fixed pins, so it always exists
+        options = config.get("options") or [{}]
+        masks, values = [], []
+        for option in options:
+            mask = fixed_mask
+            valid = fixed_valid
+            if option.get("instance") is not None:
+                mask |= self._bit(bits, (INSTANCE, option["instance"]))
+            for pin in option.get("pins", {}).values():
+                pin_bit = self._bit(bits, (PIN, pin))
+                valid = valid and not mask & pin_bit
+                mask |= pin_bit
+            if valid and not mask & reserved:
+                masks.append(mask)
+                values.append(option)
+        variables = [_Variable(peripheral_id, "option", "option", masks, values)]
+
+        for signal, candidates in config.get("signals", {}).items():
+            variables.append(
+                self._unit(peripheral_id, "signal", signal, PIN, candidates, bits, reserved)
+            )
+
+        for kind, count in ((TIMER, self.timer_count), (DMA, self.dma_count)):
+            request = config.get("timers" if kind == TIMER else kind, 0)
+            if isinstance(request, int):
+                previous = None
+                for index in range(request):
+                    var = self._unit(
+                        peripheral_id, kind, str(index), kind, range(count), bits, reserved
+                    )
+                    var.prev, previous = previous, var
+                    variables.append(var)
+            else:
+                for index, candidates in enumerate(request):
+                    var = self._unit(
+                        peripheral_id, kind, str(index), kind, candidates, bits, reserved
+                    )
+                    variables.append(var)
+
+        for var in variables:
+            var.union = 0
+            for mask in var.bits if var.unit else var.masks:
+                var.union |= mask
+        return variables
+
+    def _unit(
+        self,
+        peripheral_id: str,
+        kind: str,
+        name: str,
+        resource: str,
+        candidates: Iterable[Any],
+        bits: Dict[Tuple[str, Any], int],
+        reserved: int,
+    ) -> _Variable:
+        """Build a variable whose every choice consumes exactly one resource."""
+        var = _Variable(peripheral_id, kind, name, [], [], unit=True)
+        for candidate in candidates:
+            bit = self._bit(bits, (resource, candidate))
+            if not bit & reserved and bit not in var.bits:
+                var.bits.append(bit)
+                var.values.append(candidate)
+        return var
+
+    @staticmethod
+    def _components(variables: Dict[str, List[_Variable]]) -> List[List[str]]:
+        """Group peripherals that (transitively) compete for resources."""
+        components: List[Tuple[int, List[str]]] = []
+        for peripheral_id, peripheral_vars in variables.items():
+            mask = 0
+            for var in peripheral_vars:
+                mask |= var.union
+            members = [peripheral_id]
+            remaining = []
+            for component_mask, component_members in components:
+                if component_mask & mask:
+                    mask |= component_mask
+                    members = component_members + members
+                else:
+                    remaining.append((component_mask, component_members))
+            remaining.append((mask, members))
+            components = remaining
+        return [members for _, members in components]
+
+    def _search(self, variables: List[_Variable]) -> Tuple[Optional[List[Any]], bool]:
+        """
+        Backtracking search with forward checking.
+
+        Args:
+            variables: Variables of one component
+
+        Returns:
+            (values per variable or None, whether the node limit was hit)
+        """
+        count = len(variables)
+        domains = []
+        for var in variables:
+            if var.unit:
+                mask = 0
+                for bit in var.bits:
+                    mask |= bit
+                domains.append(mask)
+            else:
+                domains.append((1 << len(var.masks)) - 1)
+        sizes = [_popcount(domain) for domain in domains]
+
+        owners: Dict[int, List[int]] = {}
+        for i, var in enumerate(variables):
+            union = var.union
+            while union:
+                bit = union & -union
+                union ^= bit
+                owners.setdefault(bit, []).append(i)
+        linked: List[set] = [set() for _ in variables]
+        for members in owners.values():
+            for i in members:
+                linked[i].update(members)
+        neighbors = [sorted(links - {i}) for i, links in enumerate(linked)]
+        degree = [len(n) for n in neighbors]
+
+        index = {id(var): i for i, var in enumerate(variables)}
+        predecessors = {
+            i: index[id(var.prev)] for i, var in enumerate(variables) if var.prev is not None
+        }
+        followers = {prev: i for i, prev in predecessors.items()}
+
+        # Matching slots: a variable needs at least k distinct resources of each
+        # kind, k being the fewest any of its choices consumes
+        slots: List[Tuple[int, int]] = []
+        for i, var in enumerate(variables):
+            if var.unit:
+                slots.append((i, -1))
+                continue
+            for kind_mask in self._kind_masks:
+                need = min((_popcount(mask & kind_mask) for mask in var.masks), default=0)
+                slots.extend([(i, kind_mask)] * need)
+        assigned: List[Optional[int]] = [None] * count
+        match: Dict[int, int] = {}
+
+        def select() -> Optional[int]:
+            best, best_key = None, None
+            for i in range(count):
+                if assigned[i] is not None:
+                    continue
+                prev = predecessors.get(i)
+                if prev is not None and assigned[prev] is None:
+                    continue
+                key = (sizes[i], -degree[i])
+                if best_key is None or key < best_key:
+                    best, best_key = i, key
+            return best
+
+        def choices(i: int) -> List[Tuple[int, int]]:
+            var = variables[i]
+            if var.unit:
+                return [(p, bit) for p, bit in enumerate(var.bits) if bit & domains[i]]
+            return [(p, mask) for p, mask in enumerate(var.masks) if domains[i] >> p & 1]
+
+        def propagate(i: int, mask: int) -> List[Tuple[int, int, int]]:
+            trail: List[Tuple[int, int, int]] = []
+            targets = list(neighbors[i])
+            if i in followers:
+                targets.append(followers[i])
+            for j in targets:
+                if assigned[j] is not None:
+                    continue
+                var, domain = variables[j], domains[j]
+                if var.unit:
+                    new = domain & ~mask
+                    if predecessors.get(j) == i:
+                        new &= ~((mask << 1) - 1)
+                else:
+                    new = domain
+                    for p, option_mask in enumerate(var.masks):
+                        if new >> p & 1 and option_mask & mask:
+                            new &= ~(1 << p)
+                if new != domain:
+                    trail.append((j, domain, sizes[j]))
+                    domains[j] = new
+                    sizes[j] = _popcount(new)
+                    if not new:
+                        return trail
+            return trail
+
+        def undo(trail: List[Tuple[int, int, int]]):
+            for j, domain, size in reversed(trail):
+                domains[j] = domain
+                sizes[j] = size
+
+        def matchable() -> Optional[List[int]]:
+            # Hall's condition per resource kind via a warm-started matching
+            reach: Dict[int, int] = {}
+            slot_domains: List[int] = []
+            for i, kind_mask in slots:
+                if assigned[i] is not None:
+                    slot_domains.append(0)
+                    continue
+                union = reach.get(i)
+                if union is None:
+                    var = variables[i]
+                    if var.unit:
+                        union = domains[i]
+                    else:
+                        union = 0
+                        for p, mask in enumerate(var.masks):
+                            if domains[i] >> p & 1:
+                                union |= mask
+                    reach[i] = union
+                slot_domains.append(union & kind_mask)
+
+            owner: Dict[int, int] = {}
+            pending = []
+            for slot, (i, _) in enumerate(slots):
+                if assigned[i] is not None:
+                    match.pop(slot, None)
+                    continue
+                bit = match.get(slot)
+                if bit is not None and bit & slot_domains[slot] and bit not in owner:
+                    owner[bit] = slot
+                else:
+                    match.pop(slot, None)
+                    pending.append(slot)
+            for slot in pending:
+                violator = _augment(slot, slot_domains, owner, match)
+                if violator is not None:
+                    return violator
+            return None
+
+        violator = matchable()
+        if violator is not None:
+            self._core = {variables[slots[slot][0]].peripheral for slot in violator}
+            return None, False
+        self._core = None
+        current = select()
+        if current is None:
+            return [], False
+        stack = [[current, choices(current), 0, None]]
+        while stack:
+            frame = stack[-1]
+            i, options, position, trail = frame
+            if trail is not None:
+                undo(trail)
+                assigned[i] = None
+                frame[3] = None
+            if position == len(options):
+                stack.pop()
+                self._stats["backtracks"] += 1
+                continue
+            frame[2] = position + 1
+            self._stats["nodes"] += 1
+            if self._stats["nodes"] > self.node_limit:
+                return None, True
+
+            choice, mask = options[position]
+            assigned[i] = choice
+            trail = propagate(i, mask)
+            frame[3] = trail
+            if any(not domains[j] for j, _, _ in trail) or matchable() is not None:
+                continue
+
+            current = select()
+            if current is None:
+                return [var.values[choice] for var, choice in zip(variables, assigned)], False
+            stack.append([current, choices(current), 0, None])
+        return None, False
+
+    def _conflict_set(
+        self, component: List[str], variables: Dict[str, List[_Variable]]
+    ) -> Tuple[List[str], bool]:
+        """
+        Shrink a failing component to an irreducible conflicting subset.
+
+        Deletion filter: a peripheral stays if the set becomes satisfiable
+        without it. Checks that fail on the initial matching return a Hall
+        violator, which shrinks the candidate set in one step.
+
+        Returns:
+            (conflicting peripherals, whether the set is proven minimal)
+        """
+        for peripheral_id in component:
+            for var in variables[peripheral_id]:
+                if not (var.bits if var.unit else var.masks):
+                    return [peripheral_id], True
+
+        conflict = [p for p in component if self._core is None or p in self._core]
+        minimal = True
+        position = 0
+        while position < len(conflict):
+            trial = conflict[:position] + conflict[position + 1 :]
+            solution, exhausted = self._search([v for p in trial for v in variables[p]])
+            if solution is None and not exhausted:
+                core = self._core
+                conflict = [p for p in trial if core is None or p in core]
+            else:
+                minimal = minimal and not exhausted
+                position += 1
+        return conflict, minimal
+
+    @staticmethod
+    def _record(
+        assignments: Dict[str, Dict[str, Any]],
+        configs: Dict[str, Dict[str, Any]],
+        var: _Variable,
+        value: Any,
+    ):
+        """Write one variable's value into the peripheral's assignment."""
+        config = configs[var.peripheral]
+        assignment = assignments.get(var.peripheral)
+        if assignment is None:
+            assignment = assignments[var.peripheral] = {
+                "id": var.peripheral,
+                "type": config.get("type", "unknown"),
+                "instance": None,
+                "pins": [dict(pin_info) for pin_info in config.get("pins", [])],
+                "timers": [],
+                "dma": [],
+            }
+
+        if var.kind == "option":
+            assignment["instance"] = value.get("instance")
+            for signal, pin in value.get("pins", {}).items():
+                pin_info = {"pin": pin, "function": signal}
+                if value.get("af") is not None:
+                    pin_info["af"] = value["af"]
+                assignment["pins"].append(pin_info)
+        elif var.kind == "signal":
+            assignment["pins"].append({"pin": value, "function": var.name})
+        elif var.kind == TIMER:
+            assignment["timers"].append(value)
+        else:
+            assignment["dma"].append(value)
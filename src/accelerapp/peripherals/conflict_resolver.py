@@ -6,6 +6,9 @@ Detects pin conflicts and suggests alternative configurations.
 from typing import Dict, Any, List, Set, Tuple, Optional
 from dataclasses import dataclass
 
+from .allocator import PIN, AllocationResult, PeripheralAllocator
+from .resource_manager import PeripheralResourceManager, ResourceType
+
 
 @dataclass
 class PinAssignment:
@@ -33,6 +36,7 @@ class PeripheralConflictResolver:
         self.platform = platform
         self.pin_assignments: Dict[int, List[PinAssignment]] = {}
         self.peripheral_instances: Dict[str, str] = {}  # peripheral_id -> type
+        self.peripheral_configs: Dict[str, Dict[str, Any]] = {}  # peripheral_id -> config
         
     def add_peripheral(self, peripheral_config: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
@@ -79,6 +83,7 @@ class PeripheralConflictResolver:
             self.pin_assignments[pin_number].append(assignment)
         
         self.peripheral_instances[peripheral_id] = peripheral_type
+        self.peripheral_configs[peripheral_id] = {**peripheral_config, "id": peripheral_id}
         
         return len(conflicts) == 0, conflicts
     
@@ -247,24 +252,59 @@ class PeripheralConflictResolver:
         
         return report
     
+    def solve(
+        self,
+        peripherals: Optional[List[Dict[str, Any]]] = None,
+        reserved_pins: Optional[List[Any]] = None,
+        node_limit: int = 100000,
+    ) -> AllocationResult:
+        """
+        Solve pin, alternate function, timer and DMA allocation for a design.
+        
+        Peripherals may list alternative mappings ("options"), freely routable
+        signals ("signals") and timer/DMA needs; see PeripheralAllocator.
+        
+        Args:
+            peripherals: Peripheral configurations (the added peripherals if None)
+            reserved_pins: Pins that must not be used
+            node_limit: Maximum search nodes
+            
+        Returns:
+            AllocationResult with assignments or the minimal conflict set
+        """
+        if peripherals is None:
+            peripherals = list(self.peripheral_configs.values())
+        limits = PeripheralResourceManager(self.platform).resource_limits
+        allocator = PeripheralAllocator(
+            timer_count=limits.get(ResourceType.TIMER, 0),
+            dma_count=limits.get(ResourceType.DMA_CHANNEL, 0),
+            node_limit=node_limit,
+        )
+        return allocator.solve(peripherals, reserved=[(PIN, pin) for pin in reserved_pins or []])
+    
     def optimize_pin_mapping(self) -> Dict[str, Any]:
         """
         Optimize pin mapping to minimize conflicts.
         
+        Solves the added peripherals as a constraint problem. When every
+        peripheral can be placed, the solution resolves all current
+        conflicts; otherwise the minimal conflicting set is reported along
+        with alternative configurations.
+        
         Returns:
             Optimized pin mapping suggestions
         """
-        # This is a placeholder for a more sophisticated optimization algorithm
-        # Could use constraint satisfaction or genetic algorithms for complex cases
+        report = self.get_conflict_report()
+        result = self.solve()
         
         optimization = {
-            "status": "analyzed",
+            "status": "solved" if result.success else "unsatisfiable",
             "suggestions": [],
-            "conflicts_resolved": 0
+            "conflicts_resolved": len(report["conflicts"]) if result.success else 0,
+            "solution": result.assignments,
+            "conflict_set": result.conflict_set,
         }
         
-        report = self.get_conflict_report()
-        
         for conflict in report["conflicts"]:
             # For each conflict, suggest moving one peripheral to alternative pins
             peripheral_id = conflict["peripheral1"]
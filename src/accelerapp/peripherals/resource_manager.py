@@ -3,10 +3,12 @@ Peripheral resource manager.
 Manages peripheral instances, DMA channels, timers, and other shared resources.
 """
 
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, Iterator, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .allocator import DMA, INSTANCE, PIN, TIMER, AllocationResult, PeripheralAllocator
+
 
 class ResourceType(Enum):
     """Types of peripheral resources."""
@@ -32,6 +34,15 @@ class ResourceAllocation:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Instance resource types by peripheral type, for recording solver instances
+INSTANCE_TYPES = {
+    "uart": ResourceType.UART_INSTANCE,
+    "usart": ResourceType.UART_INSTANCE,
+    "i2c": ResourceType.I2C_INSTANCE,
+    "spi": ResourceType.SPI_INSTANCE,
+}
+
+
 class PeripheralResourceManager:
     """
     Manages allocation of shared peripheral resources.
@@ -50,6 +61,9 @@ class PeripheralResourceManager:
             res_type: [] for res_type in ResourceType
         }
         self.resource_limits = self._get_platform_limits()
+        # O(1) lookups: allocation by (type, id), and allocated integer IDs as bitsets
+        self._index: Dict[Tuple[ResourceType, Any], ResourceAllocation] = {}
+        self._bitsets: Dict[ResourceType, int] = {res_type: 0 for res_type in ResourceType}
         
     def _get_platform_limits(self) -> Dict[ResourceType, int]:
         """Get platform-specific resource limits."""
@@ -129,7 +143,7 @@ class PeripheralResourceManager:
                     priority=priority,
                     metadata=metadata or {}
                 )
-                self.allocations[resource_type].append(allocation)
+                self._add(allocation)
                 return allocation
             else:
                 return None
@@ -145,33 +159,34 @@ class PeripheralResourceManager:
                 priority=priority,
                 metadata=metadata or {}
             )
-            self.allocations[resource_type].append(allocation)
+            self._add(allocation)
             return allocation
         
         return None
     
+    def _add(self, allocation: ResourceAllocation):
+        """Record an allocation in the list and the lookup indexes."""
+        self.allocations[allocation.resource_type].append(allocation)
+        self._index[(allocation.resource_type, allocation.resource_id)] = allocation
+        if isinstance(allocation.resource_id, int) and allocation.resource_id >= 0:
+            self._bitsets[allocation.resource_type] |= 1 << allocation.resource_id
+    
     def _is_resource_available(self, resource_type: ResourceType, resource_id: Any) -> bool:
         """Check if a specific resource is available."""
-        for allocation in self.allocations[resource_type]:
-            if allocation.resource_id == resource_id:
-                return False
-        return True
+        return (resource_type, resource_id) not in self._index
+    
+    def _free_ids(self, resource_type: ResourceType) -> Iterator[int]:
+        """Iterate over unallocated resource IDs below the platform limit, lowest first."""
+        limit = self.resource_limits.get(resource_type, 0)
+        free = ~self._bitsets[resource_type] & ((1 << limit) - 1)
+        while free:
+            lowest = free & -free
+            yield lowest.bit_length() - 1
+            free ^= lowest
     
     def _find_next_available(self, resource_type: ResourceType) -> Optional[Any]:
         """Find the next available resource ID of a given type."""
-        limit = self.resource_limits.get(resource_type, 0)
-        if limit == 0:
-            return None
-        
-        # Get currently allocated IDs
-        allocated_ids = {alloc.resource_id for alloc in self.allocations[resource_type]}
-        
-        # Find first available ID
-        for i in range(limit):
-            if i not in allocated_ids:
-                return i
-        
-        return None
+        return next(self._free_ids(resource_type), None)
     
     def free_resource(self, resource_type: ResourceType, resource_id: Any) -> bool:
         """
@@ -184,19 +199,17 @@ class PeripheralResourceManager:
         Returns:
             True if freed, False if not found
         """
-        allocations = self.allocations[resource_type]
-        for i, alloc in enumerate(allocations):
-            if alloc.resource_id == resource_id:
-                allocations.pop(i)
-                return True
-        return False
+        allocation = self._index.pop((resource_type, resource_id), None)
+        if allocation is None:
+            return False
+        self.allocations[resource_type].remove(allocation)
+        if isinstance(resource_id, int) and resource_id >= 0:
+            self._bitsets[resource_type] &= ~(1 << resource_id)
+        return True
     
     def get_allocation(self, resource_type: ResourceType, resource_id: Any) -> Optional[ResourceAllocation]:
         """Get allocation details for a specific resource."""
-        for alloc in self.allocations[resource_type]:
-            if alloc.resource_id == resource_id:
-                return alloc
-        return None
+        return self._index.get((resource_type, resource_id))
     
     def get_peripheral_resources(self, peripheral_id: str) -> List[ResourceAllocation]:
         """Get all resources allocated to a specific peripheral."""
@@ -293,9 +306,10 @@ class PeripheralResourceManager:
         
         suggestions["timers_needed"] = timers_needed
         
-        # Find available timers
+        # Find available timers (distinct, lowest IDs first)
+        free_timers = self._free_ids(ResourceType.TIMER)
         for i in range(timers_needed):
-            timer_id = self._find_next_available(ResourceType.TIMER)
+            timer_id = next(free_timers, None)
             if timer_id is not None:
                 suggestions["allocations"].append({
                     "timer": timer_id,
@@ -307,6 +321,64 @@ class PeripheralResourceManager:
         
         return suggestions
     
+    def allocate_design(
+        self,
+        peripherals: List[Dict[str, Any]],
+        reserved_pins: Optional[List[Any]] = None,
+        node_limit: int = 100000,
+    ) -> AllocationResult:
+        """
+        Allocate pins, instances, timers and DMA channels for a whole design.
+
+        The design is solved as one constraint problem (see
+        PeripheralAllocator for the configuration format) around the
+        resources already allocated here; on success every assignment is
+        recorded, on failure nothing is.
+        
+        Args:
+            peripherals: Peripheral configurations
+            reserved_pins: Pins that must not be used (e.g. flash or strapping pins)
+            node_limit: Maximum search nodes
+            
+        Returns:
+            AllocationResult with assignments or the minimal conflict set
+        """
+        reserved = [(PIN, pin) for pin in reserved_pins or []]
+        kinds = [
+            (PIN, ResourceType.PIN),
+            (TIMER, ResourceType.TIMER),
+            (DMA, ResourceType.DMA_CHANNEL),
+        ] + [(INSTANCE, res_type) for res_type in set(INSTANCE_TYPES.values())]
+        for kind, res_type in kinds:
+            reserved.extend((kind, alloc.resource_id) for alloc in self.allocations[res_type])
+        
+        allocator = PeripheralAllocator(
+            timer_count=self.resource_limits.get(ResourceType.TIMER, 0),
+            dma_count=self.resource_limits.get(ResourceType.DMA_CHANNEL, 0),
+            node_limit=node_limit,
+        )
+        result = allocator.solve(peripherals, reserved=reserved)
+        if not result.success:
+            return result
+        
+        for peripheral_id, assignment in result.assignments.items():
+            peripheral_type = assignment["type"]
+            resources = [(ResourceType.PIN, info["pin"], info) for info in assignment["pins"]]
+            resources += [(ResourceType.TIMER, timer, {}) for timer in assignment["timers"]]
+            resources += [(ResourceType.DMA_CHANNEL, channel, {}) for channel in assignment["dma"]]
+            instance_type = INSTANCE_TYPES.get(str(peripheral_type).lower())
+            if assignment["instance"] is not None and instance_type is not None:
+                resources.append((instance_type, assignment["instance"], {}))
+            for resource_type, resource_id, metadata in resources:
+                self._add(ResourceAllocation(
+                    resource_type=resource_type,
+                    resource_id=resource_id,
+                    peripheral_id=peripheral_id,
+                    peripheral_type=peripheral_type,
+                    metadata=dict(metadata),
+                ))
+        return result
+    
     def generate_resource_report(self) -> str:
         """
         Generate a human-readable resource allocation report.
@@ -1,26 +1,29 @@
 """
 Multi-platform support module for Accelerapp.
 Provides platform abstraction and specialized implementations.
+
+Platform classes are imported on first access, so importing this package
+only loads the base class and the registry.
 """
 
 from .base import BasePlatform
-from .arduino import ArduinoPlatform
-from .esp32 import ESP32Platform
-from .stm32 import STM32Platform
-from .micropython import MicroPythonPlatform
-from .raspberry_pi_pico import RaspberryPiPicoPlatform
-from .raspberry_pi import RaspberryPiPlatform
-from .m5stack import M5StackPlatform
-
-# Enhanced STM32 platforms
-from .stm32.f4_series import STM32F4Platform
-from .stm32.h7_series import STM32H7Platform
-
-# Nordic nRF platforms
-from .nordic.nrf52 import NRF52Platform
-from .nordic.nrf53 import NRF53Platform
-
+from .registry import PlatformRegistry, registry
 
+_LAZY_CLASSES = {
+    "ArduinoPlatform": "arduino",
+    "ESP32Platform": "esp32",
+    "STM32Platform": "stm32",
+    "MicroPythonPlatform": "micropython",
+    "RaspberryPiPicoPlatform": "raspberry_pi_pico",
+    "RaspberryPiPlatform": "raspberry_pi",
+    "M5StackPlatform": "m5stack",
+    # Enhanced STM32 platforms
+    "STM32F4Platform": "stm32f4",
+    "STM32H7Platform": "stm32h7",
+    # Nordic nRF platforms
+    "NRF52Platform": "nrf52",
+    "NRF53Platform": "nrf53",
+}
 
 __all__ = [
     "BasePlatform",
@@ -35,17 +38,37 @@ __all__ = [
     "STM32H7Platform",
     "NRF52Platform",
     "NRF53Platform",
-
+    "PlatformRegistry",
+    "registry",
     "get_platform",
+    "register_platform",
+    "list_platforms",
 ]
 
 
+def __getattr__(name: str):
+    """Resolve platform classes lazily through the registry."""
+    if name in _LAZY_CLASSES:
+        platform_class = registry.get_class(_LAZY_CLASSES[name])
+        globals()[name] = platform_class
+        return platform_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 def get_platform(platform_name: str) -> BasePlatform:
     """
     Factory function to get platform instance by name.
 
+    The platform module is imported on first use and the instance is
+    cached; use registry.create() for an unshared instance.
+
     Args:
-        platform_name: Name of the platform (arduino, esp32, stm32, micropython, raspberry_pi_pico, raspberry_pi, m5stack)
+        platform_name: Name of the platform (arduino, esp32, stm32, micropython,
+            raspberry_pi_pico, raspberry_pi, m5stack, nrf52, ... or a plugin name)
 
     Returns:
         Platform instance
@@ -53,27 +76,26 @@ def get_platform(platform_name: str) -> BasePlatform:
     Raises:
         ValueError: If platform is not supported
     """
-    platforms = {
-        "arduino": ArduinoPlatform,
-        "esp32": ESP32Platform,
-        "stm32": STM32Platform,
-        "stm32f4": STM32F4Platform,
-        "stm32h7": STM32H7Platform,
-        "micropython": MicroPythonPlatform,
-        "raspberry_pi_pico": RaspberryPiPicoPlatform,
-        "raspberry_pi": RaspberryPiPlatform,
-        "m5stack": M5StackPlatform,
-        "m5stack_core": M5StackPlatform,
-        "m5stack_core2": M5StackPlatform,
-        "nrf52": NRF52Platform,
-        "nrf52840": NRF52Platform,
-        "nrf53": NRF53Platform,
-        "nrf5340": NRF53Platform,
-
-    }
-
-    platform_class = platforms.get(platform_name.lower())
-    if not platform_class:
-        raise ValueError(f"Unsupported platform: {platform_name}")
-
-    return platform_class()
+    return registry.get(platform_name)
+
+
+def register_platform(name: str, target, replace: bool = True):
+    """
+    Register a platform class or "module:attribute" reference.
+
+    Args:
+        name: Platform name
+        target: Platform class or "module:attribute" reference
+        replace: Replace an existing registration
+    """
+    registry.register(name, target, replace=replace)
+
+
+def list_platforms() -> list:
+    """
+    Get all available platform names, including entry-point plugins.
+
+    Returns:
+        Sorted list of platform names
+    """
+    return registry.names()
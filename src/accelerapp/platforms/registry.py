@@ -0,0 +1,229 @@
+"""
+Lazy platform registry for Accelerapp.
+
+Platforms are registered as "module:attribute" references and imported the
+first time they are requested, so generating for one board never imports
+the others. Third-party platforms are discovered through the
+"accelerapp.platforms" entry-point group, whose metadata is only read when
+a name is not found among the registered platforms.
+"""
+
+import importlib
+import threading
+from typing import Dict, List, Optional, Type, Union
+
+from .base import BasePlatform
+
+ENTRY_POINT_GROUP = "accelerapp.platforms"
+
+BUILTIN_PLATFORMS: Dict[str, str] = {
+    "arduino": "accelerapp.platforms.arduino:ArduinoPlatform",
+    "esp32": "accelerapp.platforms.esp32:ESP32Platform",
+    "stm32": "accelerapp.platforms.stm32:STM32Platform",
+    "stm32f4": "accelerapp.platforms.stm32.f4_series:STM32F4Platform",
+    "stm32h7": "accelerapp.platforms.stm32.h7_series:STM32H7Platform",
+    "micropython": "accelerapp.platforms.micropython:MicroPythonPlatform",
+    "raspberry_pi_pico": "accelerapp.platforms.raspberry_pi_pico:RaspberryPiPicoPlatform",
+    "raspberry_pi": "accelerapp.platforms.raspberry_pi:RaspberryPiPlatform",
+    "m5stack": "accelerapp.platforms.m5stack:M5StackPlatform",
+    "m5stack_core": "accelerapp.platforms.m5stack:M5StackPlatform",
+    "m5stack_core2": "accelerapp.platforms.m5stack:M5StackPlatform",
+    "nrf52": "accelerapp.platforms.nordic.nrf52:NRF52Platform",
+    "nrf52840": "accelerapp.platforms.nordic.nrf52:NRF52Platform",
+    "nrf53": "accelerapp.platforms.nordic.nrf53:NRF53Platform",
+    "nrf5340": "accelerapp.platforms.nordic.nrf53:NRF53Platform",
+}
+
+PlatformTarget = Union[str, Type[BasePlatform]]
+
+
+def _load_reference(reference: str) -> Type[BasePlatform]:
+    """Import a "module:attribute" reference."""
+    module_name, _, attribute = reference.partition(":")
+    target = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class PlatformRegistry:
+    """
+    Name-to-platform registry with lazy imports and cached instances.
+    """
+
+    def __init__(
+        self,
+        platforms: Optional[Dict[str, PlatformTarget]] = None,
+        entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+    ):
+        """
+        Initialize platform registry.
+
+        Args:
+            platforms: Initial name to class or "module:attribute" mapping
+            entry_point_group: Entry-point group for plugins (None disables)
+        """
+        self.entry_point_group = entry_point_group
+        self._targets: Dict[str, PlatformTarget] = {}
+        self._classes: Dict[str, Type[BasePlatform]] = {}
+        self._instances: Dict[str, BasePlatform] = {}
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+        for name, target in (platforms or {}).items():
+            self.register(name, target)
+
+    def register(self, name: str, target: PlatformTarget, replace: bool = True):
+        """
+        Register a platform.
+
+        Args:
+            name: Platform name (case-insensitive)
+            target: Platform class or "module:attribute" reference
+            replace: Replace an existing registration
+
+        Raises:
+            ValueError: If name is taken and replace is False
+        """
+        key = name.lower()
+        with self._lock:
+            if key in self._targets and not replace:
+                raise ValueError(f"Platform already registered: {name}")
+            self._targets[key] = target
+            self._classes.pop(key, None)
+            self._instances.pop(key, None)
+
+    def unregister(self, name: str) -> bool:
+        """
+        Remove a platform registration.
+
+        Args:
+            name: Platform name
+
+        Returns:
+            True if the platform was registered
+        """
+        key = name.lower()
+        with self._lock:
+            self._classes.pop(key, None)
+            self._instances.pop(key, None)
+            return self._targets.pop(key, None) is not None
+
+    def names(self) -> List[str]:
+        """
+        Get all platform names, including entry-point plugins.
+
+        Returns:
+            Sorted list of platform names
+        """
+        self._load_entry_points()
+        return sorted(self._targets)
+
+    def is_loaded(self, name: str) -> bool:
+        """
+        Check whether a platform's class has been imported.
+
+        Args:
+            name: Platform name
+
+        Returns:
+            True if the class is resolved
+        """
+        return name.lower() in self._classes
+
+    def get_class(self, name: str) -> Type[BasePlatform]:
+        """
+        Resolve a platform class, importing its module on first use.
+
+        Args:
+            name: Platform name
+
+        Returns:
+            Platform class
+
+        Raises:
+            ValueError: If the platform is not supported
+        """
+        key = name.lower()
+        platform_class = self._classes.get(key)
+        if platform_class is not None:
+            return platform_class
+
+        with self._lock:
+            if key not in self._targets:
+                self._load_entry_points()
+            target = self._targets.get(key)
+            if target is None:
+                raise ValueError(f"Unsupported platform: {name}")
+
+            platform_class = _load_reference(target) if isinstance(target, str) else target
+            self._classes[key] = platform_class
+            return platform_class
+
+    def get(self, name: str) -> BasePlatform:
+        """
+        Get the shared platform instance, creating it on first use.
+
+        Args:
+            name: Platform name
+
+        Returns:
+            Platform instance
+
+        Raises:
+            ValueError: If the platform is not supported
+        """
+        key = name.lower()
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = self._instances[key] = self.get_class(key)()
+            return instance
+
+    def create(self, name: str) -> BasePlatform:
+        """
+        Create a new, unshared platform instance.
+
+        Args:
+            name: Platform name
+
+        Returns:
+            Platform instance
+
+        Raises:
+            ValueError: If the platform is not supported
+        """
+        return self.get_class(name)()
+
+    def clear_cache(self):
+        """Drop cached instances and resolved classes."""
+        with self._lock:
+            self._classes.clear()
+            self._instances.clear()
+
+    def _load_entry_points(self):
+        """Register plugin platforms from entry-point metadata (once)."""
+        if self._entry_points_loaded:
+            return
+
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            from importlib.metadata import entry_points
+
+            discovered = entry_points()
+            if hasattr(discovered, "select"):
+                group = discovered.select(group=self.entry_point_group)
+            else:
+                group = discovered.get(self.entry_point_group, [])
+
+            for entry_point in group:
+                # Built-in and explicit registrations win over plugins
+                self._targets.setdefault(entry_point.name.lower(), entry_point.value)
+
+
+registry = PlatformRegistry(BUILTIN_PLATFORMS)
@@ -3,7 +3,8 @@ Production infrastructure module for Accelerapp.
 Provides benchmarking, security, deployment, support, and optimization systems.
 """
 
-from .benchmarking.performance_tests import PerformanceBenchmark
+from .benchmarking.performance_tests import PerformanceBenchmark, BenchmarkResult
+from .benchmarking.suite import create_default_suite
 from .security.vulnerability_scan import VulnerabilityScanner
 from .deployment.automation import DeploymentAutomation
 from .support.troubleshooting import TroubleshootingGuide
@@ -12,6 +13,8 @@ from .optimization.performance_profiler import PerformanceProfiler, ProfileResul
 
 __all__ = [
     "PerformanceBenchmark",
+    "BenchmarkResult",
+    "create_default_suite",
     "VulnerabilityScanner",
     "DeploymentAutomation",
     "TroubleshootingGuide",
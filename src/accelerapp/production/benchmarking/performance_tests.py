@@ -2,15 +2,29 @@
 Performance benchmarking system.
 """
 
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Union, Iterator, ContextManager
+import gc
+import json
+import math
+import statistics
 import time
-from dataclasses import dataclass, field
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from functools import partial
+from itertools import repeat
+from pathlib import Path
 
 
 @dataclass
 class BenchmarkResult:
-    """Represents a benchmark test result."""
+    """
+    Represents a benchmark test result.
+
+    Timing statistics are per iteration, computed over timed rounds
+    (each round runs the benchmark a calibrated number of times).
+    """
 
     name: str
     duration_ms: float
@@ -19,85 +33,258 @@ class BenchmarkResult:
     success: bool
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
+    iterations: int = 0
+    rounds: int = 0
+    median_ms: float = 0.0
+    mean_ms: float = 0.0
+    stdev_ms: float = 0.0
+    min_ms: float = 0.0
+    q1_ms: float = 0.0
+    q3_ms: float = 0.0
+    iqr_ms: float = 0.0
+    p99_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        """Create from dictionary."""
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+@dataclass
+class _BenchmarkSpec:
+    """Registered benchmark."""
+
+    fixture: Callable[[], ContextManager[Callable]]
+    operations_per_call: int = 1
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Percentile of sorted data with linear interpolation."""
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * fraction
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
 
 
 class PerformanceBenchmark:
     """
     Performance benchmarking and testing system.
+
+    Each benchmark is warmed up and auto-calibrated so a timed round lasts
+    at least min_round_time, then timed over many rounds with the garbage
+    collector paused. Results report the per-iteration distribution
+    (median, IQR, p99) and the tracemalloc peak of a single call.
+    Baselines can be saved to JSON and later runs gated against them.
     """
 
-    def __init__(self):
-        """Initialize performance benchmark."""
+    def __init__(
+        self,
+        min_round_time: float = 0.005,
+        max_time: float = 0.5,
+        min_rounds: int = 5,
+        max_rounds: int = 200,
+        track_memory: bool = True,
+    ):
+        """
+        Initialize performance benchmark.
+
+        Args:
+            min_round_time: Minimum duration of one timed round in seconds
+            max_time: Approximate timing budget per benchmark in seconds
+            min_rounds: Minimum number of timed rounds
+            max_rounds: Maximum number of timed rounds
+            track_memory: Measure tracemalloc peak per call
+        """
+        self.min_round_time = min_round_time
+        self.max_time = max_time
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.track_memory = track_memory
         self.results: List[BenchmarkResult] = []
-        self.benchmarks: Dict[str, Callable] = {}
+        self.benchmarks: Dict[str, _BenchmarkSpec] = {}
 
-    def register_benchmark(self, name: str, func: Callable):
+    def register_benchmark(self, name: str, func: Callable, operations_per_call: int = 1):
         """
         Register a benchmark function.
 
         Args:
             name: Benchmark name
             func: Benchmark function
+            operations_per_call: Operations performed by one call (for throughput)
+        """
+
+        @contextmanager
+        def fixture() -> Iterator[Callable]:
+            yield func
+
+        self.benchmarks[name] = _BenchmarkSpec(fixture, operations_per_call)
+
+    def register_fixture(
+        self,
+        name: str,
+        fixture: Callable[[], ContextManager[Callable]],
+        operations_per_call: int = 1,
+    ):
+        """
+        Register a benchmark with untimed setup and teardown.
+
+        Args:
+            name: Benchmark name
+            fixture: Context manager factory yielding the function to time
+            operations_per_call: Operations performed by one call (for throughput)
         """
-        self.benchmarks[name] = func
+        self.benchmarks[name] = _BenchmarkSpec(fixture, operations_per_call)
 
-    def run_benchmark(self, name: str, iterations: int = 1000, **kwargs) -> BenchmarkResult:
+    def run_benchmark(
+        self, name: str, iterations: Optional[int] = None, **kwargs
+    ) -> BenchmarkResult:
         """
         Run a benchmark test.
 
         Args:
             name: Benchmark name
-            iterations: Number of iterations
+            iterations: Total timed iterations (auto-calibrated if None)
             **kwargs: Additional arguments for benchmark
 
         Returns:
-            BenchmarkResult
+            BenchmarkResult (success is False with error set if the
+            benchmark raised during setup, warm-up or timing)
         """
         if name not in self.benchmarks:
             raise ValueError(f"Benchmark not found: {name}")
 
-        func = self.benchmarks[name]
-
-        # Warm up
-        for _ in range(10):
-            try:
-                func(**kwargs)
-            except Exception:
-                pass
-
-        # Run benchmark
-        start_time = time.perf_counter()
-        success = True
+        spec = self.benchmarks[name]
 
         try:
-            for _ in range(iterations):
-                func(**kwargs)
+            with spec.fixture() as func:
+                call = partial(func, **kwargs) if kwargs else func
+                result = self._measure(name, call, iterations, spec.operations_per_call)
         except Exception as e:
-            success = False
-            print(f"Benchmark failed: {e}")
+            result = BenchmarkResult(
+                name=name,
+                duration_ms=0.0,
+                operations_per_second=0.0,
+                memory_used_mb=0.0,
+                success=False,
+                error=f"{type(e).__name__}: {e}",
+            )
 
-        end_time = time.perf_counter()
-        duration_ms = (end_time - start_time) * 1000
-        ops_per_second = iterations / (duration_ms / 1000) if duration_ms > 0 else 0
+        self.results.append(result)
+        return result
 
-        result = BenchmarkResult(
+    def _measure(
+        self, name: str, call: Callable, iterations: Optional[int], ops_per_call: int
+    ) -> BenchmarkResult:
+        """Calibrate, time and memory-profile one benchmark."""
+        number, estimate = self._calibrate(call)
+
+        if iterations:
+            number = max(1, min(number, iterations // self.min_rounds))
+            rounds = max(1, iterations // number)
+        else:
+            budget = int(self.max_time / max(number * estimate, 1e-9))
+            rounds = max(self.min_rounds, min(self.max_rounds, budget))
+
+        samples = self._time_rounds(call, number, rounds)
+        peak_bytes = self._measure_memory(call) if self.track_memory else 0
+
+        ordered = sorted(samples)
+        median = statistics.median(ordered)
+        q1 = _percentile(ordered, 0.25)
+        q3 = _percentile(ordered, 0.75)
+        ms = 1000.0
+
+        return BenchmarkResult(
             name=name,
-            duration_ms=duration_ms,
-            operations_per_second=ops_per_second,
-            memory_used_mb=0.0,  # Simplified for now
-            success=success,
-            metadata={"iterations": iterations},
+            duration_ms=sum(samples) * number * ms,
+            operations_per_second=ops_per_call / median if median > 0 else 0.0,
+            memory_used_mb=peak_bytes / (1024 * 1024),
+            success=True,
+            metadata={
+                "number": number,
+                "operations_per_call": ops_per_call,
+                "peak_memory_bytes": peak_bytes,
+            },
+            iterations=number * rounds,
+            rounds=rounds,
+            median_ms=median * ms,
+            mean_ms=statistics.fmean(ordered) * ms,
+            stdev_ms=statistics.stdev(ordered) * ms if len(ordered) > 1 else 0.0,
+            min_ms=ordered[0] * ms,
+            q1_ms=q1 * ms,
+            q3_ms=q3 * ms,
+            iqr_ms=(q3 - q1) * ms,
+            p99_ms=_percentile(ordered, 0.99) * ms,
         )
 
-        self.results.append(result)
-        return result
+    def _calibrate(self, call: Callable) -> tuple:
+        """
+        Find calls per round so a round lasts at least min_round_time.
+
+        Doubles as warm-up. Uses the 1, 2, 5, 10, ... sequence of timeit.
 
-    def run_all_benchmarks(self, iterations: int = 1000) -> List[BenchmarkResult]:
+        Returns:
+            (calls per round, estimated seconds per call)
+        """
+        call()  # first call pays import and cache costs
+        number = 1
+        while True:
+            for factor in (1, 2, 5):
+                count = number * factor
+                elapsed = self._time_rounds(call, count, 1)[0] * count
+                if elapsed >= self.min_round_time or count >= 10_000_000:
+                    return count, elapsed / count
+            number *= 10
+
+    @staticmethod
+    def _time_rounds(call: Callable, number: int, rounds: int) -> List[float]:
+        """Time rounds of number calls; returns seconds per call for each round."""
+        timer = time.perf_counter
+        samples = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                start = timer()
+                for _ in repeat(None, number):
+                    call()
+                samples.append((timer() - start) / number)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return samples
+
+    @staticmethod
+    def _measure_memory(call: Callable) -> int:
+        """Peak bytes allocated by one call, measured with tracemalloc."""
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+        return max(0, peak - baseline)
+
+    def run_all_benchmarks(self, iterations: Optional[int] = None) -> List[BenchmarkResult]:
         """
         Run all registered benchmarks.
 
         Args:
-            iterations: Number of iterations per benchmark
+            iterations: Total iterations per benchmark (auto-calibrated if None)
 
         Returns:
             List of BenchmarkResult
@@ -146,50 +333,145 @@ class PerformanceBenchmark:
             "avg_operations_per_second": avg_ops_per_sec,
         }
 
-    def compare_results(self, baseline_name: str, current_name: str) -> Dict[str, Any]:
+    def compare_results(
+        self, baseline_name: str, current_name: str, threshold: float = 0.05
+    ) -> Dict[str, Any]:
         """
         Compare two benchmark results.
 
         Args:
             baseline_name: Baseline benchmark name
             current_name: Current benchmark name
+            threshold: Relative median slowdown treated as a regression
 
         Returns:
             Comparison dictionary
         """
-        baseline_results = [r for r in self.results if r.name == baseline_name]
-        current_results = [r for r in self.results if r.name == current_name]
+        baseline_results = [r for r in self.results if r.name == baseline_name and r.success]
+        current_results = [r for r in self.results if r.name == current_name and r.success]
 
         if not baseline_results or not current_results:
             return {"error": "Insufficient data for comparison"}
 
-        baseline = baseline_results[-1]
-        current = current_results[-1]
+        return self._compare(baseline_results[-1], current_results[-1], threshold)
+
+    @staticmethod
+    def _compare(
+        baseline: BenchmarkResult, current: BenchmarkResult, threshold: float
+    ) -> Dict[str, Any]:
+        """
+        Compare per-iteration distributions of two results.
+
+        A change is significant only when the interquartile ranges do not
+        overlap, so noise within the usual spread is never flagged.
+        """
+        if baseline.median_ms <= 0 or baseline.operations_per_second <= 0:
+            return {"error": "Baseline has no timing data"}
 
-        duration_change = (current.duration_ms - baseline.duration_ms) / baseline.duration_ms * 100
+        median_change = (current.median_ms - baseline.median_ms) / baseline.median_ms * 100
         ops_change = (
             (current.operations_per_second - baseline.operations_per_second)
             / baseline.operations_per_second
             * 100
         )
+        slower = current.q1_ms > baseline.q3_ms
+        faster = current.q3_ms < baseline.q1_ms
 
         return {
             "baseline": baseline.name,
             "current": current.name,
-            "duration_change_percent": duration_change,
+            "duration_change_percent": median_change,
+            "median_change_percent": median_change,
+            "p99_change_percent": (
+                (current.p99_ms - baseline.p99_ms) / baseline.p99_ms * 100
+                if baseline.p99_ms > 0
+                else 0.0
+            ),
+            "memory_change_mb": current.memory_used_mb - baseline.memory_used_mb,
             "operations_change_percent": ops_change,
+            "significant": slower or faster,
             "improved": current.operations_per_second > baseline.operations_per_second,
+            "regression": slower and median_change > threshold * 100,
         }
 
+    def save_baseline(self, filepath: Union[str, Path], names: Optional[List[str]] = None):
+        """
+        Save the latest successful result of each benchmark as a JSON baseline.
 
-# Default benchmarks
-def _default_code_generation_benchmark():
-    """Benchmark code generation."""
-    # Placeholder for actual code generation
-    time.sleep(0.001)
+        Args:
+            filepath: Output file path
+            names: Benchmarks to include (all if None)
+        """
+        latest: Dict[str, BenchmarkResult] = {}
+        for result in self.results:
+            if result.success and (names is None or result.name in names):
+                latest[result.name] = result
+
+        data = {
+            "created": datetime.utcnow().isoformat(),
+            "results": {name: result.to_dict() for name, result in latest.items()},
+        }
+        Path(filepath).write_text(json.dumps(data, indent=2))
 
+    @staticmethod
+    def load_baseline(filepath: Union[str, Path]) -> Dict[str, BenchmarkResult]:
+        """
+        Load a JSON baseline.
+
+        Args:
+            filepath: Baseline file path
 
-def _default_template_processing_benchmark():
-    """Benchmark template processing."""
-    # Placeholder for actual template processing
-    time.sleep(0.0005)
+        Returns:
+            Mapping of benchmark name to BenchmarkResult
+        """
+        data = json.loads(Path(filepath).read_text())
+        return {
+            name: BenchmarkResult.from_dict(result)
+            for name, result in data.get("results", {}).items()
+        }
+
+    def check_regressions(
+        self,
+        baseline: Union[str, Path, Dict[str, BenchmarkResult]],
+        threshold: float = 0.05,
+    ) -> Dict[str, Any]:
+        """
+        Gate the latest results against a baseline.
+
+        Args:
+            baseline: Baseline file path or loaded baseline
+            threshold: Relative median slowdown treated as a regression
+
+        Returns:
+            Dictionary with passed flag, regressed/failed/missing benchmark
+            names and per-benchmark comparisons
+        """
+        if not isinstance(baseline, dict):
+            baseline = self.load_baseline(baseline)
+
+        latest: Dict[str, BenchmarkResult] = {}
+        for result in self.results:
+            latest[result.name] = result
+
+        comparisons = {}
+        regressions = []
+        failed = []
+        for name, reference in baseline.items():
+            current = latest.get(name)
+            if current is None:
+                continue
+            if not current.success:
+                failed.append(name)
+                continue
+            comparison = self._compare(reference, current, threshold)
+            comparisons[name] = comparison
+            if comparison.get("regression"):
+                regressions.append(name)
+
+        return {
+            "passed": not regressions and not failed,
+            "regressions": regressions,
+            "failed": failed,
+            "missing": [name for name in baseline if name not in latest],
+            "comparisons": comparisons,
+        }
@@ -0,0 +1,258 @@
+"""
+Default benchmark suite covering Accelerapp's hot paths.
+
+Each fixture performs its setup outside the timed region and yields the
+function to time. Modules are imported inside the fixtures, so a missing
+optional dependency only fails its own benchmark.
+"""
+
+import asyncio
+import random
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+from .performance_tests import PerformanceBenchmark
+
+EVENT_BURST_SIZE = 100
+MESH_GRID_SIZE = 8
+CRYPTO_BATCH_SIZE = 100
+
+
+def _hardware_spec() -> Dict[str, Any]:
+    """Representative hardware specification for generator benchmarks."""
+    return {
+        "device_name": "BenchmarkDevice",
+        "platform": "arduino",
+        "software_language": "python",
+        "ui_framework": "react",
+        "peripherals": [
+            {"type": "led", "pin": 13, "description": "Status LED"},
+            {"type": "button", "pin": 2, "description": "User button"},
+            {"type": "sensor", "pin": 34, "description": "Light sensor"},
+            {"type": "motor", "pin": 9, "description": "Drive motor"},
+        ],
+    }
+
+
+@contextmanager
+def _generator_fixture(module: str, class_name: str) -> Iterator[Callable]:
+    """Time a code generator writing into a scratch directory."""
+    import importlib
+
+    generator_class = getattr(importlib.import_module(module), class_name)
+    generator = generator_class(_hardware_spec())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        yield lambda: generator.generate(output_dir)
+
+
+def firmware_generation() -> Any:
+    """Firmware generation for a four-peripheral device."""
+    return _generator_fixture("accelerapp.firmware.generator", "FirmwareGenerator")
+
+
+def software_generation() -> Any:
+    """Python SDK generation for a four-peripheral device."""
+    return _generator_fixture("accelerapp.software.generator", "SoftwareGenerator")
+
+
+def ui_generation() -> Any:
+    """React UI generation for a four-peripheral device."""
+    return _generator_fixture("accelerapp.ui.generator", "UIGenerator")
+
+
+@contextmanager
+def template_rendering() -> Iterator[Callable]:
+    """Render the packaged Arduino main template."""
+    from accelerapp.templates.manager import TemplateManager
+
+    manager = TemplateManager()
+    context = {**manager.get_template_context_defaults(), **_hardware_spec()}
+    yield lambda: manager.render_template("arduino/main.j2", context)
+
+
+@contextmanager
+def knowledge_search() -> Iterator[Callable]:
+    """Similarity search over a 200-entry knowledge base."""
+    from accelerapp.knowledge.knowledge_base import KnowledgeBase
+
+    topics = ["gpio", "pwm", "i2c", "spi", "uart", "adc", "timer", "interrupt", "dma", "rtos"]
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        kb = KnowledgeBase(storage_dir=Path(tmpdir))
+        for i in range(200):
+            words = " ".join(rng.choice(topics) for _ in range(30))
+            kb.add_entry(f"entry-{i}", f"{topics[i % 10]} {words}")
+        yield lambda: kb.search("configure spi dma transfer with interrupt", limit=10)
+
+
+@contextmanager
+def event_bus_throughput() -> Iterator[Callable]:
+    """Publish and dispatch a burst of events through the EventBus."""
+    from accelerapp.core.events.bus import Event, EventBus
+
+    loop = asyncio.new_event_loop()
+    state = {"received": 0, "done": None}
+
+    def handler(event: Event) -> None:
+        state["received"] += 1
+        if state["received"] == EVENT_BURST_SIZE:
+            state["done"].set()
+
+    async def start() -> EventBus:
+        bus = EventBus()
+        bus.subscribe("benchmark", handler)
+        await bus.start_processing()
+        return bus
+
+    async def burst() -> None:
+        state["received"] = 0
+        state["done"] = asyncio.Event()
+        for i in range(EVENT_BURST_SIZE):
+            await bus.publish(Event("benchmark", {"sequence": i}))
+        await state["done"].wait()
+
+    bus = loop.run_until_complete(start())
+    try:
+        yield lambda: loop.run_until_complete(burst())
+    finally:
+        loop.run_until_complete(bus.stop_processing())
+        loop.close()
+
+
+@contextmanager
+def mesh_routing() -> Iterator[Callable]:
+    """Route between random node pairs on an 8x8 grid mesh."""
+    from accelerapp.meshtastic.network_manager import MeshNetworkManager, MeshNode
+
+    manager = MeshNetworkManager()
+    size = MESH_GRID_SIZE
+    for i in range(size * size):
+        manager.topology.add_node(MeshNode(f"node-{i}", f"N{i}", f"Node {i}", "tbeam", "2.3"))
+    for row in range(size):
+        for col in range(size):
+            index = row * size + col
+            if col + 1 < size:
+                manager.topology.add_edge(f"node-{index}", f"node-{index + 1}")
+            if row + 1 < size:
+                manager.topology.add_edge(f"node-{index}", f"node-{index + size}")
+
+    rng = random.Random(7)
+    pairs = [
+        (f"node-{rng.randrange(size * size)}", f"node-{rng.randrange(size * size)}")
+        for _ in range(64)
+    ]
+    state = {"next": 0}
+
+    def route() -> None:
+        source, dest = pairs[state["next"] % len(pairs)]
+        state["next"] += 1
+        manager.find_route(source, dest)
+
+    yield route
+
+
+@contextmanager
+def pq_keypair_generation() -> Iterator[Callable]:
+    """Generate a Kyber-768-sized lattice key pair."""
+    from accelerapp.security.post_quantum_crypto import PostQuantumCrypto
+
+    crypto = PostQuantumCrypto()
+    yield lambda: crypto.generate_lattice_keypair("benchmark")
+
+
+@contextmanager
+def pq_signing() -> Iterator[Callable]:
+    """Sign a 256-byte message."""
+    from accelerapp.security.post_quantum_crypto import PostQuantumCrypto
+
+    crypto = PostQuantumCrypto()
+    crypto.generate_lattice_keypair("benchmark")
+    message = bytes(range(256))
+    yield lambda: crypto.sign_message("benchmark", message)
+
+
+@contextmanager
+def pq_batch_verification() -> Iterator[Callable]:
+    """Verify a batch of signatures from ten local keys."""
+    from accelerapp.security.post_quantum_crypto import PostQuantumCrypto
+
+    crypto = PostQuantumCrypto()
+    keys = [crypto.generate_lattice_keypair(f"key-{i}").public_key for i in range(10)]
+    items = []
+    for i in range(CRYPTO_BATCH_SIZE):
+        message = f"telemetry-{i}".encode()
+        items.append((keys[i % 10], message, crypto.sign_message(f"key-{i % 10}", message)))
+    yield lambda: crypto.verify_signatures(items)
+
+
+@contextmanager
+def hybrid_key_exchange() -> Iterator[Callable]:
+    """Full hybrid classical/post-quantum key exchange."""
+    from accelerapp.security.post_quantum_crypto import PostQuantumCrypto
+
+    crypto = PostQuantumCrypto()
+    classical_key = crypto.get_quantum_random(32)
+    pq_key = crypto.generate_lattice_keypair("peer").public_key
+    yield lambda: crypto.hybrid_key_exchange(classical_key, pq_key)
+
+
+@contextmanager
+def secure_channel_reconnect() -> Iterator[Callable]:
+    """Re-establish channels to a fleet of peers with cached session keys."""
+    from accelerapp.security.post_quantum_crypto import HybridCryptoManager
+
+    manager = HybridCryptoManager()
+    manager.create_hybrid_identity("gateway")
+    remotes = []
+    for i in range(CRYPTO_BATCH_SIZE):
+        manager.create_hybrid_identity(f"device-{i}")
+        remotes.append(manager.get_public_keys(f"device-{i}"))
+    manager.establish_secure_channels("gateway", remotes)
+    yield lambda: manager.establish_secure_channels("gateway", remotes)
+
+
+DEFAULT_BENCHMARKS = {
+    "firmware_generation": (firmware_generation, 1),
+    "software_generation": (software_generation, 1),
+    "ui_generation": (ui_generation, 1),
+    "template_rendering": (template_rendering, 1),
+    "knowledge_search": (knowledge_search, 1),
+    "event_bus_throughput": (event_bus_throughput, EVENT_BURST_SIZE),
+    "mesh_routing": (mesh_routing, 1),
+    "pq_keypair_generation": (pq_keypair_generation, 1),
+    "pq_signing": (pq_signing, 1),
+    "pq_batch_verification": (pq_batch_verification, CRYPTO_BATCH_SIZE),
+    "hybrid_key_exchange": (hybrid_key_exchange, 1),
+    "secure_channel_reconnect": (secure_channel_reconnect, CRYPTO_BATCH_SIZE),
+}
+
+
+def register_default_benchmarks(benchmark: PerformanceBenchmark) -> PerformanceBenchmark:
+    """
+    Register the hot-path benchmarks on a PerformanceBenchmark.
+
+    Args:
+        benchmark: Benchmark instance
+
+    Returns:
+        The same benchmark instance
+    """
+    for name, (fixture, operations) in DEFAULT_BENCHMARKS.items():
+        benchmark.register_fixture(name, fixture, operations_per_call=operations)
+    return benchmark
+
+
+def create_default_suite(**options: Any) -> PerformanceBenchmark:
+    """
+    Create a PerformanceBenchmark with the default hot-path suite.
+
+    Args:
+        **options: PerformanceBenchmark arguments
+
+    Returns:
+        Configured PerformanceBenchmark
+    """
+    return register_default_benchmarks(PerformanceBenchmark(**options))
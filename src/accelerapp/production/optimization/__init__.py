@@ -4,6 +4,7 @@ Production optimization module for performance and cost optimization.
 
 from .cost_monitor import CostMonitor, ResourceUsage, CostReport
 from .performance_profiler import PerformanceProfiler, ProfileResult
+from .sampling_profiler import SampleProfile, SamplingMode, StackSampler
 
 __all__ = [
     "CostMonitor",
@@ -11,4 +12,7 @@ __all__ = [
     "CostReport",
     "PerformanceProfiler",
     "ProfileResult",
+    "SampleProfile",
+    "SamplingMode",
+    "StackSampler",
 ]
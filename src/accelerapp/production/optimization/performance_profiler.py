@@ -2,13 +2,17 @@
 Performance profiling and optimization system.
 """
 
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Union
+from pathlib import Path
+import threading
 import time
 import tracemalloc
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from .sampling_profiler import SampleProfile, SamplingMode, StackSampler
+
 
 class ProfileType(str, Enum):
     """Types of profiling."""
@@ -33,6 +37,7 @@ class ProfileResult:
     recommendations: List[str]
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
+    samples: Optional[SampleProfile] = None
 
 
 class PerformanceProfiler:
@@ -40,8 +45,21 @@ class PerformanceProfiler:
     Profile and optimize application performance.
     """
     
-    def __init__(self):
-        """Initialize performance profiler."""
+    def __init__(
+        self,
+        sample_interval: float = 0.001,
+        sampling_mode: str = SamplingMode.THREAD,
+        sample_stacks: bool = False,
+    ):
+        """
+        Initialize performance profiler.
+        
+        Args:
+            sample_interval: Seconds between stack samples
+            sampling_mode: SamplingMode.THREAD or SamplingMode.SIGNAL
+            sample_stacks: Sample call stacks during CPU/full profiles; off by
+                default because each profiled call then starts a sampler
+        """
         self.profiles: List[ProfileResult] = []
         self.baseline_profiles: Dict[str, ProfileResult] = {}
         
@@ -49,6 +67,16 @@ class PerformanceProfiler:
         self.slow_threshold_ms = 100  # Functions slower than 100ms
         self.memory_threshold_mb = 50  # Memory usage above 50MB
         
+        # Stack sampling
+        self.sample_interval = sample_interval
+        self.sampling_mode = sampling_mode
+        self.sample_stacks = sample_stacks
+        self.hotspot_min_percent = 10.0  # Self-time share reported as a hotspot
+        self.hotspot_min_samples = 5  # Samples needed before hotspot shifts count
+        self._continuous_sampler: Optional[StackSampler] = None
+        self.sampling_profile: Optional[SampleProfile] = None  # latest continuous window
+        self.sampling_baseline: Optional[SampleProfile] = None
+        
     def profile_function(
         self,
         func: Callable,
@@ -76,7 +104,18 @@ class PerformanceProfiler:
         if profile_type in (ProfileType.MEMORY, ProfileType.FULL):
             tracemalloc.start()
         
+        # Sample this thread's stacks below func when enabled
+        sampler = None
+        if self.sample_stacks and profile_type in (ProfileType.CPU, ProfileType.FULL):
+            sampler = StackSampler(
+                interval=self.sample_interval,
+                mode=self.sampling_mode,
+                thread_ids=[threading.get_ident()],
+                root_code=getattr(func, "__code__", None),
+            ).start()
+        
         # Run function and measure time
+        start_cpu = time.thread_time()
         start_time = time.perf_counter()
         
         for _ in range(iterations):
@@ -86,6 +125,8 @@ class PerformanceProfiler:
                 print(f"Function execution failed: {e}")
         
         end_time = time.perf_counter()
+        cpu_time = time.thread_time() - start_cpu
+        samples = sampler.stop() if sampler else None
         
         # Calculate execution time
         execution_time_ms = (end_time - start_time) * 1000 / iterations
@@ -100,15 +141,18 @@ class PerformanceProfiler:
             tracemalloc.stop()
         
         # Identify hotspots
-        hotspots = self._identify_hotspots(function_name, execution_time_ms, memory_used_mb)
+        hotspots = self._identify_hotspots(
+            function_name, execution_time_ms, memory_used_mb, samples
+        )
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
             execution_time_ms, memory_used_mb, hotspots
         )
         
-        # Estimate CPU usage (simplified)
-        cpu_percent = min(100.0, (execution_time_ms / 1000) * 100)
+        # CPU time of the calling thread relative to wall time
+        wall_time = end_time - start_time
+        cpu_percent = min(100.0, cpu_time / wall_time * 100) if wall_time > 0 else 0.0
         
         result = ProfileResult(
             function_name=function_name,
@@ -120,7 +164,12 @@ class PerformanceProfiler:
             cpu_percent=cpu_percent,
             hotspots=hotspots,
             recommendations=recommendations,
-            metadata={"args_count": len(args), "kwargs_count": len(kwargs)}
+            metadata={
+                "args_count": len(args),
+                "kwargs_count": len(kwargs),
+                "sample_count": samples.sample_count if samples else 0,
+            },
+            samples=samples,
         )
         
         self.profiles.append(result)
@@ -130,7 +179,8 @@ class PerformanceProfiler:
         self,
         function_name: str,
         execution_time_ms: float,
-        memory_mb: float
+        memory_mb: float,
+        samples: Optional[SampleProfile] = None
     ) -> List[Dict[str, Any]]:
         """
         Identify performance hotspots.
@@ -139,12 +189,28 @@ class PerformanceProfiler:
             function_name: Name of profiled function
             execution_time_ms: Execution time in milliseconds
             memory_mb: Memory usage in MB
+            samples: Stack samples taken while the function ran
             
         Returns:
             List of hotspots
         """
         hotspots = []
         
+        # Functions with the largest share of sampled self time
+        if samples and samples.sample_count:
+            for stats in samples.top_functions(limit=5):
+                if stats["self_percent"] < self.hotspot_min_percent:
+                    break
+                hotspots.append({
+                    "type": "cpu_hotspot",
+                    "function": stats["function"],
+                    "self_percent": stats["self_percent"],
+                    "total_percent": stats["total_percent"],
+                    "self_ms": stats["self_ms"],
+                    "samples": stats["self_samples"],
+                    "severity": "medium" if stats["self_percent"] >= 50 else "low"
+                })
+        
         # Check for slow execution
         if execution_time_ms > self.slow_threshold_ms:
             hotspots.append({
@@ -214,6 +280,11 @@ class PerformanceProfiler:
         
         # Hotspot-based recommendations
         for hotspot in hotspots:
+            if hotspot["type"] == "cpu_hotspot" and execution_time_ms > self.slow_threshold_ms:
+                recommendations.append(
+                    f"{hotspot['function']} accounts for {hotspot['self_percent']:.0f}% "
+                    "of sampled time. Focus optimization there first."
+                )
             if hotspot["severity"] == "high":
                 recommendations.append(
                     f"Critical performance issue in {hotspot['type']}: "
@@ -279,9 +350,62 @@ class PerformanceProfiler:
             "current_memory_mb": current.memory_used_mb,
             "memory_change_percent": memory_change,
             "performance_improved": time_change < 0,
-            "regression_detected": time_change > 10  # More than 10% slower
+            "regression_detected": time_change > 10,  # More than 10% slower
+            "hotspot_shifts": self._hotspot_shifts(baseline.samples, current.samples, 10.0)
         }
     
+    def _hotspot_shifts(
+        self,
+        baseline: Optional[SampleProfile],
+        current: Optional[SampleProfile],
+        threshold_percent: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Find functions whose share of sampled time grew.
+        
+        Shares rather than absolute times are compared, so a shift is
+        reported even when total run time is unchanged. Self-time shares
+        catch leaf functions getting slower; total-time shares catch a
+        subtree growing even when its leaves are shared helpers.
+        
+        Args:
+            baseline: Baseline samples
+            current: Current samples
+            threshold_percent: Minimum growth in percentage points
+            
+        Returns:
+            List of hotspot shifts, largest first
+        """
+        if not baseline or not current:
+            return []
+        if (baseline.sample_count < self.hotspot_min_samples
+                or current.sample_count < self.hotspot_min_samples):
+            return []
+        
+        before = baseline.function_stats()
+        shifts = []
+        for label, stats in current.function_stats().items():
+            previous = before.get(label, {})
+            best = None
+            for metric in ("self", "total"):
+                if stats[f"{metric}_samples"] < self.hotspot_min_samples:
+                    continue
+                old = previous.get(f"{metric}_percent", 0.0)
+                shift = stats[f"{metric}_percent"] - old
+                if shift > threshold_percent and (best is None or shift > best["shift_percent"]):
+                    best = {
+                        "hotspot": label,
+                        "metric": metric,
+                        "baseline_percent": old,
+                        "current_percent": stats[f"{metric}_percent"],
+                        "shift_percent": shift,
+                        "new_hotspot": not previous
+                    }
+            if best:
+                shifts.append(best)
+        
+        return sorted(shifts, key=lambda s: -s["shift_percent"])
+    
     def set_baseline(self, function_name: str) -> bool:
         """
         Set current profile as baseline for function.
@@ -353,6 +477,10 @@ class PerformanceProfiler:
         """
         Detect performance regressions compared to baselines.
         
+        Profiled functions are compared with their baselines, and the
+        latest continuous sampling window with the sampling baseline
+        (reported with "source": "continuous" and no function).
+        
         Args:
             threshold_percent: Threshold for regression detection (default 10%)
             
@@ -364,17 +492,130 @@ class PerformanceProfiler:
         for func_name, baseline in self.baseline_profiles.items():
             comparison = self.compare_with_baseline(func_name)
             
-            if comparison.get("regression_detected"):
+            if "error" in comparison:
+                continue
+            
+            if comparison["time_change_percent"] > threshold_percent:
                 regressions.append({
+                    "type": "slowdown",
                     "function": func_name,
                     "baseline_time_ms": comparison["baseline_time_ms"],
                     "current_time_ms": comparison["current_time_ms"],
                     "degradation_percent": comparison["time_change_percent"],
                     "severity": "critical" if comparison["time_change_percent"] > 50 else "high"
                 })
+            
+            current = next(
+                p for p in reversed(self.profiles) if p.function_name == func_name
+            )
+            for shift in self._hotspot_shifts(baseline.samples, current.samples, threshold_percent):
+                regressions.append({
+                    "type": "hotspot_shift",
+                    "function": func_name,
+                    **shift,
+                    "severity": "high" if shift["shift_percent"] > 50 else "medium"
+                })
+        
+        for shift in self._hotspot_shifts(
+            self.sampling_baseline, self.sampling_profile, threshold_percent
+        ):
+            regressions.append({
+                "type": "hotspot_shift",
+                "function": None,
+                "source": "continuous",
+                **shift,
+                "severity": "high" if shift["shift_percent"] > 50 else "medium"
+            })
         
         return regressions
     
+    def start_sampling(self, interval: float = 0.01) -> StackSampler:
+        """
+        Start always-on sampling of every thread in the process.
+        
+        Args:
+            interval: Seconds between samples (10ms keeps overhead negligible)
+            
+        Returns:
+            Running StackSampler
+        """
+        if self._continuous_sampler and self._continuous_sampler.running:
+            return self._continuous_sampler
+        self._continuous_sampler = StackSampler(interval=interval).start()
+        return self._continuous_sampler
+    
+    def stop_sampling(self) -> Optional[SampleProfile]:
+        """
+        Stop always-on sampling.
+        
+        Returns:
+            Collected SampleProfile, or None if sampling was not started
+        """
+        if not self._continuous_sampler:
+            return None
+        profile = self._continuous_sampler.stop()
+        self._continuous_sampler = None
+        self.sampling_profile = profile
+        return profile
+    
+    def snapshot_sampling(self) -> Optional[SampleProfile]:
+        """
+        Close the current always-on sampling window and start the next one.
+        
+        Returns:
+            SampleProfile of the closed window, or None if sampling was not started
+        """
+        sampler = self._continuous_sampler
+        if not sampler:
+            return None
+        profile = self.stop_sampling()
+        self.start_sampling(interval=sampler.interval)
+        return profile
+    
+    def set_sampling_baseline(self) -> bool:
+        """
+        Use the latest continuous sampling window as the baseline.
+        
+        While sampling runs the current window is closed first (see
+        snapshot_sampling); later windows are compared against it by
+        detect_regressions.
+        
+        Returns:
+            True if a sampled window was available
+        """
+        if self._continuous_sampler:
+            self.snapshot_sampling()
+        if self.sampling_profile is None:
+            return False
+        self.sampling_baseline = self.sampling_profile
+        return True
+    
+    def export_flamegraph(
+        self,
+        function_name: str,
+        filepath: Union[str, Path],
+        format: str = "speedscope"
+    ) -> bool:
+        """
+        Export the latest samples for a function as a flamegraph.
+        
+        Args:
+            function_name: Profiled function name
+            filepath: Output file path
+            format: "speedscope" (JSON) or "collapsed" (flamegraph.pl input)
+            
+        Returns:
+            True if a sampled profile was exported
+        """
+        for profile in reversed(self.profiles):
+            if profile.function_name == function_name and profile.samples:
+                if format == "collapsed":
+                    profile.samples.save_collapsed(filepath)
+                else:
+                    profile.samples.save_speedscope(filepath, name=function_name)
+                return True
+        return False
+    
     def optimize_function(self, function_name: str) -> Dict[str, Any]:
         """
         Get optimization strategies for a function.
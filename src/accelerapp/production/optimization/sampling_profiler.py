@@ -0,0 +1,402 @@
+"""
+Statistical stack sampling profiler.
+
+Periodically captures the Python call stacks of running threads and
+aggregates them into collapsed stacks, from which per-function self/total
+time and flamegraph exports (collapsed text, speedscope JSON) are derived.
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+class SamplingMode:
+    """Stack sampling strategies."""
+
+    THREAD = "thread"  # background thread reading sys._current_frames()
+    SIGNAL = "signal"  # SIGPROF interval timer, main thread only, CPU time
+
+
+def _frame_label(code: CodeType) -> str:
+    """Short, stable label for a code object."""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SampleProfile:
+    """
+    Aggregated stack samples.
+
+    Stacks are stored root first as tuples of frame labels together with
+    the number of samples that observed them.
+    """
+
+    def __init__(
+        self,
+        stacks: Optional[Dict[Tuple[str, ...], int]] = None,
+        interval: float = 0.0,
+        duration: float = 0.0,
+        files: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize sample profile.
+
+        Args:
+            stacks: Collapsed stack to sample count mapping
+            interval: Effective seconds represented by one sample
+            duration: Wall-clock sampling duration in seconds
+            files: Frame label to source file mapping
+        """
+        self.stacks: Dict[Tuple[str, ...], int] = dict(stacks or {})
+        self.interval = interval
+        self.duration = duration
+        self.files: Dict[str, str] = dict(files or {})
+
+    @property
+    def sample_count(self) -> int:
+        """Total number of samples."""
+        return sum(self.stacks.values())
+
+    def function_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-function self and total time.
+
+        Self time counts samples where the function was executing (the
+        leaf frame); total time counts samples where it was anywhere on
+        the stack, once per sample even under recursion.
+
+        Returns:
+            Mapping of frame label to sample counts, milliseconds and
+            percentages of all samples
+        """
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if not stack:
+                continue
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+
+        samples = self.sample_count or 1
+        ms = self.interval * 1000
+        return {
+            label: {
+                "self_samples": self_counts[label],
+                "total_samples": total,
+                "self_ms": self_counts[label] * ms,
+                "total_ms": total * ms,
+                "self_percent": self_counts[label] / samples * 100,
+                "total_percent": total / samples * 100,
+            }
+            for label, total in total_counts.items()
+        }
+
+    def top_functions(self, limit: int = 10, by: str = "self") -> List[Dict[str, Any]]:
+        """
+        Get the functions with the most sampled time.
+
+        Args:
+            limit: Maximum number of functions
+            by: Sort by "self" or "total" time
+
+        Returns:
+            List of function statistics, highest first
+        """
+        key = f"{by}_samples"
+        stats = self.function_stats()
+        ranked = sorted(stats.items(), key=lambda item: -item[1][key])[:limit]
+        return [{"function": label, **values} for label, values in ranked]
+
+    def merge(self, other: "SampleProfile") -> "SampleProfile":
+        """
+        Combine two profiles.
+
+        Args:
+            other: Profile to merge
+
+        Returns:
+            New profile containing the samples of both
+        """
+        stacks = Counter(self.stacks)
+        stacks.update(other.stacks)
+        samples = self.sample_count + other.sample_count
+        interval = (
+            (self.interval * self.sample_count + other.interval * other.sample_count) / samples
+            if samples
+            else max(self.interval, other.interval)
+        )
+        return SampleProfile(
+            stacks=stacks,
+            interval=interval,
+            duration=self.duration + other.duration,
+            files={**self.files, **other.files},
+        )
+
+    def collapsed(self) -> str:
+        """
+        Render stacks in collapsed (folded) format.
+
+        Each line is "root;caller;leaf count", the input format of
+        flamegraph.pl, inferno and speedscope.
+
+        Returns:
+            Collapsed stacks text
+        """
+        lines = [
+            f"{';'.join(stack)} {count}"
+            for stack, count in sorted(self.stacks.items())
+            if stack
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_speedscope(self, name: str = "accelerapp") -> Dict[str, Any]:
+        """
+        Render the profile in speedscope's sampled file format.
+
+        Args:
+            name: Profile name shown in speedscope
+
+        Returns:
+            speedscope JSON document
+        """
+        index: Dict[str, int] = {}
+        frames: List[Dict[str, Any]] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+
+        for stack, count in sorted(self.stacks.items()):
+            ids = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frame: Dict[str, Any] = {"name": label}
+                    if label in self.files:
+                        frame["file"] = self.files[label]
+                    frames.append(frame)
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "accelerapp",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def save_collapsed(self, filepath: Union[str, Path]):
+        """
+        Write collapsed stacks for flamegraph tools.
+
+        Args:
+            filepath: Output file path
+        """
+        Path(filepath).write_text(self.collapsed())
+
+    def save_speedscope(self, filepath: Union[str, Path], name: str = "accelerapp"):
+        """
+        Write a speedscope profile.
+
+        Args:
+            filepath: Output file path
+            name: Profile name
+        """
+        Path(filepath).write_text(json.dumps(self.to_speedscope(name)))
+
+
+class StackSampler:
+    """
+    Low-overhead statistical stack sampler.
+
+    In thread mode a daemon thread wakes every interval and records the
+    stacks of the sampled threads; the profiled code runs unmodified, so
+    the cost is one stack walk per thread per sample. In signal mode a
+    SIGPROF interval timer interrupts the main thread instead, which
+    samples on CPU time and is not delayed by the GIL.
+
+    Stack walks stop at root_code when given, and samples that never reach
+    it are discarded, which scopes a profile to one function's subtree.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        mode: str = SamplingMode.THREAD,
+        thread_ids: Optional[Iterable[int]] = None,
+        root_code: Optional[CodeType] = None,
+        max_depth: int = 128,
+    ):
+        """
+        Initialize stack sampler.
+
+        Args:
+            interval: Seconds between samples
+            mode: SamplingMode.THREAD or SamplingMode.SIGNAL
+            thread_ids: Threads to sample in thread mode (all but the sampler if None)
+            root_code: Only keep the subtree below this code object
+            max_depth: Maximum frames recorded per stack
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        if mode not in (SamplingMode.THREAD, SamplingMode.SIGNAL):
+            raise ValueError(f"Unknown sampling mode: {mode}")
+
+        self.interval = interval
+        self.mode = mode
+        self.thread_ids: Optional[Set[int]] = set(thread_ids) if thread_ids is not None else None
+        self.root_code = root_code
+        self.max_depth = max_depth
+
+        self._stacks: Counter = Counter()
+        self._ticks = 0
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._previous_handler: Any = None
+        self.profile: Optional[SampleProfile] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether sampling is active."""
+        return self._started > 0
+
+    def start(self) -> "StackSampler":
+        """
+        Start sampling.
+
+        Returns:
+            The sampler
+        """
+        if self.running:
+            raise RuntimeError("Sampler already running")
+
+        self._stacks.clear()
+        self._ticks = 0
+        self._stop.clear()
+        self._started = time.perf_counter()
+
+        if self.mode == SamplingMode.SIGNAL:
+            if not hasattr(signal, "setitimer"):
+                self._started = 0.0
+                raise RuntimeError("Signal sampling requires setitimer (POSIX only)")
+            if threading.current_thread() is not threading.main_thread():
+                self._started = 0.0
+                raise RuntimeError("Signal sampling must be started from the main thread")
+            self._previous_handler = signal.signal(signal.SIGPROF, self._handle_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(
+                target=self._run, name="accelerapp-stack-sampler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> SampleProfile:
+        """
+        Stop sampling.
+
+        Returns:
+            Aggregated SampleProfile
+        """
+        if not self.running:
+            return self.snapshot()
+
+        if self.mode == SamplingMode.SIGNAL:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        else:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+
+        profile = self.snapshot()
+        self._started = 0.0
+        return profile
+
+    def snapshot(self) -> SampleProfile:
+        """
+        Get the samples collected so far without stopping.
+
+        Returns:
+            Aggregated SampleProfile
+        """
+        duration = time.perf_counter() - self._started if self.running else 0.0
+        labels: Dict[CodeType, str] = {}
+        files: Dict[str, str] = {}
+        stacks: Counter = Counter()
+
+        for codes, count in list(self._stacks.items()):
+            stack = []
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                    files[label] = code.co_filename
+                stack.append(label)
+            stacks[tuple(stack)] += count
+
+        # Thread mode: one tick spans interval plus GIL wait; use measured spacing
+        interval = self.interval
+        if self.mode == SamplingMode.THREAD and self._ticks and duration:
+            interval = max(self.interval, duration / self._ticks)
+        return SampleProfile(stacks=stacks, interval=interval, duration=duration, files=files)
+
+    def __enter__(self) -> "StackSampler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profile = self.stop()
+
+    def _run(self):
+        """Thread-mode sampling loop."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._ticks += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                self._record(frame)
+
+    def _handle_signal(self, signum: int, frame: Optional[FrameType]):
+        """Signal-mode handler: sample the interrupted frame."""
+        self._ticks += 1
+        if frame is not None:
+            self._record(frame)
+
+    def _record(self, frame: Optional[FrameType]):
+        """Collapse one stack (leaf to root walk) into the counter."""
+        codes = []
+        root = self.root_code
+        while frame is not None and len(codes) < self.max_depth:
+            code = frame.f_code
+            codes.append(code)
+            if code is root:
+                break
+            frame = frame.f_back
+        else:
+            if root is not None:
+                return
+        codes.reverse()
+        self._stacks[tuple(codes)] += 1
@@ -32,6 +32,7 @@ from .backup_recovery import (
     BackupStatus,
     RecoveryStatus
 )
+from .backup_engine import BackupEngine, Snapshot, SnapshotFile
 from .security_audit import (
     SecurityAuditSystem,
     AuditEvent,
@@ -71,6 +72,9 @@ __all__ = [
     "BackupType",
     "BackupStatus",
     "RecoveryStatus",
+    "BackupEngine",
+    "Snapshot",
+    "SnapshotFile",
     # Security audit
     "SecurityAuditSystem",
     "AuditEvent",
@@ -7,8 +7,11 @@ from typing import Dict, Any, List, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 import json
 
+from .backup_engine import BackupEngine
+
 
 class BackupType(Enum):
     """Backup types."""
@@ -104,10 +107,20 @@ class BackupRecoverySystem:
     """
     Automated backup and disaster recovery system.
     Manages backups, retention, and recovery procedures.
+    
+    With a BackupEngine attached, run_backup and restore_backup move real
+    data and verify_backup checks every stored chunk; without one the
+    system only tracks backups performed elsewhere.
     """
     
-    def __init__(self):
-        """Initialize backup and recovery system."""
+    def __init__(self, engine: Optional[BackupEngine] = None):
+        """
+        Initialize backup and recovery system.
+        
+        Args:
+            engine: Optional local backup engine that stores backup data
+        """
+        self.engine = engine
         self.configs: Dict[str, BackupConfig] = {}
         self.backups: Dict[str, BackupRecord] = {}
         self.recovery_plans: Dict[str, RecoveryPlan] = {}
@@ -228,6 +241,68 @@ class BackupRecoverySystem:
         self.backup_history.append(record)
         return record
     
+    def run_backup(
+        self,
+        config_id: str,
+        backup_id: Optional[str] = None
+    ) -> BackupRecord:
+        """
+        Back up a configuration's target paths with the backup engine.
+        
+        Full backups read every file. Incremental backups reuse unchanged
+        files from the latest completed backup of the configuration, and
+        differential backups from the latest completed full backup.
+        
+        Args:
+            config_id: Configuration identifier
+            backup_id: Optional backup identifier
+            
+        Returns:
+            Completed (or failed) BackupRecord
+        """
+        if self.engine is None:
+            raise ValueError("No backup engine configured")
+        
+        record = self.start_backup(config_id, backup_id)
+        config = self.configs[config_id]
+        parent = self._parent_backup(config)
+        record.location = str(self.engine.repository)
+        
+        try:
+            snapshot = self.engine.backup(
+                record.backup_id,
+                config.target_paths,
+                exclude_patterns=config.exclude_patterns,
+                parent_id=parent.backup_id if parent else None,
+                compress=config.compression
+            )
+        except (OSError, ValueError) as e:
+            record.metadata["error"] = str(e)
+            return self.complete_backup(record.backup_id, 0, 0, "", success=False)
+        
+        record.metadata.update(snapshot.stats)
+        record.metadata["parent_backup_id"] = snapshot.parent_id
+        return self.complete_backup(
+            record.backup_id,
+            snapshot.size_bytes,
+            len(snapshot.files),
+            snapshot.checksum
+        )
+    
+    def _parent_backup(self, config: BackupConfig) -> Optional[BackupRecord]:
+        """Find the backup an incremental or differential backup builds on."""
+        if config.backup_type == BackupType.FULL:
+            return None
+        
+        candidates = [
+            b for b in self.backups.values()
+            if b.config_id == config.config_id
+            and b.status == BackupStatus.COMPLETED
+            and (config.backup_type == BackupType.INCREMENTAL or b.backup_type == BackupType.FULL)
+            and self.engine.has_snapshot(b.backup_id)
+        ]
+        return max(candidates, key=lambda b: b.started_at) if candidates else None
+    
     def create_recovery_plan(
         self,
         plan_id: str,
@@ -333,6 +408,43 @@ class BackupRecoverySystem:
         
         return operation
     
+    def restore_backup(
+        self,
+        backup_id: str,
+        destination: str,
+        operation_id: Optional[str] = None,
+        plan_id: Optional[str] = None
+    ) -> RecoveryOperation:
+        """
+        Restore a backup into a directory with the backup engine.
+        
+        Args:
+            backup_id: Backup to recover from
+            destination: Directory to restore into
+            operation_id: Optional operation identifier
+            plan_id: Optional recovery plan to follow
+            
+        Returns:
+            Completed (or failed) RecoveryOperation
+        """
+        if self.engine is None:
+            raise ValueError("No backup engine configured")
+        
+        operation = self.start_recovery(backup_id, operation_id, plan_id)
+        try:
+            result = self.engine.restore(backup_id, Path(destination))
+        except (OSError, ValueError) as e:
+            operation.details["error"] = str(e)
+            return self.complete_recovery(operation.operation_id, 0, 0, success=False)
+        
+        operation.details.update(result)
+        return self.complete_recovery(
+            operation.operation_id,
+            result["restored_files"],
+            result["failed_files"],
+            success=result["failed_files"] == 0
+        )
+    
     def cleanup_old_backups(self) -> Dict[str, Any]:
         """
         Clean up old backups based on retention policies.
@@ -356,10 +468,18 @@ class BackupRecoverySystem:
                 removed_backups.append(backup_id)
                 del self.backups[backup_id]
         
-        return {
+        result = {
             "removed_count": len(removed_backups),
             "removed_backups": removed_backups
         }
+        
+        if self.engine is not None and removed_backups:
+            for backup_id in removed_backups:
+                self.engine.delete_snapshot(backup_id)
+            # Chunks are shared between snapshots; drop only unreferenced ones
+            result.update(self.engine.collect_garbage())
+        
+        return result
     
     def verify_backup(self, backup_id: str) -> Dict[str, Any]:
         """
@@ -378,7 +498,24 @@ class BackupRecoverySystem:
         if backup.status != BackupStatus.COMPLETED:
             return {"valid": False, "reason": "Backup not completed"}
         
-        # In real implementation, would verify checksum and file integrity
+        if self.engine is not None:
+            if not self.engine.has_snapshot(backup_id):
+                return {
+                    "valid": False,
+                    "backup_id": backup_id,
+                    "reason": "Snapshot not found in backup engine"
+                }
+            result = self.engine.verify(backup_id)
+            if result["checksum"] != backup.checksum:
+                result["valid"] = False
+                result["reason"] = "Manifest checksum mismatch"
+            elif not result["valid"]:
+                result["reason"] = "Missing or corrupted chunks"
+            result["size_bytes"] = backup.size_bytes
+            result["files_count"] = backup.files_count
+            return result
+        
+        # Without an engine, backups can only be checked by metadata
         return {
             "valid": True,
             "backup_id": backup_id,
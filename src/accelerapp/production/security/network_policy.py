@@ -3,10 +3,15 @@ Network policy enforcement for cluster-wide security.
 Implements Kubernetes-style network policies with enforcement capabilities.
 """
 
-from typing import Dict, Any, List, Optional, Set
-from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
 from enum import Enum
+from collections import OrderedDict
+from types import MappingProxyType
+
+
+_NO_LABELS: frozenset = frozenset()
 
 
 class PolicyAction(Enum):
@@ -25,29 +30,48 @@ class PolicyType(Enum):
     BOTH = "both"
 
 
-@dataclass
+@dataclass(frozen=True)
 class NetworkRule:
-    """Network policy rule."""
+    """
+    Network policy rule.
+    
+    Rules are immutable: labels are read-only mappings and ports and
+    protocols are tuples. Change them with NetworkPolicyEnforcer.update_rule.
+    """
     
     rule_id: str
     source_cidr: Optional[str] = None
     destination_cidr: Optional[str] = None
-    source_labels: Dict[str, str] = field(default_factory=dict)
-    destination_labels: Dict[str, str] = field(default_factory=dict)
-    ports: List[int] = field(default_factory=list)
-    protocols: List[str] = field(default_factory=list)
+    source_labels: Mapping[str, str] = field(default_factory=dict)
+    destination_labels: Mapping[str, str] = field(default_factory=dict)
+    ports: Tuple[int, ...] = ()
+    protocols: Tuple[str, ...] = ()
     action: PolicyAction = PolicyAction.ALLOW
+    
+    def __post_init__(self):
+        object.__setattr__(self, "source_labels", MappingProxyType(dict(self.source_labels)))
+        object.__setattr__(
+            self, "destination_labels", MappingProxyType(dict(self.destination_labels))
+        )
+        object.__setattr__(self, "ports", tuple(self.ports))
+        object.__setattr__(self, "protocols", tuple(self.protocols))
 
 
 @dataclass
 class NetworkPolicy:
-    """Cluster-wide network policy."""
+    """
+    Cluster-wide network policy.
+    
+    Policies are compiled for matching, so change them through the
+    NetworkPolicyEnforcer (update_policy, add_rule, ...) rather than by
+    assigning attributes directly.
+    """
     
     policy_id: str
     name: str
     namespace: str
     policy_type: PolicyType
-    rules: List[NetworkRule] = field(default_factory=list)
+    rules: Tuple[NetworkRule, ...] = ()
     enabled: bool = True
     priority: int = 100
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
@@ -69,17 +93,125 @@ class PolicyViolation:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
+class CompiledPolicyIndex:
+    """
+    Enabled policy rules compiled for matching.
+    
+    Rules of enabled policies are flattened once into evaluation order
+    (policy priority, then rule order), and each rule gets one bit. Masks
+    indexed by port, protocol and required label pair select the rules
+    that can match a connection; only those are checked, lowest bit first.
+    """
+    
+    def __init__(self, policies: Iterable[NetworkPolicy]):
+        """
+        Compile policies.
+        
+        Args:
+            policies: All policies (disabled policies are skipped)
+        """
+        ordered = sorted(
+            (policy for policy in policies if policy.enabled),
+            key=lambda p: p.priority
+        )
+        self.entries: List[Tuple[NetworkPolicy, NetworkRule]] = [
+            (policy, rule) for policy in ordered for rule in policy.rules
+        ]
+        
+        self.ports: Dict[int, int] = {}
+        self.protocols: Dict[str, int] = {}
+        self.source_labels: Dict[Tuple[str, str], int] = {}
+        self.destination_labels: Dict[Tuple[str, str], int] = {}
+        self.any_port = 0
+        self.any_protocol = 0
+        self.any_source = 0
+        self.any_destination = 0
+        for position, (_, rule) in enumerate(self.entries):
+            bit = 1 << position
+            self.any_port |= self._index(self.ports, rule.ports, bit)
+            self.any_protocol |= self._index(self.protocols, rule.protocols, bit)
+            self.any_source |= self._index(
+                self.source_labels, rule.source_labels.items(), bit
+            )
+            self.any_destination |= self._index(
+                self.destination_labels, rule.destination_labels.items(), bit
+            )
+    
+    @staticmethod
+    def _index(masks: Dict[Any, int], keys: Iterable[Any], bit: int) -> int:
+        """Add a rule's bit under each key; return the bit if it has no keys."""
+        unconstrained = bit
+        for key in keys:
+            masks[key] = masks.get(key, 0) | bit
+            unconstrained = 0
+        return unconstrained
+    
+    def candidates(
+        self,
+        port: int,
+        protocol: str,
+        source_labels: Dict[str, str],
+        destination_labels: Dict[str, str]
+    ) -> List[Tuple[NetworkPolicy, NetworkRule]]:
+        """
+        Get the rules that may match a connection, in evaluation order.
+        
+        A label-constrained rule is a candidate when the connection carries
+        at least one of its required pairs; the caller checks the rest.
+        
+        Returns:
+            List of (policy, rule)
+        """
+        mask = self.ports.get(port, 0) | self.any_port
+        mask &= self.protocols.get(protocol, 0) | self.any_protocol
+        if mask & ~self.any_source:
+            source = self.any_source
+            for pair in source_labels.items():
+                source |= self.source_labels.get(pair, 0)
+            mask &= source
+        if mask & ~self.any_destination:
+            destination = self.any_destination
+            for pair in destination_labels.items():
+                destination |= self.destination_labels.get(pair, 0)
+            mask &= destination
+        
+        candidates = []
+        while mask:
+            lowest = mask & -mask
+            candidates.append(self.entries[lowest.bit_length() - 1])
+            mask ^= lowest
+        return candidates
+
+
 class NetworkPolicyEnforcer:
     """
     Enforces network policies across clusters.
     Implements policy-based network access control.
+    
+    Policies are compiled into a CompiledPolicyIndex, rebuilt after any
+    change made through the enforcer; rules are immutable, and policies
+    are changed with update_policy rather than attribute assignment.
+    Verdicts are cached per connection in an LRU keyed on everything
+    matching depends on; each change bumps a generation number that makes
+    older entries stale without clearing the cache.
     """
     
-    def __init__(self):
-        """Initialize network policy enforcer."""
+    def __init__(self, cache_size: int = 10000):
+        """
+        Initialize network policy enforcer.
+        
+        Args:
+            cache_size: Maximum cached connection verdicts (0 disables caching)
+        """
         self.policies: Dict[str, NetworkPolicy] = {}
         self.violations: List[PolicyViolation] = []
         self.enforcement_enabled = True
+        self.cache_size = cache_size
+        self.cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._generation = 0
+        self._compiled: Optional[CompiledPolicyIndex] = None
+        self._compiled_generation = -1
+        self._verdicts: "OrderedDict[tuple, Tuple[int, tuple, Optional[tuple]]]" = OrderedDict()
     
     def create_policy(
         self,
@@ -113,8 +245,53 @@ class NetworkPolicyEnforcer:
             metadata=metadata or {}
         )
         self.policies[policy_id] = policy
+        self._invalidate()
         return policy
     
+    def remove_policy(self, policy_id: str) -> bool:
+        """
+        Remove network policy.
+        
+        Args:
+            policy_id: Policy identifier
+            
+        Returns:
+            True if policy was removed
+        """
+        if self.policies.pop(policy_id, None) is None:
+            return False
+        self._invalidate()
+        return True
+    
+    def update_policy(self, policy_id: str, /, **changes: Any) -> bool:
+        """
+        Update fields of a network policy.
+        
+        Args:
+            policy_id: Policy identifier
+            **changes: New values for NetworkPolicy fields (name, namespace,
+                enabled, priority, metadata, ...); rules are changed with
+                add_rule, update_rule and remove_rule
+            
+        Returns:
+            True if the policy exists
+            
+        Raises:
+            ValueError: If a field is unknown or cannot be updated
+        """
+        policy = self.policies.get(policy_id)
+        if policy is None:
+            return False
+        invalid = set(changes) - {f.name for f in fields(NetworkPolicy)}
+        invalid |= set(changes) & {"policy_id", "rules"}
+        if invalid:
+            raise ValueError(f"Cannot update policy fields: {', '.join(sorted(invalid))}")
+        
+        for name, value in changes.items():
+            setattr(policy, name, value)
+        self._invalidate()
+        return True
+    
     def add_rule(
         self,
         policy_id: str,
@@ -158,7 +335,62 @@ class NetworkPolicyEnforcer:
             protocols=protocols or [],
             action=action
         )
-        policy.rules.append(rule)
+        policy.rules += (rule,)
+        self._invalidate()
+        return True
+    
+    def update_rule(self, policy_id: str, rule_id: str, /, **changes: Any) -> bool:
+        """
+        Replace a rule of a network policy with an updated copy.
+        
+        Args:
+            policy_id: Policy identifier
+            rule_id: Rule identifier
+            **changes: New values for NetworkRule fields (action, ports,
+                protocols, source_labels, ...)
+            
+        Returns:
+            True if the rule exists
+            
+        Raises:
+            ValueError: If a field is unknown or cannot be updated
+        """
+        policy = self.policies.get(policy_id)
+        if policy is None:
+            return False
+        invalid = set(changes) - {f.name for f in fields(NetworkRule)}
+        invalid |= set(changes) & {"rule_id"}
+        if invalid:
+            raise ValueError(f"Cannot update rule fields: {', '.join(sorted(invalid))}")
+        
+        for position, rule in enumerate(policy.rules):
+            if rule.rule_id == rule_id:
+                rules = list(policy.rules)
+                rules[position] = replace(rule, **changes)
+                policy.rules = tuple(rules)
+                self._invalidate()
+                return True
+        return False
+    
+    def remove_rule(self, policy_id: str, rule_id: str) -> bool:
+        """
+        Remove a rule from a network policy.
+        
+        Args:
+            policy_id: Policy identifier
+            rule_id: Rule identifier
+            
+        Returns:
+            True if the rule was removed
+        """
+        policy = self.policies.get(policy_id)
+        if policy is None:
+            return False
+        rules = tuple(rule for rule in policy.rules if rule.rule_id != rule_id)
+        if len(rules) == len(policy.rules):
+            return False
+        policy.rules = rules
+        self._invalidate()
         return True
     
     def check_connection(
@@ -187,89 +419,153 @@ class NetworkPolicyEnforcer:
         if not self.enforcement_enabled:
             return {"allowed": True, "reason": "Enforcement disabled"}
         
-        # Sort policies by priority
-        sorted_policies = sorted(
-            self.policies.values(),
-            key=lambda p: p.priority
+        logged, decision = self._decide(
+            port, protocol, source_labels or {}, destination_labels or {}
         )
+        return self._enforce(logged, decision, source, destination, port, protocol)
+    
+    def check_many(self, connections: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """
+        Check a batch of connections.
         
-        # Check each policy
-        for policy in sorted_policies:
-            if not policy.enabled:
-                continue
+        Args:
+            connections: Tuples of check_connection arguments: (source,
+                destination, port, protocol[, source_labels[, destination_labels]])
             
-            for rule in policy.rules:
-                if self._rule_matches(
-                    rule, source, destination, port, protocol,
-                    source_labels or {}, destination_labels or {}
-                ):
-                    if rule.action == PolicyAction.DENY:
-                        self._record_violation(
-                            policy.policy_id, source, destination,
-                            port, protocol, "DENIED"
-                        )
-                        return {
-                            "allowed": False,
-                            "reason": f"Denied by policy {policy.name}",
-                            "policy_id": policy.policy_id
-                        }
-                    elif rule.action == PolicyAction.ALLOW:
-                        return {
-                            "allowed": True,
-                            "reason": f"Allowed by policy {policy.name}",
-                            "policy_id": policy.policy_id
-                        }
-                    elif rule.action == PolicyAction.LOG:
-                        self._record_violation(
-                            policy.policy_id, source, destination,
-                            port, protocol, "LOGGED"
-                        )
-        
-        # Default deny if no matching rule
-        self._record_violation(
-            "default", source, destination, port, protocol, "DEFAULT_DENY"
-        )
-        return {
-            "allowed": False,
-            "reason": "No matching policy found (default deny)"
-        }
+        Returns:
+            Check results, in input order
+        """
+        if not self.enforcement_enabled:
+            return [
+                {"allowed": True, "reason": "Enforcement disabled"}
+                for _ in connections
+            ]
+        
+        results = []
+        for connection in connections:
+            source, destination, port, protocol = connection[:4]
+            source_labels = connection[4] if len(connection) > 4 else None
+            destination_labels = connection[5] if len(connection) > 5 else None
+            logged, decision = self._decide(
+                port, protocol, source_labels or {}, destination_labels or {}
+            )
+            results.append(
+                self._enforce(logged, decision, source, destination, port, protocol)
+            )
+        return results
     
-    def _rule_matches(
+    def _decide(
         self,
-        rule: NetworkRule,
-        source: str,
-        destination: str,
         port: int,
         protocol: str,
         source_labels: Dict[str, str],
         destination_labels: Dict[str, str]
-    ) -> bool:
-        """Check if rule matches connection parameters."""
-        # Check port
-        if rule.ports and port not in rule.ports:
-            return False
+    ) -> Tuple[tuple, Optional[Tuple[NetworkPolicy, PolicyAction]]]:
+        """
+        Evaluate policies for a connection, using the verdict cache.
         
-        # Check protocol
-        if rule.protocols and protocol not in rule.protocols:
-            return False
+        Matching looks only at port, protocol and labels, so those form
+        the cache key and endpoints with the same traffic share verdicts.
         
-        # Check source labels
-        if rule.source_labels:
-            if not all(
-                source_labels.get(k) == v
-                for k, v in rule.source_labels.items()
-            ):
-                return False
+        Returns:
+            (policies whose LOG rules matched, deciding (policy, action) or None)
+        """
+        key = None
+        if self.cache_size > 0:
+            key = (
+                port,
+                protocol,
+                frozenset(source_labels.items()) if source_labels else _NO_LABELS,
+                frozenset(destination_labels.items()) if destination_labels else _NO_LABELS,
+            )
+            cached = self._verdicts.get(key)
+            if cached is not None and cached[0] == self._generation:
+                self._verdicts.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return cached[1], cached[2]
+            self.cache_stats["misses"] += 1
         
-        # Check destination labels
-        if rule.destination_labels:
-            if not all(
-                destination_labels.get(k) == v
-                for k, v in rule.destination_labels.items()
+        logged = []
+        decision = None
+        for policy, rule in self._compiled_policies().candidates(
+            port, protocol, source_labels, destination_labels
+        ):
+            # Port and protocol are exact in the index; check every required label
+            if not (
+                self._labels_match(rule.source_labels, source_labels)
+                and self._labels_match(rule.destination_labels, destination_labels)
             ):
-                return False
+                continue
+            if rule.action == PolicyAction.LOG:
+                logged.append(policy)
+            else:
+                decision = (policy, rule.action)
+                break
+        logged = tuple(logged)
         
-        return True
+        if key is not None:
+            self._verdicts[key] = (self._generation, logged, decision)
+            self._verdicts.move_to_end(key)
+            if len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return logged, decision
+    
+    def _enforce(
+        self,
+        logged: tuple,
+        decision: Optional[Tuple[NetworkPolicy, PolicyAction]],
+        source: str,
+        destination: str,
+        port: int,
+        protocol: str
+    ) -> Dict[str, Any]:
+        """Record violations for a verdict and build the check result."""
+        for policy in logged:
+            self._record_violation(
+                policy.policy_id, source, destination, port, protocol, "LOGGED"
+            )
+        
+        if decision is None:
+            # Default deny if no matching rule
+            self._record_violation(
+                "default", source, destination, port, protocol, "DEFAULT_DENY"
+            )
+            return {
+                "allowed": False,
+                "reason": "No matching policy found (default deny)"
+            }
+        
+        policy, action = decision
+        if action == PolicyAction.DENY:
+            self._record_violation(
+                policy.policy_id, source, destination, port, protocol, "DENIED"
+            )
+            return {
+                "allowed": False,
+                "reason": f"Denied by policy {policy.name}",
+                "policy_id": policy.policy_id
+            }
+        return {
+            "allowed": True,
+            "reason": f"Allowed by policy {policy.name}",
+            "policy_id": policy.policy_id
+        }
+    
+    def _invalidate(self):
+        """Mark the compiled index and cached verdicts stale."""
+        self._generation += 1
+    
+    def _compiled_policies(self) -> CompiledPolicyIndex:
+        """Get the compiled index, rebuilding it if policies changed."""
+        if self._compiled is None or self._compiled_generation != self._generation:
+            self._compiled = CompiledPolicyIndex(self.policies.values())
+            self._compiled_generation = self._generation
+        return self._compiled
+    
+    @staticmethod
+    def _labels_match(required: Mapping[str, str], labels: Dict[str, str]) -> bool:
+        """Check that labels contain every required key/value pair."""
+        return all(labels.get(k) == v for k, v in required.items())
     
     def _record_violation(
         self,
@@ -295,19 +591,11 @@ class NetworkPolicyEnforcer:
     
     def enable_policy(self, policy_id: str) -> bool:
         """Enable network policy."""
-        policy = self.policies.get(policy_id)
-        if policy:
-            policy.enabled = True
-            return True
-        return False
+        return self.update_policy(policy_id, enabled=True)
     
     def disable_policy(self, policy_id: str) -> bool:
         """Disable network policy."""
-        policy = self.policies.get(policy_id)
-        if policy:
-            policy.enabled = False
-            return True
-        return False
+        return self.update_policy(policy_id, enabled=False)
     
     def list_policies(
         self,
@@ -377,7 +665,12 @@ class NetworkPolicyEnforcer:
             "enabled_policies": enabled_policies,
             "total_violations": total_violations,
             "violations_by_action": violation_by_action,
-            "enforcement_enabled": self.enforcement_enabled
+            "enforcement_enabled": self.enforcement_enabled,
+            "verdict_cache": {
+                "size": len(self._verdicts),
+                "hits": self.cache_stats["hits"],
+                "misses": self.cache_stats["misses"]
+            }
         }
     
     def export_policy(self, policy_id: str) -> Optional[Dict[str, Any]]:
@@ -411,7 +704,7 @@ class NetworkPolicyEnforcer:
     
     def _export_rules(
         self,
-        rules: List[NetworkRule],
+        rules: Sequence[NetworkRule],
         rule_type: str
     ) -> List[Dict[str, Any]]:
         """Export rules in Kubernetes format."""
@@ -421,6 +714,6 @@ class NetworkPolicyEnforcer:
                 "ports": [{"port": p, "protocol": "TCP"} for p in rule.ports]
             }
             if rule.source_labels:
-                rule_spec["from"] = [{"podSelector": {"matchLabels": rule.source_labels}}]
+                rule_spec["from"] = [{"podSelector": {"matchLabels": dict(rule.source_labels)}}]
             exported.append(rule_spec)
         return exported
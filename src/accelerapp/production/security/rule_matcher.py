@@ -0,0 +1,287 @@
+"""
+Literal prefiltering for regex rule sets.
+
+Most rule patterns can only match text that contains one of a few literal
+substrings (``\\bUNION\\b`` needs "union", ``(<script|javascript:)`` needs
+"<script" or "javascript:"). Those literals are extracted from every
+pattern and compiled into one Aho-Corasick automaton, so a single pass over
+the request finds the rules that can possibly match; only their regexes are
+then evaluated. Patterns whose literals cannot be determined are always
+evaluated.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Escapes that consume one character class or assert a position
+_CLASS_ESCAPES = set("bBAZdDsSwW")
+# Escapes followed by a fixed number of hex digits
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+_INLINE_FLAGS = set("aiLmsux")
+
+# Above this many transitions the automaton follows failure links instead
+DENSE_TRANSITION_LIMIT = 250000
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Return the index after a character class starting at pattern[i] == '['."""
+    i += 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    """Return the index after a group starting at pattern[i] == '('."""
+    depth = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            i = _skip_class(pattern, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a pattern on top-level '|'."""
+    branches, start, i = [], 0, 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+        elif char == "[":
+            i = _skip_class(pattern, i)
+        elif char == "(":
+            i = _skip_group(pattern, i)
+        elif char == "|":
+            branches.append(pattern[start:i])
+            i += 1
+            start = i
+        else:
+            i += 1
+    branches.append(pattern[start:])
+    return branches
+
+
+def _unwrap(pattern: str) -> str:
+    """Strip groups that enclose the whole pattern: (...) or (?:...)."""
+    while pattern.startswith("(") and _skip_group(pattern, 0) == len(pattern):
+        if pattern.startswith("(?:"):
+            pattern = pattern[3:-1]
+        elif pattern.startswith("(?P<"):
+            pattern = pattern[pattern.index(">") + 1 : -1]
+        elif not pattern.startswith("(?"):
+            pattern = pattern[1:-1]
+        else:
+            break
+    return pattern
+
+
+def _branch_literal(branch: str) -> Optional[str]:
+    """Longest literal run every match of a branch must contain."""
+    runs: List[str] = []
+    run: List[str] = []
+    literal_atom = False  # whether the last atom is the last char of run
+
+    def close():
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    i = 0
+    while i < len(branch):
+        char = branch[i]
+        if char == "\\":
+            if i + 1 >= len(branch):
+                return None
+            escaped = branch[i + 1]
+            if escaped in _CLASS_ESCAPES:
+                close()
+                literal_atom = False
+                i += 2
+            elif escaped in _HEX_ESCAPES:
+                close()
+                literal_atom = False
+                i += 2 + _HEX_ESCAPES[escaped]
+            elif escaped.isalnum():
+                return None  # backreferences, octal, named characters
+            else:
+                run.append(escaped)
+                literal_atom = True
+                i += 2
+        elif char == "[":
+            close()
+            literal_atom = False
+            i = _skip_class(branch, i)
+        elif char == "(":
+            close()
+            literal_atom = False
+            i = _skip_group(branch, i)
+        elif char in ".^$":
+            close()
+            literal_atom = False
+            i += 1
+        elif char in "*?{":
+            # The previous atom is optional (or bounded): drop it from the run
+            if literal_atom:
+                run.pop()
+            close()
+            literal_atom = False
+            if char == "{":
+                end = branch.find("}", i)
+                i = len(branch) if end < 0 else end + 1
+            else:
+                i += 1
+        elif char == "+":
+            close()
+            literal_atom = False
+            i += 1
+        else:
+            run.append(char)
+            literal_atom = True
+            i += 1
+    close()
+    return max(runs, key=len) if runs else None
+
+
+def required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Get literals of which every match of a pattern contains at least one.
+
+    Literals are lowercased for case-insensitive matching. The analysis is
+    conservative: when any alternative cannot be reduced to a literal (or
+    the pattern uses inline flags or non-ASCII literals) None is returned
+    and the pattern must always be evaluated.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        Lowercase literals, or None if they cannot be determined
+    """
+    if pattern.startswith("(?") and pattern[2:3] in _INLINE_FLAGS:
+        return None
+
+    literals = []
+    for branch in _split_alternatives(_unwrap(pattern)):
+        branch = _unwrap(branch)
+        if "|" in branch and len(_split_alternatives(branch)) > 1:
+            nested = required_literals(branch)
+            if nested is None:
+                return None
+            literals.extend(nested)
+            continue
+        literal = _branch_literal(branch)
+        if literal is None or not literal.isascii():
+            return None
+        literals.append(literal.lower())
+    return literals
+
+
+class LiteralMatcher:
+    """
+    Aho-Corasick automaton reporting which tagged literals occur in a text.
+
+    Every literal carries an integer tag mask; scanning returns the OR of
+    the masks of all literals found, in one pass over the text.
+    """
+
+    def __init__(self, literals: List[Tuple[str, int]]):
+        """
+        Initialize matcher.
+
+        Args:
+            literals: (literal, tag mask) pairs
+        """
+        goto: List[Dict[str, int]] = [{}]
+        output = [0]
+        for literal, tags in literals:
+            state = 0
+            for char in literal:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    output.append(0)
+                state = following
+            output[state] |= tags
+
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, following in goto[state].items():
+                queue.append(following)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(char, 0)
+                fail[following] = target if state and target != following else 0
+                output[following] |= output[fail[following]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._dense: Optional[List[Dict[str, int]]] = None
+
+        alphabet = {char for transitions in goto for char in transitions}
+        if len(goto) * len(alphabet) <= DENSE_TRANSITION_LIMIT:
+            # Precompute every transition so scanning never follows failure links
+            dense: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+            for state in order:
+                transitions = dict(dense[fail[state]])
+                transitions.update(goto[state])
+                dense[state] = transitions
+            self._dense = dense
+
+    @property
+    def states(self) -> int:
+        """Number of automaton states."""
+        return len(self._goto)
+
+    def scan(self, text: str) -> int:
+        """
+        Scan a (lowercased) text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            OR of the tag masks of all literals that occur in the text
+        """
+        output = self._output
+        found = 0
+        state = 0
+        if self._dense is not None:
+            dense = self._dense
+            for char in text:
+                state = dense[state].get(char, 0)
+                if output[state]:
+                    found |= output[state]
+            return found
+
+        goto, fail = self._goto, self._fail
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
@@ -7,6 +7,10 @@ from typing import Dict, Any, List, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
+import json
+
+from ...utils.audit_pipeline import AuditRing, BackgroundAuditWriter
 
 
 class AuditEventType(Enum):
@@ -78,11 +82,23 @@ class SecurityAuditSystem:
     """
     Comprehensive security auditing and compliance system.
     Tracks events, generates audit trails, and ensures compliance.
+    
+    Events are kept in a bounded ring indexed by type, actor and severity,
+    with their times pre-parsed, so queries and statistics cost O(result)
+    rather than O(history). With a log path, events are also written to
+    a rotating JSONL file by a background writer.
     """
     
-    def __init__(self):
-        """Initialize security audit system."""
-        self.events: List[AuditEvent] = []
+    def __init__(self, max_events: int = 100000, log_path: Optional[Path] = None):
+        """
+        Initialize security audit system.
+        
+        Args:
+            max_events: Events kept in memory
+            log_path: Optional JSONL file receiving every event
+        """
+        self.ring = AuditRing(max_events, index_fields=("event_type", "actor", "severity"))
+        self.writer = BackgroundAuditWriter(Path(log_path)) if log_path else None
         self.compliance_checks: Dict[str, ComplianceCheck] = {}
         self.compliance_results: List[ComplianceResult] = []
         self.audit_enabled = True
@@ -90,6 +106,11 @@ class SecurityAuditSystem:
         # Initialize compliance checks
         self._init_compliance_checks()
     
+    @property
+    def events(self) -> List[AuditEvent]:
+        """Events kept in memory, oldest first."""
+        return self.ring.snapshot()
+    
     def _init_compliance_checks(self):
         """Initialize default compliance checks."""
         # SOC2 checks
@@ -192,10 +213,11 @@ class SecurityAuditSystem:
         if not self.audit_enabled:
             return None
         
+        now = datetime.utcnow()
         event = AuditEvent(
-            event_id=f"event-{len(self.events) + 1}",
+            event_id=f"event-{self.ring.total + 1}",
             event_type=event_type,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=now.isoformat(),
             actor=actor,
             action=action,
             resource=resource,
@@ -206,7 +228,10 @@ class SecurityAuditSystem:
             severity=severity
         )
         
-        self.events.append(event)
+        self.ring.append(event, now)
+        if self.writer is not None:
+            record = dict(event.__dict__, event_type=event_type.value)
+            self.writer.write(json.dumps(record, default=str))
         return event
     
     def run_compliance_check(
@@ -324,30 +349,13 @@ class SecurityAuditSystem:
         Returns:
             List of AuditEvent
         """
-        events = self.events
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        
-        if actor:
-            events = [e for e in events if e.actor == actor]
-        
-        if severity:
-            events = [e for e in events if e.severity == severity]
-        
-        if start_time:
-            events = [
-                e for e in events
-                if datetime.fromisoformat(e.timestamp) >= start_time
-            ]
-        
-        if end_time:
-            events = [
-                e for e in events
-                if datetime.fromisoformat(e.timestamp) <= end_time
-            ]
-        
-        return events[-limit:]
+        filters = {"event_type": event_type, "actor": actor, "severity": severity}
+        return self.ring.query(
+            {field: value for field, value in filters.items() if value},
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit
+        )
     
     def get_security_violations(self, limit: int = 100) -> List[AuditEvent]:
         """
@@ -393,12 +401,12 @@ class SecurityAuditSystem:
         Returns:
             Statistics dictionary
         """
-        total_events = len(self.events)
+        total_events = len(self.ring)
         
-        events_by_type = {}
-        for event in self.events:
-            event_type = event.event_type.value
-            events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
+        events_by_type = {
+            event_type.value: count
+            for event_type, count in self.ring.counts("event_type").items()
+        }
         
         events_by_severity = {
             "info": 0,
@@ -406,8 +414,7 @@ class SecurityAuditSystem:
             "error": 0,
             "critical": 0
         }
-        for event in self.events:
-            events_by_severity[event.severity] += 1
+        events_by_severity.update(self.ring.counts("severity"))
         
         return {
             "audit_enabled": self.audit_enabled,
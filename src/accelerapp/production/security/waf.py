@@ -3,11 +3,15 @@ Web Application Firewall (WAF) for protecting external endpoints.
 Implements request filtering, rate limiting, and threat detection.
 """
 
-from typing import Dict, Any, List, Optional, Set, Callable
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Callable, Pattern, Tuple
+from dataclasses import dataclass, field, fields
+from datetime import datetime
 from enum import Enum
 import re
+import time
+
+from .rule_matcher import LiteralMatcher, required_literals
+from ...utils.rate_limit import Limit, RateAlgorithm, RateLimitEngine
 
 
 class ThreatLevel(Enum):
@@ -46,6 +50,67 @@ class WAFRule:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class CompiledRuleSet:
+    """
+    Enabled pattern rules compiled for matching.
+    
+    Rules are ordered by priority once, their patterns precompiled, and the
+    literals each pattern requires are merged into one Aho-Corasick
+    automaton. A request is scanned once to find the rules that can match;
+    only those regexes run. Non-ASCII requests, whose case folding the
+    lowercase prefilter cannot mirror, evaluate every rule.
+    """
+    
+    def __init__(self, rules: List[WAFRule]):
+        """
+        Compile rules.
+        
+        Args:
+            rules: All rules (disabled and pattern-less rules are skipped)
+        """
+        active = [rule for rule in rules if rule.enabled and rule.pattern]
+        self.rules: List[WAFRule] = sorted(active, key=lambda r: r.priority)
+        self.patterns: List[Pattern] = [
+            re.compile(rule.pattern, re.IGNORECASE) for rule in self.rules
+        ]
+        
+        literals: Dict[str, int] = {}
+        self.always = 0  # rules without usable literals
+        for position, rule in enumerate(self.rules):
+            required = required_literals(rule.pattern)
+            if not required:
+                self.always |= 1 << position
+                continue
+            for literal in required:
+                literals[literal] = literals.get(literal, 0) | 1 << position
+        self.prefiltered = len(self.rules) - bin(self.always).count("1")
+        self.matcher = LiteralMatcher(list(literals.items()))
+        self.all_rules = (1 << len(self.rules)) - 1
+    
+    def candidates(self, text: str) -> List[Tuple[WAFRule, Pattern]]:
+        """
+        Get the rules that may match a text, in priority order.
+        
+        Args:
+            text: Request data
+            
+        Returns:
+            List of (rule, compiled pattern)
+        """
+        if text.isascii():
+            mask = self.matcher.scan(text.lower()) | self.always
+        else:
+            mask = self.all_rules
+        
+        candidates = []
+        while mask:
+            lowest = mask & -mask
+            position = lowest.bit_length() - 1
+            candidates.append((self.rules[position], self.patterns[position]))
+            mask ^= lowest
+        return candidates
+
+
 @dataclass
 class ThreatDetection:
     """Detected security threat."""
@@ -69,6 +134,14 @@ class RateLimitConfig:
     requests_per_hour: int = 1000
     requests_per_day: int = 10000
     burst_size: int = 10
+    
+    def limits(self) -> List[Limit]:
+        """Sliding-window engine limits, per minute, hour and day."""
+        return [
+            Limit(self.requests_per_minute, 60, algorithm=RateAlgorithm.SLIDING_WINDOW),
+            Limit(self.requests_per_hour, 3600, algorithm=RateAlgorithm.SLIDING_WINDOW),
+            Limit(self.requests_per_day, 86400, algorithm=RateAlgorithm.SLIDING_WINDOW),
+        ]
 
 
 class WebApplicationFirewall:
@@ -82,10 +155,22 @@ class WebApplicationFirewall:
         self.rules: Dict[str, WAFRule] = {}
         self.detections: List[ThreatDetection] = []
         self.rate_limits: Dict[str, RateLimitConfig] = {}
-        self.request_history: Dict[str, List[datetime]] = {}
+        self.default_rate_limit = RateLimitConfig()
+        self.rate_limiter = RateLimitEngine()
         self.blocked_ips: Set[str] = set()
         self.whitelisted_ips: Set[str] = set()
         self.enabled = True
+        self.rule_stats: Dict[str, Dict[str, float]] = {}
+        self.inspection_stats: Dict[str, float] = {
+            "requests": 0,
+            "rules_evaluated": 0,
+            "rules_skipped": 0,
+            "prefilter_ms": 0.0,
+            "regex_ms": 0.0,
+        }
+        self._compiled: Optional[CompiledRuleSet] = None
+        self._compiled_version = 0
+        self._rules_version = 0
         
         # Initialize default rules
         self._init_default_rules()
@@ -143,7 +228,12 @@ class WebApplicationFirewall:
             
         Returns:
             WAFRule
+            
+        Raises:
+            re.error: If the pattern is not a valid regular expression
         """
+        if pattern:
+            re.compile(pattern, re.IGNORECASE)
         rule = WAFRule(
             rule_id=rule_id,
             name=name,
@@ -154,8 +244,88 @@ class WebApplicationFirewall:
             metadata=metadata or {}
         )
         self.rules[rule_id] = rule
+        self.rule_stats[rule_id] = {"evaluations": 0, "matches": 0, "time_ms": 0.0}
+        self._invalidate_rules()
         return rule
     
+    def remove_rule(self, rule_id: str) -> bool:
+        """
+        Remove WAF rule.
+        
+        Args:
+            rule_id: Rule identifier
+            
+        Returns:
+            True if the rule existed
+        """
+        if self.rules.pop(rule_id, None) is None:
+            return False
+        self.rule_stats.pop(rule_id, None)
+        self._invalidate_rules()
+        return True
+    
+    def enable_rule(self, rule_id: str, enabled: bool = True) -> bool:
+        """
+        Enable or disable WAF rule.
+        
+        Args:
+            rule_id: Rule identifier
+            enabled: New state
+            
+        Returns:
+            True if the rule exists
+        """
+        return self.update_rule(rule_id, enabled=enabled)
+    
+    def disable_rule(self, rule_id: str) -> bool:
+        """Disable WAF rule."""
+        return self.enable_rule(rule_id, False)
+    
+    def update_rule(self, rule_id: str, **changes: Any) -> bool:
+        """
+        Update fields of a WAF rule.
+        
+        Rules are compiled for matching, so change them here rather than by
+        assigning attributes of the WAFRule directly.
+        
+        Args:
+            rule_id: Rule identifier
+            **changes: New values for WAFRule fields (name, enabled, action,
+                priority, pattern, metadata, ...)
+            
+        Returns:
+            True if the rule exists
+            
+        Raises:
+            ValueError: If a field name is unknown
+            re.error: If the pattern is not a valid regular expression
+        """
+        rule = self.rules.get(rule_id)
+        if rule is None:
+            return False
+        unknown = set(changes) - {f.name for f in fields(WAFRule)}
+        if unknown:
+            raise ValueError(f"Unknown rule fields: {', '.join(sorted(unknown))}")
+        if changes.get("pattern"):
+            re.compile(changes["pattern"], re.IGNORECASE)
+        
+        for name, value in changes.items():
+            setattr(rule, name, value)
+        self._invalidate_rules()
+        return True
+    
+    def _invalidate_rules(self):
+        """Bump the rule version; the compiled set is rebuilt on the next inspection."""
+        self._rules_version += 1
+    
+    def _compiled_rules(self) -> CompiledRuleSet:
+        """Get the compiled rule set, rebuilding it after rule changes."""
+        compiled = self._compiled
+        if compiled is None or self._compiled_version != self._rules_version:
+            compiled = self._compiled = CompiledRuleSet(list(self.rules.values()))
+            self._compiled_version = self._rules_version
+        return compiled
+    
     def inspect_request(
         self,
         source_ip: str,
@@ -207,17 +377,25 @@ class WebApplicationFirewall:
             )
             return rate_limit_result
         
-        # Check rules
-        rules = sorted(
-            [r for r in self.rules.values() if r.enabled],
-            key=lambda r: r.priority
-        )
+        # Combine all request data once for pattern matching
+        request_data = f"{endpoint} {method}"
+        if body:
+            request_data += f" {body}"
+        for key, value in (query_params or {}).items():
+            request_data += f" {key}={value}"
         
-        for rule in rules:
-            threat = self._check_rule(
-                rule, source_ip, endpoint, method,
-                headers or {}, body, query_params or {}
-            )
+        # Check rules that can match, in priority order
+        compiled = self._compiled_rules()
+        stats = self.inspection_stats
+        start = time.perf_counter()
+        candidates = compiled.candidates(request_data)
+        stats["prefilter_ms"] += (time.perf_counter() - start) * 1000
+        stats["requests"] += 1
+        stats["rules_skipped"] += len(compiled.rules) - len(candidates)
+        
+        for rule, pattern in candidates:
+            stats["rules_evaluated"] += 1
+            threat = self._check_rule(rule, pattern, request_data, source_ip, endpoint, method)
             if threat:
                 return threat
         
@@ -226,26 +404,25 @@ class WebApplicationFirewall:
     def _check_rule(
         self,
         rule: WAFRule,
+        pattern: Pattern,
+        request_data: str,
         source_ip: str,
         endpoint: str,
-        method: str,
-        headers: Dict[str, str],
-        body: Optional[str],
-        query_params: Dict[str, str]
+        method: str
     ) -> Optional[Dict[str, Any]]:
-        """Check if request matches rule pattern."""
-        if not rule.pattern:
-            return None
-        
-        # Combine all request data for pattern matching
-        request_data = f"{endpoint} {method}"
-        if body:
-            request_data += f" {body}"
-        for key, value in query_params.items():
-            request_data += f" {key}={value}"
-        
-        # Check pattern
-        if re.search(rule.pattern, request_data, re.IGNORECASE):
+        """Check if request data matches a rule's compiled pattern."""
+        start = time.perf_counter()
+        matched = pattern.search(request_data) is not None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        self.inspection_stats["regex_ms"] += elapsed_ms
+        rule_stats = self.rule_stats.get(rule.rule_id)
+        if rule_stats is not None:
+            rule_stats["evaluations"] += 1
+            rule_stats["time_ms"] += elapsed_ms
+            rule_stats["matches"] += matched
+        
+        if matched:
             threat_level = self._determine_threat_level(rule.rule_type)
             self._record_detection(
                 rule.rule_id, threat_level, source_ip,
@@ -278,63 +455,22 @@ class WebApplicationFirewall:
     
     def _check_rate_limit(self, source_ip: str) -> Dict[str, Any]:
         """Check if IP exceeds rate limits."""
-        config = self.rate_limits.get(source_ip)
-        if not config:
-            # Use default config
-            config = RateLimitConfig()
-            self.rate_limits[source_ip] = config
-        
-        now = datetime.utcnow()
-        
-        # Initialize request history
-        if source_ip not in self.request_history:
-            self.request_history[source_ip] = []
-        
-        # Clean old entries
-        history = self.request_history[source_ip]
-        history = [
-            ts for ts in history
-            if now - ts < timedelta(days=1)
-        ]
-        self.request_history[source_ip] = history
+        config = self.rate_limits.get(source_ip, self.default_rate_limit)
+        limits = config.limits()
         
-        # Check limits
-        minute_ago = now - timedelta(minutes=1)
-        hour_ago = now - timedelta(hours=1)
-        day_ago = now - timedelta(days=1)
+        # Records the request only if every window admits it
+        decision = self.rate_limiter.acquire(source_ip, limits)
+        if decision.allowed:
+            return {"allowed": True}
         
-        requests_last_minute = sum(1 for ts in history if ts > minute_ago)
-        requests_last_hour = sum(1 for ts in history if ts > hour_ago)
-        requests_last_day = sum(1 for ts in history if ts > day_ago)
-        
-        if requests_last_minute >= config.requests_per_minute:
-            return {
-                "allowed": False,
-                "reason": "Rate limit exceeded (per minute)",
-                "limit": config.requests_per_minute,
-                "current": requests_last_minute
-            }
-        
-        if requests_last_hour >= config.requests_per_hour:
-            return {
-                "allowed": False,
-                "reason": "Rate limit exceeded (per hour)",
-                "limit": config.requests_per_hour,
-                "current": requests_last_hour
-            }
-        
-        if requests_last_day >= config.requests_per_day:
-            return {
-                "allowed": False,
-                "reason": "Rate limit exceeded (per day)",
-                "limit": config.requests_per_day,
-                "current": requests_last_day
-            }
-        
-        # Record request
-        history.append(now)
-        
-        return {"allowed": True}
+        period = ["minute", "hour", "day"][limits.index(decision.limit)]
+        return {
+            "allowed": False,
+            "reason": f"Rate limit exceeded (per {period})",
+            "limit": decision.limit.rate,
+            "current": round(decision.used),
+            "retry_after": decision.retry_after,
+        }
     
     def _record_detection(
         self,
@@ -449,6 +585,30 @@ class WebApplicationFirewall:
             "whitelisted_ips": len(self.whitelisted_ips)
         }
     
+    def get_rule_statistics(self) -> Dict[str, Any]:
+        """
+        Get per-rule match counts and timing.
+        
+        Returns:
+            Dictionary with per-rule evaluations, matches and regex time,
+            prefilter coverage and aggregate inspection counters
+        """
+        compiled = self._compiled_rules()
+        rules = {}
+        for rule_id, stats in self.rule_stats.items():
+            evaluations = stats["evaluations"]
+            rules[rule_id] = {
+                **stats,
+                "avg_time_us": stats["time_ms"] * 1000 / evaluations if evaluations else 0.0,
+            }
+        return {
+            "rules": rules,
+            "compiled_rules": len(compiled.rules),
+            "prefiltered_rules": compiled.prefiltered,
+            "automaton_states": compiled.matcher.states,
+            "inspection": dict(self.inspection_stats),
+        }
+    
     def generate_security_report(self) -> Dict[str, Any]:
         """
         Generate WAF security report.
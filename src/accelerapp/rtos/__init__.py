@@ -6,9 +6,12 @@ Provides FreeRTOS, Zephyr, and ThreadX integration.
 from .freertos.task_generator import FreeRTOSTaskGenerator
 from .freertos.config_generator import FreeRTOSConfigGenerator
 from .freertos.ipc_primitives import IPCPrimitives
+from .freertos.schedulability import SchedulabilityAnalyzer, TaskTiming
 
 __all__ = [
     "FreeRTOSTaskGenerator",
     "FreeRTOSConfigGenerator",
     "IPCPrimitives",
+    "SchedulabilityAnalyzer",
+    "TaskTiming",
 ]
@@ -6,9 +6,12 @@ Provides task generation, configuration, and IPC primitives.
 from .task_generator import FreeRTOSTaskGenerator
 from .config_generator import FreeRTOSConfigGenerator
 from .ipc_primitives import IPCPrimitives
+from .schedulability import SchedulabilityAnalyzer, TaskTiming
 
 __all__ = [
     "FreeRTOSTaskGenerator",
     "FreeRTOSConfigGenerator",
     "IPCPrimitives",
+    "SchedulabilityAnalyzer",
+    "TaskTiming",
 ]
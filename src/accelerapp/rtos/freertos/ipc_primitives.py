@@ -195,6 +195,26 @@ class IPCPrimitives:
         
         return "\n".join(lines)
     
+    def get_lock_protocols(self, ipc_config: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Describe how each generated lock handles priority inversion.
+        
+        FreeRTOS mutexes (recursive or not) use priority inheritance;
+        semaphores taken around shared data do not.
+        
+        Args:
+            ipc_config: Complete IPC configuration
+            
+        Returns:
+            Mapping of primitive name to "inheritance" or "none"
+        """
+        protocols = {}
+        for semaphore in ipc_config.get("semaphores", []):
+            protocols[semaphore["name"]] = "none"
+        for mutex in ipc_config.get("mutexes", []):
+            protocols[mutex["name"]] = "inheritance"
+        return protocols
+    
     def generate_all_ipc(self, ipc_config: Dict[str, Any]) -> str:
         """
         Generate all IPC primitives.
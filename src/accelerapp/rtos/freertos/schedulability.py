@@ -0,0 +1,619 @@
+"""
+FreeRTOS schedulability analysis.
+Response-time analysis with resource blocking, rate/deadline-monotonic
+priority assignment and a hyperperiod simulator for fixed-priority
+preemptive scheduling.
+"""
+
+import heapq
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Any, Dict, List, Optional, Sequence
+
+from .ipc_primitives import IPCPrimitives
+
+# Times are analysed as integer microseconds so fixed-point iterations are exact
+UNITS_PER_MS = 1000
+
+PRIORITY_MACROS = {
+    "tskIDLE_PRIORITY": 0,
+    "TASK_PRIORITY_IDLE": 0,
+    "TASK_PRIORITY_LOW": 1,
+    "TASK_PRIORITY_NORMAL": 2,
+    "TASK_PRIORITY_HIGH": 3,
+    "TASK_PRIORITY_CRITICAL": 4,
+}
+
+_PRIORITY_EXPR = re.compile(r"^\(?\s*([A-Za-z_]\w*)?\s*(?:([+-])?\s*(\d+))?\s*\)?$")
+
+# Resource access protocols
+INHERITANCE = "inheritance"  # FreeRTOS mutexes
+CEILING = "ceiling"  # immediate priority ceiling
+NO_PROTOCOL = "none"  # semaphores used as locks
+
+
+def parse_priority(value: Any, max_priorities: int = 5) -> Optional[int]:
+    """
+    Resolve a FreeRTOS priority expression to a number.
+
+    Understands integers, tskIDLE_PRIORITY + n, configMAX_PRIORITIES - n
+    and the TASK_PRIORITY_* macros emitted by generate_task_priorities.
+
+    Args:
+        value: Priority value or expression
+        max_priorities: configMAX_PRIORITIES
+
+    Returns:
+        Numeric priority (higher is more urgent), or None if unknown
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if not isinstance(value, str):
+        return None
+
+    match = _PRIORITY_EXPR.match(value.strip())
+    if not match:
+        return None
+    symbol, sign, number = match.groups()
+    if symbol is None:
+        return int(number) if number is not None else None
+
+    if symbol == "configMAX_PRIORITIES":
+        base = max_priorities
+    elif symbol in PRIORITY_MACROS:
+        base = PRIORITY_MACROS[symbol]
+    else:
+        return None
+    offset = int(number) if number is not None else 0
+    return base - offset if sign == "-" else base + offset
+
+
+def hyperperiod(periods: Sequence[int]) -> int:
+    """
+    Least common multiple of integer periods.
+
+    Args:
+        periods: Periods in integer time units
+
+    Returns:
+        Hyperperiod in the same units
+    """
+    return reduce(lambda a, b: a * b // math.gcd(a, b), periods, 1)
+
+
+def _units(ms: float) -> int:
+    """Convert milliseconds to integer analysis units."""
+    return int(round(ms * UNITS_PER_MS))
+
+
+def _ms(units: int) -> float:
+    """Convert integer analysis units to milliseconds."""
+    return units / UNITS_PER_MS
+
+
+@dataclass
+class TaskTiming:
+    """Timing model of one periodic task."""
+
+    name: str
+    period_ms: float
+    wcet_ms: float
+    deadline_ms: Optional[float] = None
+    priority: Optional[int] = None
+    offset_ms: float = 0.0
+    jitter_ms: float = 0.0
+    critical_sections: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.period_ms <= 0:
+            raise ValueError(f"Task {self.name}: period must be positive")
+        if self.wcet_ms < 0:
+            raise ValueError(f"Task {self.name}: execution time must not be negative")
+        if self.deadline_ms is None:
+            self.deadline_ms = self.period_ms
+
+    @classmethod
+    def from_config(
+        cls, task_config: Dict[str, Any], index: int = 0, max_priorities: int = 5
+    ) -> "TaskTiming":
+        """
+        Build a timing model from a generator task configuration.
+
+        Reads period_ms, exec_time_ms, deadline_ms, offset_ms, jitter_ms,
+        priority and critical_sections ({resource: duration_ms} or a list of
+        {"resource", "duration_ms"} entries).
+
+        Args:
+            task_config: Task configuration
+            index: Position used to name unnamed tasks
+            max_priorities: configMAX_PRIORITIES for priority expressions
+
+        Returns:
+            TaskTiming instance
+        """
+        sections = task_config.get("critical_sections", {})
+        if isinstance(sections, list):
+            merged: Dict[str, float] = {}
+            for section in sections:
+                resource = section["resource"]
+                merged[resource] = max(merged.get(resource, 0.0), section["duration_ms"])
+            sections = merged
+
+        return cls(
+            name=task_config.get("name", f"task{index}"),
+            period_ms=task_config.get("period_ms", 1000),
+            wcet_ms=task_config.get("exec_time_ms", 10),
+            deadline_ms=task_config.get("deadline_ms"),
+            priority=parse_priority(task_config.get("priority"), max_priorities),
+            offset_ms=task_config.get("offset_ms", 0.0),
+            jitter_ms=task_config.get("jitter_ms", 0.0),
+            critical_sections=dict(sections),
+        )
+
+
+class SchedulabilityAnalyzer:
+    """
+    Fixed-priority preemptive schedulability analysis for FreeRTOS task sets.
+
+    Priorities follow FreeRTOS: larger numbers preempt smaller ones. Tasks
+    sharing a priority are treated as interfering with each other, which
+    is safe under both FIFO and round-robin time slicing.
+    """
+
+    def __init__(
+        self,
+        default_protocol: str = INHERITANCE,
+        context_switch_ms: float = 0.0,
+        max_priorities: int = 5,
+    ):
+        """
+        Initialize analyzer.
+
+        Args:
+            default_protocol: Protocol for resources not described by the IPC
+                configuration ("inheritance", "ceiling" or "none")
+            context_switch_ms: Context switch cost charged twice per job
+            max_priorities: configMAX_PRIORITIES for priority expressions
+        """
+        self.default_protocol = default_protocol
+        self.context_switch_ms = context_switch_ms
+        self.max_priorities = max_priorities
+
+    def load_tasks(self, tasks: Sequence[Any]) -> List[TaskTiming]:
+        """
+        Normalize task configurations to TaskTiming models.
+
+        Args:
+            tasks: TaskTiming instances or task configuration dictionaries
+
+        Returns:
+            List of TaskTiming
+        """
+        return [
+            task
+            if isinstance(task, TaskTiming)
+            else TaskTiming.from_config(task, index, self.max_priorities)
+            for index, task in enumerate(tasks)
+        ]
+
+    @staticmethod
+    def assign_priorities(
+        tasks: Sequence[TaskTiming], policy: str = "deadline_monotonic", base_priority: int = 1
+    ) -> Dict[str, int]:
+        """
+        Assign priorities by rate- or deadline-monotonic order.
+
+        Deadline-monotonic is optimal among fixed-priority assignments for
+        constrained deadlines and equals rate-monotonic when deadlines equal
+        periods. Each task gets its own level; ties favour the earlier task.
+
+        Args:
+            tasks: Task models
+            policy: "rate_monotonic" or "deadline_monotonic"
+            base_priority: Priority of the least urgent task
+
+        Returns:
+            Mapping of task name to priority
+        """
+        if policy not in ("rate_monotonic", "deadline_monotonic"):
+            raise ValueError(f"Unknown priority policy: {policy}")
+
+        def urgency(index: int) -> tuple:
+            task = tasks[index]
+            if policy == "rate_monotonic":
+                return (-task.period_ms, -index)
+            return (-task.deadline_ms, -task.period_ms, -index)
+
+        ordered = sorted(range(len(tasks)), key=urgency)
+        return {tasks[index].name: base_priority + rank for rank, index in enumerate(ordered)}
+
+    def resource_protocols(
+        self, tasks: Sequence[TaskTiming], ipc_config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """
+        Map each shared resource to its access protocol.
+
+        Mutexes from the IPC configuration use priority inheritance (as
+        FreeRTOS mutexes do); semaphores have no inheritance.
+
+        Args:
+            tasks: Task models
+            ipc_config: IPCPrimitives configuration
+
+        Returns:
+            Mapping of resource name to protocol
+        """
+        known = IPCPrimitives().get_lock_protocols(ipc_config or {})
+        resources = {name for task in tasks for name in task.critical_sections}
+        return {name: known.get(name, self.default_protocol) for name in sorted(resources)}
+
+    def blocking_times(
+        self,
+        tasks: Sequence[TaskTiming],
+        priorities: Sequence[int],
+        protocols: Dict[str, str],
+    ) -> List[int]:
+        """
+        Worst-case blocking by lower-priority tasks, in analysis units.
+
+        Priority inheritance: a task is blocked at most once per lower
+        priority task and once per resource whose ceiling reaches its
+        priority, so the bound is the smaller of the two sums. Priority
+        ceiling: at most one critical section. Resources without a protocol
+        are bounded like inheritance, but flagged by the caller.
+
+        Args:
+            tasks: Task models
+            priorities: Numeric priority per task
+            protocols: Resource protocols
+
+        Returns:
+            Blocking term per task
+        """
+        ceilings: Dict[str, int] = {}
+        for task, priority in zip(tasks, priorities):
+            for resource in task.critical_sections:
+                ceilings[resource] = max(ceilings.get(resource, priority), priority)
+
+        blocking = []
+        for i, priority in enumerate(priorities):
+            lower = [j for j, other in enumerate(priorities) if other < priority]
+            reachable = [r for r, ceiling in ceilings.items() if ceiling >= priority]
+            if not lower or not reachable:
+                blocking.append(0)
+                continue
+
+            sections = {
+                j: {
+                    r: _units(tasks[j].critical_sections[r])
+                    for r in reachable
+                    if r in tasks[j].critical_sections
+                }
+                for j in lower
+            }
+            if all(protocols.get(r) == CEILING for r in reachable):
+                blocking.append(max((d for s in sections.values() for d in s.values()), default=0))
+                continue
+
+            per_task = sum(max(s.values(), default=0) for s in sections.values())
+            per_resource = sum(
+                max((s.get(r, 0) for s in sections.values()), default=0) for r in reachable
+            )
+            blocking.append(min(per_task, per_resource))
+        return blocking
+
+    def response_time_analysis(
+        self,
+        tasks: Sequence[Any],
+        ipc_config: Optional[Dict[str, Any]] = None,
+        policy: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Exact response-time analysis for fixed-priority preemptive scheduling.
+
+        Handles release jitter, blocking and arbitrary deadlines (deadlines
+        longer than periods are analysed over the level-i busy period).
+
+        Args:
+            tasks: TaskTiming instances or task configuration dictionaries
+            ipc_config: IPCPrimitives configuration for blocking protocols
+            policy: Reassign priorities ("rate_monotonic" or
+                "deadline_monotonic"); configured priorities are used if
+                None, falling back to deadline-monotonic when any is missing
+
+        Returns:
+            Dictionary with schedulable flag, utilization and per-task
+            response times, blocking and slack (milliseconds)
+        """
+        models = self.load_tasks(tasks)
+        warnings: List[str] = []
+
+        assignment = "configured"
+        if policy is None and any(task.priority is None for task in models):
+            policy = "deadline_monotonic"
+            warnings.append("Missing priorities; using deadline-monotonic assignment")
+        if policy is not None:
+            assigned = self.assign_priorities(models, policy)
+            priorities = [assigned[task.name] for task in models]
+            assignment = policy
+        else:
+            priorities = [task.priority for task in models]
+
+        protocols = self.resource_protocols(models, ipc_config)
+        for resource, protocol in protocols.items():
+            if protocol == NO_PROTOCOL:
+                warnings.append(
+                    f"Resource {resource} is a semaphore without priority inheritance; "
+                    "blocking may be unbounded under medium-priority preemption"
+                )
+
+        overhead = 2 * _units(self.context_switch_ms)
+        wcet = [_units(task.wcet_ms) + overhead for task in models]
+        period = [_units(task.period_ms) for task in models]
+        deadline = [_units(task.deadline_ms) for task in models]
+        jitter = [_units(task.jitter_ms) for task in models]
+        blocking = self.blocking_times(models, priorities, protocols)
+
+        results = []
+        for i, task in enumerate(models):
+            interferers = [
+                j for j in range(len(models)) if j != i and priorities[j] >= priorities[i]
+            ]
+            response = self._response_time(
+                i, interferers, wcet, period, deadline, jitter, blocking[i]
+            )
+            schedulable = response is not None and response <= deadline[i]
+            results.append(
+                {
+                    "name": task.name,
+                    "priority": priorities[i],
+                    "period_ms": task.period_ms,
+                    "wcet_ms": task.wcet_ms,
+                    "deadline_ms": task.deadline_ms,
+                    "blocking_ms": _ms(blocking[i]),
+                    "response_time_ms": _ms(response) if response is not None else None,
+                    "slack_ms": _ms(deadline[i] - response) if response is not None else None,
+                    "schedulable": schedulable,
+                }
+            )
+
+        n = len(models)
+        utilization = sum(c / t for c, t in zip(wcet, period)) * 100 if n else 0.0
+        return {
+            "schedulable": all(r["schedulable"] for r in results),
+            "utilization": utilization,
+            "rm_utilization_bound": n * (2 ** (1 / n) - 1) * 100 if n else 100.0,
+            "priority_assignment": assignment,
+            "resource_protocols": protocols,
+            "tasks": results,
+            "warnings": warnings,
+        }
+
+    @staticmethod
+    def _response_time(
+        i: int,
+        interferers: List[int],
+        wcet: List[int],
+        period: List[int],
+        deadline: List[int],
+        jitter: List[int],
+        blocking: int,
+    ) -> Optional[int]:
+        """
+        Worst-case response time of task i, or None if it misses its deadline.
+
+        Iterates the level-i busy period job by job and stops at the first
+        job whose response exceeds the deadline, so unschedulable tasks and
+        overloaded priority levels terminate quickly.
+        """
+        level = interferers + [i]
+        if sum(wcet[j] / period[j] for j in level) > 1:
+            return None
+
+        def interference(window: int) -> int:
+            return sum(-(-(window + jitter[j]) // period[j]) * wcet[j] for j in interferers)
+
+        worst = 0
+        q = 0
+        while True:
+            # Completion time of job q measured from the busy period start
+            w = blocking + (q + 1) * wcet[i]
+            while True:
+                demand = blocking + (q + 1) * wcet[i] + interference(w)
+                if demand == w:
+                    break
+                w = demand
+                if w - q * period[i] + jitter[i] > deadline[i]:
+                    return None
+
+            response = w - q * period[i] + jitter[i]
+            if response > deadline[i]:
+                return None
+            worst = max(worst, response)
+
+            # The busy period ends once job q completes before job q+1 arrives
+            if w <= (q + 1) * period[i] - jitter[i]:
+                return worst
+            q += 1
+
+    def simulate(
+        self,
+        tasks: Sequence[Any],
+        horizon_ms: Optional[float] = None,
+        policy: Optional[str] = None,
+        stop_on_miss: bool = False,
+        max_jobs: int = 1_000_000,
+    ) -> Dict[str, Any]:
+        """
+        Simulate fixed-priority preemptive scheduling over the hyperperiod.
+
+        Discrete-event simulation: time advances straight to the next
+        release or completion, so cost is O(jobs log tasks) regardless of
+        the time resolution. Jobs are released strictly periodically
+        (jitter and blocking are not simulated; response_time_analysis
+        bounds those). Equal-priority jobs run in release order.
+
+        Args:
+            tasks: TaskTiming instances or task configuration dictionaries
+            horizon_ms: Simulated time (hyperperiod, plus the largest offset
+                plus one more hyperperiod when offsets are used, if None)
+            policy: Priority policy as for response_time_analysis
+            stop_on_miss: Stop at the first deadline miss
+            max_jobs: Upper bound on released jobs
+
+        Returns:
+            Dictionary with per-task observed response times, deadline
+            misses, preemptions and processor utilization
+        """
+        models = self.load_tasks(tasks)
+        if policy is None and any(task.priority is None for task in models):
+            policy = "deadline_monotonic"
+        if policy is not None:
+            assigned = self.assign_priorities(models, policy)
+            priorities = [assigned[task.name] for task in models]
+        else:
+            priorities = [task.priority for task in models]
+
+        n = len(models)
+        overhead = 2 * _units(self.context_switch_ms)
+        wcet = [_units(task.wcet_ms) + overhead for task in models]
+        period = [_units(task.period_ms) for task in models]
+        deadline = [_units(task.deadline_ms) for task in models]
+        offset = [_units(task.offset_ms) for task in models]
+
+        hyper = hyperperiod(period)
+        if horizon_ms is not None:
+            horizon = _units(horizon_ms)
+        else:
+            max_offset = max(offset, default=0)
+            horizon = max_offset + hyper * (2 if max_offset else 1)
+
+        releases = [(offset[i], i) for i in range(n)]
+        heapq.heapify(releases)
+        ready: List[List[int]] = []  # [-priority, release, task, remaining]
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        worst = [0] * n
+        total = [0] * n
+        completed = [0] * n
+        missed = [0] * n
+        preemptions = 0
+        busy = 0
+        released = 0
+        first_miss: Optional[Dict[str, Any]] = None
+        now = 0
+
+        while releases or ready:
+            if not ready:
+                now = max(now, releases[0][0])
+            while releases and releases[0][0] <= now:
+                release, i = heappop(releases)
+                if ready and -priorities[i] < ready[0][0]:
+                    preemptions += 1
+                heappush(ready, [-priorities[i], release, i, wcet[i]])
+                released += 1
+                following = release + period[i]
+                if following < horizon and released < max_jobs:
+                    heappush(releases, (following, i))
+
+            job = ready[0]
+            next_release = releases[0][0] if releases else None
+            finish = now + job[3]
+            if next_release is not None and next_release < finish:
+                job[3] -= next_release - now
+                busy += next_release - now
+                now = next_release
+                continue
+
+            heappop(ready)
+            busy += job[3]
+            now = finish
+            i, release = job[2], job[1]
+            response = now - release
+            total[i] += response
+            completed[i] += 1
+            if response > worst[i]:
+                worst[i] = response
+            if response > deadline[i]:
+                missed[i] += 1
+                if first_miss is None:
+                    first_miss = {
+                        "task": models[i].name,
+                        "release_ms": _ms(release),
+                        "completion_ms": _ms(now),
+                    }
+                    if stop_on_miss:
+                        break
+
+        return {
+            "schedulable": not any(missed),
+            "horizon_ms": _ms(horizon),
+            "hyperperiod_ms": _ms(hyper),
+            "jobs": released,
+            "preemptions": preemptions,
+            "utilization": busy / now * 100 if now else 0.0,
+            "first_miss": first_miss,
+            "tasks": [
+                {
+                    "name": task.name,
+                    "priority": priorities[i],
+                    "jobs": completed[i],
+                    "worst_response_ms": _ms(worst[i]),
+                    "mean_response_ms": _ms(total[i] / completed[i]) if completed[i] else None,
+                    "deadline_misses": missed[i],
+                }
+                for i, task in enumerate(models)
+            ],
+        }
+
+    def sweep(
+        self,
+        task_sets: Sequence[Sequence[Any]],
+        simulate: bool = False,
+        ipc_config: Optional[Dict[str, Any]] = None,
+        policy: Optional[str] = None,
+        processes: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyse many task-set variants.
+
+        Args:
+            task_sets: Task sets (lists of TaskTiming or configuration dicts)
+            simulate: Also run the hyperperiod simulator (stopping at the
+                first miss) on each variant
+            ipc_config: IPCPrimitives configuration shared by all variants
+            policy: Priority policy as for response_time_analysis
+            processes: Worker processes (in-process if None or 1)
+
+        Returns:
+            One summary per task set with schedulable, utilization and,
+            when simulating, simulated_schedulable
+        """
+        jobs = [(self, list(tasks), simulate, ipc_config, policy) for tasks in task_sets]
+        if not processes or processes <= 1:
+            return [_sweep_one(job) for job in jobs]
+
+        chunk = max(1, len(jobs) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return list(pool.map(_sweep_one, jobs, chunksize=chunk))
+
+
+def _sweep_one(job) -> Dict[str, Any]:
+    """Analyse one sweep variant (process pool worker)."""
+    analyzer, tasks, simulate, ipc_config, policy = job
+    analysis = analyzer.response_time_analysis(tasks, ipc_config=ipc_config, policy=policy)
+    summary = {
+        "schedulable": analysis["schedulable"],
+        "utilization": analysis["utilization"],
+        "unschedulable_tasks": [t["name"] for t in analysis["tasks"] if not t["schedulable"]],
+    }
+    if simulate:
+        result = analyzer.simulate(tasks, policy=policy, stop_on_miss=True)
+        summary["simulated_schedulable"] = result["schedulable"]
+        summary["hyperperiod_ms"] = result["hyperperiod_ms"]
+    return summary
@@ -3,7 +3,9 @@ FreeRTOS task generator.
 Generates task functions, initialization, and scheduling code.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from .schedulability import SchedulabilityAnalyzer
 
 
 class FreeRTOSTaskGenerator:
@@ -186,12 +188,61 @@ class FreeRTOSTaskGenerator:
         
         return "\n".join(lines)
     
-    def analyze_task_timing(self, tasks_config: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def assign_priorities(
+        self,
+        tasks_config: List[Dict[str, Any]],
+        policy: str = "rate_monotonic",
+        max_priorities: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Assign rate- or deadline-monotonic priorities to tasks.
+        
+        Args:
+            tasks_config: List of task configurations
+            policy: "rate_monotonic" or "deadline_monotonic"
+            max_priorities: configMAX_PRIORITIES of the target configuration
+            
+        Returns:
+            Copies of the task configurations with priority set to
+            "tskIDLE_PRIORITY + n"
+            
+        Raises:
+            ValueError: If there are more tasks than available priorities
+        """
+        if len(tasks_config) > max_priorities - 1:
+            raise ValueError(
+                f"{len(tasks_config)} tasks need distinct priorities but only "
+                f"{max_priorities - 1} are available above idle"
+            )
+        
+        analyzer = SchedulabilityAnalyzer(max_priorities=max_priorities)
+        priorities = analyzer.assign_priorities(analyzer.load_tasks(tasks_config), policy)
+        
+        assigned = []
+        for index, task in enumerate(tasks_config):
+            name = task.get("name", f"task{index}")
+            assigned.append({**task, "priority": f"tskIDLE_PRIORITY + {priorities[name]}"})
+        return assigned
+    
+    def analyze_task_timing(
+        self,
+        tasks_config: List[Dict[str, Any]],
+        ipc_config: Optional[Dict[str, Any]] = None,
+        max_priorities: int = 5,
+        context_switch_ms: float = 0.0
+    ) -> Dict[str, Any]:
         """
         Analyze task timing and scheduling feasibility.
         
+        Runs response-time analysis under fixed-priority preemption, with
+        blocking from the mutexes and semaphores in ipc_config that tasks
+        list in their critical_sections.
+        
         Args:
             tasks_config: List of task configurations
+            ipc_config: IPC configuration as passed to IPCPrimitives
+            max_priorities: configMAX_PRIORITIES of the target configuration
+            context_switch_ms: Context switch cost per switch
             
         Returns:
             Timing analysis results
@@ -221,4 +272,19 @@ class FreeRTOSTaskGenerator:
         if analysis["utilization"] > 80:
             analysis["warnings"].append(f"High CPU utilization: {analysis['utilization']:.1f}%")
         
+        # Response-time analysis
+        analyzer = SchedulabilityAnalyzer(
+            context_switch_ms=context_switch_ms, max_priorities=max_priorities
+        )
+        rta = analyzer.response_time_analysis(tasks_config, ipc_config=ipc_config)
+        analysis["schedulable"] = rta["schedulable"]
+        analysis["priority_assignment"] = rta["priority_assignment"]
+        analysis["response_times"] = {t["name"]: t["response_time_ms"] for t in rta["tasks"]}
+        analysis["blocking"] = {t["name"]: t["blocking_ms"] for t in rta["tasks"]}
+        analysis["deadline_misses"] = [t["name"] for t in rta["tasks"] if not t["schedulable"]]
+        analysis["tasks"] = rta["tasks"]
+        analysis["warnings"].extend(rta["warnings"])
+        for name in analysis["deadline_misses"]:
+            analysis["warnings"].append(f"Task {name} can miss its deadline")
+        
         return analysis
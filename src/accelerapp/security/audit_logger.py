@@ -2,21 +2,57 @@
 Audit logging for security-critical operations.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
+import operator
 from pathlib import Path
 
+from ..utils.audit_pipeline import AuditRing, BackgroundAuditWriter
+
 
 class AuditLogger:
-    """Logs security-critical operations for compliance."""
+    """
+    Logs security-critical operations for compliance.
+
+    Recent events are kept in a bounded ring indexed by type and user;
+    every event is also appended to audit.log by a background writer
+    that batches writes and rotates the file.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_events: int = 10000,
+        flush_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ):
+        """
+        Initialize audit logger.
 
-    def __init__(self, log_dir: Path):
-        """Initialize audit logger."""
+        Args:
+            log_dir: Directory for audit.log
+            max_events: Events kept in memory for queries
+            flush_interval: Maximum seconds before queued events are written
+            max_bytes: Rotate audit.log once it grows past this size
+            backup_count: Rotated log files to keep
+        """
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.log_dir / "audit.log"
-        self.events: List[Dict[str, Any]] = []
+        self.ring = AuditRing(max_events, index_fields=("type", "user"), accessor=operator.getitem)
+        self.writer = BackgroundAuditWriter(
+            self.log_file,
+            flush_interval=flush_interval,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+        )
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Events kept in memory, oldest first."""
+        return self.ring.snapshot()
 
     def log_event(
         self,
@@ -28,8 +64,9 @@ class AuditLogger:
         metadata: Dict[str, Any] = None,
     ) -> None:
         """Log security event."""
+        now = datetime.now()
         event = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "type": event_type,
             "user": user,
             "action": action,
@@ -38,12 +75,28 @@ class AuditLogger:
             "metadata": metadata or {},
         }
 
-        self.events.append(event)
+        self.ring.append(event, now)
+
+        # Serialize now so later changes to metadata are not logged
+        self.writer.write(json.dumps(event))
+
+    def get_events(
+        self,
+        limit: int = 100,
+        event_type: Optional[str] = None,
+        user: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get recent events, oldest first, optionally filtered by type and user."""
+        filters = {"type": event_type, "user": user}
+        return self.ring.query(
+            {field: value for field, value in filters.items() if value is not None},
+            limit=limit,
+        )
 
-        # Write to log file
-        with open(self.log_file, "a") as f:
-            f.write(json.dumps(event) + "\n")
+    def flush(self) -> None:
+        """Write queued events to audit.log."""
+        self.writer.flush()
 
-    def get_events(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent events."""
-        return self.events[-limit:]
+    def close(self) -> None:
+        """Write queued events and stop the background writer."""
+        self.writer.close()
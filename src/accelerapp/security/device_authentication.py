@@ -2,11 +2,13 @@
 Continuous authentication and behavioral analysis for zero-trust architecture.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-import statistics
+from array import array
+import heapq
+import math
 
 
 class TrustLevel(Enum):
@@ -28,10 +30,10 @@ class BehaviorMetrics:
     last_activity: Optional[datetime] = None
     suspicious_activities: List[str] = field(default_factory=list)
     
-    def update_activity(self, response_time: float):
+    def update_activity(self, response_time: float, now: Optional[datetime] = None):
         """Update activity metrics."""
         self.request_count += 1
-        self.last_activity = datetime.now()
+        self.last_activity = now or datetime.now()
         
         # Update moving average of response time
         if self.avg_response_time == 0:
@@ -42,7 +44,13 @@ class BehaviorMetrics:
 
 @dataclass
 class DeviceSession:
-    """Active device session."""
+    """
+    Active device session.
+    
+    The service schedules expiry from last_activity and authenticated, so
+    change them through DeviceAuthenticationService (touch_session,
+    deauthenticate) rather than by assignment.
+    """
     
     device_id: str
     session_id: str
@@ -60,6 +68,175 @@ class DeviceSession:
         return datetime.now() - self.last_activity < timeout
 
 
+class ResponseTimeBaselines:
+    """
+    Per-device response time baselines.
+    
+    Each device keeps an exponentially weighted mean and variance in
+    compact typed arrays, updated in O(1) per sample. The weight starts
+    at 1/n, so the first samples give their exact mean and variance, and
+    settles at 2 / (span + 1), which tracks roughly the last span samples.
+    """
+    
+    def __init__(self, span: int = 20, min_samples: int = 10, z_threshold: float = 3.0):
+        """
+        Initialize baselines.
+        
+        Args:
+            span: Approximate number of recent samples the baseline follows
+            min_samples: Samples needed before anomalies are reported
+            z_threshold: Standard deviations from the mean that count as anomalous
+        """
+        self.alpha = 2.0 / (span + 1)
+        self.min_samples = min_samples
+        self.z_threshold = z_threshold
+        self._slots: Dict[str, int] = {}
+        self._samples = array("q")
+        self._failures = array("q")
+        self._mean = array("d")
+        self._variance = array("d")
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._slots
+    
+    def _slot(self, device_id: str) -> int:
+        slot = self._slots.get(device_id)
+        if slot is None:
+            slot = self._slots[device_id] = len(self._slots)
+            self._samples.append(0)
+            self._failures.append(0)
+            self._mean.append(0.0)
+            self._variance.append(0.0)
+        return slot
+    
+    def observe(self, device_id: str, value: float) -> bool:
+        """
+        Score a sample against the device baseline, then fold it in.
+        
+        Args:
+            device_id: Device identifier
+            value: Response time sample
+            
+        Returns:
+            True if the sample is anomalous
+        """
+        slot = self._slot(device_id)
+        count = self._samples[slot]
+        mean = self._mean[slot]
+        variance = self._variance[slot]
+        
+        anomalous = (
+            count >= self.min_samples
+            and variance > 0
+            and abs(value - mean) > self.z_threshold * math.sqrt(variance)
+        )
+        
+        count += 1
+        alpha = max(self.alpha, 1.0 / count)
+        delta = value - mean
+        increment = alpha * delta
+        self._samples[slot] = count
+        self._mean[slot] = mean + increment
+        self._variance[slot] = (1.0 - alpha) * (variance + delta * increment)
+        return anomalous
+    
+    def record_failure(self, device_id: str) -> None:
+        """
+        Count a failed authentication for a device.
+        
+        Args:
+            device_id: Device identifier
+        """
+        self._failures[self._slot(device_id)] += 1
+    
+    def get(self, device_id: str) -> Optional[Tuple[int, int, float, float]]:
+        """
+        Get a device baseline.
+        
+        Args:
+            device_id: Device identifier
+            
+        Returns:
+            (samples, failures, mean, standard deviation), or None if unknown
+        """
+        slot = self._slots.get(device_id)
+        if slot is None:
+            return None
+        return (
+            self._samples[slot],
+            self._failures[slot],
+            self._mean[slot],
+            math.sqrt(self._variance[slot]),
+        )
+
+
+class _ExpiryWheel:
+    """
+    Keys bucketed by last-activity time.
+    
+    Touching a key moves it between buckets in O(1); expiry pops whole
+    buckets older than the cutoff from a heap of bucket numbers and only
+    checks keys individually in the bucket containing the cutoff.
+    """
+    
+    def __init__(self, resolution: float = 1.0):
+        self.resolution = resolution
+        self._buckets: Dict[int, Set[str]] = {}
+        self._order: List[int] = []  # heap of bucket numbers, may hold stale entries
+        self._times: Dict[str, float] = {}
+    
+    def __len__(self) -> int:
+        return len(self._times)
+    
+    def touch(self, key: str, timestamp: float) -> None:
+        bucket = int(timestamp // self.resolution)
+        previous = self._times.get(key)
+        self._times[key] = timestamp
+        if previous is not None:
+            old = int(previous // self.resolution)
+            if old == bucket:
+                return
+            self._discard(key, old)
+        keys = self._buckets.get(bucket)
+        if keys is None:
+            keys = self._buckets[bucket] = set()
+            heapq.heappush(self._order, bucket)
+        keys.add(key)
+    
+    def remove(self, key: str) -> None:
+        previous = self._times.pop(key, None)
+        if previous is not None:
+            self._discard(key, int(previous // self.resolution))
+    
+    def _discard(self, key: str, bucket: int) -> None:
+        keys = self._buckets[bucket]
+        keys.discard(key)
+        if not keys:
+            del self._buckets[bucket]
+    
+    def expire(self, cutoff: float) -> List[str]:
+        """Remove and return keys last touched at or before cutoff."""
+        expired: List[str] = []
+        last = int(cutoff // self.resolution)
+        while self._order and self._order[0] < last:
+            keys = self._buckets.pop(heapq.heappop(self._order), None)
+            if keys:
+                expired.extend(keys)
+                for key in keys:
+                    del self._times[key]
+        
+        keys = self._buckets.get(last)
+        if keys:
+            stale = [key for key in keys if self._times[key] <= cutoff]
+            for key in stale:
+                self.remove(key)
+            expired.extend(stale)
+        return expired
+
+
 class DeviceAuthenticationService:
     """Continuous authentication and behavioral analysis service."""
     
@@ -72,7 +249,9 @@ class DeviceAuthenticationService:
         """
         self.identity_manager = identity_manager
         self._sessions: Dict[str, DeviceSession] = {}
-        self._behavior_history: Dict[str, List[BehaviorMetrics]] = {}
+        self._baselines = ResponseTimeBaselines()
+        self._expiry = _ExpiryWheel()
+        self._deauthenticated: Set[str] = set()
         self._anomaly_threshold = 0.7  # Threshold for anomaly detection
     
     def authenticate_device(
@@ -109,8 +288,54 @@ class DeviceAuthenticationService:
         )
         
         self._sessions[session_id] = session
+        self._track(session)
         return session_id
     
+    def touch_session(self, session_id: str, when: Optional[datetime] = None) -> bool:
+        """
+        Record activity on a session.
+        
+        Args:
+            session_id: Session identifier
+            when: Activity time (default: now)
+            
+        Returns:
+            True if the session exists
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        session.last_activity = when or datetime.now()
+        self._track(session)
+        return True
+    
+    def deauthenticate(self, session_id: str) -> bool:
+        """
+        Mark a session as no longer authenticated.
+        
+        The session stays inspectable until the next cleanup removes it.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            True if the session exists
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        session.authenticated = False
+        self._track(session)
+        return True
+    
+    def _track(self, session: DeviceSession) -> None:
+        """Reschedule a session's expiry after its activity or auth state changed."""
+        self._expiry.touch(session.session_id, session.last_activity.timestamp())
+        if session.authenticated:
+            self._deauthenticated.discard(session.session_id)
+        else:
+            self._deauthenticated.add(session.session_id)
+    
     def verify_session(self, session_id: str) -> bool:
         """
         Verify active session.
@@ -148,12 +373,50 @@ class DeviceAuthenticationService:
         if not session:
             return 0.0
         
+        return self._score(session, response_time, success, datetime.now())
+    
+    def update_trust_scores(
+        self,
+        updates: Iterable[Tuple[str, float, bool]]
+    ) -> List[float]:
+        """
+        Update trust scores for many operations in one pass.
+        
+        Equivalent to calling update_trust_score for each update in order,
+        but shares one timestamp and the service lookups across the batch.
+        
+        Args:
+            updates: (session ID, response time, success) tuples
+            
+        Returns:
+            Updated trust scores in input order (0.0 for unknown sessions)
+        """
+        now = datetime.now()
+        sessions = self._sessions
+        score = self._score
+        scores = []
+        for session_id, response_time, success in updates:
+            session = sessions.get(session_id)
+            scores.append(score(session, response_time, success, now) if session else 0.0)
+        return scores
+    
+    def _score(
+        self,
+        session: DeviceSession,
+        response_time: float,
+        success: bool,
+        now: datetime
+    ) -> float:
+        """Apply one operation to a session and return its new trust score."""
+        metrics = session.metrics
+        
         # Update metrics
-        session.metrics.update_activity(response_time)
-        session.last_activity = datetime.now()
+        metrics.update_activity(response_time, now)
+        session.last_activity = now
+        self._track(session)
         
         if not success:
-            session.metrics.failed_auth_count += 1
+            metrics.failed_auth_count += 1
         
         # Calculate trust score adjustments
         trust_adjustment = 0.0
@@ -163,15 +426,15 @@ class DeviceAuthenticationService:
             trust_adjustment -= 5.0
         
         # Penalize for anomalous response times
-        if self._is_anomalous_response_time(session.device_id, response_time):
+        if self._baselines.observe(session.device_id, response_time):
             trust_adjustment -= 2.0
-            session.metrics.suspicious_activities.append(
-                f"Anomalous response time: {response_time:.3f}s at {datetime.now()}"
+            metrics.suspicious_activities.append(
+                f"Anomalous response time: {response_time:.3f}s at {now}"
             )
         
         # Penalize for high failure rate
-        if session.metrics.request_count > 10:
-            failure_rate = session.metrics.failed_auth_count / session.metrics.request_count
+        if metrics.request_count > 10:
+            failure_rate = metrics.failed_auth_count / metrics.request_count
             if failure_rate > 0.1:
                 trust_adjustment -= 10.0
         
@@ -213,7 +476,7 @@ class DeviceAuthenticationService:
     
     def _is_anomalous_response_time(self, device_id: str, response_time: float) -> bool:
         """
-        Detect anomalous response times using historical data.
+        Detect anomalous response times against the device baseline.
         
         Args:
             device_id: Device identifier
@@ -222,56 +485,11 @@ class DeviceAuthenticationService:
         Returns:
             True if response time is anomalous
         """
-        history = self._behavior_history.get(device_id, [])
-        if len(history) < 10:
-            # Not enough data for anomaly detection
-            self._record_behavior(device_id, response_time)
-            return False
-        
-        # Get recent response times
-        recent_times = [m.avg_response_time for m in history[-20:]]
-        
-        # Calculate statistics
-        mean = statistics.mean(recent_times)
-        stdev = statistics.stdev(recent_times) if len(recent_times) > 1 else 0
-        
-        # Record current behavior
-        self._record_behavior(device_id, response_time)
-        
-        # Detect anomaly (more than 3 standard deviations from mean)
-        if stdev > 0:
-            z_score = abs(response_time - mean) / stdev
-            return z_score > 3
-        
-        return False
-    
-    def _record_behavior(self, device_id: str, response_time: float):
-        """Record device behavior for analysis."""
-        if device_id not in self._behavior_history:
-            self._behavior_history[device_id] = []
-        
-        metrics = BehaviorMetrics()
-        metrics.avg_response_time = response_time
-        metrics.last_activity = datetime.now()
-        
-        self._behavior_history[device_id].append(metrics)
-        
-        # Keep only recent history (last 100 entries)
-        if len(self._behavior_history[device_id]) > 100:
-            self._behavior_history[device_id] = self._behavior_history[device_id][-100:]
+        return self._baselines.observe(device_id, response_time)
     
     def _record_failed_auth(self, device_id: str):
         """Record failed authentication attempt."""
-        if device_id not in self._behavior_history:
-            self._behavior_history[device_id] = []
-        
-        metrics = BehaviorMetrics()
-        metrics.failed_auth_count = 1
-        metrics.suspicious_activities.append(
-            f"Failed authentication at {datetime.now()}"
-        )
-        
-        self._behavior_history[device_id].append(metrics)
+        self._baselines.record_failure(device_id)
     
     def terminate_session(self, session_id: str) -> bool:
         """
@@ -283,10 +501,15 @@ class DeviceAuthenticationService:
         Returns:
             True if terminated successfully
         """
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            return True
-        return False
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._forget(session)
+        return True
+    
+    def _forget(self, session: DeviceSession) -> None:
+        self._expiry.remove(session.session_id)
+        self._deauthenticated.discard(session.session_id)
     
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -328,23 +551,23 @@ class DeviceAuthenticationService:
         Returns:
             Statistics dictionary
         """
-        history = self._behavior_history.get(device_id, [])
+        baseline = self._baselines.get(device_id)
         
-        if not history:
+        if baseline is None:
             return {"device_id": device_id, "no_data": True}
         
-        total_requests = sum(m.request_count for m in history)
-        total_failures = sum(m.failed_auth_count for m in history)
-        avg_response_times = [m.avg_response_time for m in history if m.avg_response_time > 0]
+        samples, failures, mean, stdev = baseline
+        total_requests = samples + failures
         
         return {
             "device_id": device_id,
             "total_requests": total_requests,
-            "total_failures": total_failures,
-            "failure_rate": total_failures / total_requests if total_requests > 0 else 0,
-            "avg_response_time": statistics.mean(avg_response_times) if avg_response_times else 0,
-            "history_entries": len(history),
-            "suspicious_activities": sum(len(m.suspicious_activities) for m in history)
+            "total_failures": failures,
+            "failure_rate": failures / total_requests if total_requests > 0 else 0,
+            "avg_response_time": mean,
+            "response_time_stdev": stdev,
+            "history_entries": total_requests,
+            "suspicious_activities": failures
         }
     
     def cleanup_inactive_sessions(self, timeout_minutes: int = 30) -> int:
@@ -357,12 +580,16 @@ class DeviceAuthenticationService:
         Returns:
             Number of sessions cleaned up
         """
-        inactive = []
-        for session_id, session in self._sessions.items():
-            if not session.is_active(timeout_minutes):
-                inactive.append(session_id)
+        # Only sessions in activity buckets older than the cutoff are visited
+        cutoff = datetime.now() - timedelta(minutes=timeout_minutes)
+        inactive = self._expiry.expire(cutoff.timestamp())
+        inactive.extend(self._deauthenticated)
         
+        removed = 0
         for session_id in inactive:
-            del self._sessions[session_id]
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._forget(session)
+                removed += 1
         
-        return len(inactive)
+        return removed
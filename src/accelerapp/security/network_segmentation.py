@@ -3,7 +3,7 @@ Micro-segmented device networks for zero-trust architecture.
 Provides network isolation and communication policies.
 """
 
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Iterable, Optional, List, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -28,6 +28,16 @@ class Protocol(Enum):
     COAP = "coap"
 
 
+# Zones each zone may initiate communication with
+ZONE_COMMUNICATION: Dict[NetworkZone, Set[NetworkZone]] = {
+    NetworkZone.PUBLIC: {NetworkZone.DMZ},
+    NetworkZone.DMZ: {NetworkZone.INTERNAL},
+    NetworkZone.INTERNAL: {NetworkZone.INTERNAL, NetworkZone.RESTRICTED},
+    NetworkZone.RESTRICTED: {NetworkZone.RESTRICTED, NetworkZone.CRITICAL},
+    NetworkZone.CRITICAL: {NetworkZone.CRITICAL}
+}
+
+
 @dataclass
 class CommunicationPolicy:
     """Communication policy between devices."""
@@ -85,7 +95,13 @@ class DeviceSegment:
 
 
 class NetworkSegmentationService:
-    """Manages micro-segmented device networks."""
+    """
+    Manages micro-segmented device networks.
+    
+    Policies are indexed by (source, destination) device pair and by
+    device, so a communication check is a handful of dictionary lookups.
+    The indexes are rebuilt lazily after policies are created.
+    """
     
     def __init__(self):
         """Initialize network segmentation service."""
@@ -93,6 +109,8 @@ class NetworkSegmentationService:
         self._policies: Dict[str, CommunicationPolicy] = {}
         self._device_to_segment: Dict[str, str] = {}
         self._default_deny = True
+        self._pair_index: Optional[Dict[Tuple[str, str], CommunicationPolicy]] = None
+        self._device_index: Dict[str, List[CommunicationPolicy]] = {}
     
     def create_segment(
         self,
@@ -180,8 +198,24 @@ class NetworkSegmentationService:
             metadata=metadata or {}
         )
         self._policies[policy_id] = policy
+        self._pair_index = None
         return policy
     
+    def _indexed_policies(self) -> Dict[Tuple[str, str], CommunicationPolicy]:
+        """Get the device pair index, rebuilding it if policies changed."""
+        if self._pair_index is None:
+            pair_index: Dict[Tuple[str, str], CommunicationPolicy] = {}
+            device_index: Dict[str, List[CommunicationPolicy]] = {}
+            for policy in self._policies.values():
+                # The first policy for a pair decides, as in a linear scan
+                pair_index.setdefault((policy.source_device, policy.destination_device), policy)
+                device_index.setdefault(policy.source_device, []).append(policy)
+                if policy.destination_device != policy.source_device:
+                    device_index.setdefault(policy.destination_device, []).append(policy)
+            self._pair_index = pair_index
+            self._device_index = device_index
+        return self._pair_index
+    
     def check_communication_allowed(
         self,
         source_device: str,
@@ -208,36 +242,49 @@ class NetworkSegmentationService:
         if not source_segment_id or not dest_segment_id:
             return not self._default_deny
         
-        source_segment = self._segments[source_segment_id]
-        dest_segment = self._segments[dest_segment_id]
+        policy = self._indexed_policies().get((source_device, destination_device))
         
         # Same segment communication
         if source_segment_id == dest_segment_id:
             # Check if there's a specific policy
-            for policy in self._policies.values():
-                if (policy.source_device == source_device and
-                    policy.destination_device == destination_device):
-                    return policy.allows_communication(protocol, port)
+            if policy is not None:
+                return policy.allows_communication(protocol, port)
             
             # Allow same-segment communication by default
             return True
         
         # Cross-segment communication - check zone rules
         if not self._is_zone_communication_allowed(
-            source_segment.zone,
-            dest_segment.zone
+            self._segments[source_segment_id].zone,
+            self._segments[dest_segment_id].zone
         ):
             return False
         
         # Check explicit policies
-        for policy in self._policies.values():
-            if (policy.source_device == source_device and
-                policy.destination_device == destination_device):
-                return policy.allows_communication(protocol, port)
+        if policy is not None:
+            return policy.allows_communication(protocol, port)
         
         # Default deny for cross-segment
         return False
     
+    def check_many(
+        self,
+        communications: Iterable[Tuple[str, str, Protocol, int]]
+    ) -> List[bool]:
+        """
+        Check a batch of communications.
+        
+        Args:
+            communications: (source_device, destination_device, protocol, port) tuples
+            
+        Returns:
+            Whether each communication is allowed, in input order
+        """
+        return [
+            self.check_communication_allowed(source, destination, protocol, port)
+            for source, destination, protocol, port in communications
+        ]
+    
     def _is_zone_communication_allowed(
         self,
         source_zone: NetworkZone,
@@ -253,16 +300,7 @@ class NetworkSegmentationService:
         Returns:
             True if allowed
         """
-        # Define zone communication matrix
-        allowed_communications = {
-            NetworkZone.PUBLIC: {NetworkZone.DMZ},
-            NetworkZone.DMZ: {NetworkZone.INTERNAL},
-            NetworkZone.INTERNAL: {NetworkZone.INTERNAL, NetworkZone.RESTRICTED},
-            NetworkZone.RESTRICTED: {NetworkZone.RESTRICTED, NetworkZone.CRITICAL},
-            NetworkZone.CRITICAL: {NetworkZone.CRITICAL}
-        }
-        
-        return dest_zone in allowed_communications.get(source_zone, set())
+        return dest_zone in ZONE_COMMUNICATION.get(source_zone, ())
     
     def get_segment(self, segment_id: str) -> Optional[DeviceSegment]:
         """
@@ -314,10 +352,8 @@ class NetworkSegmentationService:
             List of policies
         """
         if device_id:
-            return [
-                p for p in self._policies.values()
-                if p.source_device == device_id or p.destination_device == device_id
-            ]
+            self._indexed_policies()
+            return list(self._device_index.get(device_id, []))
         return list(self._policies.values())
     
     def enable_policy(self, policy_id: str) -> bool:
@@ -389,10 +425,8 @@ class NetworkSegmentationService:
         Returns:
             True if isolated successfully
         """
-        isolated = False
-        for policy in self._policies.values():
-            if (policy.source_device == device_id or
-                policy.destination_device == device_id):
-                policy.enabled = False
-                isolated = True
-        return isolated
+        self._indexed_policies()
+        policies = self._device_index.get(device_id, [])
+        for policy in policies:
+            policy.enabled = False
+        return bool(policies)
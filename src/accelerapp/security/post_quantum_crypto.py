@@ -3,10 +3,13 @@ Post-quantum cryptography for zero-trust architecture.
 Provides lattice-based cryptography and quantum random number generation.
 """
 
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable, Iterable, List, NamedTuple
 from dataclasses import dataclass
+from collections import OrderedDict
 import hashlib
+import hmac
 import secrets
+import threading
 import time
 
 
@@ -67,6 +70,9 @@ class PostQuantumCrypto:
             last_update=time.time()
         )
         self._key_pairs: Dict[str, LatticeKeyPair] = {}
+        self._public_index: Dict[bytes, str] = {}  # public key -> key_id
+        # SHA3-512 states with the private key already absorbed, copied per signature
+        self._signers: Dict[str, Any] = {}
     
     def generate_lattice_keypair(
         self,
@@ -102,7 +108,12 @@ class PostQuantumCrypto:
             key_size=key_size
         )
         
+        previous = self._key_pairs.get(key_id)
+        if previous is not None:
+            self._public_index.pop(previous.public_key, None)
         self._key_pairs[key_id] = keypair
+        self._public_index[public_key] = key_id
+        self._signers[key_id] = hashlib.sha3_512(private_key)
         return keypair
     
     def _derive_public_key(self, private_key: bytes, algorithm: str) -> bytes:
@@ -222,16 +233,16 @@ class PostQuantumCrypto:
         Returns:
             Signature bytes or None
         """
-        keypair = self._key_pairs.get(key_id)
-        if not keypair:
+        signer = self._signers.get(key_id)
+        if signer is None:
             return None
         
-        # Simplified signature generation
+        # Simplified signature generation: SHA3-512(private_key + message)
         # Real implementation would use Dilithium signature scheme
-        signature_data = keypair.private_key + message
-        signature = hashlib.sha3_512(signature_data).digest()
+        signature = signer.copy()
+        signature.update(message)
         
-        return signature
+        return signature.digest()
     
     def verify_signature(
         self,
@@ -250,10 +261,44 @@ class PostQuantumCrypto:
         Returns:
             True if signature is valid
         """
-        # Simplified verification
-        # Real implementation would use Dilithium verification
-        # This is a placeholder that always returns True for valid format
-        return len(signature) == 64  # SHA3-512 output size
+        return self.verify_signatures([(public_key, message, signature)])[0]
+    
+    def verify_signatures(
+        self,
+        items: Iterable[Tuple[bytes, bytes, bytes]]
+    ) -> List[bool]:
+        """
+        Verify many post-quantum signatures in one pass.
+        
+        Signatures from key pairs held by this service are recomputed and
+        compared in constant time; each distinct public key is resolved
+        once per batch. The simplified scheme cannot check signatures
+        from foreign keys, which are only checked for format.
+        
+        Args:
+            items: (public_key, message, signature) tuples
+            
+        Returns:
+            Validity of each signature, in input order
+        """
+        # Real implementation would use Dilithium (batch) verification
+        signers: Dict[bytes, Any] = {}
+        results = []
+        for public_key, message, signature in items:
+            if len(signature) != 64:  # SHA3-512 output size
+                results.append(False)
+                continue
+            if public_key not in signers:
+                key_id = self._public_index.get(public_key)
+                signers[public_key] = self._signers.get(key_id) if key_id else None
+            signer = signers[public_key]
+            if signer is None:
+                results.append(True)
+                continue
+            expected = signer.copy()
+            expected.update(message)
+            results.append(hmac.compare_digest(expected.digest(), signature))
+        return results
     
     def get_quantum_random(self, length: int) -> bytes:
         """
@@ -299,13 +344,63 @@ class PostQuantumCrypto:
         }
 
 
+class HybridKeys(NamedTuple):
+    """Key material of one hybrid identity, held as raw bytes."""
+    
+    classical_private: bytes
+    classical_public: bytes
+    pq_keypair: LatticeKeyPair
+    created_at: float
+
+
+class _Session:
+    """Cached channel secret for one identity pair."""
+    
+    __slots__ = ("secret", "expires", "uses")
+    
+    def __init__(self, secret: bytes, expires: float):
+        self.secret = secret
+        self.expires = expires
+        self.uses = 1
+
+
 class HybridCryptoManager:
-    """Manages hybrid classical and post-quantum cryptography."""
+    """
+    Manages hybrid classical and post-quantum cryptography.
     
-    def __init__(self):
-        """Initialize hybrid crypto manager."""
+    Channel secrets are cached per (local identity, remote keys) pair, so
+    re-establishing a channel between the same identities skips the hybrid
+    exchange until the session expires, reaches its use limit or is
+    rotated. The cache is bounded and evicts the least recently used
+    session.
+    """
+    
+    def __init__(
+        self,
+        session_ttl: Optional[float] = 3600.0,
+        max_session_uses: Optional[int] = None,
+        max_sessions: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize hybrid crypto manager.
+        
+        Args:
+            session_ttl: Seconds a channel secret is reused (None: no expiry)
+            max_session_uses: Establishments served per secret before rotating
+                (None: unlimited)
+            max_sessions: Maximum cached sessions
+            clock: Monotonic time source in seconds
+        """
         self.pq_crypto = PostQuantumCrypto()
-        self._hybrid_keys: Dict[str, Dict[str, Any]] = {}
+        self._hybrid_keys: Dict[str, HybridKeys] = {}
+        self.session_ttl = session_ttl
+        self.max_session_uses = max_session_uses
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions: "OrderedDict[Tuple[str, bytes, bytes], _Session]" = OrderedDict()
+        self._session_lock = threading.Lock()
+        self.session_stats = {"hits": 0, "misses": 0, "rotations": 0}
     
     def create_hybrid_identity(
         self,
@@ -315,6 +410,7 @@ class HybridCryptoManager:
         Create hybrid cryptographic identity.
         
         Combines classical and post-quantum keys for defense-in-depth.
+        Re-creating an identity drops its cached sessions.
         
         Args:
             identity_id: Identity identifier
@@ -332,27 +428,45 @@ class HybridCryptoManager:
             algorithm="kyber768"
         )
         
-        hybrid_identity = {
+        keys = HybridKeys(
+            classical_private=classical_private,
+            classical_public=classical_public,
+            pq_keypair=pq_keypair,
+            created_at=time.time()
+        )
+        if identity_id in self._hybrid_keys:
+            self.invalidate_sessions(identity_id)
+        self._hybrid_keys[identity_id] = keys
+        
+        return {
             "identity_id": identity_id,
             "classical_public_key": classical_public.hex(),
             "pq_public_key": pq_keypair.public_key.hex(),
             "pq_algorithm": pq_keypair.algorithm,
-            "created_at": time.time()
-        }
-        
-        self._hybrid_keys[identity_id] = {
-            "classical_private": classical_private,
-            "classical_public": classical_public,
-            "pq_keypair": pq_keypair
+            "created_at": keys.created_at
         }
+    
+    def get_public_keys(self, identity_id: str) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Get an identity's public keys as raw bytes.
         
-        return hybrid_identity
+        Args:
+            identity_id: Identity identifier
+            
+        Returns:
+            (classical public key, post-quantum public key) or None
+        """
+        keys = self._hybrid_keys.get(identity_id)
+        if keys is None:
+            return None
+        return keys.classical_public, keys.pq_keypair.public_key
     
     def establish_secure_channel(
         self,
         local_id: str,
         remote_classical_key: bytes,
-        remote_pq_key: bytes
+        remote_pq_key: bytes,
+        rotate: bool = False
     ) -> Optional[bytes]:
         """
         Establish secure channel using hybrid key exchange.
@@ -361,22 +475,94 @@ class HybridCryptoManager:
             local_id: Local identity identifier
             remote_classical_key: Remote classical public key
             remote_pq_key: Remote post-quantum public key
+            rotate: Replace any cached secret with a fresh exchange
             
         Returns:
             Shared secret or None
         """
-        local_keys = self._hybrid_keys.get(local_id)
-        if not local_keys:
+        if local_id not in self._hybrid_keys:
             return None
         
+        key = (local_id, bytes(remote_classical_key), bytes(remote_pq_key))
+        now = self.clock()
+        with self._session_lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                if (
+                    rotate
+                    or now >= session.expires
+                    or (self.max_session_uses is not None
+                        and session.uses >= self.max_session_uses)
+                ):
+                    del self._sessions[key]
+                    self.session_stats["rotations"] += 1
+                else:
+                    session.uses += 1
+                    self._sessions.move_to_end(key)
+                    self.session_stats["hits"] += 1
+                    return session.secret
+            self.session_stats["misses"] += 1
+        
         # Perform hybrid key exchange
         shared_secret, _ = self.pq_crypto.hybrid_key_exchange(
             remote_classical_key,
             remote_pq_key
         )
         
+        expires = now + self.session_ttl if self.session_ttl is not None else float("inf")
+        with self._session_lock:
+            # Another thread may have established this pair meanwhile; keep one secret
+            session = self._sessions.get(key)
+            if session is not None and not rotate and now < session.expires:
+                session.uses += 1
+                return session.secret
+            self._sessions[key] = _Session(shared_secret, expires)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        
         return shared_secret
     
+    def establish_secure_channels(
+        self,
+        local_id: str,
+        remotes: Iterable[Tuple[bytes, bytes]]
+    ) -> List[Optional[bytes]]:
+        """
+        Establish channels to many remote identities.
+        
+        Args:
+            local_id: Local identity identifier
+            remotes: (classical public key, post-quantum public key) pairs
+            
+        Returns:
+            Shared secrets in input order (None if the identity is unknown)
+        """
+        return [
+            self.establish_secure_channel(local_id, classical_key, pq_key)
+            for classical_key, pq_key in remotes
+        ]
+    
+    def invalidate_sessions(self, local_id: Optional[str] = None) -> int:
+        """
+        Drop cached channel secrets.
+        
+        Args:
+            local_id: Only drop sessions of this identity (all if None)
+            
+        Returns:
+            Number of sessions dropped
+        """
+        with self._session_lock:
+            if local_id is None:
+                dropped = len(self._sessions)
+                self._sessions.clear()
+                return dropped
+            keys = [key for key in self._sessions if key[0] == local_id]
+            for key in keys:
+                del self._sessions[key]
+            return len(keys)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get hybrid crypto statistics.
@@ -388,5 +574,7 @@ class HybridCryptoManager:
         
         return {
             "total_hybrid_identities": len(self._hybrid_keys),
+            "cached_sessions": len(self._sessions),
+            "session_cache": dict(self.session_stats),
             "post_quantum": pq_stats
         }
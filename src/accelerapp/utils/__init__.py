@@ -1,11 +1,16 @@
 """
 Utility modules for Accelerapp.
-Provides caching, async helpers, and performance profiling tools.
+Provides caching, async helpers, performance profiling, time-series, rate limiting
+and audit pipeline tools.
 """
 
 from .caching import CacheManager, cache_result
 from .async_utils import run_async, gather_with_concurrency
 from .performance import PerformanceProfiler, profile
+from .timeseries import RingTimeSeries
+from .import_time import measure_import_time
+from .rate_limit import Limit, RateAlgorithm, RateDecision, RateLimitEngine
+from .audit_pipeline import AuditRing, BackgroundAuditWriter
 
 __all__ = [
     "CacheManager",
@@ -14,4 +19,12 @@ __all__ = [
     "gather_with_concurrency",
     "PerformanceProfiler",
     "profile",
+    "RingTimeSeries",
+    "measure_import_time",
+    "Limit",
+    "RateAlgorithm",
+    "RateDecision",
+    "RateLimitEngine",
+    "AuditRing",
+    "BackgroundAuditWriter",
 ]
@@ -0,0 +1,406 @@
+"""
+Audit event pipeline for Accelerapp.
+Bounded in-memory event ring with field indexes, and a background file writer
+with batched writes and rotation.
+"""
+
+import atexit
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+
+class _Postings:
+    """Sequence numbers of retained records with one field value, oldest first."""
+
+    __slots__ = ("items", "head")
+
+    def __init__(self):
+        self.items: List[int] = []
+        self.head = 0  # items before head belong to evicted records
+
+    def __len__(self) -> int:
+        return len(self.items) - self.head
+
+
+class AuditRing:
+    """
+    Bounded, indexed store of recent audit records.
+
+    Records live in a fixed-size ring; once full, each append evicts the
+    oldest record. Every indexed field maps values to posting lists of
+    sequence numbers, so filtered queries visit only matching records,
+    newest first, and eviction just advances each list's head. Event
+    times are stored parsed, so time filters never reparse timestamps.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        index_fields: Sequence[str] = (),
+        accessor: Callable[[Any, str], Any] = getattr,
+    ):
+        """
+        Initialize audit ring.
+
+        Args:
+            capacity: Maximum records kept in memory
+            index_fields: Record fields to index for equality queries
+            accessor: Reads a field from a record (getattr, or
+                operator.getitem for dict records)
+        """
+        self.capacity = max(1, capacity)
+        self.index_fields = tuple(index_fields)
+        self.accessor = accessor
+        self._records: List[Any] = [None] * self.capacity
+        self._times: List[Optional[datetime]] = [None] * self.capacity
+        self._seqs: List[int] = [-1] * self.capacity
+        self._indexes: Dict[str, Dict[Any, _Postings]] = {f: {} for f in self.index_fields}
+        self._next = 0  # sequence number of the next record
+        self._ordered = True  # whether times never decreased
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Records appended since creation, including evicted ones."""
+        return self._next
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate retained records, oldest first."""
+        return iter(self.snapshot())
+
+    def snapshot(self) -> List[Any]:
+        """Get retained records, oldest first."""
+        with self._lock:
+            start = max(0, self._next - self.capacity)
+            return [self._records[seq % self.capacity] for seq in range(start, self._next)]
+
+    def append(self, record: Any, event_time: datetime) -> int:
+        """
+        Add a record, evicting the oldest one when full.
+
+        Args:
+            record: Record to store
+            event_time: Parsed event time
+
+        Returns:
+            Sequence number of the record
+        """
+        with self._lock:
+            seq = self._next
+            slot = seq % self.capacity
+            if seq and self._ordered and event_time < self._times[(seq - 1) % self.capacity]:
+                self._ordered = False
+            if seq >= self.capacity:
+                self._evict(slot)
+
+            # Invalidate the slot first so lock-free readers notice the overwrite
+            self._seqs[slot] = -1
+            self._records[slot] = record
+            self._times[slot] = event_time
+            self._seqs[slot] = seq
+            for field, index in self._indexes.items():
+                value = self.accessor(record, field)
+                postings = index.get(value)
+                if postings is None:
+                    postings = index[value] = _Postings()
+                postings.items.append(seq)
+            self._next = seq + 1
+            return seq
+
+    def _evict(self, slot: int) -> None:
+        """Drop the record in a slot from every index."""
+        record = self._records[slot]
+        for field, index in self._indexes.items():
+            value = self.accessor(record, field)
+            postings = index[value]
+            postings.head += 1
+            if not len(postings):
+                del index[value]
+            elif postings.head > 1024 and postings.head * 2 > len(postings.items):
+                # Replace rather than trim in place: live iterators keep the old list
+                postings.items = postings.items[postings.head:]
+                postings.head = 0
+
+    def iter_newest(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Iterator[Any]:
+        """
+        Iterate matching records, newest first.
+
+        Args:
+            filters: Field to required value mapping
+            start_time: Optional inclusive lower time bound
+            end_time: Optional inclusive upper time bound
+
+        Returns:
+            Lazy iterator of records
+        """
+        filters = dict(filters or {})
+        with self._lock:
+            first = max(0, self._next - self.capacity)
+            candidates: Sequence[int] = range(first, self._next)
+            head = 0
+            chosen = None
+            # Walk the shortest posting list among the indexed filters
+            for field, value in filters.items():
+                index = self._indexes.get(field)
+                if index is None:
+                    continue
+                postings = index.get(value)
+                if postings is None:
+                    return
+                if len(postings) < len(candidates) - head:
+                    candidates, head, chosen = postings.items, postings.head, field
+            filters.pop(chosen, None)
+            end = len(candidates)
+            ordered = self._ordered
+
+        accessor = self.accessor
+        for i in range(end - 1, head - 1, -1):
+            seq = candidates[i]
+            slot = seq % self.capacity
+            if self._seqs[slot] != seq:
+                return  # evicted while iterating; everything older is gone too
+            record, event_time = self._records[slot], self._times[slot]
+            if self._seqs[slot] != seq:
+                return
+            if end_time is not None and event_time > end_time:
+                continue
+            if start_time is not None and event_time < start_time:
+                if ordered:
+                    return
+                continue
+            if all(accessor(record, field) == value for field, value in filters.items()):
+                yield record
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Any]:
+        """
+        Get the most recent matching records.
+
+        Args:
+            filters: Field to required value mapping
+            start_time: Optional inclusive lower time bound
+            end_time: Optional inclusive upper time bound
+            limit: Maximum records to return
+
+        Returns:
+            Up to limit records, oldest first
+        """
+        matches = []
+        if limit > 0:
+            for record in self.iter_newest(filters, start_time, end_time):
+                matches.append(record)
+                if len(matches) >= limit:
+                    break
+        matches.reverse()
+        return matches
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """
+        Count retained records per value of an indexed field.
+
+        Args:
+            field: Indexed field
+
+        Returns:
+            Value to record count mapping
+        """
+        with self._lock:
+            return {value: len(postings) for value, postings in self._indexes[field].items()}
+
+
+def _close_writer(reference: "weakref.ref") -> None:
+    writer = reference()
+    if writer is not None:
+        writer.close()
+
+
+class BackgroundAuditWriter:
+    """
+    Appends lines to a log file from a background thread.
+
+    Callers only enqueue; the writer thread wakes when a batch is full or
+    the flush interval passes and writes the whole batch at once. The file
+    rotates when it exceeds max_bytes or rotate_interval seconds, keeping
+    backup_count numbered backups (audit.log.1 is the most recent). Queued
+    lines are flushed at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        backup_count: int = 5,
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            path: Log file path
+            batch_size: Queued lines that trigger an immediate write
+            flush_interval: Maximum seconds a line waits in the queue
+            max_bytes: Rotate once the file grows past this size (0 disables)
+            rotate_interval: Rotate after this many seconds (None disables)
+            backup_count: Rotated files to keep
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+
+        self._queue: Deque[str] = deque()
+        self._condition = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._opened_at = time.monotonic()
+        atexit.register(_close_writer, weakref.ref(self))
+
+    def write(self, line: str) -> None:
+        """
+        Queue one line (without trailing newline).
+
+        Args:
+            line: Line to write
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Audit writer is closed")
+            self._queue.append(line)
+            self._enqueued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"audit-writer-{self.path.name}", daemon=True
+                )
+                self._thread.start()
+            # Wake the writer to start the flush interval, or for a full batch
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued line has been written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was drained
+        """
+        with self._condition:
+            target = self._enqueued
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self) -> None:
+        """Write remaining lines and stop the writer thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = None
+                while not (
+                    self._closed
+                    or self._flush_requested
+                    or len(self._queue) >= self.batch_size
+                ):
+                    if not self._queue:
+                        deadline = None
+                        self._condition.wait()
+                        continue
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = list(self._queue)
+                self._queue.clear()
+                self._flush_requested = False
+                closing = self._closed
+
+            if batch:
+                self._write_batch(batch)
+            with self._condition:
+                self._written += len(batch)
+                self._condition.notify_all()
+            if closing:
+                return
+
+    def _write_batch(self, batch: List[str]) -> None:
+        try:
+            if self._interval_elapsed():
+                self._rotate()
+            size = self.path.stat().st_size if self.path.exists() else 0
+            rotating = self.max_bytes > 0 and self.backup_count > 0
+
+            # Split the batch wherever the file would reach max_bytes
+            chunks: List[List[str]] = [[]]
+            for line in batch:
+                if rotating and size >= self.max_bytes:
+                    chunks.append([])
+                    size = 0
+                chunks[-1].append(line)
+                size += len(line.encode()) + 1
+
+            for i, chunk in enumerate(chunks):
+                if i:
+                    self._rotate()
+                if chunk:
+                    with open(self.path, "a") as f:
+                        f.write("\n".join(chunk) + "\n")
+        except OSError as e:
+            self.errors += 1
+            self.last_error = e
+
+    def _interval_elapsed(self) -> bool:
+        return (
+            self.backup_count > 0
+            and self.rotate_interval is not None
+            and time.monotonic() - self._opened_at >= self.rotate_interval
+        )
+
+    def _rotate(self) -> None:
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.path.exists():
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self._opened_at = time.monotonic()
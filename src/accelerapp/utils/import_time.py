@@ -0,0 +1,99 @@
+"""
+Import-time measurement for Accelerapp.
+Runs an import in a fresh interpreter with -X importtime and parses the report.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_PACKAGE_ROOT = str(Path(__file__).resolve().parents[2])
+
+
+def parse_import_time(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse ``python -X importtime`` output.
+
+    Args:
+        output: stderr of the interpreter
+
+    Returns:
+        One entry per imported module, in import order, with name,
+        self_ms, cumulative_ms and depth (0 for top-level imports)
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            entry = {
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        except ValueError:
+            continue
+        stripped = name.lstrip()
+        entry["name"] = stripped.strip()
+        entry["depth"] = (len(name) - len(stripped) - 1) // 2
+        modules.append(entry)
+    return modules
+
+
+def measure_import_time(module: str = "accelerapp", python: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Measure the cold import time of a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+        python: Interpreter to use (the current one if None)
+
+    Returns:
+        Dictionary with total_ms (the module's cumulative import time),
+        wall_ms (interpreter start to exit) and per-module entries
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PACKAGE_ROOT, env.get("PYTHONPATH")]))
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if completed.returncode != 0:
+        message = completed.stderr.strip().splitlines()
+        raise RuntimeError(f"Importing {module} failed: {message[-1] if message else ''}")
+
+    modules = parse_import_time(completed.stderr)
+    total_ms = next(
+        (m["cumulative_ms"] for m in reversed(modules) if m["name"] == module and m["depth"] == 0),
+        0.0,
+    )
+    return {"module": module, "total_ms": total_ms, "wall_ms": wall_ms, "modules": modules}
+
+
+def slowest_imports(
+    report: Dict[str, Any], limit: int = 15, by: str = "cumulative_ms"
+) -> List[Dict[str, Any]]:
+    """
+    Get the slowest imports from a measure_import_time report.
+
+    Args:
+        report: Report from measure_import_time
+        limit: Maximum number of modules
+        by: Sort key ("cumulative_ms" or "self_ms")
+
+    Returns:
+        Module entries, slowest first
+    """
+    return sorted(report["modules"], key=lambda m: -m[by])[:limit]
@@ -0,0 +1,348 @@
+"""
+Rate limiting engine for Accelerapp.
+Keeps small per-client state for each limit, with lock striping and idle-client eviction.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+
+class RateAlgorithm:
+    """Rate limiting algorithms."""
+
+    GCRA = "gcra"  # token bucket as one theoretical-arrival timestamp
+    SLIDING_WINDOW = "sliding_window"  # weighted current + previous fixed buckets (approximate)
+    SLIDING_LOG = "sliding_log"  # timestamps of in-window requests (exact)
+
+
+@dataclass(frozen=True)
+class Limit:
+    """
+    One rate limit.
+
+    GCRA admits bursts of up to ``burst`` requests and refills at
+    rate/period. The sliding window estimates the requests in the trailing
+    period from two fixed buckets, assuming the previous bucket's requests
+    were spread evenly; traffic bunched around a bucket boundary can get
+    up to about twice ``rate`` admitted within one period. The sliding log
+    keeps the timestamp of every in-window request and admits exactly
+    ``rate`` requests per trailing period, at O(rate) memory per client.
+    """
+
+    rate: int
+    period: float
+    burst: Optional[int] = None
+    algorithm: str = RateAlgorithm.GCRA
+
+    @property
+    def capacity(self) -> int:
+        """Requests admitted back to back from an idle state."""
+        if self.algorithm == RateAlgorithm.GCRA and self.burst is not None:
+            return self.burst
+        return self.rate
+
+
+@dataclass
+class RateDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: Optional[Limit] = None  # denying limit, or the one with least headroom
+    used: float = 0.0
+    remaining: int = 0
+    retry_after: float = 0.0  # seconds until the request would be admitted
+    reset_after: float = 0.0  # seconds until every limit is fully recovered
+
+
+class _Client:
+    """Per-client limiter state."""
+
+    __slots__ = ("last_seen", "expires", "states")
+
+    def __init__(self, now: float):
+        self.last_seen = now
+        self.expires = now  # when every limit is back to its idle state
+        self.states: Dict[Limit, Any] = {}
+
+
+def _gcra(limit: Limit, state: Optional[float], now: float, cost: int):
+    """Evaluate a GCRA limit; the state is the theoretical arrival time."""
+    interval = limit.period / limit.rate
+    tolerance = interval * limit.capacity
+    tat = now if state is None else max(state, now)
+    new_tat = tat + cost * interval
+    allowed = new_tat - now <= tolerance + 1e-9
+    if allowed:
+        backlog = new_tat - now
+        retry_after = 0.0
+    else:
+        backlog = tat - now
+        retry_after = new_tat - tolerance - now
+    used = backlog / interval
+    remaining = max(0, math.floor(limit.capacity - used + 1e-9))
+    return allowed, new_tat, used, remaining, retry_after, now + backlog
+
+
+def _sliding_window(limit: Limit, state: Optional[tuple], now: float, cost: int):
+    """Evaluate a sliding-window limit; the state is (bucket index, current, previous)."""
+    period = limit.period
+    index = int(now // period)
+    if state is None or index >= state[0] + 2:
+        current = previous = 0
+    elif index == state[0] + 1:
+        current, previous = 0, state[1]
+    else:
+        current, previous = state[1], state[2]
+
+    elapsed = now / period - index  # fraction of the current bucket that has passed
+    used = previous * (1.0 - elapsed) + current
+    allowed = used + cost <= limit.rate + 1e-9
+    if allowed:
+        current += cost
+        used += cost
+        retry_after = 0.0
+    elif current + cost <= limit.rate:
+        # Wait for the previous bucket's weight to decay
+        retry_after = ((1.0 - (limit.rate - current - cost) / previous) - elapsed) * period
+    elif cost <= limit.rate:
+        # Wait for the current bucket to become the previous one and decay
+        retry_after = (2.0 - elapsed - (limit.rate - cost) / current) * period
+    else:
+        retry_after = math.inf
+
+    if current:
+        expires = (index + 2) * period
+    elif previous:
+        expires = (index + 1) * period
+    else:
+        expires = now
+    remaining = max(0, math.floor(limit.rate - used + 1e-9))
+    return allowed, (index, current, previous), used, remaining, max(0.0, retry_after), expires
+
+
+def _sliding_log(limit: Limit, state: Optional[Deque[float]], now: float, cost: int):
+    """
+    Evaluate a sliding-log limit; the state is a deque of in-window request times.
+
+    Expired times are popped from the left in place (they no longer count
+    either way); admitted requests are appended by _sliding_log_commit.
+    """
+    log = deque() if state is None else state
+    cutoff = now - limit.period
+    while log and log[0] <= cutoff:
+        log.popleft()
+
+    used = len(log)
+    allowed = used + cost <= limit.rate
+    if allowed:
+        used += cost
+        retry_after = 0.0
+        newest = now
+    else:
+        newest = log[-1] if log else now
+        if cost <= limit.rate:
+            # Wait for enough of the oldest requests to leave the window
+            retry_after = log[used + cost - limit.rate - 1] + limit.period - now
+        else:
+            retry_after = math.inf
+
+    expires = newest + limit.period if used else now
+    remaining = max(0, limit.rate - used)
+    return allowed, log, float(used), remaining, max(0.0, retry_after), expires
+
+
+def _sliding_log_commit(log: Deque[float], now: float, cost: int) -> None:
+    """Record admitted requests in a sliding log."""
+    log.extend(repeat(now, cost))
+
+
+_ALGORITHMS = {
+    RateAlgorithm.GCRA: _gcra,
+    RateAlgorithm.SLIDING_WINDOW: _sliding_window,
+    RateAlgorithm.SLIDING_LOG: _sliding_log,
+}
+
+# Algorithms whose state is updated in place once a request is admitted
+_COMMITS = {
+    RateAlgorithm.SLIDING_LOG: _sliding_log_commit,
+}
+
+
+class RateLimitEngine:
+    """
+    Shared rate limiting engine.
+
+    Each client keeps one small state per limit (a timestamp for GCRA, two
+    counters for sliding windows), so checks are O(1) regardless of request
+    history; exact sliding logs instead keep up to ``rate`` timestamps.
+    Clients are spread over independently locked stripes by hash, so
+    concurrent checks for different clients rarely contend. Clients whose
+    limits have fully recovered carry no information and are evicted in
+    bulk, a stripe at a time, as requests come in.
+    """
+
+    def __init__(
+        self,
+        stripes: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+        sweep_interval: Optional[float] = 60.0,
+    ):
+        """
+        Initialize rate limit engine.
+
+        Args:
+            stripes: Number of lock stripes (rounded up to a power of two)
+            clock: Monotonic time source in seconds
+            sweep_interval: Seconds for the rolling eviction to cover every
+                stripe once (None disables automatic eviction)
+        """
+        size = 1
+        while size < max(1, stripes):
+            size <<= 1
+        self._mask = size - 1
+        self._locks = [threading.Lock() for _ in range(size)]
+        self._clients: List[Dict[str, _Client]] = [{} for _ in range(size)]
+        self.clock = clock
+        self.sweep_interval = sweep_interval
+        self._sweep_step = sweep_interval / size if sweep_interval else None
+        self._next_sweep = clock() + (self._sweep_step or 0.0)
+        self._sweep_cursor = 0
+
+    def acquire(self, client_id: str, limits: Sequence[Limit], cost: int = 1) -> RateDecision:
+        """
+        Consume capacity from every limit, or from none if any would be exceeded.
+
+        Args:
+            client_id: Client identifier
+            limits: Limits that apply to the client
+            cost: Units to consume
+
+        Returns:
+            RateDecision
+        """
+        return self._evaluate(client_id, limits, cost, commit=True)
+
+    def peek(self, client_id: str, limits: Sequence[Limit], cost: int = 1) -> RateDecision:
+        """
+        Check limits without consuming capacity.
+
+        Args:
+            client_id: Client identifier
+            limits: Limits that apply to the client
+            cost: Units that would be consumed
+
+        Returns:
+            RateDecision
+        """
+        return self._evaluate(client_id, limits, cost, commit=False)
+
+    def reset(self, client_id: str) -> bool:
+        """
+        Forget a client's state.
+
+        Args:
+            client_id: Client identifier
+
+        Returns:
+            True if the client was tracked
+        """
+        stripe = hash(client_id) & self._mask
+        with self._locks[stripe]:
+            return self._clients[stripe].pop(client_id, None) is not None
+
+    def evict_idle(self, max_idle: Optional[float] = None) -> List[str]:
+        """
+        Evict clients in bulk.
+
+        Args:
+            max_idle: Also evict clients not seen for this many seconds;
+                by default only clients whose limits have fully recovered
+                (evicting them loses nothing)
+
+        Returns:
+            Evicted client IDs
+        """
+        evicted: List[str] = []
+        for stripe in range(len(self._locks)):
+            evicted.extend(self._evict_stripe(stripe, self.clock(), max_idle))
+        return evicted
+
+    def client_ids(self) -> List[str]:
+        """Get IDs of all tracked clients."""
+        ids: List[str] = []
+        for stripe, lock in enumerate(self._locks):
+            with lock:
+                ids.extend(self._clients[stripe])
+        return ids
+
+    def __len__(self) -> int:
+        return sum(len(clients) for clients in self._clients)
+
+    def _evaluate(
+        self, client_id: str, limits: Sequence[Limit], cost: int, commit: bool
+    ) -> RateDecision:
+        now = self.clock()
+        if self._sweep_step is not None and now >= self._next_sweep:
+            self._sweep(now)
+
+        stripe = hash(client_id) & self._mask
+        with self._locks[stripe]:
+            clients = self._clients[stripe]
+            client = clients.get(client_id)
+            if client is None:
+                client = _Client(now)
+
+            results = []
+            for limit in limits:
+                result = _ALGORITHMS[limit.algorithm](limit, client.states.get(limit), now, cost)
+                results.append((limit, result))
+            allowed = all(result[0] for _, result in results)
+
+            if commit and allowed:
+                for limit, result in results:
+                    client.states[limit] = result[1]
+                    record = _COMMITS.get(limit.algorithm)
+                    if record is not None:
+                        record(result[1], now, cost)
+                client.last_seen = now
+                client.expires = max([now] + [result[5] for _, result in results])
+                clients[client_id] = client
+
+        decision = RateDecision(allowed=allowed)
+        if not results:
+            return decision
+        if allowed:
+            decision.limit, result = min(results, key=lambda item: item[1][3])
+            decision.remaining = result[3]
+        else:
+            denied = [item for item in results if not item[1][0]]
+            decision.limit, result = max(denied, key=lambda item: item[1][4])
+        decision.used = result[2]
+        decision.retry_after = result[4]
+        decision.reset_after = max(0.0, max(item[1][5] for item in results) - now)
+        return decision
+
+    def _sweep(self, now: float):
+        """Advance the rolling eviction by one stripe."""
+        stripe = self._sweep_cursor
+        self._sweep_cursor = (stripe + 1) & self._mask
+        self._next_sweep = now + self._sweep_step
+        self._evict_stripe(stripe, now, None)
+
+    def _evict_stripe(self, stripe: int, now: float, max_idle: Optional[float]) -> List[str]:
+        idle_before = now - max_idle if max_idle is not None else -math.inf
+        with self._locks[stripe]:
+            clients = self._clients[stripe]
+            evicted = [
+                client_id
+                for client_id, client in clients.items()
+                if client.expires <= now or client.last_seen < idle_before
+            ]
+            for client_id in evicted:
+                del clients[client_id]
+        return evicted
@@ -0,0 +1,312 @@
+"""
+Fixed-capacity time-series storage for Accelerapp.
+Provides a typed ring buffer with incrementally maintained windowed aggregates.
+"""
+
+import time
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class _Window:
+    """Running aggregate state for one sliding time window."""
+
+    __slots__ = ("seconds", "start", "total", "min_queue", "max_queue")
+
+    def __init__(self, seconds: float, start: int):
+        self.seconds = seconds
+        self.start = start  # sequence number of the oldest in-window sample
+        self.total = 0.0
+        self.min_queue: Deque[Tuple[int, float]] = deque()  # increasing values
+        self.max_queue: Deque[Tuple[int, float]] = deque()  # decreasing values
+
+
+class RingTimeSeries:
+    """
+    Typed ring buffer of (timestamp, value) samples.
+
+    Appends are O(1) and never copy the buffer. Mean/min/max over
+    registered sliding windows are maintained incrementally (running sum
+    plus monotonic queues) and expired by appends relative to the newest
+    sample; queries never change that state. A query at or after the
+    newest sample only discounts the samples that have aged out since, so
+    windowed queries are amortized O(1). Older reference times and
+    unregistered windows fall back to a binary search plus scan of the
+    matching samples. Timestamps are kept non-decreasing: a
+    sample older than the newest one is stored at the newest timestamp and
+    counted in ``late_samples``.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        typecode: str = "d",
+        windows: Sequence[float] = (),
+        keep_items: bool = False,
+    ):
+        """
+        Initialize time series.
+
+        Args:
+            capacity: Maximum number of samples retained
+            typecode: array typecode for values ('d' for float, 'q' for int, ...)
+            windows: Window lengths in seconds to aggregate incrementally
+            keep_items: Store an arbitrary object alongside each sample
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+
+        self.capacity = capacity
+        self.typecode = typecode
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._items: Optional[List[Any]] = [None] * capacity if keep_items else None
+        self._next = 0  # sequence number of the next sample
+        self.late_samples = 0
+        self._windows: Dict[float, _Window] = {}
+        for seconds in windows:
+            self.add_window(seconds)
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate oldest to newest over items (or values without items)."""
+        source = self._items if self._items is not None else self._values
+        for seq in range(self._oldest, self._next):
+            yield source[seq % self.capacity]
+
+    @property
+    def _oldest(self) -> int:
+        """Sequence number of the oldest retained sample."""
+        return self._next - len(self)
+
+    @property
+    def total_appended(self) -> int:
+        """Number of samples appended since creation or the last clear."""
+        return self._next
+
+    def add_window(self, seconds: float) -> None:
+        """
+        Register a sliding window for incremental aggregation.
+
+        Args:
+            seconds: Window length in seconds
+        """
+        if seconds in self._windows:
+            return
+        window = _Window(seconds, self._oldest)
+        for seq in range(self._oldest, self._next):
+            self._window_push(window, seq, self._values[seq % self.capacity])
+        self._windows[seconds] = window
+        if self._next:
+            self._expire(window, self._times[(self._next - 1) % self.capacity] - seconds)
+
+    def append(self, value: float, timestamp: Optional[float] = None, item: Any = None) -> None:
+        """
+        Append a sample, overwriting the oldest one when full.
+
+        Args:
+            value: Sample value
+            timestamp: Sample time as epoch seconds (now if None); clamped
+                to the newest timestamp if older
+            item: Object stored with the sample (requires keep_items)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        seq = self._next
+        if seq:
+            newest = self._times[(seq - 1) % self.capacity]
+            if timestamp < newest:
+                # Window expiry and binary searches rely on ordered timestamps
+                timestamp = newest
+                self.late_samples += 1
+        slot = seq % self.capacity
+        if seq >= self.capacity:
+            evicted = seq - self.capacity
+            for window in self._windows.values():
+                if window.start == evicted:
+                    self._window_pop(window)
+
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        if self._items is not None:
+            self._items[slot] = item
+        self._next = seq + 1
+
+        stored = self._values[slot]
+        for window in self._windows.values():
+            self._window_push(window, seq, stored)
+            self._expire(window, timestamp - window.seconds)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self._next = 0
+        self.late_samples = 0
+        if self._items is not None:
+            self._items = [None] * self.capacity
+        for seconds in list(self._windows):
+            self._windows[seconds] = _Window(seconds, 0)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """Most recent (timestamp, value) pair, or None if empty."""
+        if not self._next:
+            return None
+        slot = (self._next - 1) % self.capacity
+        return self._times[slot], self._values[slot]
+
+    def values(self, limit: Optional[int] = None, since: Optional[float] = None) -> List[float]:
+        """
+        Get values oldest to newest.
+
+        Args:
+            limit: Return at most this many of the newest samples
+            since: Only samples with timestamp >= since
+
+        Returns:
+            List of values
+        """
+        return [self._values[seq % self.capacity] for seq in self._range(limit, since)]
+
+    def timestamps(self, limit: Optional[int] = None, since: Optional[float] = None) -> List[float]:
+        """
+        Get timestamps oldest to newest.
+
+        Args:
+            limit: Return at most this many of the newest samples
+            since: Only samples with timestamp >= since
+
+        Returns:
+            List of epoch-second timestamps
+        """
+        return [self._times[seq % self.capacity] for seq in self._range(limit, since)]
+
+    def items(self, limit: Optional[int] = None, since: Optional[float] = None) -> List[Any]:
+        """
+        Get stored items oldest to newest.
+
+        Args:
+            limit: Return at most this many of the newest samples
+            since: Only samples with timestamp >= since
+
+        Returns:
+            List of items
+        """
+        if self._items is None:
+            raise ValueError("Time series was created without keep_items")
+        return [self._items[seq % self.capacity] for seq in self._range(limit, since)]
+
+    def aggregate(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get count/mean/min/max over the last window of time.
+
+        A sample is in the window when its age is strictly less than
+        the window length.
+
+        Args:
+            seconds: Window length in seconds
+            now: Reference time as epoch seconds (now if None)
+
+        Returns:
+            Dictionary with count, mean, min and max (None when empty)
+        """
+        if now is None:
+            now = time.time()
+
+        cutoff = now - seconds
+        window = self._windows.get(seconds)
+        if window is None:
+            return self._scan(cutoff)
+
+        first = self._first_at_or_after(cutoff, inclusive=False)
+        if first < window.start:
+            # Older than the window's cutoff: its expired samples are gone
+            return self._scan(cutoff)
+        count = self._next - first
+        if count == 0:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+
+        # Discount samples that aged out since the last append
+        total = window.total
+        for seq in range(window.start, first):
+            total -= self._values[seq % self.capacity]
+        return {
+            "count": count,
+            "mean": total / count,
+            "min": next(value for seq, value in window.min_queue if seq >= first),
+            "max": next(value for seq, value in window.max_queue if seq >= first),
+        }
+
+    def mean(self, seconds: float, now: Optional[float] = None) -> Optional[float]:
+        """Mean over the last window of time, or None if empty."""
+        return self.aggregate(seconds, now)["mean"]
+
+    def min(self, seconds: float, now: Optional[float] = None) -> Optional[float]:
+        """Minimum over the last window of time, or None if empty."""
+        return self.aggregate(seconds, now)["min"]
+
+    def max(self, seconds: float, now: Optional[float] = None) -> Optional[float]:
+        """Maximum over the last window of time, or None if empty."""
+        return self.aggregate(seconds, now)["max"]
+
+    def _range(self, limit: Optional[int], since: Optional[float]) -> range:
+        """Sequence numbers matching limit/since, oldest to newest."""
+        start = self._oldest
+        if since is not None:
+            start = self._first_at_or_after(since, inclusive=True)
+        if limit is not None:
+            start = max(start, self._next - max(limit, 0))
+        return range(start, self._next)
+
+    def _first_at_or_after(self, cutoff: float, inclusive: bool) -> int:
+        """Binary search for the first sample at (or strictly after) cutoff."""
+        lo, hi = self._oldest, self._next
+        while lo < hi:
+            mid = (lo + hi) // 2
+            stamp = self._times[mid % self.capacity]
+            if stamp < cutoff or (not inclusive and stamp == cutoff):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _scan(self, cutoff: float) -> Dict[str, Any]:
+        """Aggregate samples newer than cutoff without window state."""
+        start = self._first_at_or_after(cutoff, inclusive=False)
+        values = [self._values[seq % self.capacity] for seq in range(start, self._next)]
+        if not values:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+        return {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "min": min(values),
+            "max": max(values),
+        }
+
+    def _window_push(self, window: _Window, seq: int, value: float) -> None:
+        """Add the newest sample to a window."""
+        window.total += value
+        while window.min_queue and window.min_queue[-1][1] >= value:
+            window.min_queue.pop()
+        window.min_queue.append((seq, value))
+        while window.max_queue and window.max_queue[-1][1] <= value:
+            window.max_queue.pop()
+        window.max_queue.append((seq, value))
+
+    def _window_pop(self, window: _Window) -> None:
+        """Drop the oldest sample from a window."""
+        window.total -= self._values[window.start % self.capacity]
+        window.start += 1
+        if window.start == self._next:
+            window.total = 0.0  # reset accumulated rounding error
+        if window.min_queue and window.min_queue[0][0] < window.start:
+            window.min_queue.popleft()
+        if window.max_queue and window.max_queue[0][0] < window.start:
+            window.max_queue.popleft()
+
+    def _expire(self, window: _Window, cutoff: float) -> None:
+        """Drop samples at or before cutoff from a window."""
+        while window.start < self._next and self._times[window.start % self.capacity] <= cutoff:
+            self._window_pop(window)
@@ -6,6 +6,7 @@ import pytest
 import time
 from accelerapp.api import RateLimiter, APIKeyManager
 from accelerapp.api.rate_limiter import RateLimitRule
+from accelerapp.utils.rate_limit import RateLimitEngine
 
 
 def test_rate_limiter_initialization():
@@ -70,6 +71,25 @@ def test_rate_limit_reset():
     assert allowed is True
 
 
+def test_rate_limiter_keeps_empty_shared_engine():
+    """Test an empty shared engine is used rather than replaced."""
+    engine = RateLimitEngine()
+    limiter = RateLimiter(engine=engine)
+    
+    assert limiter.engine is engine
+    limiter.check_limit("client1")
+    assert "client1" in engine.client_ids()
+
+
+def test_rate_limit_exact_window():
+    """Test exact rules admit at most max_requests in any trailing window."""
+    engine = RateLimitEngine()
+    limiter = RateLimiter(RateLimitRule(max_requests=10, time_window=60, exact=True), engine)
+    
+    allowed = sum(limiter.check_limit("client1")[0] for _ in range(14))
+    assert allowed == 10
+
+
 def test_rate_limit_multiple_clients():
     """Test rate limiting with multiple clients."""
     rule = RateLimitRule(max_requests=2, time_window=60)
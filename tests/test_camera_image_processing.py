@@ -0,0 +1,92 @@
+"""
+Tests for camera image processing utilities.
+"""
+
+import pytest
+
+from accelerapp.hardware.camera.utils import ImageProcessor
+
+
+def test_image_brightness_histogram():
+    """Test histogram-based brightness for frames, batches and raw bytes."""
+    np = pytest.importorskip("numpy")
+    
+    assert ImageProcessor.calculate_brightness(np.full((8, 8), 255, dtype=np.uint8)) == 1.0
+    assert ImageProcessor.calculate_brightness(bytes([0, 255])) == 0.5
+    
+    frames = np.stack([np.zeros((8, 8, 3), np.uint8), np.full((8, 8, 3), 51, np.uint8)])
+    values = ImageProcessor.calculate_brightness(frames, batch=True)
+    assert values.tolist() == pytest.approx([0.0, 0.2], abs=0.01)
+
+
+def test_image_motion_regions():
+    """Test frame differencing with connected-region extraction."""
+    np = pytest.importorskip("numpy")
+    
+    reference = np.zeros((48, 64), dtype=np.uint8)
+    current = reference.copy()
+    current[8:16, 8:24] = 200
+    current[32:40, 40:56] = 255
+    
+    regions = ImageProcessor.detect_motion_regions(reference, current)
+    assert sorted(regions) == [(8, 8, 16, 8), (40, 32, 16, 8)]
+    
+    # Diagonally touching blocks belong to one region
+    diagonal = reference.copy()
+    diagonal[0:8, 0:8] = 255
+    diagonal[8:16, 8:16] = 255
+    assert ImageProcessor.detect_motion_regions(reference, diagonal) == [(0, 0, 16, 16)]
+    
+    batched = ImageProcessor.detect_motion_regions(
+        np.stack([reference, reference]),
+        np.stack([current, reference]),
+        batch=True,
+    )
+    assert len(batched[0]) == 2
+    assert batched[1] == []
+    
+    # Encoded frames cannot be compared
+    assert ImageProcessor.detect_motion_regions(b"jpeg1", b"jpeg2") == []
+
+
+def test_image_resize_area_average():
+    """Test area-averaging resize into a preallocated buffer."""
+    np = pytest.importorskip("numpy")
+    
+    frame = np.array([[0, 4, 8, 8], [4, 8, 8, 8]], dtype=np.uint8)
+    out = np.empty((1, 2), dtype=np.uint8)
+    result = ImageProcessor.resize_image(frame, 2, 1, out=out)
+    assert result is out
+    assert out.tolist() == [[4, 8]]
+    
+    frames = np.random.randint(0, 256, (3, 30, 40, 3), dtype=np.uint8)
+    assert ImageProcessor.resize_image(frames, 25, 17, batch=True).shape == (3, 17, 25, 3)
+    assert ImageProcessor.resize_image(b"jpeg", 10, 10) == b"jpeg"
+
+
+def test_image_filters():
+    """Test separable blur, sharpen, grayscale and invert filters."""
+    np = pytest.importorskip("numpy")
+    
+    flat = np.full((6, 6), 100, dtype=np.uint8)
+    assert (ImageProcessor.apply_filter(flat, "blur") == 100).all()
+    assert (ImageProcessor.apply_filter(flat, "sharpen") == 100).all()
+    assert (ImageProcessor.apply_filter(flat, "invert") == 155).all()
+    
+    impulse = np.zeros((5, 5), dtype=np.uint8)
+    impulse[2, 2] = 255
+    blurred = ImageProcessor.apply_filter(impulse, "blur")
+    assert blurred[2, 2] < 255
+    assert blurred[1, 2] > 0
+    
+    # In-place filtering over a batch of color frames
+    frames = np.random.randint(0, 256, (2, 10, 12, 3), dtype=np.uint8)
+    result = ImageProcessor.apply_filter(frames, "blur", out=frames, batch=True)
+    assert result is frames
+    
+    gray = np.empty((2, 10, 12), dtype=np.uint8)
+    ImageProcessor.apply_filter(frames, "grayscale", out=gray, batch=True)
+    assert gray.shape == (2, 10, 12)
+    
+    with pytest.raises(ValueError):
+        ImageProcessor.apply_filter(flat, "emboss")
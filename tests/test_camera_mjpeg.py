@@ -0,0 +1,115 @@
+"""
+Tests for the MJPEG streaming protocol and relay server.
+"""
+
+import asyncio
+
+import pytest
+
+from accelerapp.hardware.camera.protocols import MJPEGProtocol, MJPEGStreamServer
+
+
+class _FakeCamera:
+    """Camera stand-in for servers fed with published frames."""
+
+
+def test_mjpeg_frame_parts():
+    """Test MJPEG frame pieces reference the frame without copying."""
+    camera = _FakeCamera()
+    mjpeg = MJPEGProtocol(camera)
+    frame = b"\xff\xd8jpeg\xff\xd9"
+    
+    header, view, trailer = mjpeg.frame_parts(frame)
+    
+    assert header.startswith(b"--frame\r\n")
+    assert b"Content-Length: 8" in header
+    assert view.obj is frame
+    assert trailer == b"\r\n"
+    assert mjpeg.format_frame(frame) == header + frame + trailer
+
+
+@pytest.mark.asyncio
+async def test_mjpeg_stream_server_shares_frames():
+    """Test one published frame reaches every client and slow clients skip frames."""
+    camera = _FakeCamera()
+    server = MJPEGProtocol(camera).create_server(host="127.0.0.1", port=0)
+    assert await server.start()
+    
+    clients = []
+    for _ in range(2):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /stream HTTP/1.1\r\nHost: camera\r\n\r\n")
+        await writer.drain()
+        response = await reader.readuntil(b"\r\n\r\n")
+        assert response.startswith(b"HTTP/1.1 200 OK")
+        assert b"multipart/x-mixed-replace" in response
+        clients.append((reader, writer))
+    
+    await asyncio.sleep(0.05)
+    server.publish_frame(b"J" * 1000)
+    for reader, _ in clients:
+        part_header = await reader.readuntil(b"\r\n\r\n")
+        assert b"Content-Length: 1000" in part_header
+        assert await reader.readexactly(1002) == b"J" * 1000 + b"\r\n"
+    
+    # A burst of frames is coalesced to the newest one per client
+    await asyncio.sleep(0.01)
+    for index in range(5):
+        server.publish_frame(bytes([index]) * 10)
+    await asyncio.sleep(0.05)
+    
+    status = server.get_status()
+    assert status["clients"] == 2
+    for stats in status["client_stats"]:
+        assert stats["frames_sent"] + stats["frames_skipped"] == 6
+        assert stats["frames_skipped"] >= 1
+        assert stats["bytes_sent"] > 1000
+        assert stats["last_latency_ms"] >= 0.0
+    
+    for _, writer in clients:
+        writer.close()
+    await server.stop()
+    
+    # Disconnected clients are folded into the running totals
+    closed = server.get_status()
+    assert not closed["running"]
+    assert closed["clients"] == 0
+    assert closed["total_bytes_sent"] == status["total_bytes_sent"]
+    assert closed["total_frames_sent"] == status["total_frames_sent"]
+
+
+@pytest.mark.asyncio
+async def test_mjpeg_stream_server_unknown_path():
+    """Test requests outside the stream path get a 404."""
+    camera = _FakeCamera()
+    server = MJPEGStreamServer(MJPEGProtocol(camera), host="127.0.0.1", port=0)
+    await server.start()
+    
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(b"GET /snapshot HTTP/1.1\r\n\r\n")
+    await writer.drain()
+    
+    assert (await reader.read()).startswith(b"HTTP/1.1 404")
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_mjpeg_stream_server_stop_disconnects_clients():
+    """Test stopping the server ends every client handler task."""
+    server = MJPEGProtocol(_FakeCamera()).create_server(host="127.0.0.1", port=0)
+    await server.start()
+    
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(b"GET /stream HTTP/1.1\r\n\r\n")
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    handlers = list(server._handlers)
+    assert len(handlers) == 1
+    
+    await asyncio.wait_for(server.stop(), timeout=5.0)
+    
+    assert all(task.done() for task in handlers)
+    assert not server._handlers
+    assert await asyncio.wait_for(reader.read(), timeout=5.0) == b""
+    writer.close()
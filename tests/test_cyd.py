@@ -186,6 +186,63 @@ def test_sensor_monitor():
     assert "LDR_PIN" in arduino_code
 
 
+def test_sensor_monitor_readings():
+    """Test SensorMonitor reading history and windowed aggregates."""
+    from datetime import timedelta
+    from accelerapp.hardware.cyd.hal import SensorMonitor, SensorType, SensorReading
+    
+    monitor = SensorMonitor(max_readings=5)
+    now = datetime.now()
+    
+    # Old reading falls outside the 5 minute window
+    monitor.record_reading(
+        SensorReading(SensorType.TEMPERATURE, 90.0, "C", now - timedelta(minutes=10))
+    )
+    for i, value in enumerate([30.0, 40.0, 35.0]):
+        monitor.record_reading(
+            SensorReading(SensorType.TEMPERATURE, value, "C", now + timedelta(microseconds=i))
+        )
+    monitor.record_reading(SensorReading(SensorType.LIGHT, 1200.0, "raw", now))
+    
+    assert monitor.get_average(SensorType.TEMPERATURE) == pytest.approx(35.0)
+    assert monitor.get_min_max(SensorType.TEMPERATURE) == {"min": 30.0, "max": 40.0}
+    assert monitor.get_average(SensorType.TEMPERATURE, minutes=15) == pytest.approx(48.75)
+    assert monitor.get_min_max(SensorType.PERFORMANCE) is None
+    
+    assert len(monitor.get_readings(SensorType.TEMPERATURE)) == 4
+    assert len(monitor.get_readings()) == 5
+    assert monitor.get_readings(limit=1)[0].value == 35.0
+    
+    # Capacity is per sensor type
+    for i in range(10):
+        monitor.record_reading(SensorReading(SensorType.TEMPERATURE, float(i), "C", now))
+    assert [r.value for r in monitor.get_readings(SensorType.TEMPERATURE)] == [5, 6, 7, 8, 9]
+    
+    monitor.clear_readings()
+    assert monitor.get_readings() == []
+
+
+def test_sensor_monitor_late_readings():
+    """Test readings arriving out of order keep windowed aggregates consistent."""
+    from datetime import timedelta
+    from accelerapp.hardware.cyd.hal import SensorMonitor, SensorType, SensorReading
+    
+    monitor = SensorMonitor(max_readings=10)
+    now = datetime.now()
+    for value, age in ((20.0, 2), (30.0, 1), (25.0, 3)):
+        monitor.record_reading(
+            SensorReading(SensorType.TEMPERATURE, value, "C", now - timedelta(seconds=age))
+        )
+    
+    # The late reading is recorded at the newest timestamp, never before it
+    aggregate = monitor.get_aggregate(SensorType.TEMPERATURE, minutes=1)
+    assert aggregate["count"] == 3
+    assert aggregate["mean"] == pytest.approx(25.0)
+    assert aggregate["min"] == 20.0 and aggregate["max"] == 30.0
+    assert [r.value for r in monitor.get_readings(SensorType.TEMPERATURE)] == [20.0, 30.0, 25.0]
+    assert monitor.get_aggregate(SensorType.TEMPERATURE, minutes=1.5) == aggregate
+
+
 # Community Integration Tests
 
 def test_community_integration():
@@ -338,6 +395,96 @@ def test_cyd_simulator():
     assert simulator._running is False
 
 
+def test_cyd_simulator_framebuffer():
+    """Test CYDSimulator framebuffer fills, blits and exports."""
+    from accelerapp.hardware.cyd.digital_twin import CYDSimulator
+    
+    simulator = CYDSimulator()
+    simulator.fill_rectangle(310, 230, 20, 20, 0xF800)  # clipped at the edge
+    assert simulator.get_pixel(319, 239) == 0xF800
+    assert simulator.get_pixel(309, 239) == 0x0000
+    
+    simulator.blit(0, 0, 2, 2, [0x0001, 0x0002, 0x0003, 0x0004])
+    assert simulator.get_pixel(1, 1) == 0x0004
+    
+    # Short or empty sources are rejected without touching the display
+    with pytest.raises(ValueError):
+        simulator.blit(0, 0, 4, 2, [1, 2, 3])
+    with pytest.raises(ValueError):
+        simulator.blit(0, 0, 0, 2, [])
+    assert len(simulator.export_display_buffer()) == 320 * 240 * 2
+    
+    regions = simulator.export_dirty_regions()
+    assert [rect for rect, _ in regions] == [(310, 230, 10, 10), (0, 0, 2, 2)]
+    assert len(regions[0][1]) == 10 * 10 * 2
+    assert simulator.export_dirty_regions() == []
+    
+    # RGB565 export is big-endian; RGB888 expands each channel to 8 bits
+    rgb565 = simulator.export_display_buffer()
+    offset = (239 * 320 + 319) * 2
+    assert rgb565[offset:offset + 2] == b"\xf8\x00"
+    rgb888 = simulator.export_display_buffer("rgb888")
+    offset = (239 * 320 + 319) * 3
+    assert rgb888[offset:offset + 3] == b"\xff\x00\x00"
+    assert simulator.export_display_buffer("png").startswith(b"\x89PNG")
+    
+    assert simulator.get_display_view()[239, 319] == 0xF800
+    
+    # State snapshots index as [y][x] and do not follow later drawing
+    display = simulator.get_state().display_buffer
+    assert display[239][319] == 0xF800
+    assert display[-1][-1] == 0xF800
+    assert len(display) == 240 and len(display[0]) == 320
+    simulator.set_pixel(319, 239, 0x001F)
+    assert display[239][319] == 0xF800
+    assert simulator.get_state().display_buffer.tolist()[239][319] == 0x001F
+    assert simulator.get_statistics()["display_pixels_lit"] == 104
+    
+    simulator.reset()
+    assert simulator.get_statistics()["display_pixels_lit"] == 0
+
+
+def test_cyd_fleet_simulator():
+    """Test CYDFleetSimulator batch stepping and scheduled events."""
+    from accelerapp.hardware.cyd.digital_twin import CYDFleetSimulator, CYDSimulator, run_fleet
+    
+    # A single fleet device follows the same thermal model as CYDSimulator
+    simulator = CYDSimulator()
+    simulator.start()
+    simulator.fill_rectangle(0, 0, 10, 10, 0xFFFF)
+    simulator.set_cpu_frequency(240)
+    simulator.inject_event("temperature", {"temperature": 30.0})
+    for _ in range(500):
+        simulator.step(0.5)
+    
+    fleet = CYDFleetSimulator(3, dt=0.5)
+    fleet.inject_event(0, "temperature", {"temperature": 30.0})
+    fleet.inject_event(100, "cpu_frequency", {"frequency": 80}, instances=[2])
+    fleet.inject_event(100, "gpio", {"pin": 22, "state": True}, instances=[1])
+    fleet.step(500)
+    
+    assert fleet.temperature[0] == pytest.approx(simulator.get_statistics()["temperature_c"])
+    assert fleet.get_device_state(1)["gpio_states"] == {22: True}
+    assert fleet.get_device_state(2)["cpu_frequency_mhz"] == 80
+    assert fleet.power[2] < fleet.power[0] < fleet.power[1]
+    assert fleet.get_statistics()["events_applied"] == 3
+    
+    telemetry = fleet.run(3600, sample_interval=60)
+    assert telemetry.temperature.shape == (61, 3)
+    assert telemetry.times[-1] - telemetry.times[0] == 3600
+    assert telemetry.summary()["energy_wh"] > 0
+    
+    with pytest.raises(ValueError):
+        fleet.inject_event(10, "unknown", {})
+    
+    # Sharded runs match a single-process run
+    events = [(60, "display", {"on": False}, [0, 9])]
+    sharded = run_fleet(10, 600, events=events, processes=2)
+    single = run_fleet(10, 600, events=events)
+    assert (sharded.temperature == single.temperature).all()
+    assert sharded.power[-1, 0] < sharded.power[-1, 1]
+
+
 def test_cyd_twin_model():
     """Test CYDTwinModel."""
     from accelerapp.hardware.cyd.digital_twin import CYDTwinModel, TwinStatus
@@ -369,6 +516,21 @@ def test_cyd_twin_model():
     telemetry = model.get_telemetry(limit=1)
     assert len(telemetry) == 1
     
+    model.record_telemetry({"temperature": 55.0, "status": "ok"})
+    assert model.get_telemetry()[-1]["status"] == "ok"
+    stats = model.get_telemetry_aggregate("temperature", window_seconds=60)
+    assert stats["count"] == 2
+    assert stats["mean"] == pytest.approx(50.0)
+    assert stats["max"] == 55.0
+    assert model.get_telemetry_aggregate("status")["count"] == 0
+    
+    # History keeps only the newest records
+    bounded = CYDTwinModel(device_id="cyd-002", device_name="Bounded", max_telemetry_records=3)
+    for i in range(5):
+        bounded.record_telemetry({"index": i})
+    assert [r["index"] for r in bounded.get_telemetry()] == [2, 3, 4]
+    assert [r["index"] for r in bounded.get_telemetry(limit=2)] == [3, 4]
+    
     # Serialization
     data = model.to_dict()
     assert data["device_id"] == "cyd-001"
@@ -405,6 +567,14 @@ def test_cyd_monitor():
     # Get metrics
     metrics = monitor.get_metrics(device_id="cyd-001", metric_name="temperature")
     assert len(metrics) > 0
+    assert [m.value for m in metrics] == [35.0, 65.0]
+    assert len(monitor.get_metrics(device_id="cyd-001")) == 3
+    assert len(monitor.get_metrics(limit=1)) == 1
+    
+    stats = monitor.get_metric_aggregate("cyd-001", "temperature", window_seconds=60)
+    assert stats["count"] == 2
+    assert stats["mean"] == pytest.approx(50.0)
+    assert stats["min"] == 35.0
     
     # Get summaries
     device_summary = monitor.get_device_summary("cyd-001")
@@ -2,6 +2,7 @@
 Tests for enterprise features.
 """
 
+import json
 import pytest
 import tempfile
 from pathlib import Path
@@ -15,6 +16,7 @@ from accelerapp.enterprise import (
     BIDashboard,
 )
 from accelerapp.enterprise.governance.data_governor import DataClassification
+from accelerapp.enterprise.audit.audit_logger import AuditEvent
 
 
 class TestSSOManager:
@@ -121,6 +123,67 @@ class TestRBACManager:
         rbac.assign_role("user1", "developer")
         assert rbac.check_resource_access("user1", "devices", "read")
         assert not rbac.check_resource_access("user1", "users", "manage")
+    
+    def test_transitive_role_inheritance(self):
+        """Test permissions are inherited through every ancestor role."""
+        rbac = RBACManager()
+        rbac.create_role("operator", "Operator", "Runs jobs", ["execute_generation"], ["viewer"])
+        rbac.create_role("lead", "Lead", "Leads a team", ["manage_users"], ["operator"])
+        # Cycles are tolerated
+        rbac.set_role_parents("viewer", ["lead"])
+        
+        rbac.assign_role("user1", "lead")
+        assert rbac.check_permission("user1", "read_logs")
+        assert rbac.check_resource_access("user1", "generation", "execute")
+        
+        rbac.assign_role("user2", "viewer")
+        assert rbac.check_resource_access("user2", "users", "manage")
+        assert not rbac.check_resource_access("user2", "settings", "manage")
+    
+    def test_materialized_access_invalidation(self):
+        """Test cached access follows role assignments and role edits."""
+        rbac = RBACManager()
+        rbac.create_role("operator", "Operator", "Runs jobs", [], ["viewer"])
+        rbac.assign_role("user1", "operator")
+        assert rbac.check_resource_access("user1", "devices", "read")
+        assert not rbac.check_resource_access("user1", "devices", "write")
+        
+        assert rbac.grant_permission("operator", "write_devices")
+        assert rbac.check_resource_access("user1", "devices", "write")
+        assert rbac.revoke_permission("operator", "write_devices")
+        assert not rbac.check_resource_access("user1", "devices", "write")
+        
+        assert rbac.update_role("viewer", permissions=["read_analytics"])
+        assert not rbac.check_resource_access("user1", "devices", "read")
+        assert rbac.update_permission("read_analytics", action="export")
+        assert rbac.check_resource_access("user1", "analytics", "export")
+        assert not rbac.update_role("missing", name="Missing")
+        with pytest.raises(ValueError):
+            rbac.update_permission("read_analytics", scope="all")
+        with pytest.raises(ValueError):
+            rbac.update_permission("read_analytics", permission_id="other")
+        with pytest.raises(ValueError):
+            rbac.update_role("operator", role_id="other")
+        assert rbac.roles["operator"].role_id == "operator"
+        
+        assert rbac.delete_role("viewer")
+        assert not rbac.check_permission("user1", "read_analytics")
+        
+        assert rbac.revoke_role("user1", "operator")
+        assert not rbac.check_permission("user1", "read_analytics")
+    
+    def test_bulk_resource_access(self):
+        """Test checking many users against many resources at once."""
+        rbac = RBACManager()
+        rbac.assign_role("alice", "admin")
+        rbac.assign_role("bob", "viewer")
+        requests = [("devices", "read"), ("devices", "delete")]
+        
+        results = rbac.check_resource_access_bulk(["alice", "bob", "nobody"], requests)
+        
+        assert results["alice"] == {("devices", "read"): True, ("devices", "delete"): True}
+        assert results["bob"] == {("devices", "read"): True, ("devices", "delete"): False}
+        assert not any(results["nobody"].values())
 
 
 class TestTenantManager:
@@ -177,6 +240,81 @@ class TestTenantManager:
         
         usage = tm.get_tenant_usage(tenant.tenant_id)
         assert usage["total_resources"] == 1
+    
+    def test_resource_counters_and_limits(self):
+        """Test incremental per-type counts against limits."""
+        tm = TenantManager()
+        
+        tenant = tm.create_tenant("Test Org", resource_limits={"max_device": 2})
+        first = tm.create_resource(tenant.tenant_id, "device", {"n": 1})
+        assert tm.create_resource(tenant.tenant_id, "device", {"n": 2}) is not None
+        assert tm.create_resource(tenant.tenant_id, "device", {"n": 3}) is None
+        assert tm.create_resource(tenant.tenant_id, "user", {}) is not None
+        
+        assert tm.delete_resource(tenant.tenant_id, first.resource_id)
+        assert not tm.delete_resource(tenant.tenant_id, first.resource_id)
+        assert tm.create_resource(tenant.tenant_id, "device", {"n": 4}) is not None
+        
+        devices = tm.get_tenant_resources(tenant.tenant_id, "device")
+        assert [r.data["n"] for r in devices] == [2, 4]
+        usage = tm.get_tenant_usage(tenant.tenant_id)
+        assert usage["total_resources"] == 3
+        assert usage["resources_by_type"] == {"device": 2, "user": 1}
+        assert len(tm.resources[tenant.tenant_id]) == 3
+    
+    def test_reserve_then_commit_is_thread_safe(self):
+        """Test concurrent reservations never exceed a limit."""
+        import threading
+        
+        tm = TenantManager()
+        tenant = tm.create_tenant("Test Org", resource_limits={"max_device": 50})
+        
+        def worker():
+            for _ in range(20):
+                reservation = tm.reserve_resources(tenant.tenant_id, {"device": 1})
+                if reservation is not None:
+                    tm.commit_reservation(reservation, [("device", {})])
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(tm.get_tenant_resources(tenant.tenant_id, "device")) == 50
+        
+        oldest = tm.get_tenant_resources(tenant.tenant_id)[0]
+        tm.delete_resource(tenant.tenant_id, oldest.resource_id)
+        reservation = tm.reserve_resources(tenant.tenant_id, {"device": 1})
+        assert reservation is not None
+        assert tm.get_tenant_usage(tenant.tenant_id)["reserved_by_type"] == {"device": 1}
+        assert tm.reserve_resources(tenant.tenant_id, {"device": 1}) is None
+        assert tm.commit_reservation(reservation, [("device", {}), ("device", {})]) is None
+        assert tm.release_reservation(reservation)
+        assert tm.commit_reservation(reservation, [("device", {})]) is None
+        assert tm.get_tenant_usage(tenant.tenant_id)["reserved_by_type"] == {}
+    
+    def test_bulk_provisioning_is_all_or_nothing(self):
+        """Test creating resources for many tenants in one call."""
+        tm = TenantManager()
+        tenants = [
+            tm.create_tenant(f"Org {i}", resource_limits={"max_device": 2}) for i in range(3)
+        ]
+        
+        requests = [(t.tenant_id, "device", {"i": i}) for i, t in enumerate(tenants * 2)]
+        created = tm.create_resources(requests)
+        assert [r.data["i"] for r in created] == list(range(6))
+        assert all(
+            tm.get_tenant_usage(t.tenant_id)["resources_by_type"] == {"device": 2}
+            for t in tenants
+        )
+        
+        tm.delete_resource(tenants[0].tenant_id, created[0].resource_id)
+        assert tm.create_resources([
+            (tenants[0].tenant_id, "device", {}),
+            (tenants[1].tenant_id, "device", {}),
+        ]) is None
+        assert tm.get_tenant_usage(tenants[0].tenant_id)["total_resources"] == 1
+        assert tm.get_tenant_usage(tenants[0].tenant_id)["reserved_by_type"] == {}
 
 
 class TestEnterpriseAuditLogger:
@@ -220,6 +358,123 @@ class TestEnterpriseAuditLogger:
             
             activity = logger.get_user_activity("user1")
             assert len(activity) == 2
+    
+    def test_segments_survive_restart(self):
+        """Test events are appended to rolling segments and reloaded."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = EnterpriseAuditLogger(Path(tmpdir))
+            logger.store.segment_max_events = 4
+            for i in range(10):
+                logger.log_event(
+                    f"tenant{i % 2}", f"user{i % 3}", "read", "device", f"dev{i}", "success"
+                )
+            logger.close()
+            assert len(list(Path(tmpdir).glob("audit-*.jsonl"))) == 3
+            
+            # A torn final line from a crash is dropped
+            with open(sorted(Path(tmpdir).glob("audit-*.jsonl"))[-1], "a") as f:
+                f.write('{"event_id": "torn"')
+            
+            reloaded = EnterpriseAuditLogger(Path(tmpdir))
+            assert len(reloaded.events) == 10
+            reloaded.log_event("tenant0", "user0", "delete", "device", "dev0", "success")
+            reloaded.close()
+            assert len(EnterpriseAuditLogger(Path(tmpdir)).events) == 11
+    
+    def test_indexed_queries_newest_first(self):
+        """Test indexed queries match filtering and sorting the full history."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = EnterpriseAuditLogger(Path(tmpdir))
+            for i in range(60):
+                event = logger.log_event(
+                    f"tenant{i % 3}", f"user{i % 4}", ["create", "update"][i % 2],
+                    "device", f"dev{i % 5}", ["success", "failure"][i % 7 == 0]
+                )
+                event.timestamp = f"2024-01-01T00:{i:02d}:00"
+            logger.store._reindex()
+            
+            def expected(predicate, limit=100):
+                matches = [e for e in logger.events if predicate(e)]
+                return sorted(matches, key=lambda e: e.timestamp, reverse=True)[:limit]
+            
+            assert logger.query_events(tenant_id="tenant1", user_id="user2", limit=3) == expected(
+                lambda e: e.tenant_id == "tenant1" and e.user_id == "user2", 3
+            )
+            assert logger.query_events(
+                user_id="user1", start_time="2024-01-01T00:10:00", end_time="2024-01-01T00:41:00"
+            ) == expected(
+                lambda e: e.user_id == "user1" and "2024-01-01T00:10:00" <= e.timestamp
+                <= "2024-01-01T00:41:00"
+            )
+            failures = expected(lambda e: e.status == "failure")
+            assert logger.query_events(status="failure") == failures
+            assert logger.get_resource_history("device", "dev3", limit=5) == expected(
+                lambda e: e.resource_id == "dev3", 5
+            )
+            assert logger.query_events(tenant_id="missing") == []
+            
+            # Results are produced lazily
+            newest = next(logger.iter_events(action="update"))
+            assert newest.timestamp == "2024-01-01T00:59:00"
+    
+    def test_compaction_and_legacy_migration(self):
+        """Test expired segments are compacted and legacy logs imported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy = [
+                {
+                    "event_id": f"e{i}", "timestamp": f"2020-01-0{i + 1}T00:00:00",
+                    "tenant_id": "t", "user_id": "u", "action": "read",
+                    "resource_type": "device", "resource_id": "d", "status": "success",
+                    "details": {}
+                }
+                for i in range(3)
+            ]
+            (Path(tmpdir) / "audit_log.json").write_text(json.dumps(legacy))
+            
+            logger = EnterpriseAuditLogger(Path(tmpdir))
+            assert [e.event_id for e in logger.query_events()] == ["e2", "e1", "e0"]
+            assert not (Path(tmpdir) / "audit_log.json").exists()
+            logger.log_event("t", "u", "update", "device", "d", "success")
+            
+            assert logger.compact(before="2020-01-02T12:00:00") == 2
+            assert [e.event_id for e in logger.query_events()][1:] == ["e2"]
+            logger.close()
+            
+            # Expired events do not come back on reload
+            assert len(EnterpriseAuditLogger(Path(tmpdir), retention_days=30).events) == 1
+    
+    def test_legacy_migration_failures(self, caplog):
+        """Test a failed migration imports nothing and an interrupted one resumes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy_file = Path(tmpdir) / "audit_log.json"
+            legacy = [
+                {
+                    "event_id": f"e{i}", "timestamp": f"2020-01-0{i + 1}T00:00:00",
+                    "tenant_id": "t", "user_id": "u", "action": "read",
+                    "resource_type": "device", "resource_id": "d", "status": "success",
+                    "details": {}
+                }
+                for i in range(3)
+            ]
+            legacy_file.write_text(json.dumps(legacy + [{"event_id": "bad"}]))
+            
+            with caplog.at_level("ERROR"):
+                logger = EnterpriseAuditLogger(Path(tmpdir))
+            assert logger.events == []
+            assert legacy_file.exists()
+            assert "Failed to migrate legacy audit log" in caplog.text
+            logger.close()
+            
+            # Simulate a crash after the first event was imported
+            logger.store.import_records([AuditEvent(**legacy[0])])
+            logger.close()
+            legacy_file.write_text(json.dumps(legacy))
+            
+            logger = EnterpriseAuditLogger(Path(tmpdir))
+            assert [e.event_id for e in logger.events] == ["e0", "e1", "e2"]
+            assert not legacy_file.exists()
+            logger.close()
+            assert len(EnterpriseAuditLogger(Path(tmpdir)).events) == 3
 
 
 class TestDataGovernor:
@@ -0,0 +1,170 @@
+"""
+Tests for the ESP32-CAM AI processing pipeline.
+"""
+
+import time
+
+import pytest
+
+from accelerapp.hardware.camera.esp32_cam.ai_processing import (
+    AIProcessor,
+    DetectionResult,
+    ModelConfig,
+    bbox_iou,
+    non_max_suppression,
+)
+
+
+class _FakeCamera:
+    """Camera stand-in for processors fed explicit frames."""
+
+    initialized = False
+
+
+def test_ai_non_max_suppression():
+    """Test IoU-based non-maximum suppression keeps the best box per object."""
+    assert bbox_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert bbox_iou((0, 0, 10, 10), (20, 20, 5, 5)) == 0.0
+    
+    detections = [
+        DetectionResult(label="person", confidence=0.8, bbox=(1, 1, 10, 10)),
+        DetectionResult(label="person", confidence=0.9, bbox=(0, 0, 10, 10)),
+        DetectionResult(label="person", confidence=0.7, bbox=(30, 30, 10, 10)),
+        DetectionResult(label="face", confidence=0.95, bbox=(0, 0, 10, 10)),
+    ]
+    kept = non_max_suppression(detections, iou_threshold=0.5)
+    
+    assert [d.confidence for d in kept] == [0.95, 0.9, 0.7]
+    assert len(non_max_suppression(detections, 0.5, max_detections=2)) == 2
+
+
+def test_ai_batched_pipeline():
+    """Test queued frames are processed in batches with stage metrics."""
+    camera = _FakeCamera()
+    batches = []
+    
+    def inference_fn(frames):
+        batches.append(len(frames))
+        return [[{"label": "person", "confidence": 0.9, "bbox": (0, 0, 8, 8)}] for _ in frames]
+    
+    processor = AIProcessor(camera, ModelConfig(batch_size=4, queue_size=6), inference_fn)
+    processor.load_model()
+    
+    for index in range(8):
+        processor.submit_frame(b"frame", source_id=index)
+    
+    results = processor.process_pending()
+    
+    # The bounded queue drops the two oldest frames
+    assert [source for source, _ in results] == [2, 3, 4, 5, 6, 7]
+    assert batches == [4, 2]
+    assert processor.inference_count == 6
+    
+    stats = processor.get_statistics()
+    pipeline = stats["pipeline"]
+    assert pipeline["frames_dropped"] == 2
+    assert pipeline["frames_processed"] == 6
+    assert set(pipeline["stages"]) == {"preprocess", "inference", "postprocess"}
+    assert pipeline["stages"]["inference"]["samples"] == 2
+
+
+def test_ai_detection_history_ring_buffer():
+    """Test detection history is bounded by history_size."""
+    camera = _FakeCamera()
+    processor = AIProcessor(camera, ModelConfig(history_size=5))
+    processor.load_model()
+    
+    for _ in range(10):
+        processor.detect(b"frame")
+    
+    assert len(processor.detection_history) == 5
+    assert len(processor.get_statistics()["recent_detections"]) == 5
+
+
+def test_ai_batched_preprocessing():
+    """Test decoded frames are resized to the model input in one batch."""
+    np = pytest.importorskip("numpy")
+    camera = _FakeCamera()
+    seen = []
+    
+    def inference_fn(frames):
+        seen.extend(frame.shape for frame in frames)
+        return [[] for _ in frames]
+    
+    config = ModelConfig(input_width=32, input_height=24, input_channels=1)
+    processor = AIProcessor(camera, config, inference_fn)
+    processor.load_model()
+    
+    for index in range(3):
+        processor.submit_frame(np.zeros((120, 160, 3), dtype=np.uint8), source_id=index)
+    processor.process_pending()
+    
+    assert seen == [(24, 32)] * 3
+
+
+def test_ai_background_pipeline():
+    """Test the threaded pipeline delivers results for every queued frame."""
+    camera = _FakeCamera()
+    processor = AIProcessor(camera, ModelConfig(batch_size=4))
+    processor.load_model()
+    delivered = []
+    
+    assert processor.start_pipeline(lambda source, results: delivered.append(source))
+    for index in range(10):
+        processor.submit_frame(b"frame", source_id=index)
+    
+    deadline = time.time() + 5.0
+    while len(delivered) < 10 and time.time() < deadline:
+        time.sleep(0.01)
+    processor.stop_pipeline()
+    
+    assert sorted(delivered) == list(range(10))
+    assert processor.get_statistics()["pipeline"]["running"] is False
+
+
+def test_ai_pipeline_survives_failing_batches():
+    """Test a failing batch is counted and later frames still flow through."""
+    processor = AIProcessor(_FakeCamera(), ModelConfig(batch_size=1))
+    processor.load_model()
+    delivered = []
+    
+    def preprocess(frames):
+        if frames == ["bad"]:
+            raise ValueError("undecodable frame")
+        return frames
+    
+    processor._preprocess_batch = preprocess
+    assert processor.start_pipeline(lambda source, results: delivered.append(source))
+    processor.submit_frame("bad", source_id=0)
+    processor.submit_frame(b"frame", source_id=1)
+    
+    deadline = time.time() + 5.0
+    while not delivered and time.time() < deadline:
+        time.sleep(0.01)
+    stats = processor.get_statistics()["pipeline"]
+    threads = list(processor._pipeline_threads)
+    processor.stop_pipeline()
+    
+    assert delivered == [1]
+    assert stats["running"] is True
+    assert stats["errors"] == 1
+    assert not any(thread.is_alive() for thread in threads)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_ai_pipeline_stops_when_preprocessing_dies():
+    """Test the inference worker is released if the preprocessing thread exits."""
+    processor = AIProcessor(_FakeCamera(), ModelConfig(batch_size=1))
+    processor.load_model()
+    
+    def take_batch():
+        raise RuntimeError("queue corrupted")
+    
+    processor._take_batch = take_batch
+    assert processor.start_pipeline(lambda source, results: None)
+    threads = list(processor._pipeline_threads)
+    for thread in threads:
+        thread.join(5.0)
+    
+    assert not any(thread.is_alive() for thread in threads)
+    assert processor.get_statistics()["pipeline"]["running"] is False
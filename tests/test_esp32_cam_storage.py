@@ -0,0 +1,94 @@
+"""
+Tests for ESP32-CAM storage management.
+"""
+
+import os
+
+from accelerapp.hardware.camera.esp32_cam.storage import (
+    ShardInterval,
+    StorageConfig,
+    StorageManager,
+    WriteBehindWriter,
+)
+
+
+class _FakeCamera:
+    """Camera stand-in; storage only keeps a reference to it."""
+
+
+def test_storage_oldest_first_eviction():
+    """Test quota checks evict the oldest files down to the cleanup target."""
+    camera = _FakeCamera()
+    storage_config = StorageConfig(
+        capacity_mb=1,
+        cleanup_threshold_percent=80,
+        cleanup_target_percent=50,
+    )
+    storage = StorageManager(camera, storage_config)
+    
+    for index in range(9):
+        storage.save_image({"size_bytes": 100_000}, f"img{index}.jpg")
+    
+    files = [f["filename"] for f in storage.list_files()]
+    assert files == ["img4.jpg", "img5.jpg", "img6.jpg", "img7.jpg", "img8.jpg"]
+    info = storage.get_storage_info()
+    assert info["file_count"] == 5
+    assert info["oldest_file"] == "img4.jpg"
+    assert [f["filename"] for f in storage.list_files(limit=2)] == ["img7.jpg", "img8.jpg"]
+
+
+def test_storage_write_behind(tmp_path):
+    """Test frame bytes are persisted by the write-behind queue and sharded by time."""
+    camera = _FakeCamera()
+    storage_config = StorageConfig(
+        base_path=str(tmp_path),
+        persist_data=True,
+        shard_interval=ShardInterval.DAY,
+    )
+    storage = StorageManager(camera, storage_config)
+    
+    paths = [storage.save_image({"data": bytes([index]) * 64}) for index in range(5)]
+    assert len(set(paths)) == 5
+    assert storage.flush(timeout=5.0)
+    
+    for index, path in enumerate(paths):
+        assert path.startswith(str(tmp_path))
+        assert len(path[len(str(tmp_path)):].strip("/").split("/")) == 4  # YYYY/MM/DD/name
+        with open(path, "rb") as f:
+            assert f.read() == bytes([index]) * 64
+    
+    writer_stats = storage.get_storage_info()["writer"]
+    assert writer_stats["writes"] == 5
+    assert writer_stats["batches"] >= 1
+    
+    # Deletion is queued behind the write of the same file
+    filename = storage.list_files()[0]["filename"]
+    assert storage.delete_file(filename)
+    storage.close()
+    assert not os.path.exists(paths[0])
+
+
+def test_write_behind_survives_failed_fsync(tmp_path, monkeypatch):
+    """Test fsync failures are reported by flush and the writer keeps running."""
+    writer = WriteBehindWriter(flush_interval=0.01, max_pending=2)
+    real_fsync = os.fsync
+    
+    def failing_fsync(fd):
+        raise OSError(5, "Input/output error")
+    
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+    writer.submit_write(str(tmp_path / "a.jpg"), b"a")
+    assert not writer.flush(timeout=5.0)
+    
+    errors = writer.take_errors()
+    assert errors and errors[0][0] == str(tmp_path / "a.jpg")
+    assert writer.get_stats()["last_error"] is not None
+    assert writer.take_errors() == []
+    
+    # The thread is still alive and the bounded queue keeps draining
+    monkeypatch.setattr(os, "fsync", real_fsync)
+    for index in range(5):
+        writer.submit_write(str(tmp_path / f"b{index}.jpg"), b"b")
+    assert writer.flush(timeout=5.0)
+    writer.close(timeout=5.0)
+    assert (tmp_path / "b4.jpg").read_bytes() == b"b"
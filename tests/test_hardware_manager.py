@@ -391,3 +391,184 @@ async def test_hardware_manager_shutdown():
     
     # All devices should be removed
     assert len(manager.devices) == 0
+
+
+class _FakeConnection:
+    """Minimal stand-in for a pyserial connection."""
+
+    def __init__(self):
+        self.is_open = True
+
+
+class _FakeDevice:
+    """Device double that counts connect/disconnect calls."""
+
+    connects = 0
+
+    def __init__(self, port=None, logger=None):
+        self.port = port
+        self.is_connected = False
+        self.connection = None
+        self.disconnects = 0
+
+    def connect(self, port=None):
+        type(self).connects += 1
+        self.port = port or self.port
+        self.is_connected = True
+        self.connection = _FakeConnection()
+        return True
+
+    def disconnect(self):
+        self.disconnects += 1
+        self.is_connected = False
+        self.connection = None
+
+
+def _patch_probes(monkeypatch, marauder_ports, flipper_ports, calls=None):
+    """Replace the serial discovery probes with fixed port lists."""
+    from accelerapp.hardware.esp32_marauder import ESP32Marauder
+    from accelerapp.hardware.flipper_zero import FlipperZero
+
+    def make_probe(name, ports):
+        def probe(port=None):
+            if calls is not None:
+                calls.append(name if port is None else (name, port))
+            return [{"port": p} for p in ports if port is None or p == port]
+
+        return staticmethod(probe)
+
+    monkeypatch.setattr(ESP32Marauder, "discover_devices", make_probe("marauder", marauder_ports))
+    monkeypatch.setattr(FlipperZero, "discover_devices", make_probe("flipper", flipper_ports))
+
+
+@pytest.mark.asyncio
+async def test_hardware_manager_discovery_runs_all_probes(monkeypatch):
+    """Test concurrent discovery merges results from every probe."""
+    _patch_probes(monkeypatch, ["/dev/ttyUSB0", "/dev/ttyUSB1"], ["/dev/ttyACM0"])
+    manager = HardwareManager()
+
+    devices = await manager.discover_devices()
+
+    ids = {device.device_id for device in devices}
+    assert ids == {"marauder_/dev/ttyUSB0", "marauder_/dev/ttyUSB1", "flipper_/dev/ttyACM0"}
+    flipper = next(d for d in devices if d.device_type == DeviceType.FLIPPER_ZERO)
+    assert DeviceCapability.NFC in flipper.capabilities
+
+
+@pytest.mark.asyncio
+async def test_hardware_manager_discovery_cache_ttl(monkeypatch):
+    """Test probe results are cached until the TTL expires or a refresh is forced."""
+    calls = []
+    _patch_probes(monkeypatch, ["/dev/ttyUSB0"], [], calls)
+    manager = HardwareManager(discovery_ttl=60.0)
+
+    await manager.discover_devices()
+    await manager.discover_devices()
+    assert calls.count("marauder") == 1
+
+    await manager.discover_devices(force_refresh=True)
+    assert calls.count("marauder") == 2
+
+
+@pytest.mark.asyncio
+async def test_hardware_manager_connection_pool_reuse(monkeypatch):
+    """Test reconnecting reuses the pooled connection instead of reopening the port."""
+    _FakeDevice.connects = 0
+    manager = HardwareManager()
+    device = _FakeDevice(port="/dev/ttyUSB0")
+    manager.register_device(
+        device_id="device1",
+        device_type=DeviceType.ESP32_MARAUDER,
+        device=device,
+        capabilities={DeviceCapability.WIFI_SCAN},
+        port="/dev/ttyUSB0",
+    )
+
+    assert await manager.connect_device("device1") is True
+    assert manager.release_device("device1") is True
+    assert manager.devices["device1"].status == DeviceStatus.DISCONNECTED
+
+    assert await manager.connect_device("device1") is True
+    assert _FakeDevice.connects == 1
+    assert manager.connection_pool.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hardware_manager_connection_pool_health_check():
+    """Test unhealthy pooled connections are replaced on connect."""
+    _FakeDevice.connects = 0
+    manager = HardwareManager()
+    device = _FakeDevice(port="/dev/ttyUSB0")
+    manager.register_device(
+        device_id="device1",
+        device_type=DeviceType.ESP32_MARAUDER,
+        device=device,
+        capabilities={DeviceCapability.WIFI_SCAN},
+        port="/dev/ttyUSB0",
+    )
+
+    await manager.connect_device("device1")
+    device.connection.is_open = False
+
+    assert await manager.connect_device("device1") is True
+    assert _FakeDevice.connects == 2
+
+
+@pytest.mark.asyncio
+async def test_hardware_manager_prune_idle_connections():
+    """Test released connections are closed after the idle timeout."""
+    manager = HardwareManager(idle_timeout=0.0)
+    device = _FakeDevice(port="/dev/ttyUSB0")
+    manager.register_device(
+        device_id="device1",
+        device_type=DeviceType.ESP32_MARAUDER,
+        device=device,
+        capabilities={DeviceCapability.WIFI_SCAN},
+        port="/dev/ttyUSB0",
+    )
+
+    await manager.connect_device("device1")
+    assert manager.prune_idle_connections() == []
+
+    manager.release_device("device1")
+    assert manager.prune_idle_connections() == ["/dev/ttyUSB0"]
+    assert device.disconnects == 1
+    assert "/dev/ttyUSB0" not in manager.connection_pool
+
+
+@pytest.mark.asyncio
+async def test_hardware_manager_hotplug(monkeypatch):
+    """Test hotplug events update only the affected port."""
+    _patch_probes(monkeypatch, ["/dev/ttyUSB0"], [])
+    manager = HardwareManager()
+    await manager.discover_devices()
+
+    calls = []
+    _patch_probes(monkeypatch, ["/dev/ttyUSB0", "/dev/ttyUSB1"], [], calls)
+    added = await manager.handle_hotplug("/dev/ttyUSB1", added=True)
+    assert [device.device_id for device in added] == ["marauder_/dev/ttyUSB1"]
+    assert sorted(calls) == [("flipper", "/dev/ttyUSB1"), ("marauder", "/dev/ttyUSB1")]
+    assert [info["port"] for info in manager._discovery_cache[DeviceType.ESP32_MARAUDER][1]] == [
+        "/dev/ttyUSB0",
+        "/dev/ttyUSB1",
+    ]
+
+    disconnected = []
+    manager.add_callback("device_disconnected", disconnected.append)
+    device = _FakeDevice(port="/dev/ttyUSB0")
+    manager.register_device(
+        device_id="device1",
+        device_type=DeviceType.ESP32_MARAUDER,
+        device=device,
+        capabilities={DeviceCapability.WIFI_SCAN},
+        port="/dev/ttyUSB0",
+    )
+    await manager.connect_device("device1")
+
+    _patch_probes(monkeypatch, ["/dev/ttyUSB1"], [])
+    changes = await manager.refresh_hotplug()
+
+    assert changes == {"added": [], "removed": ["/dev/ttyUSB0"]}
+    assert manager.devices["device1"].status == DeviceStatus.DISCONNECTED
+    assert device.disconnects == 1
+    assert len(disconnected) == 1
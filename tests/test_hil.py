@@ -377,3 +377,117 @@ def test_test_runner_get_latest_report():
     report = runner.get_latest_report()
     assert report is not None
     assert 'summary' in report
+
+
+def test_parallel_run_respects_resources():
+    """Test parallel execution never overlaps tests on the same board."""
+    import threading
+    import time
+
+    active = {}
+    overlaps = []
+    lock = threading.Lock()
+
+    class BoardTest(TestCase):
+        def execute(self):
+            with lock:
+                for name in self.resources:
+                    if active.get(name):
+                        overlaps.append(name)
+                    active[name] = True
+            time.sleep(0.02)
+            with lock:
+                for name in self.resources:
+                    active[name] = False
+            self.assert_true(isinstance(self.hardware_interface, SimulatedHardware))
+
+    framework = HILTestFramework({'workers': 4})
+    for board in range(2):
+        framework.register_resource(f'board-{board}', SimulatedHardware())
+    for i in range(8):
+        framework.register_test(BoardTest(f'test{i}', f'Test {i}', resources=[f'board-{i % 2}']))
+
+    results = framework.run_all_tests()
+
+    assert [r.test_id for r in results] == [f'test{i}' for i in range(8)]
+    assert all(r.status == TestStatus.PASSED for r in results)
+    assert overlaps == []
+    assert framework.last_schedule['workers'] == 4
+    assert set(framework.history.durations) == {f'test{i}' for i in range(8)}
+
+
+def test_sequential_run_records_history(tmp_path):
+    """Test a single-worker run records durations like a parallel run."""
+    history_path = tmp_path / 'history.json'
+    framework = HILTestFramework({'history_path': str(history_path)})
+
+    class QuickTest(TestCase):
+        def execute(self):
+            pass
+
+    for i in range(3):
+        framework.register_test(QuickTest(f'test{i}', f'Test {i}'))
+
+    results = TestRunner(framework).run_tests(['test0', 'test2', 'missing'])['results']
+
+    assert [r['test_id'] for r in results] == ['test0', 'test2', 'missing']
+    assert set(framework.history.durations) == {'test0', 'test2'}
+    assert framework.last_schedule == {}
+    reloaded = HILTestFramework({'history_path': str(history_path)})
+    assert set(reloaded.history.durations) == {'test0', 'test2'}
+
+
+def test_scheduler_orders_longest_first():
+    """Test tests are dispatched by historical duration."""
+    from accelerapp.hil import TestScheduler, DurationHistory
+
+    order = []
+
+    class RecordingTest(TestCase):
+        def execute(self):
+            order.append(self.test_id)
+
+    history = DurationHistory()
+    history.record('short', 1.0)
+    history.record('long', 10.0)
+    history.record('medium', 5.0)
+
+    tests = [RecordingTest(t, t) for t in ('short', 'medium', 'long')]
+    results = TestScheduler(max_workers=1, history=history).run(tests)
+
+    assert order == ['long', 'medium', 'short']
+    assert [r.test_id for r in results] == ['short', 'medium', 'long']
+
+
+def test_sharding_and_merged_report():
+    """Test shards keep shared resources together and reports merge."""
+    from accelerapp.hil.scheduler import plan_shards
+
+    class SimpleTest(TestCase):
+        def execute(self):
+            pass
+
+    framework = HILTestFramework()
+    framework.register_test(SimpleTest('a', 'A', resources=['board-0']))
+    framework.register_test(SimpleTest('b', 'B', resources=['board-0', 'board-1']))
+    framework.register_test(SimpleTest('c', 'C', resources=['board-1']))
+    framework.register_test(SimpleTest('d', 'D', resources=['board-2']))
+
+    shards = plan_shards(list(framework.test_cases.values()), 2, framework.history)
+    assert sorted([t.test_id for t in shard] for shard in shards) == [['a', 'b', 'c'], ['d']]
+
+    runner = TestRunner(framework)
+    reports = [runner.run_tests([t.test_id for t in shard]) for shard in shards]
+    merged = runner.merge_reports(reports)
+
+    assert merged['summary']['total'] == 4
+    assert merged['summary']['passed'] == 4
+
+    results = framework.run_all_tests(processes=2)
+    assert [r.status for r in results] == [TestStatus.PASSED] * 4
+    assert framework.last_schedule['processes'] == 2
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = Path(tmpdir) / 'merged.json'
+        runner.save_report(filepath)
+        assert '"shards": 2' in filepath.read_text()
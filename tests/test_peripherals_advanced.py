@@ -354,3 +354,154 @@ def test_conflict_optimization():
     optimization = resolver.optimize_pin_mapping()
     assert "status" in optimization
     assert "suggestions" in optimization
+
+
+def test_allocator_uses_alternative_mappings():
+    """Test the solver moves peripherals to alternative pins, timers and DMA."""
+    from accelerapp.peripherals import PeripheralAllocator
+    
+    allocator = PeripheralAllocator(timer_count=2, dma_count=4)
+    design = [
+        {"id": "led1", "type": "led", "pins": [{"pin": 5, "function": "GPIO_OUTPUT"}]},
+        {
+            "id": "spi1",
+            "type": "spi",
+            "options": [
+                {"instance": "SPI1", "af": 5, "pins": {"sck": 5, "miso": 6, "mosi": 7}},
+                {"instance": "SPI1", "af": 5, "pins": {"sck": 19, "miso": 20, "mosi": 21}},
+            ],
+            "signals": {"cs": [6, 8]},
+            "dma": [[1, 2]],
+        },
+        {"id": "uart1", "type": "uart", "options": [{"instance": "SPI1"}, {"instance": "USART1"}],
+         "dma": [[2]]},
+        {"id": "pwm1", "type": "pwm", "timers": 2},
+    ]
+    
+    result = allocator.solve(design)
+    
+    assert result.success
+    spi = result.assignments["spi1"]
+    assert [p["pin"] for p in spi["pins"]] == [19, 20, 21, 6]
+    assert spi["pins"][0] == {"pin": 19, "function": "sck", "af": 5}
+    assert spi["dma"] == [1]
+    assert result.assignments["uart1"]["instance"] == "USART1"
+    assert result.assignments["uart1"]["dma"] == [2]
+    assert result.assignments["pwm1"]["timers"] == [0, 1]
+    
+    # Reserved resources are never assigned
+    result = allocator.solve(design, reserved=[("pin", 8), ("pin", 19)])
+    assert not result.success
+
+
+def test_allocator_minimal_conflict_set():
+    """Test failing designs report an irreducible set of conflicting peripherals."""
+    from accelerapp.peripherals import PeripheralAllocator
+    
+    allocator = PeripheralAllocator(timer_count=4, dma_count=2)
+    design = [
+        {"id": f"gpio{i}", "type": "gpio", "signals": {"io": list(range(20))}} for i in range(10)
+    ]
+    design += [{"id": f"uart{i}", "type": "uart", "dma": 1} for i in range(3)]
+    design += [
+        {"id": "i2c1", "type": "i2c", "pins": [{"pin": 40, "function": "I2C_SCL"}]},
+        {"id": "i2c2", "type": "i2c", "pins": [{"pin": 40, "function": "I2C_SCL"}]},
+    ]
+    
+    result = allocator.solve(design)
+    
+    assert not result.success
+    assert result.assignments == {}
+    assert result.conflict_set in (["uart0", "uart1", "uart2"], ["i2c1", "i2c2"])
+    
+    result = allocator.solve(design[:-1])
+    assert result.conflict_set == ["uart0", "uart1", "uart2"]
+
+
+def test_allocator_large_design():
+    """Test a dense 120-peripheral design solves quickly."""
+    import random
+    import time
+    from accelerapp.peripherals import PeripheralAllocator
+    
+    rng = random.Random(7)
+    design = []
+    for i in range(120):
+        if i % 4 == 0:
+            design.append({
+                "id": f"spi{i}",
+                "type": "spi",
+                "options": [
+                    {"instance": f"SPI{rng.randrange(40)}", "pins": {
+                        signal: rng.randrange(400) for signal in ("sck", "miso", "mosi")
+                    }}
+                    for _ in range(4)
+                ],
+                "dma": [rng.sample(range(32), 4)],
+            })
+        elif i % 4 == 1:
+            design.append({"id": f"pwm{i}", "type": "pwm", "timers": i % 8 // 4,
+                           "signals": {"out": rng.sample(range(400), 6)}})
+        else:
+            design.append({"id": f"gpio{i}", "type": "gpio",
+                           "signals": {"io": rng.sample(range(400), 10)}})
+    
+    start = time.perf_counter()
+    result = PeripheralAllocator(timer_count=17, dma_count=32).solve(design)
+    elapsed = time.perf_counter() - start
+    
+    assert result.success
+    assert elapsed < 1.0
+    pins = [p["pin"] for a in result.assignments.values() for p in a["pins"]]
+    assert len(pins) == len(set(pins))
+
+
+def test_resource_manager_allocate_design():
+    """Test whole-design allocation records resources around existing ones."""
+    from accelerapp.peripherals import PeripheralResourceManager
+    from accelerapp.peripherals.resource_manager import ResourceType
+    
+    manager = PeripheralResourceManager("stm32")
+    manager.allocate_resource(ResourceType.TIMER, "tick", "timer", resource_id=0)
+    
+    result = manager.allocate_design([
+        {"id": "uart1", "type": "uart",
+         "options": [{"instance": "USART1", "af": 7, "pins": {"tx": "PA9", "rx": "PA10"}}],
+         "dma": 1},
+        {"id": "pwm1", "type": "pwm", "timers": 1, "signals": {"ch1": ["PA8", "PA9"]}},
+    ])
+    
+    assert result.success
+    assert result.assignments["pwm1"]["timers"] == [1]
+    assert result.assignments["pwm1"]["pins"] == [{"pin": "PA8", "function": "ch1"}]
+    assert manager.get_allocation(ResourceType.PIN, "PA9").peripheral_id == "uart1"
+    assert manager.get_allocation(ResourceType.UART_INSTANCE, "USART1") is not None
+    assert manager.get_utilization()["dma_channel"]["allocated"] == 1
+    
+    # Freeing keeps the bitset index consistent
+    assert manager.free_resource(ResourceType.TIMER, 0)
+    assert manager._find_next_available(ResourceType.TIMER) == 0
+    assert manager.optimize_timer_allocation(8)["allocations"][1]["timer"] == 2
+
+
+def test_conflict_resolver_solve():
+    """Test the resolver solves added peripherals and reports conflicts."""
+    from accelerapp.peripherals import PeripheralConflictResolver
+    
+    resolver = PeripheralConflictResolver("stm32")
+    resolver.add_peripheral({"id": "led1", "type": "led",
+                             "pins": [{"pin": 13, "function": "GPIO_OUTPUT"}]})
+    resolver.add_peripheral({"id": "uart1", "type": "uart",
+                             "pins": [{"pin": 13, "function": "UART_TX"}],
+                             "options": [{"pins": {"rx": 3}}]})
+    
+    optimization = resolver.optimize_pin_mapping()
+    assert optimization["status"] == "unsatisfiable"
+    assert optimization["conflict_set"] == ["led1", "uart1"]
+    
+    result = resolver.solve([
+        {"id": "led1", "type": "led", "pins": [{"pin": 13, "function": "GPIO_OUTPUT"}]},
+        {"id": "uart1", "type": "uart", "signals": {"tx": [13, 14]}},
+    ])
+    assert result.success
+    assert result.assignments["uart1"]["pins"] == [{"pin": 14, "function": "tx"}]
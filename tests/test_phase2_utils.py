@@ -3,7 +3,9 @@ Tests for Phase 2 utility modules.
 """
 
 import asyncio
+import threading
 import time
+from datetime import datetime, timedelta
 import pytest
 from accelerapp.utils import (
     CacheManager,
@@ -12,7 +14,15 @@ from accelerapp.utils import (
     gather_with_concurrency,
     PerformanceProfiler,
     profile,
+    RingTimeSeries,
+    measure_import_time,
+    Limit,
+    RateAlgorithm,
+    RateLimitEngine,
+    AuditRing,
+    BackgroundAuditWriter,
 )
+from accelerapp.utils.import_time import parse_import_time, slowest_imports
 
 
 class TestCacheManager:
@@ -131,6 +141,341 @@ class TestAsyncUtils:
         assert results[9] == 18
 
 
+class TestRingTimeSeries:
+    """Test ring buffer time series."""
+
+    def test_append_wraps_at_capacity(self):
+        """Test oldest samples are overwritten once full."""
+        series = RingTimeSeries(capacity=3, keep_items=True)
+
+        for i in range(5):
+            series.append(float(i), timestamp=float(i), item=f"sample-{i}")
+
+        assert len(series) == 3
+        assert series.values() == [2.0, 3.0, 4.0]
+        assert series.items(limit=2) == ["sample-3", "sample-4"]
+        assert series.timestamps(since=3.0) == [3.0, 4.0]
+        assert series.latest() == (4.0, 4.0)
+
+    def test_windowed_aggregates(self):
+        """Test incremental window aggregates match a full scan."""
+        series = RingTimeSeries(capacity=8, windows=(10.0,))
+        values = [5.0, 1.0, 7.0, 3.0, 9.0, 2.0, 8.0, 4.0, 6.0, 0.0, 3.0, 1.0]
+
+        for i, value in enumerate(values):
+            now = i * 2.0
+            series.append(value, timestamp=now)
+            recent = [v for j, v in enumerate(values[: i + 1]) if now - j * 2.0 < 10.0]
+            stats = series.aggregate(10.0, now=now)
+            assert stats["count"] == len(recent)
+            assert stats["mean"] == pytest.approx(sum(recent) / len(recent))
+            assert stats["min"] == min(recent)
+            assert stats["max"] == max(recent)
+            # Unregistered windows are computed by scanning
+            assert series.max(6.0, now=now) == max(values[max(0, i - 2) : i + 1])
+
+        assert series.aggregate(10.0, now=100.0)["count"] == 0
+        assert series.mean(10.0, now=100.0) is None
+
+    def test_queries_do_not_expire_windows(self):
+        """Test window results do not depend on earlier queries."""
+        series = RingTimeSeries(capacity=32, windows=(60.0,))
+        for i in range(10):
+            series.append(float(i), timestamp=1000.0 + i)
+
+        before = series.aggregate(60.0, now=1009.0)
+        later = series.aggregate(60.0, now=1065.0)
+        assert later["count"] == 4
+        assert later["min"] == 6.0 and later["mean"] == pytest.approx(7.5)
+        assert series.aggregate(60.0, now=1009.0) == before
+        assert before["count"] == 10
+
+        # Reference times older than the newest sample are answered by a scan
+        series.append(10.0, timestamp=1065.0)
+        assert series.aggregate(60.0, now=1009.0) == series._scan(1009.0 - 60.0)
+        assert series.aggregate(60.0, now=1065.0)["count"] == 5
+
+    def test_out_of_order_timestamps_are_clamped(self):
+        """Test late samples keep timestamps ordered and windows consistent."""
+        series = RingTimeSeries(capacity=8, windows=(10.0,))
+        for timestamp, value in ((100.0, 1.0), (105.0, 2.0), (50.0, 9.0), (112.0, 4.0)):
+            series.append(value, timestamp=timestamp)
+
+        assert series.late_samples == 1
+        assert series.timestamps() == [100.0, 105.0, 105.0, 112.0]
+        assert series.values(since=105.0) == [2.0, 9.0, 4.0]
+        # The windowed aggregate matches a scan of the same samples
+        stats = series.aggregate(10.0, now=112.0)
+        assert stats == series._scan(112.0 - 10.0)
+        assert stats["count"] == 3
+        assert stats["max"] == 9.0
+        assert series.aggregate(10.0, now=116.0)["count"] == 1
+
+    def test_clear(self):
+        """Test clearing samples and window state."""
+        series = RingTimeSeries(capacity=4, typecode="q", windows=(60.0,))
+        series.append(10, timestamp=1.0)
+        series.clear()
+
+        assert len(series) == 0
+        assert series.latest() is None
+        assert series.aggregate(60.0, now=1.0)["count"] == 0
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimitEngine:
+    """Test the shared rate limit engine."""
+
+    def test_gcra_burst_and_refill(self):
+        """Test GCRA admits a burst, then refills at the sustained rate."""
+        clock = FakeClock()
+        engine = RateLimitEngine(clock=clock)
+        limit = Limit(rate=10, period=10.0, burst=3)  # one request per second
+
+        results = [engine.acquire("client", [limit]).allowed for _ in range(4)]
+        assert results == [True, True, True, False]
+
+        decision = engine.peek("client", [limit])
+        assert decision.retry_after == pytest.approx(1.0)
+        assert decision.reset_after == pytest.approx(3.0)
+
+        clock.now += 1.0
+        assert engine.acquire("client", [limit]).allowed
+        assert not engine.acquire("client", [limit]).allowed
+
+    def test_sliding_window_weights_previous_bucket(self):
+        """Test the sliding window counts a decaying share of the previous bucket."""
+        clock = FakeClock(now=60.0)
+        engine = RateLimitEngine(clock=clock)
+        limit = Limit(rate=10, period=60.0, algorithm=RateAlgorithm.SLIDING_WINDOW)
+
+        decision = engine.acquire("client", [limit], cost=10)
+        assert decision.allowed and decision.remaining == 0
+        assert not engine.acquire("client", [limit]).allowed
+
+        # A quarter into the next bucket, 75% of the previous one still counts
+        clock.now = 135.0
+        decision = engine.peek("client", [limit], cost=0)
+        assert decision.used == pytest.approx(7.5)
+        assert decision.remaining == 2
+        assert engine.acquire("client", [limit], cost=2).allowed
+
+        denied = engine.acquire("client", [limit])
+        assert not denied.allowed
+        # 2 + 10 * (1 - f) <= 9 once f >= 0.3 of the bucket has passed
+        assert denied.retry_after == pytest.approx(3.0)
+
+    def test_sliding_log_is_exact(self):
+        """Test the sliding log never admits more than the rate in any trailing period."""
+        clock = FakeClock(now=0.0)
+        engine = RateLimitEngine(clock=clock)
+        limit = Limit(rate=10, period=60.0, algorithm=RateAlgorithm.SLIDING_LOG)
+
+        # Bunch requests either side of a minute boundary
+        admitted = []
+        for now in [50.0] * 10 + [61.0] * 10 + [111.0] * 10:
+            clock.now = now
+            if engine.acquire("client", [limit]).allowed:
+                admitted.append(now)
+
+        assert admitted == [50.0] * 10 + [111.0] * 10
+        for start in admitted:
+            assert sum(start <= t < start + 60.0 for t in admitted) <= 10
+
+    def test_sliding_log_retry_after(self):
+        """Test the sliding log waits for the oldest requests to leave the window."""
+        clock = FakeClock(now=0.0)
+        engine = RateLimitEngine(clock=clock)
+        limit = Limit(rate=3, period=10.0, algorithm=RateAlgorithm.SLIDING_LOG)
+
+        for now in (0.0, 2.0, 4.0):
+            clock.now = now
+            assert engine.acquire("client", [limit]).allowed
+
+        clock.now = 5.0
+        denied = engine.acquire("client", [limit], cost=2)
+        assert not denied.allowed
+        assert denied.retry_after == pytest.approx(7.0)
+        assert denied.reset_after == pytest.approx(9.0)
+
+        clock.now = 12.0
+        # Peeking and denied requests record nothing
+        assert engine.peek("client", [limit], cost=2).allowed
+        assert engine.peek("client", [limit], cost=2).remaining == 0
+        decision = engine.acquire("client", [limit], cost=2)
+        assert decision.allowed and decision.remaining == 0
+        assert not engine.acquire("client", [limit], cost=4).allowed
+
+    def test_all_limits_or_none(self):
+        """Test a request denied by one limit consumes nothing from the others."""
+        clock = FakeClock()
+        engine = RateLimitEngine(clock=clock)
+        minute = Limit(2, 60.0, algorithm=RateAlgorithm.SLIDING_WINDOW)
+        hour = Limit(5, 3600.0, algorithm=RateAlgorithm.SLIDING_WINDOW)
+
+        assert engine.acquire("client", [minute, hour]).allowed
+        assert engine.acquire("client", [minute, hour]).allowed
+        denied = engine.acquire("client", [minute, hour])
+        assert not denied.allowed and denied.limit == minute
+
+        assert engine.peek("client", [hour], cost=0).remaining == 3
+        assert engine.peek("other", [minute, hour]).allowed
+
+    def test_idle_clients_are_evicted(self):
+        """Test recovered clients are dropped by the rolling sweep and in bulk."""
+        clock = FakeClock()
+        engine = RateLimitEngine(stripes=4, clock=clock, sweep_interval=4.0)
+        limit = Limit(rate=1, period=1.0)
+
+        for i in range(100):
+            engine.acquire(f"client-{i}", [limit])
+        assert len(engine) == 100
+        assert engine.evict_idle() == []
+
+        # Every stripe is swept once per interval as requests arrive
+        for _ in range(4):
+            clock.now += 1.5
+            engine.acquire("active", [limit])
+        assert engine.client_ids() == ["active"]
+
+        assert engine.reset("active")
+        assert not engine.reset("active")
+
+        engine.acquire("stale", [Limit(rate=1, period=3600.0)])
+        clock.now += 10.0
+        assert engine.evict_idle() == []
+        assert engine.evict_idle(max_idle=5.0) == ["stale"]
+
+    def test_concurrent_acquire_never_overshoots(self):
+        """Test concurrent clients sharing stripes admit exactly their limits."""
+        engine = RateLimitEngine(stripes=2)
+        limit = Limit(rate=50, period=3600.0, algorithm=RateAlgorithm.SLIDING_WINDOW)
+        admitted = {f"client-{i}": 0 for i in range(4)}
+        lock = threading.Lock()
+
+        def worker(client_id):
+            count = sum(engine.acquire(client_id, [limit]).allowed for _ in range(200))
+            with lock:
+                admitted[client_id] += count
+
+        threads = [
+            threading.Thread(target=worker, args=(client_id,))
+            for client_id in admitted
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(count == 50 for count in admitted.values())
+
+
+class TestAuditPipeline:
+    """Test the bounded audit ring and background writer."""
+
+    def test_ring_evicts_and_keeps_indexes_exact(self):
+        """Test indexed queries over a wrapped ring match a full scan."""
+        ring = AuditRing(capacity=50, index_fields=("actor", "kind"), accessor=dict.__getitem__)
+        start = datetime(2024, 1, 1)
+        history = []
+        for i in range(500):
+            record = {"id": i, "actor": f"user{i % 7}", "kind": ["read", "write"][i % 3 == 0]}
+            ring.append(record, start + timedelta(seconds=i))
+            history.append(record)
+
+        retained = history[-50:]
+        assert len(ring) == 50 and ring.total == 500
+        assert ring.snapshot() == retained
+        assert ring.counts("kind") == {
+            kind: sum(r["kind"] == kind for r in retained) for kind in ("read", "write")
+        }
+
+        since = start + timedelta(seconds=470)
+        assert ring.query({"actor": "user3", "kind": "read"}, start_time=since, limit=3) == [
+            r for r in retained
+            if r["actor"] == "user3" and r["kind"] == "read" and r["id"] >= 470
+        ][-3:]
+        assert ring.query({"actor": "nobody"}) == []
+        assert next(ring.iter_newest({"kind": "write"}))["id"] == 498
+
+    def test_writer_batches_and_rotates(self, tmp_path):
+        """Test queued lines are written in the background and rotated by size."""
+        path = tmp_path / "audit.log"
+        writer = BackgroundAuditWriter(
+            path, batch_size=10, flush_interval=0.05, max_bytes=200, backup_count=2
+        )
+        for i in range(30):
+            writer.write(f"event-{i:02d}" + "x" * 20)
+        assert writer.flush(timeout=5)
+
+        deadline = time.time() + 5
+        writer.write("late")
+        while "late" not in path.read_text() and time.time() < deadline:
+            time.sleep(0.01)
+        writer.close()
+
+        files = sorted(tmp_path.iterdir())
+        assert [f.name for f in files] == ["audit.log", "audit.log.1", "audit.log.2"]
+        lines = [line for f in reversed(files[1:]) for line in f.read_text().splitlines()]
+        lines += path.read_text().splitlines()
+        # Older files were dropped once backups ran out; the newest lines are kept in order
+        assert lines[-1] == "late"
+        assert lines[:-1] == [f"event-{i:02d}" + "x" * 20 for i in range(30)][-len(lines) + 1:]
+        with pytest.raises(RuntimeError):
+            writer.write("after close")
+
+
+class TestImportTime:
+    """Test import-time measurement."""
+
+    def test_parse_import_time(self):
+        """Test parsing -X importtime output."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   accelerapp.base\n"
+            "import time:       300 |       2500 |     pydantic\n"
+            "import time:       400 |       3020 |   accelerapp.core\n"
+            "import time:        80 |       3220 | accelerapp\n"
+            "unrelated warning line\n"
+        )
+        modules = parse_import_time(output)
+
+        assert [m["name"] for m in modules] == [
+            "accelerapp.base",
+            "pydantic",
+            "accelerapp.core",
+            "accelerapp",
+        ]
+        assert [m["depth"] for m in modules] == [1, 2, 1, 0]
+        assert modules[2]["self_ms"] == pytest.approx(0.4)
+        assert modules[3]["cumulative_ms"] == pytest.approx(3.22)
+
+        report = {"modules": modules}
+        assert slowest_imports(report, limit=1)[0]["name"] == "accelerapp"
+        assert slowest_imports(report, limit=1, by="self_ms")[0]["name"] == "accelerapp.core"
+
+    def test_measure_import_time(self):
+        """Test measuring a cold import in a subprocess."""
+        report = measure_import_time("accelerapp.utils.timeseries")
+
+        assert report["total_ms"] > 0
+        assert report["wall_ms"] >= report["total_ms"]
+        assert any(m["name"] == "accelerapp.utils.timeseries" for m in report["modules"])
+
+        with pytest.raises(RuntimeError):
+            measure_import_time("accelerapp.does_not_exist")
+
+
 class TestPerformanceProfiler:
     """Test performance profiler."""
 
@@ -275,6 +275,70 @@ def test_performance_benchmark():
     assert result.duration_ms > 0
 
 
+def test_performance_benchmark_distribution():
+    """Test calibrated timing distributions and error capture."""
+    benchmark = PerformanceBenchmark(max_time=0.05, min_rounds=5)
+    benchmark.register_benchmark("sum", lambda: sum(range(100)), operations_per_call=100)
+
+    result = benchmark.run_benchmark("sum")
+    assert result.success
+    assert result.rounds >= 5
+    assert result.metadata["number"] >= 1
+    assert result.min_ms <= result.q1_ms <= result.median_ms <= result.q3_ms <= result.p99_ms
+    assert result.iqr_ms == pytest.approx(result.q3_ms - result.q1_ms)
+    assert result.operations_per_second == pytest.approx(100 / (result.median_ms / 1000))
+
+    def failing():
+        raise RuntimeError("boom")
+
+    benchmark.register_benchmark("failing", failing)
+    failed = benchmark.run_benchmark("failing")
+    assert not failed.success
+    assert "boom" in failed.error
+    with pytest.raises(ValueError):
+        benchmark.run_benchmark("missing")
+
+
+def test_performance_benchmark_regression_gate(tmp_path):
+    """Test baseline persistence and the regression gate."""
+    benchmark = PerformanceBenchmark(max_time=0.05, track_memory=False)
+    benchmark.register_benchmark("work", lambda: sum(range(200)))
+    benchmark.run_benchmark("work")
+
+    baseline_file = tmp_path / "baseline.json"
+    benchmark.save_baseline(baseline_file)
+    baseline = PerformanceBenchmark.load_baseline(baseline_file)
+    assert baseline["work"].median_ms == benchmark.get_results("work")[-1].median_ms
+
+    benchmark.register_benchmark("work", lambda: sum(range(20000)))
+    benchmark.run_benchmark("work")
+    gate = benchmark.check_regressions(baseline_file)
+    assert not gate["passed"]
+    assert gate["regressions"] == ["work"]
+
+    benchmark.register_benchmark("work", lambda: sum(range(200)))
+    benchmark.run_benchmark("work", iterations=50)
+    benchmark.register_benchmark("slow", lambda: sum(range(20000)))
+    benchmark.run_benchmark("slow", iterations=50)
+    comparison = benchmark.compare_results("work", "slow")
+    assert comparison["significant"]
+    assert comparison["regression"]
+    assert comparison["median_change_percent"] > 100
+
+
+def test_default_benchmark_suite():
+    """Test the default hot-path benchmark suite."""
+    from accelerapp.production.benchmarking.suite import DEFAULT_BENCHMARKS, create_default_suite
+
+    benchmark = create_default_suite(max_time=0.01, min_rounds=2, track_memory=False)
+    assert set(benchmark.benchmarks) == set(DEFAULT_BENCHMARKS)
+
+    for name in ("template_rendering", "mesh_routing", "event_bus_throughput"):
+        result = benchmark.run_benchmark(name)
+        assert result.success, result.error
+        assert result.median_ms > 0
+
+
 def test_vulnerability_scanner():
     """Test vulnerability scanner."""
     scanner = VulnerabilityScanner()
@@ -2,6 +2,8 @@
 Tests for Phase 5 Security & Compliance features.
 """
 
+import io
+import random
 import pytest
 from datetime import datetime, timedelta
 
@@ -19,6 +21,7 @@ from accelerapp.production.security import (
     BackupType,
     BackupStatus,
     RecoveryStatus,
+    BackupEngine,
     # Security Audit
     SecurityAuditSystem,
     AuditEventType,
@@ -161,6 +164,108 @@ class TestNetworkPolicyEnforcement:
         policies = enforcer.list_policies()
         assert policies[0].enabled
     
+    def test_compiled_index_follows_priority_and_labels(self):
+        """Test indexed matching keeps priority order and label semantics."""
+        enforcer = NetworkPolicyEnforcer()
+        enforcer.create_policy("audit", "Audit", "default", PolicyType.INGRESS, priority=1)
+        enforcer.add_rule("audit", "log-ssh", action=PolicyAction.LOG, ports=[22])
+        enforcer.create_policy("deny", "Deny", "default", PolicyType.INGRESS, priority=5)
+        enforcer.add_rule(
+            "deny", "deny-untrusted", action=PolicyAction.DENY, ports=[22],
+            source_labels={"trust": "low", "app": "web"}
+        )
+        enforcer.create_policy("allow", "Allow", "default", PolicyType.INGRESS, priority=10)
+        enforcer.add_rule("allow", "allow-ssh", ports=[22], protocols=["tcp"])
+        
+        partial = enforcer.check_connection("a", "b", 22, "tcp", {"trust": "low"})
+        assert partial["allowed"] and partial["policy_id"] == "allow"
+        
+        denied = enforcer.check_connection("a", "b", 22, "tcp", {"trust": "low", "app": "web"})
+        assert not denied["allowed"] and denied["policy_id"] == "deny"
+        assert [v.action_taken for v in enforcer.get_violations()] == [
+            "LOGGED", "LOGGED", "DENIED"
+        ]
+        
+        assert not enforcer.check_connection("a", "b", 22, "udp")["allowed"]
+        assert not enforcer.check_connection("a", "b", 80, "tcp")["allowed"]
+    
+    def test_verdict_cache_invalidated_on_change(self):
+        """Test cached verdicts are replaced after policies change."""
+        enforcer = NetworkPolicyEnforcer(cache_size=2)
+        policy = enforcer.create_policy("p", "P", "default", PolicyType.INGRESS)
+        enforcer.add_rule("p", "allow-https", ports=[443])
+        
+        assert enforcer.check_connection("a", "b", 443, "tcp")["allowed"]
+        assert enforcer.check_connection("c", "d", 443, "tcp")["allowed"]
+        assert enforcer.cache_stats == {"hits": 1, "misses": 1}
+        
+        enforcer.update_policy("p", enabled=False)
+        assert not enforcer.check_connection("a", "b", 443, "tcp")["allowed"]
+        enforcer.enable_policy("p")
+        assert enforcer.update_rule("p", "allow-https", action=PolicyAction.DENY)
+        assert not enforcer.check_connection("a", "b", 443, "tcp")["allowed"]
+        
+        assert enforcer.remove_rule("p", "allow-https")
+        assert not policy.rules
+        assert "default deny" in enforcer.check_connection("a", "b", 443, "tcp")["reason"]
+        
+        enforcer.remove_policy("p")
+        result = enforcer.check_connection("a", "b", 443, "tcp")
+        assert "default deny" in result["reason"]
+        
+        # Least recently used verdicts are evicted
+        for port in (1, 2, 3):
+            enforcer.check_connection("a", "b", port, "tcp")
+        assert enforcer.get_statistics()["verdict_cache"]["size"] == 2
+    
+    def test_rules_cannot_change_in_place(self):
+        """Test rule contents are frozen so compiled verdicts cannot go stale."""
+        enforcer = NetworkPolicyEnforcer(cache_size=0)
+        policy = enforcer.create_policy("p", "P", "default", PolicyType.INGRESS)
+        ports = [443]
+        labels = {"tier": "web"}
+        enforcer.add_rule("p", "allow-https", ports=ports, destination_labels=labels)
+        ports.append(22)
+        labels["tier"] = "db"
+        
+        rule = policy.rules[0]
+        with pytest.raises(AttributeError):
+            rule.ports.append(22)
+        with pytest.raises(TypeError):
+            rule.destination_labels["tier"] = "db"
+        with pytest.raises(AttributeError):
+            policy.rules.append(rule)
+        assert not enforcer.check_connection("a", "b", 22, "tcp", {}, {"tier": "web"})["allowed"]
+        
+        enforcer.update_rule("p", "allow-https", ports=[22])
+        assert enforcer.check_connection("a", "b", 22, "tcp", {}, {"tier": "web"})["allowed"]
+        
+        with pytest.raises(ValueError):
+            enforcer.update_rule("p", "allow-https", port=22)
+        with pytest.raises(ValueError):
+            enforcer.update_policy("p", rules=())
+        with pytest.raises(ValueError):
+            enforcer.update_policy("p", policy_id="q")
+        with pytest.raises(ValueError):
+            enforcer.update_rule("p", "allow-https", rule_id="other")
+    
+    def test_check_many(self):
+        """Test batch connection checks."""
+        enforcer = NetworkPolicyEnforcer()
+        enforcer.create_policy("p", "P", "default", PolicyType.INGRESS)
+        enforcer.add_rule("p", "allow-web", ports=[80, 443], destination_labels={"tier": "web"})
+        
+        results = enforcer.check_many([
+            ("a", "b", 443, "tcp", {}, {"tier": "web"}),
+            ("a", "b", 443, "tcp"),
+            ("a", "c", 80, "tcp", None, {"tier": "web"}),
+        ])
+        
+        assert [r["allowed"] for r in results] == [True, False, True]
+        
+        enforcer.enforcement_enabled = False
+        assert enforcer.check_many([("a", "b", 22, "tcp")])[0]["allowed"]
+    
     def test_export_kubernetes_policy(self):
         """Test exporting policy in Kubernetes format."""
         enforcer = NetworkPolicyEnforcer()
@@ -328,6 +433,86 @@ class TestWebApplicationFirewall:
         assert "summary" in report
         assert "high_severity_threats" in report
         assert "recommendations" in report
+    
+    def test_waf_rule_changes_recompile(self):
+        """Test enabling, disabling and priorities take effect on compiled rules."""
+        waf = WebApplicationFirewall()
+        waf.add_rule(
+            "log-evil", "Log Evil", RuleType.CUSTOM, pattern=r"evil", action="log", priority=1
+        )
+        waf.add_rule("block-evil", "Block Evil", RuleType.CUSTOM, pattern=r"\bevil\w*", priority=5)
+        
+        result = waf.inspect_request("10.0.0.1", "/api/test", "GET", body="EVILness")
+        assert result["rule_id"] == "block-evil"
+        assert [d.rule_id for d in waf.get_detections()] == ["log-evil", "block-evil"]
+        
+        assert waf.disable_rule("block-evil")
+        assert waf.inspect_request("10.0.0.1", "/api/test", "GET", body="evil")["allowed"]
+        
+        assert waf.update_rule("block-evil", enabled=True, priority=0)
+        assert waf.update_rule("log-evil", action="block")
+        result = waf.inspect_request("10.0.0.1", "/api/test", "GET", body="evil")
+        assert result["rule_id"] == "block-evil"
+        
+        assert waf.update_rule("block-evil", pattern=r"\bwicked\b")
+        result = waf.inspect_request("10.0.0.1", "/api/test", "GET", body="evil")
+        assert result["rule_id"] == "log-evil"
+        assert waf.update_rule("block-evil", pattern=r"\bevil\w*")
+        assert not waf.update_rule("unknown", enabled=False)
+        with pytest.raises(ValueError):
+            waf.update_rule("block-evil", severity="high")
+        
+        assert waf.remove_rule("block-evil")
+        result = waf.inspect_request("10.0.0.1", "/api/test", "GET", body="evil")
+        assert result["rule_id"] == "log-evil"
+        
+        with pytest.raises(Exception):
+            waf.add_rule("broken", "Broken", RuleType.CUSTOM, pattern=r"(unclosed")
+    
+    def test_waf_prefilter_statistics(self):
+        """Test literal prefiltering skips rules and per-rule stats are kept."""
+        waf = WebApplicationFirewall()
+        for i in range(50):
+            waf.add_rule(f"kw-{i}", f"Keyword {i}", RuleType.CUSTOM, pattern=rf"keyword{i}x\s*=")
+        waf.add_rule("digits", "Digits", RuleType.CUSTOM, pattern=r"\d{12}", action="log")
+        
+        assert waf.inspect_request("10.0.0.2", "/api/items", "GET", query_params={"q": "ok"})["allowed"]
+        result = waf.inspect_request("10.0.0.2", "/api/items", "POST", body="KEYWORD7X = 1")
+        assert result["rule_id"] == "kw-7"
+        # Non-ASCII input bypasses the prefilter but is still matched
+        body = "\u017f keyword9x="
+        result = waf.inspect_request("10.0.0.2", "/api/items", "POST", body=body)
+        assert result["rule_id"] == "kw-9"
+        
+        stats = waf.get_rule_statistics()
+        assert stats["compiled_rules"] == 54
+        assert stats["prefiltered_rules"] == 53
+        assert stats["rules"]["kw-7"]["matches"] == 1
+        # Prefiltered requests only evaluate rules whose literals occur
+        assert stats["rules"]["digits"]["evaluations"] == 1
+        assert stats["rules"]["kw-8"]["evaluations"] == 1
+        assert stats["rules"]["kw-20"]["evaluations"] == 0
+        assert stats["inspection"]["requests"] == 3
+        assert stats["inspection"]["rules_skipped"] > 100
+    
+    def test_required_literals(self):
+        """Test literal extraction used by the WAF prefilter."""
+        from accelerapp.production.security.rule_matcher import (
+            LiteralMatcher,
+            required_literals,
+        )
+        
+        assert required_literals(r"(<script|javascript:)") == ["<script", "javascript:"]
+        assert required_literals(r"\bUNION\b|--") == ["union", "--"]
+        assert required_literals(r"admin\s*=\s*\d+") == ["admin"]
+        assert required_literals(r"colou?r") == ["colo"]
+        assert required_literals(r"\d+|abc") is None
+        assert required_literals(r"(?i)abc") is None
+        
+        matcher = LiteralMatcher([("he", 1), ("she", 2), ("hers", 4), ("his", 8)])
+        assert matcher.scan("ushers") == 7
+        assert matcher.scan("this") == 8
+        assert matcher.scan("nothing") == 0
 
 
 class TestBackupRecoverySystem:
@@ -500,6 +685,142 @@ class TestBackupRecoverySystem:
         assert verification["valid"]
         assert verification["checksum"] == "abc123"
     
+    def test_content_defined_chunking(self):
+        """Test chunk boundaries are stable across reads and local edits."""
+        from accelerapp.production.security import backup_engine
+        
+        rng = random.Random(7)
+        data = bytes(rng.getrandbits(8) for _ in range(300000))
+        sizes = dict(min_size=1024, avg_size=4096, max_size=16384)
+        chunks = list(backup_engine.iter_chunks(io.BytesIO(data), **sizes))
+        assert b"".join(chunks) == data
+        assert all(1024 <= len(c) <= 16384 for c in chunks[:-1])
+        assert chunks == list(
+            backup_engine.iter_chunks(io.BytesIO(data), read_size=5000, **sizes)
+        )
+        mask = (1 << 12) - 1
+        assert backup_engine._cut_points(data[:20000], mask, use_numpy=False) == \
+            backup_engine._cut_points(data[:20000], mask)
+        
+        # An insertion only disturbs the chunks around it
+        edited = data[:150000] + b"inserted" + data[150000:]
+        edited_chunks = list(backup_engine.iter_chunks(io.BytesIO(edited), **sizes))
+        assert len(set(edited_chunks) - set(chunks)) <= 2
+    
+    def _engine_system(self, root, backup_type):
+        source = root / "source"
+        (source / "kb").mkdir(parents=True)
+        rng = random.Random(3)
+        for i in range(3):
+            (source / "kb" / f"index{i}.bin").write_bytes(
+                bytes(rng.getrandbits(8) for _ in range(40000)) * 2
+            )
+        (source / "kb" / "notes.tmp").write_bytes(b"scratch")
+        
+        engine = BackupEngine(
+            root / "repo", workers=2, min_chunk_size=1024,
+            avg_chunk_size=4096, max_chunk_size=16384
+        )
+        system = BackupRecoverySystem(engine=engine)
+        system.create_backup_config(
+            "kb", "Knowledge base", backup_type, "0 2 * * *",
+            [str(source / "kb")], exclude_patterns=["*.tmp"]
+        )
+        return system, source
+    
+    def test_engine_backup_incremental_and_restore(self, tmp_path):
+        """Test deduplicated incremental backups and verified restore."""
+        system, source = self._engine_system(tmp_path, BackupType.INCREMENTAL)
+        
+        first = system.run_backup("kb", "backup-1")
+        assert first.status == BackupStatus.COMPLETED
+        assert first.files_count == 3
+        assert first.size_bytes == 240000
+        # Each file repeats its content, so about half the chunks are duplicates
+        assert first.metadata["new_chunks"] < first.metadata["chunks"]
+        
+        changed = source / "kb" / "index1.bin"
+        changed.write_bytes(changed.read_bytes()[:1000] + b"edit" + changed.read_bytes()[1000:])
+        second = system.run_backup("kb", "backup-2")
+        assert second.metadata["parent_backup_id"] == "backup-1"
+        assert second.metadata["reused_files"] == 2
+        assert second.metadata["new_chunks"] <= 2
+        assert system.verify_backup("backup-2")["valid"]
+        
+        for backup_id, expected in (("backup-1", 80000), ("backup-2", 80004)):
+            destination = tmp_path / backup_id
+            operation = system.restore_backup(backup_id, str(destination))
+            assert operation.status == RecoveryStatus.COMPLETED
+            assert operation.restored_files == 3
+            assert (destination / "kb" / "index1.bin").stat().st_size == expected
+            assert not (destination / "kb" / "notes.tmp").exists()
+        assert (tmp_path / "backup-2" / "kb" / "index1.bin").read_bytes() == changed.read_bytes()
+    
+    def test_engine_detects_corruption_and_collects_garbage(self, tmp_path):
+        """Test chunk verification, failed restores and retention cleanup."""
+        system, source = self._engine_system(tmp_path, BackupType.FULL)
+        system.run_backup("kb", "backup-1")
+        engine = system.engine
+        
+        snapshot = engine.load_snapshot("backup-1")
+        entry = next(f for f in snapshot.files if f.path == "kb/index0.bin")
+        chunk = engine._chunk_path(entry.chunks[0])
+        chunk.write_bytes(chunk.read_bytes()[:-1] + b"x")
+        
+        verification = system.verify_backup("backup-1")
+        assert not verification["valid"]
+        assert verification["corrupted_chunks"] == [entry.chunks[0]]
+        
+        operation = system.restore_backup("backup-1", str(tmp_path / "restore"))
+        assert operation.status == RecoveryStatus.FAILED
+        assert operation.failed_files == 1
+        assert not (tmp_path / "restore" / "kb" / "index0.bin").exists()
+        assert not list((tmp_path / "restore" / "kb").glob("*.restore-tmp"))
+        
+        system.backups["backup-1"].started_at = (
+            datetime.utcnow() - timedelta(days=40)
+        ).isoformat()
+        result = system.cleanup_old_backups()
+        assert result["removed_backups"] == ["backup-1"]
+        assert result["removed_chunks"] > 0
+        assert engine.get_statistics()["chunks"] == 0
+    
+    def test_engine_keeps_same_named_roots_apart(self, tmp_path):
+        """Test roots sharing a base name back up and restore separately."""
+        roots = []
+        for owner in ("a", "b"):
+            root = tmp_path / owner / "cache"
+            root.mkdir(parents=True)
+            (root / "data.bin").write_bytes(owner.encode() * 5000)
+            roots.append(str(root))
+        
+        system = BackupRecoverySystem(engine=BackupEngine(tmp_path / "repo"))
+        system.create_backup_config(
+            "cache", "Caches", BackupType.INCREMENTAL, "0 2 * * *", roots
+        )
+        assert system.run_backup("cache", "backup-1").files_count == 2
+        
+        (tmp_path / "b" / "cache" / "data.bin").write_bytes(b"changed" * 1000)
+        second = system.run_backup("cache", "backup-2")
+        assert second.files_count == 2
+        assert second.metadata["reused_files"] == 1
+        
+        destination = tmp_path / "restore"
+        operation = system.restore_backup("backup-2", str(destination))
+        assert operation.restored_files == 2
+        assert (destination / "cache" / "data.bin").read_bytes() == b"a" * 5000
+        assert (destination / "cache.1" / "data.bin").read_bytes() == b"changed" * 1000
+    
+    def test_verify_missing_engine_snapshot(self, tmp_path):
+        """Test a backup whose snapshot is gone fails verification."""
+        system, _ = self._engine_system(tmp_path, BackupType.FULL)
+        system.run_backup("kb", "backup-1")
+        system.engine.delete_snapshot("backup-1")
+        
+        verification = system.verify_backup("backup-1")
+        assert not verification["valid"]
+        assert verification["reason"] == "Snapshot not found in backup engine"
+    
     def test_compliance_report(self):
         """Test backup compliance report."""
         system = BackupRecoverySystem()
@@ -655,6 +976,38 @@ class TestSecurityAuditSystem:
         assert "top_actors" in report
         assert "top_resources" in report
     
+    def test_bounded_indexed_event_queries(self, tmp_path):
+        """Test queries and statistics over the bounded event ring."""
+        log_path = tmp_path / "audit.jsonl"
+        audit = SecurityAuditSystem(max_events=20, log_path=log_path)
+        
+        for i in range(50):
+            audit.log_event(
+                [AuditEventType.ACCESS, AuditEventType.AUTHENTICATION][i % 2],
+                f"user{i % 5}",
+                "read",
+                "/api/data",
+                "success",
+                severity=["info", "warning", "critical"][i % 3]
+            )
+        
+        stats = audit.get_statistics()
+        assert stats["total_events"] == 20
+        assert stats["events_by_type"] == {"access": 10, "authentication": 10}
+        assert sum(stats["events_by_severity"].values()) == 20
+        
+        events = audit.get_events(actor="user1", event_type=AuditEventType.AUTHENTICATION)
+        assert [e.event_id for e in events] == ["event-32", "event-42"]
+        critical = audit.get_events(actor="user1", severity="critical", limit=1)
+        assert [e.event_id for e in critical] == ["event-42"]
+        
+        future = datetime.utcnow() + timedelta(hours=1)
+        assert audit.get_events(start_time=future) == []
+        assert len(audit.get_events(end_time=future)) == 20
+        
+        audit.writer.close()
+        assert len(log_path.read_text().splitlines()) == 50
+    
     def test_export_audit_trail(self):
         """Test exporting audit trail."""
         audit = SecurityAuditSystem()
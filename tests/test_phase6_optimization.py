@@ -2,6 +2,7 @@
 Tests for Phase 6 optimization features.
 """
 
+import json
 import pytest
 import time
 from accelerapp.production.optimization import (
@@ -413,6 +414,146 @@ class TestPerformanceProfiler:
         assert "current_performance" in optimization
         assert "optimization_strategies" in optimization
         assert len(optimization["optimization_strategies"]) > 0
+    
+    def test_sampling_is_opt_in(self, monkeypatch):
+        """Test profiling starts no sampler thread unless stack sampling is enabled."""
+        from accelerapp.production.optimization import sampling_profiler
+        
+        started = []
+        monkeypatch.setattr(
+            sampling_profiler.StackSampler, "start", lambda sampler: started.append(sampler)
+        )
+        profiler = PerformanceProfiler()
+        
+        result = profiler.profile_function(lambda: sum(range(100)), iterations=5)
+        
+        assert started == []
+        assert result.samples is None
+        assert result.metadata["sample_count"] == 0
+    
+    def test_sampled_hotspots_and_export(self, tmp_path):
+        """Test stack sampling, per-function stats and flamegraph export."""
+        profiler = PerformanceProfiler(sample_interval=0.001, sample_stacks=True)
+        
+        def busy_leaf():
+            end = time.perf_counter() + 0.05
+            while time.perf_counter() < end:
+                pass
+        
+        def sampled_func():
+            busy_leaf()
+        
+        result = profiler.profile_function(sampled_func, profile_type=ProfileType.CPU)
+        
+        assert result.samples is not None
+        assert result.samples.sample_count > 0
+        assert result.cpu_percent > 50
+        
+        # Stacks are rooted at the profiled function
+        assert all(stack[0].startswith("sampled_func") for stack in result.samples.stacks)
+        stats = result.samples.function_stats()
+        leaf = next(label for label in stats if label.startswith("busy_leaf"))
+        assert stats[leaf]["self_percent"] > 50
+        root = next(label for label in stats if label.startswith("sampled_func"))
+        assert stats[root]["total_percent"] == pytest.approx(100.0)
+        
+        cpu_hotspots = [h for h in result.hotspots if h["type"] == "cpu_hotspot"]
+        assert cpu_hotspots[0]["function"] == leaf
+        
+        assert profiler.export_flamegraph("sampled_func", tmp_path / "profile.json")
+        document = json.loads((tmp_path / "profile.json").read_text())
+        assert document["profiles"][0]["type"] == "sampled"
+        assert any(frame["name"] == leaf for frame in document["shared"]["frames"])
+        
+        assert profiler.export_flamegraph(
+            "sampled_func", tmp_path / "profile.txt", format="collapsed"
+        )
+        lines = (tmp_path / "profile.txt").read_text().splitlines()
+        assert any(line.startswith(f"{root};{leaf} ") for line in lines)
+        assert not profiler.export_flamegraph("unknown", tmp_path / "none.json")
+    
+    def test_detect_hotspot_shift(self):
+        """Test regression detection from shifted sampled hotspots."""
+        profiler = PerformanceProfiler(sample_interval=0.001, sample_stacks=True)
+        
+        def spin(duration):
+            end = time.perf_counter() + duration
+            while time.perf_counter() < end:
+                pass
+        
+        def parse():
+            spin(0.04)
+        
+        def render():
+            spin(0.04)
+        
+        def pipeline(slow_render=False):
+            parse()
+            render()
+            if slow_render:
+                render()
+                render()
+        
+        profiler.profile_function(pipeline, profile_type=ProfileType.CPU)
+        profiler.set_baseline("pipeline")
+        profiler.profile_function(pipeline, slow_render=True, profile_type=ProfileType.CPU)
+        
+        regressions = profiler.detect_regressions(threshold_percent=10.0)
+        
+        assert any(r["type"] == "slowdown" for r in regressions)
+        shifts = [r for r in regressions if r["type"] == "hotspot_shift"]
+        assert shifts
+        assert any(s["hotspot"].startswith("render") for s in shifts)
+    
+    def test_detect_continuous_hotspot_shift(self):
+        """Test regression detection from always-on sampling windows."""
+        profiler = PerformanceProfiler()
+        
+        def spin(duration):
+            end = time.perf_counter() + duration
+            while time.perf_counter() < end:
+                pass
+        
+        def parse():
+            spin(0.04)
+        
+        def render():
+            spin(0.04)
+        
+        profiler.start_sampling(interval=0.001)
+        parse()
+        render()
+        assert profiler.set_sampling_baseline()
+        
+        parse()
+        for _ in range(3):
+            render()
+        profiler.stop_sampling()
+        
+        shifts = [
+            r for r in profiler.detect_regressions(threshold_percent=10.0)
+            if r["type"] == "hotspot_shift"
+        ]
+        assert shifts
+        assert all(s["source"] == "continuous" for s in shifts)
+        assert any(s["hotspot"].startswith("render") for s in shifts)
+    
+    def test_continuous_sampling(self):
+        """Test always-on sampling of all threads."""
+        profiler = PerformanceProfiler()
+        sampler = profiler.start_sampling(interval=0.002)
+        assert sampler.running
+        assert profiler.start_sampling() is sampler
+        
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+        
+        profile = profiler.stop_sampling()
+        assert not sampler.running
+        assert profile.sample_count > 0
+        assert profile.duration > 0
+        assert profiler.stop_sampling() is None
 
 
 class TestIntegration:
@@ -391,3 +391,77 @@ def test_raspberry_pi_pico_validation():
     }
     errors = platform.validate_config(invalid_config)
     assert len(errors) > 0
+
+
+def test_platforms_imported_lazily():
+    """Test importing the package does not import platform modules."""
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, accelerapp.platforms as p\n"
+        "assert 'accelerapp.platforms.esp32' not in sys.modules\n"
+        "p.get_platform('esp32')\n"
+        "assert 'accelerapp.platforms.esp32' in sys.modules\n"
+        "assert 'accelerapp.platforms.nordic.nrf52' not in sys.modules\n"
+        "assert p.ESP32Platform is type(p.get_platform('esp32'))\n"
+    )
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=src),
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_platform_registry_caching_and_registration():
+    """Test platform instance caching and custom registration."""
+    from accelerapp.platforms import PlatformRegistry, BasePlatform, ArduinoPlatform
+
+    class CustomPlatform(ArduinoPlatform):
+        pass
+
+    registry = PlatformRegistry(
+        {"arduino": "accelerapp.platforms.arduino:ArduinoPlatform"}, entry_point_group=None
+    )
+    assert not registry.is_loaded("arduino")
+    platform = registry.get("Arduino")
+    assert registry.is_loaded("arduino")
+    assert registry.get("arduino") is platform
+    assert registry.create("arduino") is not platform
+
+    registry.register("custom", CustomPlatform)
+    assert isinstance(registry.get("custom"), CustomPlatform)
+    with pytest.raises(ValueError):
+        registry.register("custom", CustomPlatform, replace=False)
+
+    assert registry.names() == ["arduino", "custom"]
+    assert registry.unregister("custom")
+    with pytest.raises(ValueError):
+        registry.get("custom")
+
+
+def test_platform_registry_entry_points(tmp_path, monkeypatch):
+    """Test third-party platforms are discovered from entry points."""
+    from accelerapp.platforms import PlatformRegistry
+
+    package = tmp_path / "bench_board.py"
+    package.write_text(
+        "from accelerapp.platforms.arduino import ArduinoPlatform\n"
+        "class BenchBoardPlatform(ArduinoPlatform):\n"
+        "    pass\n"
+    )
+    dist_info = tmp_path / "bench_board-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: bench-board\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[accelerapp.platforms]\nbench_board = bench_board:BenchBoardPlatform\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = PlatformRegistry({"arduino": "accelerapp.platforms.arduino:ArduinoPlatform"})
+    assert "bench_board" in registry.names()
+    assert type(registry.get("bench_board")).__name__ == "BenchBoardPlatform"
@@ -288,3 +288,115 @@ def test_task_timing_analysis():
     assert "utilization" in analysis
     assert "warnings" in analysis
     assert "priorities" in analysis
+
+
+def test_response_time_analysis():
+    """Test exact response times against a textbook task set."""
+    from accelerapp.rtos import SchedulabilityAnalyzer, TaskTiming
+    
+    analyzer = SchedulabilityAnalyzer()
+    tasks = [
+        TaskTiming("t1", period_ms=4, wcet_ms=1, priority=3),
+        TaskTiming("t2", period_ms=6, wcet_ms=2, priority=2),
+        TaskTiming("t3", period_ms=10, wcet_ms=3, priority=1),
+    ]
+    
+    result = analyzer.response_time_analysis(tasks)
+    
+    assert result["schedulable"]
+    assert [t["response_time_ms"] for t in result["tasks"]] == [1.0, 3.0, 10.0]
+    
+    # Deadline longer than the period: the second job has the worst response
+    result = analyzer.response_time_analysis([
+        TaskTiming("a", period_ms=70, wcet_ms=26, priority=2),
+        TaskTiming("b", period_ms=100, wcet_ms=62, deadline_ms=200, priority=1),
+    ])
+    assert result["tasks"][1]["response_time_ms"] == 118.0
+    
+    # Tightening t3's deadline makes it miss
+    tasks[2].deadline_ms = 9
+    result = analyzer.response_time_analysis(tasks)
+    assert not result["schedulable"]
+    assert result["tasks"][2]["response_time_ms"] is None
+
+
+def test_rta_blocking_from_ipc():
+    """Test blocking terms from mutexes and semaphores."""
+    from accelerapp.rtos.freertos import FreeRTOSTaskGenerator
+    
+    generator = FreeRTOSTaskGenerator()
+    tasks = [
+        {"name": "high", "priority": "tskIDLE_PRIORITY + 3", "period_ms": 10,
+         "exec_time_ms": 2, "critical_sections": {"i2c_mutex": 1}},
+        {"name": "mid", "priority": "tskIDLE_PRIORITY + 2", "period_ms": 20,
+         "exec_time_ms": 4, "critical_sections": {"spi_lock": 1}},
+        {"name": "low", "priority": "tskIDLE_PRIORITY + 1", "period_ms": 50,
+         "exec_time_ms": 10, "critical_sections": [
+             {"resource": "i2c_mutex", "duration_ms": 3},
+             {"resource": "spi_lock", "duration_ms": 2},
+         ]},
+    ]
+    ipc = {"mutexes": [{"name": "i2c_mutex"}], "semaphores": [{"name": "spi_lock"}]}
+    
+    analysis = generator.analyze_task_timing(tasks, ipc_config=ipc)
+    
+    assert analysis["total_tasks"] == 3
+    assert analysis["blocking"] == {"high": 3.0, "mid": 3.0, "low": 0.0}
+    assert analysis["response_times"]["high"] == 5.0
+    assert analysis["schedulable"]
+    assert any("spi_lock" in w for w in analysis["warnings"])
+
+
+def test_rate_monotonic_assignment_and_simulation():
+    """Test RM priority assignment and the hyperperiod simulator."""
+    from accelerapp.rtos import FreeRTOSTaskGenerator, SchedulabilityAnalyzer
+    
+    generator = FreeRTOSTaskGenerator()
+    tasks = [
+        {"name": "log", "period_ms": 100, "exec_time_ms": 20},
+        {"name": "control", "period_ms": 5, "exec_time_ms": 1},
+        {"name": "sensor", "period_ms": 20, "exec_time_ms": 4},
+    ]
+    
+    assigned = generator.assign_priorities(tasks)
+    priorities = {t["name"]: t["priority"] for t in assigned}
+    assert priorities == {
+        "control": "tskIDLE_PRIORITY + 3",
+        "sensor": "tskIDLE_PRIORITY + 2",
+        "log": "tskIDLE_PRIORITY + 1",
+    }
+    with pytest.raises(ValueError):
+        generator.assign_priorities(tasks, max_priorities=3)
+    
+    analyzer = SchedulabilityAnalyzer()
+    simulation = analyzer.simulate(assigned)
+    analysis = analyzer.response_time_analysis(assigned)
+    
+    assert simulation["hyperperiod_ms"] == 100.0
+    assert simulation["jobs"] == 26
+    assert simulation["schedulable"]
+    assert simulation["utilization"] > 0
+    for simulated, analysed in zip(simulation["tasks"], analysis["tasks"]):
+        # Synchronous release is the critical instant, so both agree
+        assert simulated["worst_response_ms"] == analysed["response_time_ms"]
+
+
+def test_schedulability_sweep():
+    """Test sweeping task-set variants with analysis and simulation."""
+    from accelerapp.rtos import SchedulabilityAnalyzer
+    
+    analyzer = SchedulabilityAnalyzer()
+    variants = [
+        [
+            {"name": "fast", "period_ms": 10, "exec_time_ms": 2},
+            {"name": "slow", "period_ms": 40, "exec_time_ms": exec_time},
+        ]
+        for exec_time in range(10, 40, 2)
+    ]
+    
+    results = analyzer.sweep(variants, simulate=True)
+    
+    assert len(results) == len(variants)
+    assert results[0]["schedulable"] and not results[-1]["schedulable"]
+    assert all(r["schedulable"] == r["simulated_schedulable"] for r in results)
+    assert results[-1]["unschedulable_tasks"] == ["slow"]
@@ -0,0 +1,57 @@
+"""
+Tests for Accelerapp startup cost.
+"""
+
+import os
+
+import pytest
+from accelerapp.utils.import_time import measure_import_time
+
+# Cold import budget for the CLI entry point (about 80 ms on a dev machine)
+IMPORT_BUDGET_MS = float(os.environ.get("ACCELERAPP_IMPORT_BUDGET_MS", 250))
+
+
+@pytest.fixture(scope="module")
+def cli_import():
+    """Cold import report for accelerapp.cli."""
+    return measure_import_time("accelerapp.cli")
+
+
+def test_cli_import_time_budget(cli_import):
+    """Test cold import of the CLI stays within budget."""
+    assert cli_import["total_ms"] < IMPORT_BUDGET_MS, (
+        f"accelerapp.cli took {cli_import['total_ms']:.1f} ms to import "
+        f"(budget {IMPORT_BUDGET_MS:.0f} ms)"
+    )
+
+
+def test_cli_import_defers_heavy_modules(cli_import):
+    """Test heavy subpackages are not imported at CLI startup."""
+    imported = {entry["name"] for entry in cli_import["modules"]}
+
+    for module in (
+        "pydantic",
+        "yaml",
+        "accelerapp.core.config",
+        "accelerapp.core.events",
+        "accelerapp.hardware",
+        "accelerapp.platforms.esp32",
+        "serial",
+    ):
+        assert module not in imported, f"{module} imported at startup"
+
+
+def test_lazy_exports_resolve():
+    """Test lazily exported names resolve and are cached."""
+    import accelerapp
+    import accelerapp.core as core
+    import accelerapp.hardware as hardware
+
+    assert accelerapp.AccelerappCore is core.AccelerappCore
+    assert core.ServiceContainer.__module__ == "accelerapp.core.container.container"
+    assert "ServiceContainer" in vars(core)
+    assert hardware.FlipperZero.__name__ == "FlipperZero"
+    assert "FlipperZero" in dir(hardware)
+
+    with pytest.raises(AttributeError):
+        hardware.NotAComponent
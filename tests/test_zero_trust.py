@@ -211,6 +211,88 @@ class TestDeviceAuthentication:
         
         # Session should no longer be valid
         assert not auth_service.verify_session(session_id)
+    
+    def test_response_time_baseline_flags_outliers(self):
+        """Test EWMA response time baselines and device statistics."""
+        identity_manager = DeviceIdentityManager()
+        auth_service = DeviceAuthenticationService(identity_manager)
+        
+        identity = identity_manager.create_identity({"mac": "00:11:22:33:44:55"})
+        session_id = auth_service.authenticate_device(
+            identity.device_id,
+            identity.fingerprint
+        )
+        auth_service.authenticate_device(identity.device_id, "wrong")
+        
+        # Warm up the baseline with steady response times
+        for i in range(20):
+            auth_service.update_trust_score(session_id, 0.1 + (i % 2) * 0.01)
+        assert auth_service.get_session_info(session_id)["trust_score"] == 100.0
+        
+        trust_score = auth_service.update_trust_score(session_id, 5.0)
+        assert trust_score == pytest.approx(98.0)
+        assert len(auth_service.get_session_info(session_id)["metrics"]
+                   ["suspicious_activities"]) == 1
+        
+        stats = auth_service.get_device_statistics(identity.device_id)
+        assert stats["total_requests"] == 22
+        assert stats["total_failures"] == 1
+        assert 0.1 < stats["avg_response_time"] < 1.0
+        assert auth_service.get_device_statistics("unknown")["no_data"]
+    
+    def test_batch_trust_scores_match_sequential_updates(self):
+        """Test batch trust scoring against one-at-a-time updates."""
+        updates = [(0.1, True), (0.2, False), (0.1, True)] * 10 + [(9.0, True)]
+        results = []
+        for batch in (False, True):
+            identity_manager = DeviceIdentityManager()
+            auth_service = DeviceAuthenticationService(identity_manager)
+            sessions = []
+            for i in range(3):
+                identity = identity_manager.create_identity({"mac": f"00:00:00:00:00:0{i}"})
+                sessions.append(
+                    auth_service.authenticate_device(identity.device_id, identity.fingerprint)
+                )
+            
+            operations = [
+                (session_id, response_time, success)
+                for response_time, success in updates
+                for session_id in sessions
+            ] + [("missing", 0.1, True)]
+            if batch:
+                results.append(auth_service.update_trust_scores(operations))
+            else:
+                results.append([auth_service.update_trust_score(*op) for op in operations])
+        
+        assert results[0] == results[1]
+        assert results[1][-1] == 0.0
+    
+    def test_cleanup_inactive_sessions(self):
+        """Test expiry of idle and deauthenticated sessions."""
+        identity_manager = DeviceIdentityManager()
+        auth_service = DeviceAuthenticationService(identity_manager)
+        
+        identity = identity_manager.create_identity({"mac": "00:11:22:33:44:55"})
+        session_ids = [
+            auth_service.authenticate_device(identity.device_id, identity.fingerprint)
+            for _ in range(4)
+        ]
+        sessions = auth_service._sessions
+        auth_service.touch_session(session_ids[0], datetime.now() - timedelta(minutes=45))
+        auth_service.touch_session(session_ids[1], datetime.now() - timedelta(minutes=31))
+        assert auth_service.deauthenticate(session_ids[2])
+        assert not auth_service.verify_session(session_ids[2])
+        assert not auth_service.deauthenticate("missing")
+        
+        assert auth_service.cleanup_inactive_sessions(timeout_minutes=40) == 2
+        assert set(sessions) == set(session_ids[1:2] + session_ids[3:])
+        
+        # Activity moves a session back out of the expiring buckets
+        auth_service.update_trust_score(session_ids[1], 0.1)
+        assert auth_service.cleanup_inactive_sessions() == 0
+        assert auth_service.terminate_session(session_ids[1])
+        assert auth_service.cleanup_inactive_sessions(timeout_minutes=0) == 1
+        assert not sessions
 
 
 class TestNetworkSegmentation:
@@ -340,6 +422,34 @@ class TestNetworkSegmentation:
         )
         assert not allowed
 
+    
+    def test_check_many_uses_first_policy_per_pair(self):
+        """Test batch checks against indexed device pair policies."""
+        service = NetworkSegmentationService()
+        
+        service.create_segment("seg_internal", NetworkZone.INTERNAL)
+        service.create_segment("seg_restricted", NetworkZone.RESTRICTED)
+        service.assign_device_to_segment("device1", "seg_internal")
+        service.assign_device_to_segment("device2", "seg_restricted")
+        service.assign_device_to_segment("device3", "seg_internal")
+        
+        service.create_policy("policy1", "device1", "device2", [Protocol.MQTT], [1883])
+        # Shadowed: the first policy for a device pair decides
+        service.create_policy("policy2", "device1", "device2", [Protocol.HTTPS], [443])
+        
+        allowed = service.check_many([
+            ("device1", "device2", Protocol.MQTT, 1883),
+            ("device1", "device2", Protocol.HTTPS, 443),
+            ("device2", "device1", Protocol.MQTT, 1883),
+            ("device1", "device3", Protocol.HTTPS, 443),
+            ("device1", "unknown", Protocol.HTTPS, 443),
+        ])
+        assert allowed == [True, False, False, True, False]
+        
+        assert [p.policy_id for p in service.list_policies("device2")] == [
+            "policy1", "policy2"
+        ]
+        assert service.list_policies("device3") == []
 
 class TestPostQuantumCrypto:
     """Tests for post-quantum cryptography."""
@@ -420,6 +530,64 @@ class TestPostQuantumCrypto:
         assert "classical_public_key" in identity
         assert "pq_public_key" in identity
         assert identity["pq_algorithm"] == "kyber768"
+    
+    def test_batch_signature_verification(self):
+        """Test batched verification against local and foreign keys."""
+        pq_crypto = PostQuantumCrypto()
+        
+        alice = pq_crypto.generate_lattice_keypair("alice")
+        bob = pq_crypto.generate_lattice_keypair("bob")
+        signature = pq_crypto.sign_message("alice", b"reading=42")
+        
+        results = pq_crypto.verify_signatures([
+            (alice.public_key, b"reading=42", signature),
+            (alice.public_key, b"reading=43", signature),
+            (bob.public_key, b"reading=42", signature),
+            (alice.public_key, b"reading=42", signature[:32]),
+            (b"foreign-key", b"reading=42", signature),
+        ])
+        assert results == [True, False, False, False, True]
+        assert not pq_crypto.verify_signature(bob.public_key, b"reading=42", signature)
+        
+        # Rotating a key retires its old public key
+        pq_crypto.generate_lattice_keypair("alice")
+        assert pq_crypto.sign_message("alice", b"reading=42") != signature
+    
+    def test_secure_channel_session_cache(self):
+        """Test session key reuse, expiry, rotation and invalidation."""
+        clock = {"now": 0.0}
+        manager = HybridCryptoManager(
+            session_ttl=60.0, max_session_uses=3, max_sessions=2,
+            clock=lambda: clock["now"]
+        )
+        manager.create_hybrid_identity("gateway")
+        remotes = []
+        for name in ("device1", "device2", "device3"):
+            manager.create_hybrid_identity(name)
+            remotes.append(manager.get_public_keys(name))
+        
+        first = manager.establish_secure_channel("gateway", *remotes[0])
+        assert manager.establish_secure_channel("gateway", *remotes[0]) == first
+        assert manager.establish_secure_channel("gateway", *remotes[1]) != first
+        assert manager.establish_secure_channel("unknown", *remotes[0]) is None
+        
+        # Third use is the last one served by the same secret
+        assert manager.establish_secure_channel("gateway", *remotes[0]) == first
+        second = manager.establish_secure_channel("gateway", *remotes[0])
+        assert second != first
+        
+        clock["now"] = 61.0
+        assert manager.establish_secure_channel("gateway", *remotes[0]) != second
+        rotated = manager.establish_secure_channel("gateway", *remotes[0], rotate=True)
+        assert manager.establish_secure_channels("gateway", remotes[:1]) == [rotated]
+        
+        # The cache is bounded and re-keying an identity drops its sessions
+        manager.establish_secure_channels("gateway", remotes)
+        stats = manager.get_statistics()
+        assert stats["cached_sessions"] == 2
+        assert stats["session_cache"]["hits"] == 4
+        manager.create_hybrid_identity("gateway")
+        assert manager.get_statistics()["cached_sessions"] == 0
 
 
 class TestZeroTrustArchitecture: